@@ -0,0 +1,87 @@
+"""Benchmark candle range reads: SQLite `read_candles` vs the mmap cache.
+
+Loads synthetic daily bars for N symbols into a SQLite file, syncs them
+into a `CandleCache` and times reading a one-year window for every symbol
+from each store.
+
+Usage:
+    poetry run python benchmarks/bench_candle_cache.py
+    poetry run python benchmarks/bench_candle_cache.py --symbols 5000 --bars 2500
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.database import read_candles
+from finhub_etl.loaders import BulkWriter
+from finhub_etl.models import CandlestickData
+from finhub_etl.storage import CandleCache, sync_candle_cache
+
+DAY = 86400
+START = 1_300_000_000
+
+
+async def run(symbols: int, bars: int):
+    rng = np.random.default_rng(0)
+    workdir = Path(tempfile.mkdtemp())
+    engine = create_async_engine(f"sqlite+aiosqlite:///{workdir / 'bench_cache.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[CandlestickData.__table__])
+
+    names = [f"S{i:05d}" for i in range(symbols)]
+    writer = BulkWriter(CandlestickData, batch_size=20_000, engine=engine)
+    timestamps = (START + DAY * np.arange(bars)).tolist()
+    for name in names:
+        close = (100 + np.cumsum(rng.normal(size=bars))).tolist()
+        await writer.write_rows([
+            {"symbol": name, "resolution": "D", "timestamp": ts, "open": c, "high": c,
+             "low": c, "close": c, "volume": 1000}
+            for ts, c in zip(timestamps, close)
+        ])
+
+    cache = CandleCache(workdir / "cache")
+    start = time.perf_counter()
+    await sync_candle_cache(cache, engine=engine, batch_size=500)
+    sync_s = time.perf_counter() - start
+
+    window = (timestamps[-252], timestamps[-1])
+
+    start = time.perf_counter()
+    for i in range(0, symbols, 500):
+        await read_candles(names[i:i + 500], "D", *window, engine)
+    db_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    total = sum(float(cache.read(name, "D", *window)["close"].sum()) for name in names)
+    cache_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in names:
+        cache.read(name, "D", *window)
+    warm_s = time.perf_counter() - start
+
+    await engine.dispose()
+    print(f"{symbols} symbols x {bars} bars, reading the last 252 bars of each")
+    print(f"  initial sync      : {sync_s:8.2f} s")
+    print(f"  sqlite read       : {db_s:8.2f} s")
+    print(f"  cache read + sum  : {cache_s:8.2f} s ({db_s / cache_s:.0f}x, checksum {total:.0f})")
+    print(f"  cache read, warm  : {warm_s:8.2f} s ({db_s / warm_s:.0f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--bars", type=int, default=1250)
+    args = parser.parse_args()
+    asyncio.run(run(args.symbols, args.bars))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark the local technical-indicator engine across 5k symbols.
+
+Compute-only mode times `compute_indicators` + row building on synthetic
+random-walk bars. With --db it also loads the candles into a SQLite file
+and times a full and an incremental `update_indicators` run.
+
+Usage:
+    poetry run python benchmarks/bench_indicators.py
+    poetry run python benchmarks/bench_indicators.py --db --bars 250
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.analytics.indicators import (
+    DEFAULT_INDICATORS,
+    compute_indicators,
+    indicator_rows,
+    update_indicators,
+)
+from finhub_etl.loaders import BulkWriter
+from finhub_etl.models import CandlestickData, TechnicalIndicator
+
+
+def make_bars(rng, bars: int):
+    close = 100 + np.cumsum(rng.normal(size=bars))
+    high = close + rng.random(bars)
+    low = close - rng.random(bars)
+    return high, low, close
+
+
+def bench_compute(symbols: int, bars: int):
+    rng = np.random.default_rng(0)
+    series = [make_bars(rng, bars) for _ in range(symbols)]
+    timestamps = 1_500_000_000 + 86400 * np.arange(bars)
+
+    start = time.perf_counter()
+    for high, low, close in series:
+        compute_indicators(high, low, close, DEFAULT_INDICATORS)
+    compute_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = 0
+    for i, (high, low, close) in enumerate(series):
+        results = compute_indicators(high, low, close, DEFAULT_INDICATORS)
+        rows += len(indicator_rows(f"S{i}", timestamps, results))
+    total_s = time.perf_counter() - start
+
+    print(f"compute: {symbols} symbols x {bars} bars")
+    print(f"  indicators only : {compute_s:8.2f} s ({compute_s / symbols * 1000:.2f} ms/symbol)")
+    print(f"  + row building  : {total_s:8.2f} s ({rows:,} rows)")
+
+
+async def bench_db(symbols: int, bars: int):
+    rng = np.random.default_rng(1)
+    path = Path(tempfile.mkdtemp()) / "bench_indicators.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[CandlestickData.__table__, TechnicalIndicator.__table__],
+        )
+
+    writer = BulkWriter(CandlestickData, batch_size=20_000, engine=engine)
+    timestamps = (1_500_000_000 + 86400 * np.arange(bars)).tolist()
+    for i in range(symbols):
+        high, low, close = make_bars(rng, bars)
+        await writer.write_rows([
+            {"symbol": f"S{i:05d}", "resolution": "D", "timestamp": ts, "open": c, "high": h, "low": lo,
+             "close": c, "volume": 1000}
+            for ts, h, lo, c in zip(timestamps, high.tolist(), low.tolist(), close.tolist())
+        ])
+
+    start = time.perf_counter()
+    full = await update_indicators(batch_size=500, engine=engine)
+    full_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    incremental = await update_indicators(batch_size=500, engine=engine)
+    incremental_s = time.perf_counter() - start
+
+    await engine.dispose()
+    print(f"sqlite: {symbols} symbols x {bars} bars")
+    print(f"  full run        : {full_s:8.2f} s ({full:,} rows)")
+    print(f"  incremental run : {incremental_s:8.2f} s ({incremental:,} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--db", action="store_true", help="also run update_indicators against SQLite")
+    args = parser.parse_args()
+
+    bench_compute(args.symbols, args.bars)
+    if args.db:
+        asyncio.run(bench_db(args.symbols, args.bars))
+
+
+if __name__ == "__main__":
+    main()
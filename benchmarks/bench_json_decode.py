@@ -0,0 +1,126 @@
+"""Benchmark JSON decoders on payloads shaped like the large Finnhub endpoints.
+
+Builds synthetic bodies for /stock/symbol, /stock/candle and
+/stock/financials-reported, then reports decode time and peak memory for
+every decoder installed in this environment.
+
+Usage:
+    poetry run python benchmarks/bench_json_decode.py
+"""
+
+import json
+import random
+import time
+import tracemalloc
+
+from finhub_etl.config.decoders import available_decoders, get_decoder, msgspec
+
+
+def make_stock_symbols(count: int = 120_000) -> bytes:
+    """Body shaped like /stock/symbol?exchange=US (tens of MB)."""
+    records = [
+        {
+            "currency": "USD",
+            "description": f"SYNTHETIC COMPANY {i} INC",
+            "displaySymbol": f"S{i:06d}",
+            "figi": f"BBG{i:09d}",
+            "isin": None,
+            "mic": random.choice(["XNAS", "XNYS", "OOTC"]),
+            "shareClassFIGI": f"BBG{i + 7:09d}",
+            "symbol": f"S{i:06d}",
+            "symbol2": "",
+            "type": "Common Stock",
+        }
+        for i in range(count)
+    ]
+    return json.dumps(records).encode()
+
+
+def make_candles(count: int = 400_000) -> bytes:
+    """Body shaped like /stock/candle for several years of 1-minute bars."""
+    start = 1_600_000_000
+    prices = [100 + random.random() for _ in range(count)]
+    return json.dumps({
+        "s": "ok",
+        "t": [start + 60 * i for i in range(count)],
+        "o": prices,
+        "h": [p + 0.5 for p in prices],
+        "l": [p - 0.5 for p in prices],
+        "c": prices,
+        "v": [random.randint(100, 100_000) for _ in range(count)],
+    }).encode()
+
+
+def make_financials_reported(filings: int = 80, lines: int = 250) -> bytes:
+    """Body shaped like /stock/financials-reported with nested bs/ic/cf items."""
+    def items(section):
+        return [
+            {"concept": f"us-gaap_{section}{j}", "label": f"{section} line {j}",
+             "unit": "usd", "value": random.random() * 1e9}
+            for j in range(lines)
+        ]
+
+    return json.dumps({
+        "cik": "320193",
+        "symbol": "AAPL",
+        "data": [
+            {
+                "accessNumber": f"0000320193-{i:02d}-000001",
+                "symbol": "AAPL",
+                "cik": "320193",
+                "year": 2000 + i // 4,
+                "quarter": i % 4,
+                "form": "10-Q",
+                "startDate": "2020-01-01 00:00:00",
+                "endDate": "2020-03-31 00:00:00",
+                "filedDate": "2020-04-30 00:00:00",
+                "acceptedDate": "2020-04-30 18:00:00",
+                "report": {"bs": items("bs"), "ic": items("ic"), "cf": items("cf")},
+            }
+            for i in range(filings)
+        ],
+    }).encode()
+
+
+def measure(decoder, payload: bytes, endpoint: str, repeat: int = 3):
+    """Return (best seconds, peak traced MB) for decoding payload."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = decoder.decode(payload, endpoint)
+        best = min(best, time.perf_counter() - start)
+        del result
+
+    tracemalloc.start()
+    result = decoder.decode(payload, endpoint)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak / 1024 / 1024
+
+
+def main():
+    random.seed(42)
+    payloads = {
+        "/stock/symbol": make_stock_symbols(),
+        "/stock/candle": make_candles(),
+        "/stock/financials-reported": make_financials_reported(),
+    }
+
+    decoders = [get_decoder(name) for name in available_decoders()]
+    if msgspec is not None:
+        decoders.append(get_decoder("msgspec", typed=True))
+
+    print(f"{'endpoint':<28} {'size MB':>8} {'decoder':<16} {'time ms':>9} {'peak MB':>9}")
+    print("-" * 74)
+    for endpoint, payload in payloads.items():
+        size_mb = len(payload) / 1024 / 1024
+        for decoder in decoders:
+            label = decoder.name + (" (typed)" if getattr(decoder, "typed", False) else "")
+            seconds, peak_mb = measure(decoder, payload, endpoint)
+            print(f"{endpoint:<28} {size_mb:>8.1f} {label:<16} {seconds * 1000:>9.1f} {peak_mb:>9.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark event-loop responsiveness while transforming large payloads.
+
+Transforms N synthetic 1-minute /stock/candle bodies (about a year of bars
+each) inline on the loop and through a `TransformPool`, while a heartbeat
+task measures how late the loop wakes it up: the worst lag is how long
+every in-flight HTTP request would have been stalled.
+
+Usage:
+    poetry run python benchmarks/bench_offload.py
+    poetry run python benchmarks/bench_offload.py --payloads 32 --bars 200000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from finhub_etl.loaders import TransformPool
+
+PARAMS = {"symbol": "AAPL", "resolution": "1"}
+
+
+def make_body(bars: int) -> bytes:
+    rng = np.random.default_rng(0)
+    close = (100 + np.cumsum(rng.normal(size=bars))).round(4).tolist()
+    return json.dumps({
+        "s": "ok", "t": list(range(1_600_000_000, 1_600_000_000 + 60 * bars, 60)),
+        "o": close, "h": close, "l": close, "c": close, "v": [1000] * bars,
+    }).encode()
+
+
+async def heartbeat(lags, stop, interval=0.005):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run(label, pool, bodies):
+    lags, stop = [], asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(pool.transform("/stock/candle", PARAMS, body) for body in bodies))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    rows = sum(len(result) for result in results)
+    print(f"  {label:<8}: {elapsed:6.2f} s, {rows:,} rows, max loop lag {max(lags) * 1000:7.1f} ms")
+
+
+async def main_async(payloads, bars, workers):
+    bodies = [make_body(bars)] * payloads
+    print(f"{payloads} payloads x {bars} bars ({len(bodies[0]) / 1e6:.1f} MB each)")
+    await run("inline", TransformPool(threshold=len(bodies[0]) + 1), bodies)
+    async with TransformPool(workers=workers, threshold=0) as pool:
+        await pool.transform("/stock/candle", PARAMS, make_body(10))  # start the workers
+        await run("pool", pool, bodies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--payloads", type=int, default=16)
+    parser.add_argument("--bars", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.payloads, args.bars, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark streamed trade ingestion against the local stand-in server.
+
+Streams random trades for N symbols from a `StandInServer` through
+`FinnhubStream` into a `TickIngestor` and a `BarAggregator` writing to
+SQLite, and reports the sustained ingest rate, tick-to-disk lag, bar
+aggregation cost and the time to recover from a dropped-connection outage.
+
+Usage:
+    poetry run python benchmarks/bench_stream.py
+    poetry run python benchmarks/bench_stream.py --symbols 3000 --rate 20000 --seconds 20
+"""
+
+import argparse
+import asyncio
+import itertools
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.models import CandlestickData, RealtimeQuote, TradeTick
+from finhub_etl.realtime import BarAggregator, FinnhubStream, StandInServer, Tick, TickIngestor
+
+
+def _ticks(names):
+    now = int(time.time() * 1000)
+    for i in itertools.count():
+        yield Tick(names[i % len(names)], 100.0 + (i % 97) * 0.01, 10, now + i // 1000)
+
+
+async def run(symbols: int, rate: float, seconds: float, per_connection: int):
+    workdir = Path(tempfile.mkdtemp())
+    engine = create_async_engine(f"sqlite+aiosqlite:///{workdir / 'bench_stream.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[
+            TradeTick.__table__, RealtimeQuote.__table__, CandlestickData.__table__,
+        ])
+
+    names = [f"S{i:05d}" for i in range(symbols)]
+    async with StandInServer(trades_per_second=rate, tick_interval=0.02, seed=0) as server:
+        ingestor = TickIngestor(batch_size=10_000, flush_interval=0.5, engine=engine)
+        bars = BarAggregator(engine=engine)
+        stream = FinnhubStream(names, tokens=["bench"], url=server.url, symbols_per_connection=per_connection,
+                               on_trades=[ingestor.add, bars.add], subscribe_rate=0)
+        tasks = [asyncio.create_task(stream.run()), asyncio.create_task(ingestor.run()),
+                 asyncio.create_task(bars.run())]
+
+        start = time.perf_counter()
+        while server.metrics()["subscribed"] < symbols:
+            await asyncio.sleep(0.01)
+        subscribe_s = time.perf_counter() - start
+
+        await asyncio.sleep(seconds)
+        steady = dict(ingestor.metrics())
+
+        start = time.perf_counter()
+        await server.drop_connections()
+        while server.metrics()["subscribed"] < symbols or server.metrics()["connections"] < len(stream.shards):
+            await asyncio.sleep(0.01)
+        recover_s = time.perf_counter() - start
+
+        await stream.stop()
+        ingestor.stop()
+        bars.stop()
+        await asyncio.gather(*tasks)
+        final = ingestor.metrics()
+
+    sample = list(itertools.islice(_ticks(names), 500_000))
+    start = time.perf_counter()
+    BarAggregator(engine=engine).add(sample)
+    aggregate_s = time.perf_counter() - start
+
+    await engine.dispose()
+    print(f"{symbols} symbols over {len(stream.shards)} connections, {rate:.0f} trades/s per connection")
+    print(f"  subscribe all        : {subscribe_s:8.2f} s")
+    print(f"  ticks written        : {steady['written']:8d} ({steady['written'] / seconds:,.0f}/s)")
+    print(f"  flushes              : {steady['flushes']:8d} (last {steady['last_flush_seconds'] * 1000:.1f} ms)")
+    print(f"  worst tick-to-disk   : {steady['max_lag_ms']:8d} ms")
+    print(f"  bar aggregation      : {len(sample) / aggregate_s:8,.0f} trades/s in process")
+    print(f"  bars written         : {bars.bars_written:8d}")
+    print(f"  outage recovery      : {recover_s:8.2f} s")
+    print(f"  received / written   : {final['received']} / {final['written']} (dropped {final['dropped']})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=5000, help="trades per second per connection")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--per-connection", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.symbols, args.rate, args.seconds, args.per_connection))
+
+
+if __name__ == "__main__":
+    main()
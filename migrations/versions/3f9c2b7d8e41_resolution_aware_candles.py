@@ -0,0 +1,95 @@
+"""resolution aware candles
+
+Revision ID: 3f9c2b7d8e41
+Revises: bf203a4d1944
+Create Date: 2026-10-19 10:12:31.402117
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2b7d8e41'
+down_revision: Union[str, Sequence[str], None] = 'bf203a4d1944'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created up front; later months are split out of pmax
+# by finhub_etl.database.candles.ensure_candle_partitions
+FIRST_PARTITION = (2015, 1)
+LAST_PARTITION = (2027, 12)
+
+
+def _month_start(year: int, month: int) -> int:
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp())
+
+
+def _partitions() -> str:
+    year, month = FIRST_PARTITION
+    parts = [f"PARTITION pold VALUES LESS THAN ({_month_start(year, month)})"]
+    while (year, month) <= LAST_PARTITION:
+        parts.append(f"PARTITION p{year:04d}{month:02d} VALUES LESS THAN ({_month_start(year, month + 1)})")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    parts.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+    return ",\n    ".join(parts)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    price = sa.Numeric(14, 6, asdecimal=False)
+    op.create_table('candlestick_data_new',
+    sa.Column('symbol', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('resolution', sqlmodel.sql.sqltypes.AutoString(length=2), nullable=False),
+    sa.Column('timestamp', sa.Integer().with_variant(mysql.INTEGER(unsigned=True), 'mysql'), nullable=False),
+    sa.Column('close', price, nullable=True),
+    sa.Column('high', price, nullable=True),
+    sa.Column('low', price, nullable=True),
+    sa.Column('open', price, nullable=True),
+    sa.Column('volume', sa.BigInteger(), nullable=True),
+    sa.PrimaryKeyConstraint('symbol', 'resolution', 'timestamp')
+    )
+    if op.get_bind().dialect.name == 'mysql':
+        # Partition before the copy so rows land in place
+        op.execute(f"ALTER TABLE candlestick_data_new PARTITION BY RANGE (timestamp) (\n    {_partitions()}\n)")
+
+    # Existing bars were loaded with the default daily resolution
+    op.execute(
+        "INSERT INTO candlestick_data_new "
+        "(symbol, resolution, timestamp, close, high, low, open, volume) "
+        "SELECT symbol, 'D', timestamp, close, high, low, open, volume FROM candlestick_data"
+    )
+    op.drop_index(op.f('ix_candlestick_data_symbol'), table_name='candlestick_data')
+    op.drop_table('candlestick_data')
+    op.rename_table('candlestick_data_new', 'candlestick_data')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('candlestick_data_old',
+    sa.Column('symbol', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('timestamp', sa.Integer(), nullable=False),
+    sa.Column('close', sa.Float(), nullable=True),
+    sa.Column('high', sa.Float(), nullable=True),
+    sa.Column('low', sa.Float(), nullable=True),
+    sa.Column('open', sa.Float(), nullable=True),
+    sa.Column('volume', sa.Float(), nullable=True),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.PrimaryKeyConstraint('symbol', 'timestamp')
+    )
+    # Only daily bars fit the old (symbol, timestamp) key
+    op.execute(
+        "INSERT INTO candlestick_data_old "
+        "(symbol, timestamp, close, high, low, open, volume, status) "
+        "SELECT symbol, timestamp, close, high, low, open, volume, 'ok' "
+        "FROM candlestick_data WHERE resolution = 'D'"
+    )
+    op.drop_table('candlestick_data')
+    op.rename_table('candlestick_data_old', 'candlestick_data')
+    op.create_index(op.f('ix_candlestick_data_symbol'), 'candlestick_data', ['symbol'], unique=False)
@@ -0,0 +1,55 @@
+"""work leases and rate limits
+
+Revision ID: 8d41c7a2e5f0
+Revises: 3f9c2b7d8e41
+Create Date: 2026-10-19 14:02:18.551204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41c7a2e5f0'
+down_revision: Union[str, Sequence[str], None] = '3f9c2b7d8e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('work_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('dataset', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('params', sa.Text(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=8), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('lease_owner', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True),
+    sa.Column('lease_token', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=True),
+    sa.Column('lease_expires', sa.BigInteger(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('updated_at', sa.BigInteger(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_work_items_claim', 'work_items', ['job', 'status', 'lease_expires'], unique=False)
+    op.create_index(op.f('ix_work_items_lease_token'), 'work_items', ['lease_token'], unique=False)
+    op.create_table('rate_limits',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('capacity', sa.Double(), nullable=False),
+    sa.Column('refill_per_second', sa.Double(), nullable=False),
+    sa.Column('tokens', sa.Double(), nullable=False),
+    sa.Column('updated_at', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rate_limits')
+    op.drop_index(op.f('ix_work_items_lease_token'), table_name='work_items')
+    op.drop_index('ix_work_items_claim', table_name='work_items')
+    op.drop_table('work_items')
@@ -0,0 +1,64 @@
+"""normalized news store
+
+Revision ID: a93c4e6f1d27
+Revises: 5b7e9d13c2a4
+Create Date: 2026-10-19 17:26:52.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93c4e6f1d27'
+down_revision: Union[str, Sequence[str], None] = '5b7e9d13c2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('news_articles',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('datetime', sa.BigInteger(), nullable=True),
+    sa.Column('category', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('headline', sa.Text(), nullable=True),
+    sa.Column('image', sa.Text(), nullable=True),
+    sa.Column('related', sa.Text(), nullable=True),
+    sa.Column('source', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('url', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_news_articles_datetime'), 'news_articles', ['datetime'], unique=False)
+    op.create_table('news_symbols',
+    sa.Column('symbol', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+    sa.Column('article_id', sa.BigInteger(), nullable=False),
+    sa.Column('datetime', sa.BigInteger(), nullable=True),
+    sa.PrimaryKeyConstraint('symbol', 'article_id')
+    )
+    op.create_index(op.f('ix_news_symbols_article_id'), 'news_symbols', ['article_id'], unique=False)
+    op.create_index('ix_news_symbols_symbol_datetime', 'news_symbols', ['symbol', 'datetime'], unique=False)
+
+    # Carry over the per-symbol copies already in company_news
+    op.execute(
+        "INSERT INTO news_articles (id, datetime, category, headline, image, related, source, summary, url) "
+        "SELECT id, MAX(datetime), MAX(category), MAX(headline), MAX(image), MAX(related), MAX(source), "
+        "MAX(summary), MAX(url) FROM company_news GROUP BY id"
+    )
+    op.execute(
+        "INSERT INTO news_symbols (symbol, article_id, datetime) "
+        "SELECT symbol, id, MAX(datetime) FROM company_news GROUP BY symbol, id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_news_symbols_symbol_datetime', table_name='news_symbols')
+    op.drop_index(op.f('ix_news_symbols_article_id'), table_name='news_symbols')
+    op.drop_table('news_symbols')
+    op.drop_index(op.f('ix_news_articles_datetime'), table_name='news_articles')
+    op.drop_table('news_articles')
@@ -0,0 +1,31 @@
+"""fractional candle volume
+
+Revision ID: c4e8a2d6f913
+Revises: e2f84b6c0a19
+Create Date: 2026-10-19 21:05:12.481930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2d6f913'
+down_revision: Union[str, Sequence[str], None] = 'e2f84b6c0a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Crypto and FX trades have fractional volumes; live bars sum them as-is
+    op.alter_column('candlestick_data', 'volume',
+                    existing_type=sa.BigInteger(), type_=sa.Double(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('candlestick_data', 'volume',
+                    existing_type=sa.Double(), type_=sa.BigInteger(), existing_nullable=True)
@@ -0,0 +1,38 @@
+"""trade ticks
+
+Revision ID: e2f84b6c0a19
+Revises: a93c4e6f1d27
+Create Date: 2026-10-19 18:12:44.207815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f84b6c0a19'
+down_revision: Union[str, Sequence[str], None] = 'a93c4e6f1d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('trade_ticks',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('symbol', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('timestamp', sa.BigInteger(), nullable=False),
+    sa.Column('price', sa.Numeric(precision=14, scale=6, asdecimal=False), nullable=False),
+    sa.Column('volume', sa.Double(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_trade_ticks_symbol_timestamp', 'trade_ticks', ['symbol', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trade_ticks_symbol_timestamp', table_name='trade_ticks')
+    op.drop_table('trade_ticks')
@@ -0,0 +1,33 @@
+from .indicators import (
+    IndicatorSpec,
+    DEFAULT_INDICATORS,
+    compute_indicators,
+    indicator_rows,
+    update_indicators,
+)
+from .resample import (
+    RESOLUTIONS,
+    Session,
+    EXCHANGE_SESSIONS,
+    resample,
+    load_holidays,
+    resample_candles,
+    store_resampled,
+)
+
+__all__ = [
+    # Technical indicators
+    "IndicatorSpec",
+    "DEFAULT_INDICATORS",
+    "compute_indicators",
+    "indicator_rows",
+    "update_indicators",
+    # Candle resampling
+    "RESOLUTIONS",
+    "Session",
+    "EXCHANGE_SESSIONS",
+    "resample",
+    "load_holidays",
+    "resample_candles",
+    "store_resampled",
+]
@@ -0,0 +1,383 @@
+"""Technical indicators computed locally from stored candles.
+
+Every indicator stored in `technical_indicators` (SMA, EMA, RSI, MACD,
+Bollinger Bands, ATR) is derived from the OHLCV already in
+`candlestick_data`, instead of one /indicator API call per
+(symbol, indicator, window). All math is vectorized NumPy over one symbol's
+full series; recursive averages (EMA, Wilder smoothing) are evaluated in
+fixed-size blocks so they stay vectorized and numerically stable.
+
+Indicator keys written to `TechnicalIndicator.indicator` encode the
+parameters, e.g. 'sma_20', 'rsi_14', 'macd_12_26_9', 'macd_signal_12_26_9',
+'bbands_upper_20_2'.
+
+Example:
+    >>> results = compute_indicators(high, low, close, [IndicatorSpec("rsi", (14,))])
+    >>> results["rsi_14"]
+    >>> count = await update_indicators(["AAPL", "MSFT"])
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..loaders import BulkWriter
+from ..models import CandlestickData, TechnicalIndicator
+from ..storage import CandleCache
+
+# Block length for the vectorized EMA recursion; (1 - alpha) ** -BLOCK must
+# stay far below the float64 range for the smallest windows.
+_EMA_BLOCK = 128
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """One configured indicator.
+
+    Args:
+        name: 'sma', 'ema', 'rsi', 'macd', 'bbands' or 'atr'
+        params: Window parameters, e.g. (20,) for SMA, (12, 26, 9) for MACD,
+            (20, 2) for Bollinger Bands
+    """
+
+    name: str
+    params: Tuple[float, ...]
+
+    @property
+    def key(self) -> str:
+        return "_".join([self.name, *(f"{p:g}" for p in self.params)])
+
+    @property
+    def outputs(self) -> Tuple[str, ...]:
+        """Indicator keys this spec produces."""
+        suffix = "_".join(f"{p:g}" for p in self.params)
+        if self.name == "macd":
+            return (f"macd_{suffix}", f"macd_signal_{suffix}", f"macd_hist_{suffix}")
+        if self.name == "bbands":
+            return (f"bbands_upper_{suffix}", f"bbands_middle_{suffix}", f"bbands_lower_{suffix}")
+        return (self.key,)
+
+
+DEFAULT_INDICATORS: Tuple[IndicatorSpec, ...] = (
+    IndicatorSpec("sma", (20,)),
+    IndicatorSpec("sma", (50,)),
+    IndicatorSpec("ema", (12,)),
+    IndicatorSpec("ema", (26,)),
+    IndicatorSpec("rsi", (14,)),
+    IndicatorSpec("macd", (12, 26, 9)),
+    IndicatorSpec("bbands", (20, 2)),
+    IndicatorSpec("atr", (14,)),
+)
+
+
+def _empty(size: int) -> np.ndarray:
+    return np.full(size, np.nan)
+
+
+def _recursive_average(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """Evaluate y[i] = alpha * x[i] + (1 - alpha) * y[i - 1] with y[-1] = seed."""
+    out = np.empty(len(values))
+    if alpha >= 1:
+        out[:] = values
+        return out
+
+    decay = 1.0 - alpha
+    powers = decay ** np.arange(1, _EMA_BLOCK + 1)
+    prev = seed
+    for start in range(0, len(values), _EMA_BLOCK):
+        block = values[start:start + _EMA_BLOCK]
+        n = len(block)
+        scale = powers[:n]
+        # sum_{j<=i} decay^(i-j) x_j == decay^i * cumsum(x_j / decay^j)
+        acc = np.cumsum(block / (scale / decay)) * (scale / decay)
+        out[start:start + n] = alpha * acc + scale * prev
+        prev = out[start + n - 1]
+    return out
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average (NaN until `window` values are available)."""
+    out = _empty(len(values))
+    if len(values) >= window:
+        csum = np.cumsum(np.insert(values, 0, 0.0))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def ema(values: np.ndarray, window: int) -> np.ndarray:
+    """Exponential moving average seeded with the SMA of the first window."""
+    out = _empty(len(values))
+    if len(values) >= window:
+        seed = values[:window].mean()
+        out[window - 1] = seed
+        out[window:] = _recursive_average(values[window:], 2.0 / (window + 1), seed)
+    return out
+
+
+def _wilder(values: np.ndarray, window: int, first: int) -> np.ndarray:
+    """Wilder smoothing of values[first:], seeded with their first-window mean."""
+    out = _empty(len(values))
+    end = first + window
+    if len(values) >= end:
+        seed = values[first:end].mean()
+        out[end - 1] = seed
+        out[end:] = _recursive_average(values[end:], 1.0 / window, seed)
+    return out
+
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing."""
+    delta = np.diff(close, prepend=np.nan)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    avg_gain = _wilder(gains, window, first=1)
+    avg_loss = _wilder(losses, window, first=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), out)
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, ...]:
+    """MACD line, signal line and histogram."""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = _empty(len(close))
+    valid = np.flatnonzero(~np.isnan(line))
+    if len(valid):
+        signal_line[valid[0]:] = ema(line[valid[0]:], signal)
+    return line, signal_line, line - signal_line
+
+
+def bbands(close: np.ndarray, window: int = 20, width: float = 2.0) -> Tuple[np.ndarray, ...]:
+    """Bollinger Bands (upper, middle, lower) using the population std."""
+    middle = sma(close, window)
+    std = _empty(len(close))
+    if len(close) >= window:
+        std[window - 1:] = np.lib.stride_tricks.sliding_window_view(close, window).std(axis=1)
+    return middle + width * std, middle, middle - width * std
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing."""
+    prev_close = np.roll(close, 1)
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    if len(true_range):
+        true_range[0] = high[0] - low[0]
+    return _wilder(true_range, window, first=0)
+
+
+def compute_indicators(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    indicators: Iterable[IndicatorSpec] = DEFAULT_INDICATORS,
+) -> Dict[str, np.ndarray]:
+    """Compute the configured indicators for one symbol's time-ordered bars.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        indicators: Indicators to compute (default: DEFAULT_INDICATORS)
+
+    Returns:
+        Dictionary of indicator key -> values aligned with the input bars
+        (NaN during each indicator's warm-up)
+
+    Raises:
+        ValueError: If an indicator name is unknown
+    """
+    results: Dict[str, np.ndarray] = {}
+    for spec in indicators:
+        params = spec.params
+        if spec.name == "sma":
+            values = (sma(close, int(params[0])),)
+        elif spec.name == "ema":
+            values = (ema(close, int(params[0])),)
+        elif spec.name == "rsi":
+            values = (rsi(close, int(params[0])),)
+        elif spec.name == "macd":
+            values = macd(close, *(int(p) for p in params))
+        elif spec.name == "bbands":
+            values = bbands(close, int(params[0]), float(params[1]))
+        elif spec.name == "atr":
+            values = (atr(high, low, close, int(params[0])),)
+        else:
+            raise ValueError(f"Unknown indicator '{spec.name}'")
+        results.update(zip(spec.outputs, values))
+    return results
+
+
+def indicator_rows(
+    symbol: str,
+    timestamps: np.ndarray,
+    results: Dict[str, np.ndarray],
+    after: Optional[Dict[str, int]] = None,
+) -> List[Dict[str, object]]:
+    """Turn computed indicator arrays into `technical_indicators` rows.
+
+    Args:
+        symbol: Stock symbol
+        timestamps: Bar timestamps aligned with the result arrays
+        results: Output of `compute_indicators`
+        after: Optional indicator key -> last stored timestamp; only newer
+            bars are emitted for those keys
+
+    Returns:
+        Column dicts for TechnicalIndicator (NaN warm-up values skipped)
+    """
+    after = after or {}
+    rows = []
+    for key, values in results.items():
+        mask = ~np.isnan(values)
+        if key in after:
+            mask &= timestamps > after[key]
+        for ts, value in zip(timestamps[mask].tolist(), values[mask].tolist()):
+            rows.append({"symbol": symbol, "timestamp": ts, "indicator": key, "value": value, "signal": None})
+    return rows
+
+
+def _split_by_symbol(rows: Sequence[tuple]) -> Iterable[Tuple[str, np.ndarray]]:
+    """Split (symbol, timestamp, high, low, close) rows ordered by symbol."""
+    if not rows:
+        return
+    symbols = [row[0] for row in rows]
+    data = np.array([row[1:] for row in rows], dtype=float)
+    bounds = [0] + [i for i in range(1, len(symbols)) if symbols[i] != symbols[i - 1]] + [len(symbols)]
+    for start, end in zip(bounds, bounds[1:]):
+        yield symbols[start], data[start:end]
+
+
+def _read_cached(
+    cache: CandleCache, symbols: Sequence[str], resolution: str, from_timestamp: Optional[int]
+) -> Iterable[Tuple[str, np.ndarray]]:
+    """Yield (symbol, [timestamp, high, low, close] block) from the candle cache."""
+    for symbol in symbols:
+        bars = cache.read(symbol, resolution, from_timestamp)
+        present = ~np.isnan(bars["close"])
+        if present.any():
+            yield symbol, np.column_stack([
+                bars[name][present] for name in ("timestamp", "high", "low", "close")
+            ]).astype(float)
+
+
+async def update_indicators(
+    symbols: Optional[Sequence[str]] = None,
+    indicators: Sequence[IndicatorSpec] = DEFAULT_INDICATORS,
+    resolution: str = "D",
+    batch_size: int = 200,
+    warmup_seconds: int = 400 * 86400,
+    cache: Optional[CandleCache] = None,
+    engine: Optional[AsyncEngine] = None,
+) -> int:
+    """Compute indicators from stored candles and bulk-write the new values.
+
+    Symbols are processed in batches: one query reads the last stored
+    timestamp per (symbol, indicator), one query reads the candles, and
+    only bars newer than what is already stored are written. On incremental
+    runs candles are read from `warmup_seconds` before the oldest stored
+    timestamp of the batch so recursive indicators are warmed up.
+
+    Args:
+        symbols: Symbols to process (default: every symbol in candlestick_data)
+        indicators: Indicators to compute (default: DEFAULT_INDICATORS)
+        resolution: Candle resolution to read (default: 'D'). Keys of other
+            resolutions are suffixed, e.g. 'rsi_14@60'
+        batch_size: Symbols per DB round trip (default: 200)
+        warmup_seconds: History re-read before the last stored value (default: 400 days)
+        cache: Read candles from this `CandleCache` instead of candlestick_data
+            (default: None). Symbols default to the cached ones.
+        engine: Async engine (default: finhub_etl.database.engine)
+
+    Returns:
+        Number of indicator rows written
+    """
+    if engine is None:
+        from ..database import engine
+
+    candles = CandlestickData.__table__.c
+    stored = TechnicalIndicator.__table__.c
+    suffix = "" if resolution == "D" else f"@{resolution}"
+    keys = [key + suffix for spec in indicators for key in spec.outputs]
+
+    if symbols is None and cache is not None:
+        symbols = cache.symbols(resolution)
+    elif symbols is None:
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                select(distinct(candles.symbol))
+                .where(candles.resolution == resolution)
+                .order_by(candles.symbol)
+            )
+            symbols = result.scalars().all()
+
+    writer = BulkWriter(TechnicalIndicator, on_conflict="update", engine=engine)
+    total = 0
+
+    for start in range(0, len(symbols), batch_size):
+        batch = list(symbols[start:start + batch_size])
+
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                select(stored.symbol, stored.indicator, func.max(stored.timestamp))
+                .where(stored.symbol.in_(batch), stored.indicator.in_(keys))
+                .group_by(stored.symbol, stored.indicator)
+            )
+            last: Dict[str, Dict[str, int]] = {}
+            for symbol, key, ts in result:
+                last.setdefault(symbol, {})[key] = ts
+
+            # Only skip history when every symbol/indicator already has values
+            floor = None
+            if len(last) == len(batch) and all(len(v) == len(keys) for v in last.values()):
+                floor = min(ts for v in last.values() for ts in v.values()) - warmup_seconds
+
+            if cache is None:
+                query = (
+                    select(candles.symbol, candles.timestamp, candles.high, candles.low, candles.close)
+                    .where(
+                        candles.symbol.in_(batch),
+                        candles.resolution == resolution,
+                        candles.close.is_not(None),
+                    )
+                    .order_by(candles.symbol, candles.timestamp)
+                )
+                if floor is not None:
+                    query = query.where(candles.timestamp > floor)
+                series = _split_by_symbol((await conn.execute(query)).all())
+
+        if cache is not None:
+            series = _read_cached(cache, batch, resolution, None if floor is None else floor + 1)
+
+        out = []
+        for symbol, data in series:
+            timestamps = data[:, 0].astype(np.int64)
+            high, low, close = data[:, 1], data[:, 2], data[:, 3]
+            high = np.where(np.isnan(high), close, high)
+            low = np.where(np.isnan(low), close, low)
+            results = compute_indicators(high, low, close, indicators)
+            if suffix:
+                results = {key + suffix: values for key, values in results.items()}
+            out.extend(indicator_rows(symbol, timestamps, results, last.get(symbol)))
+
+        total += await writer.write_rows(out)
+        print(f"Indicators: {min(start + batch_size, len(symbols))}/{len(symbols)} symbols, {total} rows")
+
+    return total
+
+
+__all__ = [
+    "IndicatorSpec",
+    "DEFAULT_INDICATORS",
+    "sma",
+    "ema",
+    "rsi",
+    "macd",
+    "bbands",
+    "atr",
+    "compute_indicators",
+    "indicator_rows",
+    "update_indicators",
+]
@@ -0,0 +1,317 @@
+"""Local candle resampling (1-minute -> 5/15/30/60/D/W/M).
+
+`get_candles` is called once per resolution for the same symbol and range.
+This module builds the coarser resolutions from 1-minute (or daily) bars
+instead, with a vectorized group-by over timestamp buckets, so one API call
+feeds every resolution and they stay mutually consistent.
+
+Buckets follow the exchange session: intraday buckets are aligned to the
+session open in the exchange timezone (09:30, 09:35, ... for US), bars
+outside the regular session are dropped, full-day `MarketHoliday` closures
+are skipped and half days end at their `trading_hour` close.
+
+Resampled bars are stored in `candlestick_data` under their own resolution
+(`store_resampled`).
+
+Output timestamps are the bucket start for intraday resolutions and 00:00
+UTC of the first trading day in the bucket for D/W/M, matching the
+/stock/candle convention. Daily input bars carry that same convention, so
+they are bucketed by their UTC date; only intraday bars are shifted to the
+exchange timezone.
+
+Example:
+    >>> bars = resample(t, o, h, l, c, v, "15", holidays=holidays)
+    >>> bars["t"][:2]
+    array([1704205800, 1704206700])
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..database.candles import read_candles
+from ..loaders import BulkWriter
+from ..models import CandlestickData, MarketHoliday
+
+INTRADAY_MINUTES = {"1": 1, "5": 5, "15": 15, "30": 30, "60": 60}
+RESOLUTIONS = ("1", "5", "15", "30", "60", "D", "W", "M")
+
+
+@dataclass(frozen=True)
+class Session:
+    """Regular trading session of an exchange.
+
+    Args:
+        timezone: IANA timezone of the exchange (e.g. 'America/New_York')
+        open_minute: Session open, minutes after local midnight
+        close_minute: Session close, minutes after local midnight
+    """
+
+    timezone: str
+    open_minute: int
+    close_minute: int
+
+
+EXCHANGE_SESSIONS: Dict[str, Session] = {
+    "US": Session("America/New_York", 9 * 60 + 30, 16 * 60),
+}
+
+_HOURS = re.compile(r"(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})")
+
+
+def parse_trading_hour(trading_hour: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse a MarketHoliday `trading_hour` like '09:30-13:00' to minutes.
+
+    Returns:
+        (open_minute, close_minute), or None for a full-day closure
+    """
+    match = _HOURS.search(trading_hour or "")
+    if not match:
+        return None
+    h1, m1, h2, m2 = (int(part) for part in match.groups())
+    return h1 * 60 + m1, h2 * 60 + m2
+
+
+def _local_seconds(timestamps: np.ndarray, tz: ZoneInfo) -> np.ndarray:
+    """Shift UTC timestamps to exchange-local wall-clock seconds."""
+    days = timestamps // 86400
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    # Offsets only change on weekend nights, so noon UTC of each day is enough
+    offsets = np.array([
+        datetime.fromtimestamp(int(day) * 86400 + 43200, tz).utcoffset().total_seconds()
+        for day in unique_days
+    ], dtype=np.int64)
+    return timestamps + offsets[inverse]
+
+
+def _day_number(date: str) -> int:
+    return int(np.datetime64(date, "D").astype(np.int64))
+
+
+def resample(
+    timestamps: np.ndarray,
+    open: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    resolution: str,
+    session: Session = EXCHANGE_SESSIONS["US"],
+    holidays: Optional[Dict[str, Optional[str]]] = None,
+    regular_only: bool = True,
+) -> Dict[str, np.ndarray]:
+    """Aggregate time-ordered bars into a coarser resolution.
+
+    Args:
+        timestamps: Bar open times (UNIX seconds, ascending)
+        open, high, low, close, volume: Bar values aligned with timestamps
+        resolution: Target resolution ('1', '5', '15', '30', '60', 'D', 'W', 'M')
+        session: Exchange session (default: US regular session)
+        holidays: Optional date 'YYYY-MM-DD' -> trading_hour; an empty
+            trading_hour is a full closure, otherwise a shortened session
+        regular_only: Drop intraday bars outside the regular session (default: True).
+            Ignored for daily input bars.
+
+    Returns:
+        Dictionary with arrays 't', 'o', 'h', 'l', 'c', 'v'
+
+    Raises:
+        ValueError: If the resolution is unknown
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution '{resolution}' (expected one of {RESOLUTIONS})")
+
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    values = [np.asarray(a, dtype=float) for a in (open, high, low, close, volume)]
+    if not len(timestamps):
+        return {key: np.array([]) for key in ("t", "o", "h", "l", "c", "v")}
+
+    if len(timestamps) > 1:
+        intraday_input = bool(np.median(np.diff(timestamps)) < 86400)
+    else:
+        intraday_input = bool(timestamps[0] % 86400)
+
+    if intraday_input:
+        local = _local_seconds(timestamps, ZoneInfo(session.timezone))
+    else:
+        # Daily bars are stamped 00:00 UTC of their trading date; shifting them
+        # to exchange time would move them onto the previous local day
+        local = timestamps
+    local_day = local // 86400
+    minute = (local % 86400) // 60
+
+    keep = np.ones(len(timestamps), dtype=bool)
+    close_minute = np.full(len(timestamps), session.close_minute)
+    for date, trading_hour in (holidays or {}).items():
+        on_day = local_day == _day_number(date)
+        hours = parse_trading_hour(trading_hour)
+        if hours is None:
+            keep &= ~on_day
+        else:
+            close_minute[on_day] = hours[1]
+    if regular_only and intraday_input:
+        keep &= (minute >= session.open_minute) & (minute < close_minute)
+
+    if not keep.all():
+        timestamps, local_day, minute = timestamps[keep], local_day[keep], minute[keep]
+        values = [a[keep] for a in values]
+        if not len(timestamps):
+            return {key: np.array([]) for key in ("t", "o", "h", "l", "c", "v")}
+
+    if resolution in INTRADAY_MINUTES:
+        if not intraday_input:
+            raise ValueError(f"Cannot build '{resolution}' bars from daily input")
+        size = INTRADAY_MINUTES[resolution]
+        slot = (minute - session.open_minute) // size
+        bucket = local_day * 10_000 + slot
+        start_t = (timestamps - (minute - session.open_minute - slot * size) * 60
+                   - timestamps % 60)
+    elif resolution == "D":
+        bucket = local_day
+    elif resolution == "W":
+        # Day 0 (1970-01-01) is a Thursday; shift so weeks start on Monday
+        bucket = (local_day + 3) // 7
+    else:
+        bucket = local_day.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bucket)] - 1
+    o, h, l, c, v = values
+
+    if resolution in INTRADAY_MINUTES:
+        t = start_t[starts]
+    else:
+        t = local_day[starts] * 86400
+
+    return {
+        "t": t,
+        "o": o[starts],
+        "h": np.maximum.reduceat(h, starts),
+        "l": np.minimum.reduceat(l, starts),
+        "c": c[ends],
+        "v": np.add.reduceat(np.nan_to_num(v), starts),
+    }
+
+
+async def load_holidays(exchange: str = "US", engine: Optional[AsyncEngine] = None) -> Dict[str, Optional[str]]:
+    """Read stored MarketHoliday rows as date -> trading_hour."""
+    if engine is None:
+        from ..database import engine
+
+    table = MarketHoliday.__table__.c
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(table.date, table.trading_hour).where(table.exchange == exchange)
+        )
+        return {date: trading_hour for date, trading_hour in result}
+
+
+def resampled_rows(symbol: str, resolution: str, bars: Dict[str, np.ndarray]) -> List[Dict[str, object]]:
+    """Turn `resample` output into CandlestickData column dicts."""
+    return [
+        {"symbol": symbol, "resolution": resolution, "timestamp": t, "open": o,
+         "high": h, "low": l, "close": c, "volume": v}
+        for t, o, h, l, c, v in zip(*(bars[key].tolist() for key in ("t", "o", "h", "l", "c", "v")))
+    ]
+
+
+async def resample_candles(
+    symbols: Sequence[str],
+    from_timestamp: int,
+    to_timestamp: int,
+    targets: Iterable[str] = ("5", "15", "30", "60", "D", "W", "M"),
+    source_resolution: str = "1",
+    exchange: str = "US",
+    engine: Optional[AsyncEngine] = None,
+) -> Dict[str, List[Dict[str, object]]]:
+    """Build coarser resolutions from stored candles.
+
+    Args:
+        symbols: Symbols to resample
+        from_timestamp: UNIX timestamp in seconds (inclusive)
+        to_timestamp: UNIX timestamp in seconds (inclusive)
+        targets: Resolutions to build (default: 5, 15, 30, 60, D, W, M)
+        source_resolution: Stored resolution to aggregate ('1' or 'D', default: '1')
+        exchange: Exchange whose session and holidays apply (default: 'US')
+        engine: Async engine (default: finhub_etl.database.engine)
+
+    Returns:
+        Dictionary of resolution -> candle rows
+    """
+    if engine is None:
+        from ..database import engine
+
+    session = EXCHANGE_SESSIONS[exchange]
+    holidays = await load_holidays(exchange, engine)
+    series = await read_candles(symbols, source_resolution, from_timestamp, to_timestamp, engine)
+    out: Dict[str, List[Dict[str, object]]] = {resolution: [] for resolution in targets}
+
+    for symbol, columns in series.items():
+        arrays = [columns[name] for name in ("timestamp", "open", "high", "low", "close", "volume")]
+        for resolution in targets:
+            bars = resample(*arrays, resolution, session=session, holidays=holidays)
+            out[resolution].extend(resampled_rows(symbol, resolution, bars))
+
+    return out
+
+
+async def store_resampled(
+    symbols: Sequence[str],
+    from_timestamp: int,
+    to_timestamp: int,
+    targets: Iterable[str] = ("5", "15", "30", "60", "D", "W", "M"),
+    source_resolution: str = "1",
+    exchange: str = "US",
+    batch_size: int = 100,
+    engine: Optional[AsyncEngine] = None,
+) -> Dict[str, int]:
+    """Resample stored candles and upsert the coarser resolutions.
+
+    Bucket boundaries should line up with the range (e.g. whole days) so
+    partial edge buckets don't overwrite complete ones.
+
+    Args:
+        symbols: Symbols to resample
+        from_timestamp: UNIX timestamp in seconds (inclusive)
+        to_timestamp: UNIX timestamp in seconds (inclusive)
+        targets: Resolutions to build (default: 5, 15, 30, 60, D, W, M)
+        source_resolution: Stored resolution to aggregate (default: '1')
+        exchange: Exchange whose session and holidays apply (default: 'US')
+        batch_size: Symbols read per query (default: 100)
+        engine: Async engine (default: finhub_etl.database.engine)
+
+    Returns:
+        Dictionary of resolution -> rows written
+    """
+    if engine is None:
+        from ..database import engine
+
+    writer = BulkWriter(CandlestickData, on_conflict="update", engine=engine)
+    written = {resolution: 0 for resolution in targets}
+    for start in range(0, len(symbols), batch_size):
+        rows = await resample_candles(
+            symbols[start:start + batch_size], from_timestamp, to_timestamp,
+            targets, source_resolution, exchange, engine,
+        )
+        for resolution, candles in rows.items():
+            written[resolution] += await writer.write_rows(candles)
+    return written
+
+
+__all__ = [
+    "RESOLUTIONS",
+    "Session",
+    "EXCHANGE_SESSIONS",
+    "parse_trading_hour",
+    "resample",
+    "load_holidays",
+    "resampled_rows",
+    "resample_candles",
+    "store_resampled",
+]
@@ -0,0 +1,206 @@
+"""Adaptive (AIMD) concurrency limits per Finnhub endpoint.
+
+A fixed concurrency is too timid when the API is quiet and triggers 429
+storms when it is busy. `AdaptiveConcurrency` keeps a limit per endpoint and
+adjusts it the way TCP adjusts its window:
+
+* additive increase: every healthy response adds `increase / limit`, so the
+  limit grows by about `increase` per full window of requests;
+* multiplicative decrease: a 429, a 5xx, a timeout or a latency spike
+  (latency above `latency_factor` x the endpoint's smoothed baseline)
+  multiplies the limit by `decrease`.
+
+Only one cut is taken per window: a failure from a request that started
+before the last cut is not counted again, so a burst of 429s from one
+overload halves the limit once instead of collapsing it to the minimum.
+
+Example:
+    >>> limiter = AdaptiveConcurrency(initial=8, max_limit=64)
+    >>> async with limiter.slot("/stock/candle") as outcome:
+    ...     response = await client.get(url)
+    ...     outcome.status = response.status_code
+    >>> limiter.metrics()["/stock/candle"]["limit"]
+    8.125
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, Optional
+
+import httpx
+
+# Status codes that mean "back off": rate limited or the server is struggling
+OVERLOAD_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class Outcome:
+    """Result of one request, filled in by the caller inside `slot`."""
+
+    status: Optional[int] = None
+
+
+@dataclass
+class EndpointLimit:
+    """AIMD state of one endpoint."""
+
+    limit: float
+    in_flight: int = 0
+    latency: Optional[float] = None
+    samples: int = 0
+    increases: int = 0
+    decreases: int = 0
+    last_cut: float = 0.0
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+
+
+class AdaptiveConcurrency:
+    """Per-endpoint AIMD concurrency limiter.
+
+    Args:
+        initial: Starting limit of every endpoint (default: 8)
+        min_limit: Floor of the limit (default: 1)
+        max_limit: Ceiling of the limit (default: 64)
+        increase: Additive increase per full window of healthy responses (default: 1)
+        decrease: Multiplicative factor applied on overload (default: 0.5)
+        latency_factor: Latency above this multiple of the baseline is a spike (default: 3.0)
+        min_spike: Latencies under this many seconds never count as spikes (default: 0.5)
+        warmup: Responses before latency spikes are judged (default: 10)
+    """
+
+    def __init__(
+        self,
+        initial: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_factor: float = 3.0,
+        min_spike: float = 0.5,
+        warmup: int = 10,
+    ):
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.min_spike = min_spike
+        self.warmup = warmup
+        self.endpoints: Dict[str, EndpointLimit] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def state(self, endpoint: str) -> EndpointLimit:
+        """AIMD state of an endpoint, created at the initial limit."""
+        state = self.endpoints.get(endpoint)
+        if state is None:
+            state = self.endpoints[endpoint] = EndpointLimit(float(self.initial))
+        return state
+
+    def _wake(self, state: EndpointLimit) -> None:
+        while state.waiters and state.in_flight < int(state.limit):
+            future = state.waiters.popleft()
+            if not future.done():
+                state.in_flight += 1
+                future.set_result(None)
+
+    async def acquire(self, endpoint: str) -> None:
+        """Wait for a free slot under the endpoint's current limit."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Slots and waiters of a previous event loop (e.g. another `asyncio.run`) are gone
+            self._loop = loop
+            for state in self.endpoints.values():
+                state.in_flight = 0
+                state.waiters.clear()
+        state = self.state(endpoint)
+        if not state.waiters and state.in_flight < int(state.limit):
+            state.in_flight += 1
+            return
+        future = loop.create_future()
+        state.waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                state.in_flight -= 1
+                self._wake(state)
+            raise
+
+    def release(self, endpoint: str, started: float, latency: float, overloaded: bool) -> None:
+        """Return a slot and feed the request's outcome into the limit.
+
+        Args:
+            endpoint: Endpoint of the request
+            started: `time.monotonic()` when the request was sent
+            latency: Seconds the request took
+            overloaded: Whether the request hit a 429, a 5xx or a timeout
+        """
+        state = self.state(endpoint)
+        state.in_flight -= 1
+
+        spike = (
+            not overloaded
+            and state.samples >= self.warmup
+            and latency > max(self.min_spike, self.latency_factor * (state.latency or 0.0))
+        )
+        if overloaded or spike:
+            # One cut per window: requests sent before the last cut already paid for it
+            if started >= state.last_cut:
+                state.limit = max(self.min_limit, state.limit * self.decrease)
+                state.last_cut = time.monotonic()
+                state.decreases += 1
+        else:
+            state.limit = min(self.max_limit, state.limit + self.increase / state.limit)
+            state.increases += 1
+            state.latency = latency if state.latency is None else 0.9 * state.latency + 0.1 * latency
+            state.samples += 1
+        self._wake(state)
+
+    @asynccontextmanager
+    async def slot(self, endpoint: str) -> AsyncIterator[Outcome]:
+        """Hold a slot for one request; set `outcome.status` to the response status.
+
+        Timeouts and transport errors raised inside the block count as overload.
+        """
+        await self.acquire(endpoint)
+        outcome = Outcome()
+        started = time.monotonic()
+        overloaded = False
+        try:
+            yield outcome
+        except (httpx.TimeoutException, httpx.TransportError):
+            overloaded = True
+            raise
+        finally:
+            overloaded = overloaded or outcome.status in OVERLOAD_STATUS
+            self.release(endpoint, started, time.monotonic() - started, overloaded)
+
+    def limit(self, endpoint: str) -> float:
+        """Current concurrency limit of an endpoint."""
+        return self.state(endpoint).limit
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-endpoint limit, in-flight and waiting counts, latency baseline and adjustments."""
+        return {
+            endpoint: {
+                "limit": state.limit,
+                "in_flight": state.in_flight,
+                "waiting": sum(1 for future in state.waiters if not future.done()),
+                "latency": state.latency or 0.0,
+                "increases": state.increases,
+                "decreases": state.decreases,
+            }
+            for endpoint, state in self.endpoints.items()
+        }
+
+
+__all__ = [
+    "OVERLOAD_STATUS",
+    "AdaptiveConcurrency",
+    "EndpointLimit",
+    "Outcome",
+]
@@ -0,0 +1,188 @@
+"""Per-endpoint circuit breakers for Finnhub requests.
+
+When an endpoint starts failing (5xx, timeouts) every further request to it
+wastes quota and retry time. `CircuitBreakers` keeps one breaker per
+endpoint:
+
+    closed      requests flow; `failure_threshold` consecutive failures open it
+    open        requests fail fast with `CircuitOpenError` for `reset_timeout` s
+    half-open   up to `half_open_max` probe requests go through;
+                `success_threshold` successes close it, any failure reopens it
+
+429s count as neither success nor failure: throttling is the adaptive
+limiter's business (see `config.adaptive`), not a sign the endpoint is down.
+Refused work should be parked rather than dropped, e.g. with
+`workers.park_requests`, so it is retried once the endpoint recovers while
+other endpoints keep flowing.
+
+Example:
+    >>> try:
+    ...     await api_client.get("/stock/financials-reported", {"symbol": "AAPL"})
+    ... except CircuitOpenError as exc:
+    ...     print(exc.endpoint, exc.retry_after)
+    /stock/financials-reported 27.5
+"""
+
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict
+
+import httpx
+
+from .adaptive import Outcome
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to an endpoint whose breaker is open."""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"circuit open for {endpoint}, retry in {retry_after:.1f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+@dataclass
+class Breaker:
+    """State of one endpoint's breaker."""
+
+    state: str = CLOSED
+    failures: int = 0
+    successes: int = 0
+    probes: int = 0
+    opened_at: float = 0.0
+    trips: int = 0
+    rejected: int = 0
+
+
+class CircuitBreakers:
+    """Closed/open/half-open breakers keyed by endpoint.
+
+    Args:
+        failure_threshold: Consecutive failures that open a closed breaker (default: 5)
+        reset_timeout: Seconds an open breaker waits before probing (default: 30)
+        half_open_max: Probe requests in flight while half-open (default: 1)
+        success_threshold: Probe successes that close the breaker (default: 2)
+        clock: Monotonic time source (default: time.monotonic)
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+        success_threshold: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.success_threshold = success_threshold
+        self.clock = clock
+        self.breakers: Dict[str, Breaker] = {}
+
+    def breaker(self, endpoint: str) -> Breaker:
+        """Breaker of an endpoint, created closed."""
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = Breaker()
+        return breaker
+
+    def _open(self, breaker: Breaker) -> None:
+        breaker.state = OPEN
+        breaker.opened_at = self.clock()
+        breaker.probes = breaker.successes = 0
+        breaker.trips += 1
+
+    def check(self, endpoint: str) -> None:
+        """Admit a request or raise `CircuitOpenError`.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all probes in flight
+        """
+        breaker = self.breaker(endpoint)
+        if breaker.state == OPEN:
+            remaining = breaker.opened_at + self.reset_timeout - self.clock()
+            if remaining > 0:
+                breaker.rejected += 1
+                raise CircuitOpenError(endpoint, remaining)
+            breaker.state = HALF_OPEN
+            breaker.probes = breaker.successes = 0
+        if breaker.state == HALF_OPEN:
+            if breaker.probes >= self.half_open_max:
+                breaker.rejected += 1
+                raise CircuitOpenError(endpoint, self.reset_timeout / 10)
+            breaker.probes += 1
+
+    def record(self, endpoint: str, failed: bool, neutral: bool = False) -> None:
+        """Feed a request's outcome back to its admitted breaker.
+
+        Args:
+            endpoint: Endpoint of the request
+            failed: 5xx, timeout or transport error
+            neutral: Outcome that says nothing about health (429, caller error)
+        """
+        breaker = self.breaker(endpoint)
+        if breaker.state == HALF_OPEN:
+            breaker.probes = max(0, breaker.probes - 1)
+            if failed:
+                self._open(breaker)
+            elif not neutral:
+                breaker.successes += 1
+                if breaker.successes >= self.success_threshold:
+                    breaker.state = CLOSED
+                    breaker.failures = 0
+            return
+        if breaker.state != CLOSED or neutral:
+            return
+        if failed:
+            breaker.failures += 1
+            if breaker.failures >= self.failure_threshold:
+                self._open(breaker)
+        else:
+            breaker.failures = 0
+
+    @asynccontextmanager
+    async def guard(self, endpoint: str) -> AsyncIterator[Outcome]:
+        """Check the breaker, then record the block's outcome; set `outcome.status`.
+
+        Raises:
+            CircuitOpenError: If the breaker refuses the request
+        """
+        self.check(endpoint)
+        outcome = Outcome()
+        failed = False
+        try:
+            yield outcome
+        except httpx.TransportError:
+            failed = True
+            raise
+        finally:
+            status = outcome.status
+            failed = failed or (status is not None and status >= 500)
+            neutral = not failed and (status is None or status == 429)
+            self.record(endpoint, failed, neutral)
+
+    def metrics(self) -> Dict[str, Dict[str, object]]:
+        """Per-endpoint breaker state, consecutive failures, trips and rejected requests."""
+        return {
+            endpoint: {
+                "state": breaker.state,
+                "failures": breaker.failures,
+                "trips": breaker.trips,
+                "rejected": breaker.rejected,
+            }
+            for endpoint, breaker in self.breakers.items()
+        }
+
+
+__all__ = [
+    "CLOSED",
+    "OPEN",
+    "HALF_OPEN",
+    "Breaker",
+    "CircuitBreakers",
+    "CircuitOpenError",
+]
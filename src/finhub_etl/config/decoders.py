@@ -0,0 +1,199 @@
+"""JSON decoders for Finnhub API responses.
+
+`FinnhubAPIClient` decodes every payload through a pluggable decoder. orjson
+or msgspec are used when installed, with the stdlib `json` module as the
+fallback. The msgspec decoder can optionally decode the large endpoints
+straight into typed structs instead of dicts.
+
+Example:
+    >>> from finhub_etl.config.decoders import get_decoder
+    >>> decoder = get_decoder()          # best available backend
+    >>> decoder.name
+    'orjson'
+    >>> decoder.decode(b'{"c": 1.5}')
+    {'c': 1.5}
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Protocol
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+
+class JSONDecoder(Protocol):
+    """Interface every response decoder implements."""
+
+    name: str
+
+    def decode(self, content: bytes, endpoint: Optional[str] = None) -> Any:
+        """Decode a raw response body.
+
+        Args:
+            content: Raw response bytes
+            endpoint: API endpoint the body came from (e.g. '/stock/symbol')
+
+        Returns:
+            Decoded JSON payload
+        """
+        ...
+
+
+class StdlibDecoder:
+    """Decoder backed by the stdlib `json` module."""
+
+    name = "json"
+
+    def decode(self, content: bytes, endpoint: Optional[str] = None) -> Any:
+        return json.loads(content)
+
+
+class OrjsonDecoder:
+    """Decoder backed by orjson (parses bytes without an intermediate str)."""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed (pip install orjson)")
+
+    def decode(self, content: bytes, endpoint: Optional[str] = None) -> Any:
+        return orjson.loads(content)
+
+
+if msgspec is not None:
+
+    class StockSymbolStruct(msgspec.Struct, rename="camel"):
+        """Typed record for /stock/symbol."""
+
+        symbol: str
+        display_symbol: Optional[str] = None
+        description: Optional[str] = None
+        currency: Optional[str] = None
+        figi: Optional[str] = None
+        mic: Optional[str] = None
+        type: Optional[str] = None
+
+    class CandlesStruct(msgspec.Struct):
+        """Typed payload for /stock/candle (column arrays)."""
+
+        s: str
+        t: List[int] = []
+        o: List[float] = []
+        h: List[float] = []
+        l: List[float] = []
+        c: List[float] = []
+        v: List[float] = []
+
+    class ReportedFilingStruct(msgspec.Struct, rename="camel"):
+        """Typed filing entry for /stock/financials-reported."""
+
+        access_number: str
+        symbol: Optional[str] = None
+        cik: Optional[str] = None
+        year: Optional[int] = None
+        quarter: Optional[int] = None
+        form: Optional[str] = None
+        start_date: Optional[str] = None
+        end_date: Optional[str] = None
+        filed_date: Optional[str] = None
+        accepted_date: Optional[str] = None
+        report: Dict[str, Any] = {}
+
+    class ReportedFinancialsStruct(msgspec.Struct):
+        """Typed payload for /stock/financials-reported."""
+
+        data: List[ReportedFilingStruct] = []
+        symbol: Optional[str] = None
+        cik: Optional[str] = None
+
+    ENDPOINT_STRUCTS: Dict[str, Any] = {
+        "/stock/symbol": List[StockSymbolStruct],
+        "/stock/candle": CandlesStruct,
+        "/stock/financials-reported": ReportedFinancialsStruct,
+    }
+else:
+    ENDPOINT_STRUCTS = {}
+
+
+class MsgspecDecoder:
+    """Decoder backed by msgspec.
+
+    Args:
+        typed: If True, endpoints listed in `ENDPOINT_STRUCTS` decode into
+            msgspec structs instead of plain dicts/lists (default: False)
+    """
+
+    name = "msgspec"
+
+    def __init__(self, typed: bool = False):
+        if msgspec is None:
+            raise ImportError("msgspec is not installed (pip install msgspec)")
+        self.typed = typed
+        self._default = msgspec.json.Decoder()
+        self._typed = (
+            {endpoint: msgspec.json.Decoder(struct) for endpoint, struct in ENDPOINT_STRUCTS.items()}
+            if typed
+            else {}
+        )
+
+    def decode(self, content: bytes, endpoint: Optional[str] = None) -> Any:
+        return self._typed.get(endpoint, self._default).decode(content)
+
+
+DECODERS = {
+    "orjson": OrjsonDecoder,
+    "msgspec": MsgspecDecoder,
+    "json": StdlibDecoder,
+}
+
+
+def available_decoders() -> List[str]:
+    """Return the decoder names usable in this environment, fastest first."""
+    names = []
+    if orjson is not None:
+        names.append("orjson")
+    if msgspec is not None:
+        names.append("msgspec")
+    names.append("json")
+    return names
+
+
+def get_decoder(name: Optional[str] = None, **options) -> JSONDecoder:
+    """Build a response decoder.
+
+    Args:
+        name: Decoder name ('orjson', 'msgspec' or 'json'). Defaults to the
+            FINHUB_JSON_DECODER env var, then the fastest installed backend.
+        **options: Extra options for the decoder (e.g. typed=True for msgspec)
+
+    Returns:
+        Decoder instance
+
+    Raises:
+        ValueError: If the decoder name is unknown
+        ImportError: If the requested backend is not installed
+    """
+    name = name or os.getenv("FINHUB_JSON_DECODER") or available_decoders()[0]
+    if name not in DECODERS:
+        raise ValueError(f"Unknown JSON decoder '{name}' (expected one of {list(DECODERS)})")
+    return DECODERS[name](**options)
+
+
+__all__ = [
+    "JSONDecoder",
+    "StdlibDecoder",
+    "OrjsonDecoder",
+    "MsgspecDecoder",
+    "ENDPOINT_STRUCTS",
+    "available_decoders",
+    "get_decoder",
+]
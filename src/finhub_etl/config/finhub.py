@@ -1,27 +1,114 @@
 import httpx
 import os
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Optional
 from dotenv import load_dotenv
+from .adaptive import AdaptiveConcurrency
+from .breaker import CircuitBreakers
+from .decoders import JSONDecoder, get_decoder
+from .keys import KeyPool, keys_from_env
+from .priority import PriorityScheduler
+from .streaming import iter_json_array
+
+if TYPE_CHECKING:
+    from ..storage.lake import RawLake
 
 load_dotenv()
 
-# Get the API key safely
-api_key = os.getenv("FINHUB_API_KEY")
+# Get the API keys safely: FINHUB_API_KEYS (comma-separated) or FINHUB_API_KEY
+api_keys = keys_from_env()
+
+# Check if a key exists
+if not api_keys:
+    raise ValueError("❌ FINHUB_API_KEYS / FINHUB_API_KEY not found in environment variables!")
 
-# Check if key exists
-if not api_key:
-    raise ValueError("❌ FINHUB_API_KEY not found in environment variables!")
+api_key = api_keys[0]
 
 # Base URL for Finnhub API
 BASE_URL = "https://finnhub.io/api/v1"
 
+# Requests per second per API key, across all priority classes (0 disables the limit)
+RATE_LIMIT = float(os.getenv("FINHUB_RATE_LIMIT", "30"))
+
 
 class FinnhubAPIClient:
-    """Async HTTP client for Finnhub REST API."""
+    """Async HTTP client for Finnhub REST API.
+
+    Every request is sent with the key of `keys` that has the most budget
+    left; a 401 or 429 quarantines that key and the request is retried once
+    on each other healthy key (see `config.keys`).
 
-    def __init__(self, api_key: str):
-        self.api_key = api_key
+    Args:
+        api_key: Finnhub API key, when not using a pool
+        decoder: Response decoder (default: fastest installed, see `get_decoder`)
+        lake: Keep every raw `get` response body in this `RawLake` (default: None)
+        scheduler: Admits requests by priority class under the shared rate
+            limit (default: PriorityScheduler at FINHUB_RATE_LIMIT per second per key)
+        concurrency: Per-endpoint AIMD in-flight limits (default: AdaptiveConcurrency())
+        breakers: Per-endpoint circuit breakers (default: CircuitBreakers())
+        keys: Pool of API keys, each with its own budget (default: a pool of
+            just `api_key` at FINHUB_RATE_LIMIT per second)
+
+    Raises:
+        ValueError: If neither `api_key` nor `keys` is given
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        decoder: Optional[JSONDecoder] = None,
+        lake: Optional["RawLake"] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        breakers: Optional[CircuitBreakers] = None,
+        keys: Optional[KeyPool] = None,
+    ):
+        if keys is None:
+            if not api_key:
+                raise ValueError("FinnhubAPIClient needs an api_key or a key pool")
+            keys = KeyPool([api_key], rate_per_second=RATE_LIMIT or None)
+        self.keys = keys
         self.base_url = BASE_URL
-        self.headers = {"X-Finnhub-Token": api_key}
+        self.decoder = decoder or get_decoder()
+        self.lake = lake
+        # Each key brings its own quota, so the shared budget grows with the pool
+        self.scheduler = scheduler or PriorityScheduler(rate_per_second=RATE_LIMIT * len(keys) or None)
+        self.concurrency = concurrency or AdaptiveConcurrency()
+        self.breakers = breakers or CircuitBreakers()
+
+    def metrics(self) -> dict:
+        """Queue waits per priority class, concurrency limits and breaker states per endpoint, key health."""
+        return {
+            "priority": self.scheduler.metrics(),
+            "concurrency": self.concurrency.metrics(),
+            "breakers": self.breakers.metrics(),
+            "keys": self.keys.metrics(),
+        }
+
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: Optional[dict],
+        stream: bool = False,
+    ) -> httpx.Response:
+        """GET with the pool's best key, moving on to the next key after a 401/429.
+
+        With `stream=True` the body is not read; the caller must close the
+        returned response. A refused response is closed before the retry.
+        """
+        tried = []
+        while True:
+            key = await self.keys.acquire(exclude=tried)
+            started = self.keys.clock()
+            request = client.build_request(
+                "GET", url, headers={"X-Finnhub-Token": key.token}, params=params, timeout=30.0
+            )
+            response = await client.send(request, stream=stream)
+            self.keys.report(key, response.status_code, started)
+            tried.append(key)
+            if response.status_code not in (401, 429) or not [k for k in self.keys.healthy() if k not in tried]:
+                return response
+            await response.aclose()
 
     async def get(self, endpoint: str, params: dict = None) -> dict:
         """Make GET request to Finnhub API.
@@ -33,13 +120,82 @@ class FinnhubAPIClient:
         Returns:
             dict: JSON response from API
         """
+        return self.decoder.decode(await self.get_raw(endpoint, params), endpoint)
+
+    async def get_raw(self, endpoint: str, params: dict = None) -> bytes:
+        """Make GET request to Finnhub API and return the undecoded body.
+
+        Lets callers decode elsewhere, e.g. in a `TransformPool` worker. The
+        request waits for admission under its priority class (see
+        `config.priority`), then for a slot under the endpoint's adaptive
+        concurrency limit (see `config.adaptive`). An endpoint whose circuit
+        breaker is open is refused up front (see `config.breaker`).
+        A 401/429 is retried on the other healthy keys of the pool.
+
+        Args:
+            endpoint (str): API endpoint (e.g., '/stock/candle')
+            params (dict): Query parameters
+
+        Returns:
+            bytes: Raw response body
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit breaker is open
+            NoKeyAvailableError: If every API key is quarantined
+        """
         url = f"{self.base_url}{endpoint}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
+        async with (
+            self.breakers.guard(endpoint) as verdict,
+            self.scheduler.slot(endpoint),
+            self.concurrency.slot(endpoint) as outcome,
+            httpx.AsyncClient() as client,
+        ):
+            response = await self._send(client, url, params)
+            outcome.status = verdict.status = response.status_code
             response.raise_for_status()
-            return response.json()
+            if self.lake is not None:
+                await self.lake.put_async(endpoint, params, response.content)
+            return response.content
+
+    async def stream(
+        self,
+        endpoint: str,
+        params: dict = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[List[Any]]:
+        """Stream a JSON array response in batches while it downloads.
+
+        The body is parsed incrementally, so memory stays bounded by
+        `chunk_size` records instead of the full payload. Like `get_raw`, a
+        401/429 is retried on the other healthy keys before any of the body
+        is read.
+
+        Args:
+            endpoint (str): API endpoint returning a JSON array (e.g. '/stock/symbol')
+            params (dict): Query parameters
+            chunk_size (int): Records per yielded batch (default: 1000)
+
+        Yields:
+            list: Batches of decoded records
+        """
+        url = f"{self.base_url}{endpoint}"
+
+        async with (
+            self.breakers.guard(endpoint) as verdict,
+            self.scheduler.slot(endpoint),
+            self.concurrency.slot(endpoint) as outcome,
+            httpx.AsyncClient() as client,
+        ):
+            response = await self._send(client, url, params, stream=True)
+            try:
+                outcome.status = verdict.status = response.status_code
+                response.raise_for_status()
+                async for batch in iter_json_array(response.aiter_bytes(), chunk_size, self.decoder):
+                    yield batch
+            finally:
+                await response.aclose()
 
 
 # Initialize API client
-api_client = FinnhubAPIClient(api_key=api_key)
\ No newline at end of file
+api_client = FinnhubAPIClient(keys=KeyPool(api_keys, rate_per_second=RATE_LIMIT or None))
\ No newline at end of file
@@ -62,6 +62,7 @@ from .financials import (
 from .market import (
     get_symbol_lookup,
     get_stock_symbols,
+    stream_stock_symbols,
     get_market_status,
     get_market_holiday,
     get_quote,
@@ -130,6 +131,7 @@ __all__ = [
     # Market functions
     "get_symbol_lookup",
     "get_stock_symbols",
+    "stream_stock_symbols",
     "get_market_status",
     "get_market_holiday",
     "get_quote",
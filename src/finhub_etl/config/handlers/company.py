@@ -5,6 +5,7 @@ Reference: https://finnhub.io/docs/api
 
 from typing import Optional, List, Dict, Any
 from finhub_etl.config.finhub import api_client
+from finhub_etl.config.windows import fetch_windowed
 
 
 async def get_company_profile(symbol: str) -> Dict[str, Any]:
@@ -84,7 +85,8 @@ async def get_filings(
     symbol: str,
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
-    form: Optional[str] = None
+    form: Optional[str] = None,
+    window_days: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """Get SEC filings for a company.
 
@@ -95,6 +97,8 @@ async def get_filings(
         from_date: Start date (YYYY-MM-DD)
         to_date: End date (YYYY-MM-DD)
         form: Filter by form type (e.g., '10-K', '10-Q')
+        window_days: Split from..to into windows of this many days, fetched
+            concurrently and bisected when truncated (see `config.windows`)
 
     Returns:
         List of SEC filings
@@ -106,6 +110,8 @@ async def get_filings(
         params["to"] = to_date
     if form:
         params["form"] = form
+    if window_days and from_date and to_date:
+        return await fetch_windowed("/stock/filings", params, from_date, to_date, window_days)
     return await api_client.get("/stock/filings", params=params)
 
 
@@ -3,7 +3,7 @@
 Reference: https://finnhub.io/docs/api
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 from finhub_etl.config.finhub import api_client
 from finhub_etl.models.market_info import MarketHoliday
 
@@ -51,6 +51,41 @@ async def get_stock_symbols(
     return await api_client.get("/stock/symbol", params=params)
 
 
+async def stream_stock_symbols(
+    exchange: str,
+    mic: Optional[str] = None,
+    security_type: Optional[str] = None,
+    currency: Optional[str] = None,
+    chunk_size: int = 1000
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Stream the supported stocks for an exchange in batches.
+
+    Endpoint: /stock/symbol
+
+    Same as `get_stock_symbols`, but the response is parsed incrementally
+    so batches can be written while the rest of the body downloads.
+
+    Args:
+        exchange: Exchange code (e.g., 'US')
+        mic: Market Identifier Code (optional)
+        security_type: Security type filter (optional)
+        currency: Currency filter (optional)
+        chunk_size: Symbols per yielded batch (default: 1000)
+
+    Yields:
+        Lists of stock symbols with metadata
+    """
+    params = {"exchange": exchange}
+    if mic:
+        params["mic"] = mic
+    if security_type:
+        params["securityType"] = security_type
+    if currency:
+        params["currency"] = currency
+    async for batch in api_client.stream("/stock/symbol", params=params, chunk_size=chunk_size):
+        yield batch
+
+
 async def get_market_status(exchange: str) -> Dict[str, Any]:
     """Get current market status (open/closed).
 
@@ -68,28 +103,20 @@ async def get_market_status(exchange: str) -> Dict[str, Any]:
     )
 
 
-async def get_market_holiday(exchange: str) -> List[Dict[str, Any]]:
-    """
-    Fetch and transform market holiday data for a given exchange.
-
-    Endpoint: /stock/market-holiday
+def transform_market_holiday(response: Dict[str, Any], exchange: str) -> List[Dict[str, Any]]:
+    """Flatten a /stock/market-holiday response into MarketHoliday records.
 
     Args:
-        exchange: Exchange code (e.g., 'US')
+        response: Raw API response
+        exchange: Exchange code the response was requested for
 
     Returns:
         List[Dict[str, Any]] records (JSON ready for DB insertion)
     """
-    response: Dict[str, Any] = await api_client.get(
-        "/stock/market-holiday",
-        params={"exchange": exchange}
-    )
-
     if not response or "data" not in response:
         return []
 
-    # Transform API data into JSON objects
-    records = [
+    return [
         {
             "exchange": response.get("exchange", exchange),
             "timezone": response.get("timezone", ""),
@@ -100,7 +127,24 @@ async def get_market_holiday(exchange: str) -> List[Dict[str, Any]]:
         for item in response["data"]
     ]
 
-    return records
+
+async def get_market_holiday(exchange: str) -> List[Dict[str, Any]]:
+    """
+    Fetch and transform market holiday data for a given exchange.
+
+    Endpoint: /stock/market-holiday
+
+    Args:
+        exchange: Exchange code (e.g., 'US')
+
+    Returns:
+        List[Dict[str, Any]] records (JSON ready for DB insertion)
+    """
+    response: Dict[str, Any] = await api_client.get(
+        "/stock/market-holiday",
+        params={"exchange": exchange}
+    )
+    return transform_market_holiday(response, exchange)
 
 async def get_quote(symbol: str) -> Dict[str, Any]:
     """Get real-time quote data for US stocks.
@@ -189,8 +233,10 @@ async def get_technical_indicators(
 __all__ = [
     "get_symbol_lookup",
     "get_stock_symbols",
+    "stream_stock_symbols",
     "get_market_status",
     "get_market_holiday",
+    "transform_market_holiday",
     "get_quote",
     "get_candles",
     "get_technical_indicators",
@@ -5,6 +5,7 @@ Reference: https://finnhub.io/docs/api
 
 from typing import Dict, Any, Optional, List
 from finhub_etl.config.finhub import api_client
+from finhub_etl.config.windows import fetch_windowed
 
 
 async def get_general_news(
@@ -31,7 +32,8 @@ async def get_general_news(
 async def get_company_news(
     symbol: str,
     from_date: str,
-    to_date: str
+    to_date: str,
+    window_days: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """Get company-specific news.
 
@@ -41,10 +43,14 @@ async def get_company_news(
         symbol: Stock symbol
         from_date: Start date (YYYY-MM-DD)
         to_date: End date (YYYY-MM-DD)
+        window_days: Split from..to into windows of this many days, fetched
+            concurrently and bisected when truncated (see `config.windows`)
 
     Returns:
         List of company news articles
     """
+    if window_days:
+        return await fetch_windowed("/company-news", {"symbol": symbol}, from_date, to_date, window_days)
     return await api_client.get(
         "/company-news",
         params={"symbol": symbol, "from": from_date, "to": to_date}
@@ -54,7 +60,8 @@ async def get_company_news(
 async def get_press_releases(
     symbol: str,
     from_date: Optional[str] = None,
-    to_date: Optional[str] = None
+    to_date: Optional[str] = None,
+    window_days: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """Get company press releases.
 
@@ -64,6 +71,8 @@ async def get_press_releases(
         symbol: Stock symbol
         from_date: Start date (YYYY-MM-DD, optional)
         to_date: End date (YYYY-MM-DD, optional)
+        window_days: Split from..to into windows of this many days, fetched
+            concurrently and bisected when truncated (see `config.windows`)
 
     Returns:
         List of press releases
@@ -73,6 +82,8 @@ async def get_press_releases(
         params["from"] = from_date
     if to_date:
         params["to"] = to_date
+    if window_days and from_date and to_date:
+        return await fetch_windowed("/press-releases2", params, from_date, to_date, window_days)
     return await api_client.get("/press-releases2", params=params)
 
 
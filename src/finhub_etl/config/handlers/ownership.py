@@ -5,6 +5,7 @@ Reference: https://finnhub.io/docs/api
 
 from typing import Dict, Any, Optional
 from finhub_etl.config.finhub import api_client
+from finhub_etl.config.windows import fetch_windowed
 
 
 async def get_ownership(
@@ -132,7 +133,8 @@ async def get_institutional_ownership(
 async def get_insider_transactions(
     symbol: str,
     from_date: Optional[str] = None,
-    to_date: Optional[str] = None
+    to_date: Optional[str] = None,
+    window_days: Optional[int] = None,
 ) -> Dict[str, Any]:
     """Get insider transactions.
 
@@ -142,6 +144,8 @@ async def get_insider_transactions(
         symbol: Stock symbol
         from_date: Start date (YYYY-MM-DD)
         to_date: End date (YYYY-MM-DD)
+        window_days: Split from..to into windows of this many days, fetched
+            concurrently and bisected when truncated (see `config.windows`)
 
     Returns:
         Insider transaction data
@@ -151,6 +155,8 @@ async def get_insider_transactions(
         params["from"] = from_date
     if to_date:
         params["to"] = to_date
+    if window_days and from_date and to_date:
+        return await fetch_windowed("/stock/insider-transactions", params, from_date, to_date, window_days)
     return await api_client.get("/stock/insider-transactions", params=params)
 
 
@@ -0,0 +1,237 @@
+"""Pool of Finnhub API keys with per-key quota and health.
+
+Finnhub meters each key separately, so N keys give N times the request
+budget. `KeyPool` gives every key its own token bucket and hands out the
+healthy key with the most tokens left, spreading load evenly while keys
+drain at different speeds.
+
+A key that gets a 401 is quarantined for `auth_quarantine` seconds (revoked
+or mistyped keys rarely recover on their own); one that gets a 429 is
+quarantined for `throttle_quarantine` seconds, doubling on each further
+429 in a row. A burst of in-flight requests answering 429 together counts
+as one strike: 429s of requests sent before the key's current quarantine
+began are ignored. The last healthy key rests at most `last_key_backoff`
+seconds, so a single-key deployment never stalls for long. The first
+successful response clears the strikes.
+
+When every key is quarantined `acquire` waits for the first to come back,
+or raises `NoKeyAvailableError` if that is more than `max_wait` away.
+
+Keys come from $FINHUB_API_KEYS (comma-separated), falling back to
+$FINHUB_API_KEY.
+
+Example:
+    >>> pool = KeyPool.from_env(rate_per_second=30)
+    >>> key = await pool.acquire()
+    >>> headers = {"X-Finnhub-Token": key.token}
+    >>> pool.report(key, response.status_code)
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+class NoKeyAvailableError(Exception):
+    """Raised when every key in the pool is quarantined for too long."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"all API keys quarantined, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class ApiKey:
+    """One key with its token bucket and health state."""
+
+    token: str = field(repr=False)
+    capacity: float
+    tokens: float
+    refilled: float
+    quarantined_until: float = 0.0
+    struck: float = float("-inf")
+    strikes: int = 0
+    requests: int = 0
+    throttled: int = 0
+    unauthorized: int = 0
+
+    @property
+    def label(self) -> str:
+        """Masked key for logs and metrics."""
+        return f"{self.token[:4]}…{self.token[-2:]}" if len(self.token) > 8 else "…"
+
+
+def keys_from_env() -> List[str]:
+    """Keys from $FINHUB_API_KEYS (comma-separated), else $FINHUB_API_KEY."""
+    keys = [key.strip() for key in os.getenv("FINHUB_API_KEYS", "").split(",") if key.strip()]
+    if not keys and os.getenv("FINHUB_API_KEY"):
+        keys = [os.getenv("FINHUB_API_KEY")]
+    return list(dict.fromkeys(keys))
+
+
+class KeyPool:
+    """Hand out API keys by remaining budget, quarantining unhealthy ones.
+
+    Args:
+        keys: API keys
+        rate_per_second: Request budget of each key; None for no limit,
+            which spreads requests round-robin (default: 30)
+        burst: Bucket size of each key (default: one second of requests)
+        throttle_quarantine: Seconds a key rests after a 429, doubled per
+            consecutive 429 (default: 30)
+        auth_quarantine: Seconds a key rests after a 401 (default: 3600)
+        last_key_backoff: Longest rest after a 429 when no other key is
+            healthy (default: 5)
+        max_wait: Longest `acquire` waits for a quarantined key (default: 60)
+        clock: Monotonic time source (default: time.monotonic)
+
+    Raises:
+        ValueError: If no keys are given
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        rate_per_second: Optional[float] = 30.0,
+        burst: Optional[float] = None,
+        throttle_quarantine: float = 30.0,
+        auth_quarantine: float = 3600.0,
+        last_key_backoff: float = 5.0,
+        max_wait: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not keys:
+            raise ValueError("KeyPool needs at least one API key")
+        self.rate = rate_per_second
+        self.burst = burst if burst is not None else max(rate_per_second or 0.0, 1.0)
+        self.throttle_quarantine = throttle_quarantine
+        self.auth_quarantine = auth_quarantine
+        self.last_key_backoff = last_key_backoff
+        self.max_wait = max_wait
+        self.clock = clock
+        now = clock()
+        self.keys: List[ApiKey] = [ApiKey(key, self.burst, self.burst, now) for key in dict.fromkeys(keys)]
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "KeyPool":
+        """Pool of the keys in $FINHUB_API_KEYS / $FINHUB_API_KEY."""
+        return cls(keys_from_env(), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _refill(self, key: ApiKey, now: float) -> None:
+        if self.rate is None:
+            # Unlimited: rank by fewest requests instead of most budget
+            key.tokens = key.capacity - key.requests
+            return
+        key.tokens = min(key.capacity, key.tokens + (now - key.refilled) * self.rate)
+        key.refilled = now
+
+    def healthy(self) -> List[ApiKey]:
+        """Keys not currently quarantined."""
+        now = self.clock()
+        return [key for key in self.keys if key.quarantined_until <= now]
+
+    def try_acquire(self, exclude: Sequence[ApiKey] = ()) -> Optional[ApiKey]:
+        """Take a token from the healthy key with the most budget left, if any has one."""
+        now = self.clock()
+        best: Optional[ApiKey] = None
+        for key in self.keys:
+            if key.quarantined_until > now or key in exclude:
+                continue
+            self._refill(key, now)
+            if (self.rate is None or key.tokens >= 1.0) and (best is None or key.tokens > best.tokens):
+                best = key
+        if best is not None:
+            best.tokens -= 1.0
+            best.requests += 1
+        return best
+
+    def _next_ready(self, exclude: Sequence[ApiKey]) -> float:
+        """Seconds until some key could serve a request."""
+        now = self.clock()
+        waits = []
+        for key in self.keys:
+            if key in exclude:
+                continue
+            if key.quarantined_until > now:
+                waits.append(key.quarantined_until - now)
+            elif self.rate:
+                waits.append(max(0.0, (1.0 - key.tokens) / self.rate))
+            else:
+                waits.append(0.0)
+        return min(waits, default=1.0)
+
+    async def acquire(self, exclude: Sequence[ApiKey] = ()) -> ApiKey:
+        """Wait for a key with budget left and take one request from it.
+
+        Args:
+            exclude: Keys not to use, e.g. ones that just failed this request
+
+        Raises:
+            NoKeyAvailableError: If no key is back within `max_wait` seconds
+        """
+        if all(key in exclude for key in self.keys):
+            exclude = ()
+        while (key := self.try_acquire(exclude)) is None:
+            wait = self._next_ready(exclude)
+            if wait > self.max_wait:
+                raise NoKeyAvailableError(wait)
+            await asyncio.sleep(max(wait, 0.001))
+        return key
+
+    def report(self, key: ApiKey, status: int, started: Optional[float] = None) -> None:
+        """Update a key's health from a response status.
+
+        Args:
+            key: Key the request was sent with
+            status: HTTP status of the response
+            started: Pool clock time the request was sent; a 429 of a request
+                sent by the time the key's current quarantine began adds no strike
+                (default: None, always counts)
+        """
+        if status == 401:
+            key.unauthorized += 1
+            key.quarantined_until = self.clock() + self.auth_quarantine
+            print(f"⚠️ API key {key.label} unauthorized, quarantined for {self.auth_quarantine:.0f}s")
+        elif status == 429:
+            key.throttled += 1
+            if started is not None and started <= key.struck:
+                # One strike per window: requests in flight already paid for it
+                return
+            now = self.clock()
+            backoff = self.throttle_quarantine * 2 ** min(key.strikes, 6)
+            if not any(other is not key and other.quarantined_until <= now for other in self.keys):
+                backoff = min(backoff, self.last_key_backoff)
+            key.quarantined_until = now + backoff
+            key.struck = now
+            key.strikes += 1
+        elif status < 400:
+            key.strikes = 0
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-key (masked) budget, quarantine and response counts."""
+        now = self.clock()
+        for key in self.keys:
+            self._refill(key, now)
+        return {
+            key.label: {
+                "tokens": key.tokens,
+                "quarantined_for": max(0.0, key.quarantined_until - now),
+                "requests": key.requests,
+                "throttled": key.throttled,
+                "unauthorized": key.unauthorized,
+            }
+            for key in self.keys
+        }
+
+
+__all__ = [
+    "ApiKey",
+    "KeyPool",
+    "NoKeyAvailableError",
+    "keys_from_env",
+]
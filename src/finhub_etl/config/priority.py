@@ -0,0 +1,254 @@
+"""Priority classes for Finnhub requests sharing one rate budget.
+
+Every request through `FinnhubAPIClient` is admitted by a
+`PriorityScheduler` before it is sent. Requests belong to a class:
+
+    realtime      on-demand lookups (quotes, profiles) that a user waits on
+    incremental   the scheduled daily loads (default)
+    backfill      historical sweeps that can soak up whatever is left
+
+Admission needs a token from the shared rate bucket, a free slot under the
+class's concurrency cap, and, when several classes are waiting, the class's
+turn. Turns follow stride scheduling: each admission advances the class's
+pass by 1/weight and the waiting class with the lowest pass goes next, so
+with the default weights (12:4:1) a realtime request overtakes a backfill
+queue of thousands, yet backfill still gets a share and never starves.
+
+The class of a request is taken from the `request_priority` context
+(`with priority("backfill"): ...`), else from `ENDPOINT_PRIORITY`, else the
+scheduler's default, so handlers need no extra argument.
+
+Example:
+    >>> with priority("backfill"):
+    ...     await load_endpoint("/stock/candle", params_list)   # admitted as backfill
+    >>> await get_quote("AAPL")                                  # realtime: jumps the queue
+    >>> api_client.scheduler.metrics()["backfill"]["wait_p95"]
+    0.84
+"""
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional, Sequence
+
+PRIORITY_CLASSES = ("realtime", "incremental", "backfill")
+
+# Endpoints that are realtime unless the caller's context says otherwise
+ENDPOINT_PRIORITY: Dict[str, str] = {
+    "/quote": "realtime",
+    "/stock/profile2": "realtime",
+    "/stock/market-status": "realtime",
+}
+
+request_priority: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_priority", default=None)
+
+
+@contextmanager
+def priority(name: str) -> Iterator[None]:
+    """Send every request made inside the block (and tasks it starts) as class `name`."""
+    token = request_priority.set(name)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+@dataclass
+class PriorityClass:
+    """Scheduling parameters and queue-wait stats of one class.
+
+    Args:
+        name: Class name
+        weight: Share of admissions while other classes are also waiting
+        max_concurrency: In-flight requests allowed for this class
+    """
+
+    name: str
+    weight: float
+    max_concurrency: int
+    in_flight: int = 0
+    admitted: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    waits: Deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+    queue: Deque = field(default_factory=deque)
+    pass_: float = 0.0
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class PriorityScheduler:
+    """Admit requests by class under a shared rate limit and per-class caps.
+
+    Args:
+        rate_per_second: Requests admitted per second across all classes,
+            None for no rate limit (default: 30, Finnhub's per-second ceiling)
+        burst: Rate bucket size (default: one second of requests)
+        weights: Class -> share weight (default: realtime 12, incremental 4, backfill 1)
+        max_concurrency: Class -> in-flight cap (default: 16, 16, 8)
+        default: Class for requests with no context or endpoint class (default: 'incremental')
+    """
+
+    def __init__(
+        self,
+        rate_per_second: Optional[float] = 30.0,
+        burst: Optional[float] = None,
+        weights: Optional[Dict[str, float]] = None,
+        max_concurrency: Optional[Dict[str, int]] = None,
+        default: str = "incremental",
+    ):
+        weights = {"realtime": 12.0, "incremental": 4.0, "backfill": 1.0, **(weights or {})}
+        caps = {"realtime": 16, "incremental": 16, "backfill": 8, **(max_concurrency or {})}
+        self.classes: Dict[str, PriorityClass] = {
+            name: PriorityClass(name, weights[name], caps[name]) for name in weights
+        }
+        if default not in self.classes:
+            raise ValueError(f"default must be one of {tuple(self.classes)}, got '{default}'")
+        self.default = default
+        self.rate = rate_per_second
+        self.burst = burst if burst is not None else max(rate_per_second or 1.0, 1.0)
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def resolve(self, endpoint: Optional[str] = None) -> str:
+        """Class of a request: context, then endpoint, then the default."""
+        name = request_priority.get() or ENDPOINT_PRIORITY.get(endpoint or "", self.default)
+        if name not in self.classes:
+            raise ValueError(f"priority must be one of {tuple(self.classes)}, got '{name}'")
+        return name
+
+    def _take_token(self) -> float:
+        """Take a rate token; 0.0 on success, else seconds until one accrues."""
+        if self.rate is None:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+    def _next_class(self) -> Optional[PriorityClass]:
+        eligible = [
+            cls for cls in self.classes.values()
+            if cls.queue and cls.in_flight < cls.max_concurrency
+        ]
+        if not eligible:
+            return None
+        # Lowest pass wins; ties go to the higher-priority (earlier) class
+        return min(eligible, key=lambda cls: cls.pass_)
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        while True:
+            # Drop waiters that gave up (cancelled) before they are counted
+            for cls in self.classes.values():
+                while cls.queue and cls.queue[0][0].done():
+                    cls.queue.popleft()
+            cls = self._next_class()
+            if cls is None:
+                return
+            wait = self._take_token()
+            if wait > 0:
+                self._timer = self._loop.call_later(wait, self._dispatch)
+                return
+
+            future, enqueued = cls.queue.popleft()
+            waited = time.monotonic() - enqueued
+            cls.in_flight += 1
+            cls.admitted += 1
+            cls.pass_ += 1.0 / cls.weight
+            cls.wait_total += waited
+            cls.wait_max = max(cls.wait_max, waited)
+            cls.waits.append(waited)
+            future.set_result(None)
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Forget waiters and timers left behind by a previous event loop (e.g. another `asyncio.run`)."""
+        self._loop = loop
+        self._timer = None
+        for cls in self.classes.values():
+            cls.queue.clear()
+            cls.in_flight = 0
+
+    async def acquire(self, name: str) -> None:
+        """Wait until a request of class `name` may be sent."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._bind(loop)
+        cls = self.classes[name]
+        if not cls.queue:
+            # A class that was idle rejoins at the current virtual time, not with credit
+            active = [other.pass_ for other in self.classes.values() if other.queue or other.in_flight]
+            cls.pass_ = max(cls.pass_, min(active, default=cls.pass_))
+        future = loop.create_future()
+        cls.queue.append((future, time.monotonic()))
+        if self._timer is None:
+            self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                # Admitted in the same tick the waiter was cancelled: hand the slot back
+                self.release(name)
+            raise
+
+    def release(self, name: str) -> None:
+        """Return the slot of a finished class `name` request."""
+        self.classes[name].in_flight -= 1
+        if self._timer is None:
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, endpoint: Optional[str] = None, name: Optional[str] = None) -> AsyncIterator[str]:
+        """Hold an admission for the duration of one request.
+
+        Args:
+            endpoint: Endpoint being requested, used to resolve the class
+            name: Explicit class, overriding context and endpoint
+
+        Yields:
+            The class the request was admitted as
+        """
+        name = name or self.resolve(endpoint)
+        await self.acquire(name)
+        try:
+            yield name
+        finally:
+            self.release(name)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-class queue depth, in-flight count and queue-wait stats (seconds)."""
+        return {
+            name: {
+                "queued": sum(1 for future, _ in cls.queue if not future.done()),
+                "in_flight": cls.in_flight,
+                "admitted": cls.admitted,
+                "wait_mean": cls.wait_total / cls.admitted if cls.admitted else 0.0,
+                "wait_p50": _percentile(cls.waits, 0.50),
+                "wait_p95": _percentile(cls.waits, 0.95),
+                "wait_max": cls.wait_max,
+            }
+            for name, cls in self.classes.items()
+        }
+
+
+__all__ = [
+    "ENDPOINT_PRIORITY",
+    "PRIORITY_CLASSES",
+    "PriorityClass",
+    "PriorityScheduler",
+    "priority",
+    "request_priority",
+]
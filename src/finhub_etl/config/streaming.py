@@ -0,0 +1,201 @@
+"""Incremental JSON array parsing for streamed Finnhub responses.
+
+Endpoints such as /stock/symbol return one huge top-level JSON array. Instead
+of buffering the whole body, `JSONArrayParser` is fed raw bytes as they arrive
+and hands back every element that is complete so far.
+
+The parser only finds element boundaries. The completed elements of each
+chunk are decoded in one call of the pluggable response decoder (see
+`config.decoders`), so streamed endpoints get the orjson/msgspec speedup too.
+A boundary candidate is the last comma after a closing bracket (or the last
+comma, for scalar elements), accepted when the decoder parses everything
+before it as complete elements. When that fails, e.g. because the cut fell
+inside a nested object, a regex scan over strings and brackets finds the
+exact boundary. After a chunk completes no element, the next search waits
+until the buffer has doubled, so a large element arriving in many small
+chunks is not rescanned on every one. The scan covers elements nested up
+to `MAX_DEPTH` containers deep; deeper ones are only found by the comma
+candidate, so they may be held until a later chunk or the array's end.
+
+Example:
+    >>> parser = JSONArrayParser()
+    >>> parser.feed(b'[{"symbol": "AAPL"}, {"sym')
+    [{'symbol': 'AAPL'}]
+    >>> parser.feed(b'bol": "MSFT"}]')
+    [{'symbol': 'MSFT'}]
+    >>> parser.close()
+    []
+"""
+
+import re
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional
+
+from .decoders import JSONDecoder, get_decoder
+
+MAX_DEPTH = 16
+
+_WHITESPACE = b" \t\r\n"
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+
+def _value_pattern(depth: int) -> bytes:
+    """Regex matching one JSON value nested at most `depth` containers deep.
+
+    Brackets are not paired by type; the decoder validates the elements.
+    """
+    container = None
+    for _ in range(depth):
+        inner = _STRING + (b"|" + container if container else b"")
+        container = rb"[\[{][^\"\[\]{}]*(?:(?:" + inner + rb")[^\"\[\]{}]*)*[\]}]"
+    return _STRING + rb"|[^,\[\]{}\"\s]+|" + container
+
+
+# A run of complete elements, each followed by its ',' separator
+_ELEMENTS = re.compile(rb"(?:\s*(?:" + _value_pattern(MAX_DEPTH) + rb")\s*,)*")
+
+
+class JSONArrayParser:
+    """Push parser yielding the elements of a top-level JSON array.
+
+    Args:
+        decoder: Decoder for the completed elements (default: `get_decoder()`)
+    """
+
+    def __init__(self, decoder: Optional[JSONDecoder] = None):
+        self.decoder = decoder or get_decoder()
+        # Bytes after the opening '[' not yet returned as elements
+        self._buffer = bytearray()
+        # Buffer length below which the boundary search is not retried
+        self._retry_at = 0
+        # start -> items -> done
+        self._state = "start"
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Add raw bytes and return the elements completed by them."""
+        self._buffer += data
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        """Flush the remaining input.
+
+        Raises:
+            ValueError: If the input was not a complete JSON array
+        """
+        items = self._drain(final=True)
+        if self._state != "done":
+            raise ValueError("Truncated JSON array")
+        return items
+
+    def _decode(self, elements: bytes) -> List[Any]:
+        try:
+            return self.decoder.decode(b"[" + elements + b"]")
+        except Exception as e:
+            raise ValueError(f"Invalid JSON array element: {e}") from e
+
+    def _drain(self, final: bool) -> List[Any]:
+        buffer = self._buffer
+        if self._state == "start":
+            body = buffer.lstrip(_WHITESPACE)
+            if not body:
+                buffer.clear()
+                return []
+            if body[0] != ord("["):
+                raise ValueError(f"Expected a JSON array, got {bytes(body[:40])!r}")
+            buffer[:] = body[1:]
+            self._state = "items"
+
+        if self._state == "done":
+            if buffer.strip(_WHITESPACE):
+                raise ValueError(f"Unexpected data after JSON array: {bytes(buffer[:40])!r}")
+            buffer.clear()
+            return []
+
+        rest = buffer.rstrip(_WHITESPACE)
+        if rest.endswith(b"]"):
+            # Possibly the end of the array; a nested ']' fails to decode
+            try:
+                items = self.decoder.decode(b"[" + rest)
+            except Exception as e:
+                if final:
+                    raise ValueError(f"Invalid JSON array ending in {bytes(rest[-40:])!r}") from e
+            else:
+                buffer.clear()
+                self._state = "done"
+                return items
+        if final or len(buffer) < self._retry_at:
+            return []
+
+        cut = self._candidate(buffer)
+        if cut:
+            try:
+                items = self.decoder.decode(b"[" + buffer[:cut] + b"]")
+            except Exception:
+                pass
+            else:
+                del buffer[:cut + 1]
+                self._retry_at = 0
+                return items
+
+        cut = _ELEMENTS.match(buffer).end()
+        if not cut:
+            self._retry_at = 2 * len(buffer)
+            return []
+        self._retry_at = 0
+        items = self._decode(buffer[:cut - 1])
+        del buffer[:cut]
+        return items
+
+    def _candidate(self, buffer: bytearray) -> int:
+        """Position of the last ',' likely to follow a complete element (0 if none)."""
+        first = buffer.lstrip(_WHITESPACE)[:1]
+        closer = b"}" if first == b"{" else b"]" if first == b"[" else None
+        pos = len(buffer)
+        # Fields of an object element are comma separated too; give up after a few
+        for _ in range(64):
+            pos = buffer.rfind(b",", 0, pos)
+            if pos <= 0:
+                return 0
+            if closer is None:
+                return pos
+            end = pos
+            while end and buffer[end - 1] in _WHITESPACE:
+                end -= 1
+            if buffer[end - 1:end] == closer:
+                return pos
+        return 0
+
+
+async def iter_json_array(
+    chunks: AsyncIterable[bytes],
+    chunk_size: int = 1000,
+    decoder: Optional[JSONDecoder] = None,
+) -> AsyncIterator[List[Any]]:
+    """Parse a streamed JSON array into batches of elements.
+
+    Args:
+        chunks: Async iterable of raw body bytes (e.g. `response.aiter_bytes()`)
+        chunk_size: Maximum number of elements per yielded batch (default: 1000)
+        decoder: Element decoder (default: `get_decoder()`)
+
+    Yields:
+        Lists of up to `chunk_size` decoded elements, in input order
+    """
+    parser = JSONArrayParser(decoder)
+    batch: List[Any] = []
+
+    async for data in chunks:
+        batch.extend(parser.feed(data))
+        while len(batch) >= chunk_size:
+            yield batch[:chunk_size]
+            batch = batch[chunk_size:]
+
+    batch.extend(parser.close())
+    while batch:
+        yield batch[:chunk_size]
+        batch = batch[chunk_size:]
+
+
+__all__ = [
+    "JSONArrayParser",
+    "iter_json_array",
+]
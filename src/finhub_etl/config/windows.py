@@ -0,0 +1,187 @@
+"""Adaptive date-window splitting for time-ranged Finnhub endpoints.
+
+/company-news, /press-releases2, /stock/filings and
+/stock/insider-transactions take arbitrary `from`/`to` dates but silently
+truncate a response at a page cap. `fetch_windowed` splits a long range into
+sub-windows, fetches them concurrently (every request still goes through
+the client's rate limit and priority admission) and bisects any window
+whose response hits the cap, down to `min_days`. Once a window of some size
+has hit the cap, windows still waiting for a slot are cut to half that size
+before they are sent, so dense periods cost one wasted request rather than
+one per window.
+
+The merged records are deduplicated by the endpoint's record key and
+returned in the endpoint's own response shape, so callers and transforms
+see a single, complete response.
+
+Example:
+    >>> news = await fetch_windowed("/company-news", {"symbol": "AAPL"}, "2015-01-01", "2024-12-31")
+    >>> len(news)
+    48213
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from .finhub import FinnhubAPIClient, api_client
+
+
+@dataclass(frozen=True)
+class WindowSpec:
+    """How to split and merge one time-ranged endpoint.
+
+    Attributes:
+        key: Dedupe key of a record
+        field: Key of the record list in an object response; None when the
+            response is a bare list
+        cap: Record count at which a response is assumed truncated
+        window_days: Initial sub-window length
+    """
+
+    key: Callable[[Dict[str, Any]], Hashable]
+    field: Optional[str] = None
+    cap: int = 250
+    window_days: int = 30
+
+
+WINDOWED_ENDPOINTS: Dict[str, WindowSpec] = {
+    "/company-news": WindowSpec(key=lambda r: r.get("id"), cap=250, window_days=30),
+    "/press-releases2": WindowSpec(
+        key=lambda r: (r.get("datetime"), r.get("headline")), field="majorDevelopment", cap=100, window_days=180,
+    ),
+    "/stock/filings": WindowSpec(key=lambda r: r.get("accessNumber"), cap=250, window_days=365),
+    "/stock/insider-transactions": WindowSpec(
+        key=lambda r: (r.get("name"), r.get("transactionDate"), r.get("filingDate"), r.get("transactionCode"),
+                       r.get("share"), r.get("change")),
+        field="data", cap=250, window_days=365,
+    ),
+}
+
+DateLike = Union[date, str]
+
+
+def _as_date(value: DateLike) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def split_range(start: DateLike, end: DateLike, days: int) -> List[Tuple[date, date]]:
+    """Split an inclusive date range into consecutive windows of at most `days` days.
+
+    Example:
+        >>> [(str(a), str(b)) for a, b in split_range("2024-01-01", "2024-01-10", 4)]
+        [('2024-01-01', '2024-01-04'), ('2024-01-05', '2024-01-08'), ('2024-01-09', '2024-01-10')]
+    """
+    start, end = _as_date(start), _as_date(end)
+    days = max(1, days)
+    windows = []
+    while start <= end:
+        stop = min(end, start + timedelta(days=days - 1))
+        windows.append((start, stop))
+        start = stop + timedelta(days=1)
+    return windows
+
+
+def _records(spec: WindowSpec, payload: Any) -> List[Dict[str, Any]]:
+    if spec.field is None:
+        return payload if isinstance(payload, list) else []
+    if not isinstance(payload, dict):
+        return []
+    return payload.get(spec.field) or []
+
+
+async def fetch_windowed(
+    endpoint: str,
+    params: Dict[str, Any],
+    start: DateLike,
+    end: DateLike,
+    window_days: Optional[int] = None,
+    min_days: int = 1,
+    concurrency: int = 8,
+    client: Optional[FinnhubAPIClient] = None,
+    limiter: Optional[Any] = None,
+) -> Any:
+    """Fetch a long date range of a windowed endpoint as one complete response.
+
+    Args:
+        endpoint: Endpoint registered in WINDOWED_ENDPOINTS (e.g. '/company-news')
+        params: Other query parameters (e.g. {'symbol': 'AAPL'})
+        start: First day, date or YYYY-MM-DD
+        end: Last day, date or YYYY-MM-DD
+        window_days: Initial sub-window length (default: the endpoint's)
+        min_days: Shortest window to bisect down to (default: 1)
+        concurrency: Windows in flight (default: 8)
+        client: API client (default: the global `api_client`)
+        limiter: Rate limiter whose async `acquire()` is awaited before each
+            request, e.g. `workers.SharedRateLimiter` (default: none)
+
+    Returns:
+        Deduplicated records, shaped like a single response of the endpoint
+
+    Raises:
+        KeyError: If the endpoint is not in WINDOWED_ENDPOINTS
+    """
+    spec = WINDOWED_ENDPOINTS[endpoint]
+    client = client or api_client
+    semaphore = asyncio.Semaphore(concurrency)
+    # Longest window known to fit under the cap; shrinks as caps are hit
+    fits = [window_days or spec.window_days]
+    first: List[Any] = []
+
+    def bisect(lo: date, hi: date) -> List[Tuple[date, date]]:
+        mid = lo + (hi - lo) // 2
+        return [(lo, mid), (mid + timedelta(days=1), hi)]
+
+    async def fetch(lo: date, hi: date) -> List[List[Dict[str, Any]]]:
+        span = (hi - lo).days + 1
+        payload = None
+        async with semaphore:
+            if span <= max(fits[0], min_days):
+                if limiter is not None:
+                    await limiter.acquire()
+                payload = await client.get(endpoint, dict(params, **{"from": lo.isoformat(), "to": hi.isoformat()}))
+        if payload is None:
+            # Denser than this window size: split before spending a request
+            parts = split_range(lo, hi, max(fits[0], min_days))
+            return [batch for part in await asyncio.gather(*(fetch(*window) for window in parts)) for batch in part]
+
+        if not first:
+            first.append(payload)
+        records = _records(spec, payload)
+        if len(records) < spec.cap:
+            return [records]
+        if span <= min_days:
+            print(f"⚠️ {endpoint} {params}: {lo}..{hi} still hits the {spec.cap}-record cap")
+            return [records]
+        fits[0] = min(fits[0], max((span + 1) // 2, min_days))
+        halves = await asyncio.gather(*(fetch(*window) for window in bisect(lo, hi)))
+        return [records] + [batch for half in halves for batch in half]
+
+    windows = split_range(start, end, fits[0])
+    batches = [batch for part in await asyncio.gather(*(fetch(*window) for window in windows)) for batch in part]
+
+    seen = set()
+    merged = []
+    for records in batches:
+        for record in records:
+            key = spec.key(record)
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            merged.append(record)
+
+    if spec.field is None:
+        return merged
+    shape = first[0] if first and isinstance(first[0], dict) else {}
+    return {**shape, spec.field: merged}
+
+
+__all__ = [
+    "DateLike",
+    "WindowSpec",
+    "WINDOWED_ENDPOINTS",
+    "split_range",
+    "fetch_windowed",
+]
@@ -1,8 +1,13 @@
 from .core import engine, get_session
+from .candles import candle_range_query, read_candles, ensure_candle_partitions
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 __all__ = [
     "engine",
     "get_session",
     "AsyncSession",
+    # Candle store
+    "candle_range_query",
+    "read_candles",
+    "ensure_candle_partitions",
 ]
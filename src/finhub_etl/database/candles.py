@@ -0,0 +1,158 @@
+"""Candle store queries and MySQL partition maintenance.
+
+`candlestick_data` is keyed (symbol, resolution, timestamp) and, in MySQL,
+RANGE partitioned by month on `timestamp` (partitions `pYYYYMM` plus a
+catch-all `pmax`). Reads always bound `timestamp` on both sides so the
+optimizer prunes to the partitions covering the requested range, and the
+primary key turns the symbol/resolution filter into a range scan inside them.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import Select, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..models import CandlestickData
+
+CANDLE_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+def month_start(year: int, month: int) -> int:
+    """UNIX timestamp of the first second of a UTC month."""
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp())
+
+
+def partition_name(timestamp: int) -> str:
+    """Name of the monthly partition holding `timestamp` (e.g. 'p202401')."""
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return f"p{moment.year:04d}{moment.month:02d}"
+
+
+def candle_range_query(
+    symbols: Sequence[str],
+    resolution: str,
+    from_timestamp: int,
+    to_timestamp: int,
+    columns: Sequence[str] = CANDLE_COLUMNS,
+) -> Select:
+    """Build a partition-pruned read of candles for a symbol/date range.
+
+    Args:
+        symbols: Symbols to read
+        resolution: Candle resolution (1, 5, 15, 30, 60, D, W, M)
+        from_timestamp: UNIX timestamp in seconds (inclusive)
+        to_timestamp: UNIX timestamp in seconds (inclusive)
+        columns: Columns to select (default: timestamp + OHLCV)
+
+    Returns:
+        Select ordered by symbol, timestamp (symbol is always the first column)
+    """
+    table = CandlestickData.__table__.c
+    return (
+        select(table.symbol, *(table[name] for name in columns))
+        .where(
+            table.symbol.in_(list(symbols)),
+            table.resolution == resolution,
+            table.timestamp >= from_timestamp,
+            table.timestamp <= to_timestamp,
+        )
+        .order_by(table.symbol, table.timestamp)
+    )
+
+
+async def read_candles(
+    symbols: Sequence[str],
+    resolution: str,
+    from_timestamp: int,
+    to_timestamp: int,
+    engine: Optional[AsyncEngine] = None,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """Read candles for a symbol/date range into column arrays.
+
+    Args:
+        symbols: Symbols to read
+        resolution: Candle resolution
+        from_timestamp: UNIX timestamp in seconds (inclusive)
+        to_timestamp: UNIX timestamp in seconds (inclusive)
+        engine: Async engine (default: finhub_etl.database.engine)
+
+    Returns:
+        Dictionary of symbol -> {'timestamp', 'open', 'high', 'low', 'close', 'volume'} arrays
+        (missing values as NaN)
+    """
+    if engine is None:
+        from .core import engine
+
+    async with engine.connect() as conn:
+        result = await conn.execute(candle_range_query(symbols, resolution, from_timestamp, to_timestamp))
+        rows = result.all()
+
+    out: Dict[str, Dict[str, np.ndarray]] = {}
+    if not rows:
+        return out
+
+    names = [row[0] for row in rows]
+    data = np.array([row[1:] for row in rows], dtype=float)
+    bounds = [0] + [i for i in range(1, len(names)) if names[i] != names[i - 1]] + [len(names)]
+    for start, end in zip(bounds, bounds[1:]):
+        block = data[start:end]
+        series = {name: block[:, i] for i, name in enumerate(CANDLE_COLUMNS)}
+        series["timestamp"] = series["timestamp"].astype(np.int64)
+        out[names[start]] = series
+    return out
+
+
+async def ensure_candle_partitions(months_ahead: int = 3, engine: Optional[AsyncEngine] = None) -> List[str]:
+    """Split `pmax` so monthly partitions exist up to `months_ahead` from now.
+
+    No-op outside MySQL or when the table is not partitioned.
+
+    Returns:
+        Names of the partitions created
+    """
+    if engine is None:
+        from .core import engine
+
+    if engine.dialect.name not in ("mysql", "mariadb"):
+        return []
+
+    async with engine.begin() as conn:
+        result = await conn.execute(text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'candlestick_data' "
+            "AND PARTITION_NAME IS NOT NULL"
+        ))
+        existing = {name for (name,) in result}
+        if "pmax" not in existing:
+            return []
+
+        now = datetime.now(timezone.utc)
+        created = []
+        for offset in range(months_ahead + 1):
+            start = month_start(now.year, now.month + offset)
+            name = partition_name(start)
+            if name not in existing:
+                created.append((name, month_start(now.year, now.month + offset + 1)))
+
+        if created:
+            definitions = ", ".join(
+                f"PARTITION {name} VALUES LESS THAN ({bound})" for name, bound in created
+            )
+            await conn.execute(text(
+                f"ALTER TABLE candlestick_data REORGANIZE PARTITION pmax INTO "
+                f"({definitions}, PARTITION pmax VALUES LESS THAN MAXVALUE)"
+            ))
+        return [name for name, _ in created]
+
+
+__all__ = [
+    "CANDLE_COLUMNS",
+    "month_start",
+    "partition_name",
+    "candle_range_query",
+    "read_candles",
+    "ensure_candle_partitions",
+]
@@ -0,0 +1,43 @@
+from .rows import field_map, build_tuples, build_rows, build_instances, validate_rows
+from .bulk import BulkWriter, build_insert
+from .transforms import (
+    ENDPOINT_TRANSFORMS,
+    EndpointTransform,
+    default_endpoint_transforms,
+    get_endpoint_transforms,
+    transform_payload,
+)
+from .offload import TransformPool
+from .api import stream_to_db, load_stock_symbols, endpoint_writer, load_endpoint, load_windowed
+from .news import NEWS_CATEGORIES, RecentIds, NewsPoller, NewsStore, load_company_news
+
+__all__ = [
+    # Row construction
+    "field_map",
+    "build_tuples",
+    "build_rows",
+    "build_instances",
+    "validate_rows",
+    # Bulk writer
+    "BulkWriter",
+    "build_insert",
+    # Endpoint transforms
+    "ENDPOINT_TRANSFORMS",
+    "EndpointTransform",
+    "default_endpoint_transforms",
+    "get_endpoint_transforms",
+    "transform_payload",
+    "TransformPool",
+    # API loaders
+    "stream_to_db",
+    "load_stock_symbols",
+    "endpoint_writer",
+    "load_endpoint",
+    "load_windowed",
+    # News
+    "NEWS_CATEGORIES",
+    "RecentIds",
+    "NewsPoller",
+    "NewsStore",
+    "load_company_news",
+]
@@ -0,0 +1,261 @@
+"""Load Finnhub API responses into the database.
+
+Streamed responses are written while they download: a producer task reads
+record batches from the API into a bounded queue and the caller's task
+drains it into a `BulkWriter`, so download and insert overlap and memory
+stays flat at roughly `queue_size` batches.
+
+`load_endpoint` fetches many requests of one endpoint concurrently and
+hands large bodies to a `TransformPool`, so parsing runs on every core
+while the event loop keeps the requests moving. `load_windowed` does the
+same for long date ranges of time-ranged endpoints, split into adaptive
+sub-windows (see `config.windows`). Both write /company-news through a
+`NewsStore`, like `load_company_news`, so every path fills the same tables.
+"""
+
+import asyncio
+from typing import Any, AsyncIterable, Dict, List, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel
+
+from ..config.breaker import CircuitOpenError
+from ..config.finhub import api_client
+from ..config.handlers import market
+from ..config.windows import DateLike, fetch_windowed
+from ..models import StockSymbol
+from .bulk import BulkWriter
+from .news import NewsStore
+from .offload import TransformPool
+from .transforms import get_endpoint_transforms, transform_payload
+
+T = TypeVar("T", bound=SQLModel)
+
+
+async def stream_to_db(
+    batches: AsyncIterable[List[Dict[str, Any]]],
+    model: Type[T],
+    writer: Optional[BulkWriter] = None,
+    queue_size: int = 4,
+) -> int:
+    """Write record batches from an async source as they arrive.
+
+    Args:
+        batches: Async iterable of record lists (e.g. `market.stream_stock_symbols`)
+        model: SQLModel class where data will be stored
+        writer: Bulk writer to use (default: BulkWriter(model))
+        queue_size: Batches buffered between download and insert (default: 4)
+
+    Returns:
+        Total number of rows written
+    """
+    writer = writer or BulkWriter(model)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    async def produce():
+        try:
+            async for batch in batches:
+                await queue.put(batch)
+        finally:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    total = 0
+    try:
+        while (batch := await queue.get()) is not None:
+            total += await writer.write(batch)
+            print(f"Inserted {total} {model.__name__} records...")
+    except BaseException:
+        producer.cancel()
+        # Drain so the producer's closing put() cannot block on a full queue
+        while not queue.empty():
+            queue.get_nowait()
+        await asyncio.gather(producer, return_exceptions=True)
+        raise
+
+    # Surface download errors after the queue has been drained
+    await producer
+
+    print(f"✅ Stored {total} records in {model.__name__}")
+    return total
+
+
+async def load_stock_symbols(
+    exchange: str,
+    mic: Optional[str] = None,
+    security_type: Optional[str] = None,
+    currency: Optional[str] = None,
+    chunk_size: int = 2000,
+) -> int:
+    """Stream /stock/symbol for an exchange straight into the StockSymbol table.
+
+    Args:
+        exchange: Exchange code (e.g., 'US')
+        mic: Market Identifier Code (optional)
+        security_type: Security type filter (optional)
+        currency: Currency filter (optional)
+        chunk_size: Symbols per insert batch (default: 2000)
+
+    Returns:
+        Total number of rows written
+
+    Example:
+        count = await load_stock_symbols("US")
+    """
+    batches = market.stream_stock_symbols(
+        exchange,
+        mic=mic,
+        security_type=security_type,
+        currency=currency,
+        chunk_size=chunk_size,
+    )
+    return await stream_to_db(batches, StockSymbol, BulkWriter(StockSymbol, batch_size=chunk_size))
+
+
+def endpoint_writer(endpoint: str, on_conflict: str = "update", engine: Optional[AsyncEngine] = None) -> Any:
+    """Default sink of `load_endpoint`/`load_windowed`/`storage.rebuild` for an endpoint.
+
+    /company-news goes to the deduplicated article store (`NewsStore`);
+    every other endpoint goes to its ENDPOINT_TRANSFORMS model.
+
+    Args:
+        endpoint: API endpoint registered in ENDPOINT_TRANSFORMS
+        on_conflict: Primary-key conflict policy of a BulkWriter, see `build_insert` (default: 'update')
+        engine: Async engine (default: finhub_etl.database.engine)
+    """
+    if endpoint == "/company-news":
+        return NewsStore(engine=engine)
+    return BulkWriter(get_endpoint_transforms()[endpoint].model, on_conflict=on_conflict, engine=engine)
+
+
+async def load_endpoint(
+    endpoint: str,
+    params_list: Sequence[Dict[str, Any]],
+    pool: Optional[TransformPool] = None,
+    concurrency: int = 8,
+    writer: Optional[BulkWriter] = None,
+    limiter: Optional[Any] = None,
+    parked: Optional[List[Dict[str, Any]]] = None,
+) -> int:
+    """Fetch one endpoint for many parameter sets and bulk load the rows.
+
+    Args:
+        endpoint: API endpoint registered in ENDPOINT_TRANSFORMS (e.g. '/stock/candle')
+        params_list: Query parameters per request
+        pool: Transform stage for large bodies (default: a TransformPool closed on return)
+        concurrency: Requests in flight (default: 8)
+        writer: Bulk writer to use (default: `endpoint_writer(endpoint)`)
+        limiter: Rate limiter whose async `acquire()` is awaited before each
+            request, e.g. `workers.SharedRateLimiter` (default: none)
+        parked: Collects the params of requests refused by an open circuit
+            breaker, e.g. for `workers.park_requests`; without it the first
+            refusal is raised (default: None)
+
+    Returns:
+        Total number of rows written
+
+    Raises:
+        CircuitOpenError: If the endpoint's breaker is open and `parked` is None
+
+    Example:
+        count = await load_endpoint("/stock/candle", [
+            {"symbol": s, "resolution": "D", "from": start, "to": end} for s in symbols
+        ])
+    """
+    model = get_endpoint_transforms()[endpoint].model
+    writer = writer or endpoint_writer(endpoint)
+    owned = pool is None
+    pool = pool or TransformPool()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load(params: Dict[str, Any]) -> int:
+        async with semaphore:
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                content = await api_client.get_raw(endpoint, params)
+            except CircuitOpenError:
+                if parked is None:
+                    raise
+                parked.append(params)
+                return 0
+        rows = await pool.transform(endpoint, params, content)
+        return await writer.write_tuples(rows)
+
+    try:
+        total = sum(await asyncio.gather(*(load(params) for params in params_list)))
+    finally:
+        if owned:
+            pool.close()
+
+    print(f"✅ Stored {total} records in {model.__name__} ({pool.offloaded} payloads offloaded)")
+    return total
+
+
+async def load_windowed(
+    endpoint: str,
+    symbols: Sequence[str],
+    start: DateLike,
+    end: DateLike,
+    params: Optional[Dict[str, Any]] = None,
+    window_days: Optional[int] = None,
+    concurrency: int = 4,
+    writer: Optional[BulkWriter] = None,
+    limiter: Optional[Any] = None,
+    parked: Optional[List[Dict[str, Any]]] = None,
+) -> int:
+    """Backfill a date range of a time-ranged endpoint for many symbols.
+
+    Each symbol's range is fetched as concurrent sub-windows that shrink
+    wherever responses hit the endpoint's page cap, merged and deduplicated,
+    then bulk loaded.
+
+    Args:
+        endpoint: Endpoint registered in both WINDOWED_ENDPOINTS and
+            ENDPOINT_TRANSFORMS (e.g. '/company-news', '/stock/filings')
+        symbols: Symbols to load
+        start: First day, date or YYYY-MM-DD
+        end: Last day, date or YYYY-MM-DD
+        params: Extra query parameters (e.g. {'form': '10-K'})
+        window_days: Initial sub-window length (default: the endpoint's)
+        concurrency: Symbols in flight, each with its own windows (default: 4)
+        writer: Bulk writer to use (default: `endpoint_writer(endpoint)`)
+        limiter: Rate limiter awaited before each request (default: none)
+        parked: Collects the params of symbols refused by an open circuit
+            breaker, flagged 'windowed' so `workers.load_work_item` loads them
+            the same way; without it the refusal is raised (default: None)
+
+    Returns:
+        Total number of rows written
+
+    Example:
+        count = await load_windowed("/company-news", symbols, "2015-01-01", "2024-12-31")
+    """
+    model = get_endpoint_transforms()[endpoint].model
+    writer = writer or endpoint_writer(endpoint)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load(symbol: str) -> int:
+        request = dict(params or {}, symbol=symbol)
+        async with semaphore:
+            try:
+                payload = await fetch_windowed(endpoint, request, start, end, window_days, limiter=limiter)
+            except CircuitOpenError:
+                if parked is None:
+                    raise
+                parked.append(dict(request, windowed=True, **{"from": str(start), "to": str(end)}))
+                return 0
+        return await writer.write_tuples(transform_payload(endpoint, request, payload))
+
+    total = sum(await asyncio.gather(*(load(symbol) for symbol in symbols)))
+    print(f"✅ Stored {total} records in {model.__name__}")
+    return total
+
+
+__all__ = [
+    "stream_to_db",
+    "load_stock_symbols",
+    "endpoint_writer",
+    "load_endpoint",
+    "load_windowed",
+]
@@ -0,0 +1,145 @@
+"""Batched Core INSERTs for SQLModel tables.
+
+`BulkWriter` skips the ORM unit of work entirely: records are converted to
+column dicts and sent as one executemany INSERT per batch. Conflicts on the
+primary key can be ignored, upserted or raised, using each dialect's native
+syntax (MySQL, SQLite and PostgreSQL).
+
+Example:
+    >>> writer = BulkWriter(StockSymbol, batch_size=5000)
+    >>> await writer.write(records)
+    12000
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from sqlalchemy import Table, insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel
+
+from .rows import build_rows
+
+T = TypeVar("T", bound=SQLModel)
+
+ON_CONFLICT = ("error", "ignore", "update")
+
+
+def build_insert(table: Table, dialect_name: str, on_conflict: str = "ignore"):
+    """Build an INSERT statement with the requested primary-key conflict policy.
+
+    Args:
+        table: Target table
+        dialect_name: SQLAlchemy dialect name ('mysql', 'sqlite', 'postgresql')
+        on_conflict: 'error' (plain insert), 'ignore' (skip duplicates) or
+            'update' (overwrite non-key columns)
+
+    Returns:
+        Insert statement ready for executemany
+
+    Raises:
+        ValueError: If on_conflict is unknown
+    """
+    if on_conflict not in ON_CONFLICT:
+        raise ValueError(f"on_conflict must be one of {ON_CONFLICT}, got '{on_conflict}'")
+
+    if on_conflict == "error":
+        return insert(table)
+
+    pk = [column.name for column in table.primary_key.columns]
+    non_pk = [column.name for column in table.columns if column.name not in pk]
+
+    if dialect_name in ("mysql", "mariadb"):
+        stmt = mysql.insert(table)
+        if on_conflict == "ignore" or not non_pk:
+            return stmt.prefix_with("IGNORE")
+        return stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in non_pk})
+
+    if dialect_name in ("sqlite", "postgresql"):
+        stmt = (sqlite if dialect_name == "sqlite" else postgresql).insert(table)
+        if on_conflict == "ignore" or not non_pk:
+            return stmt.on_conflict_do_nothing(index_elements=pk)
+        return stmt.on_conflict_do_update(
+            index_elements=pk,
+            set_={name: stmt.excluded[name] for name in non_pk},
+        )
+
+    # Unknown dialect: fall back to a plain insert
+    return insert(table)
+
+
+class BulkWriter:
+    """Write API records into a SQLModel table with batched Core INSERTs.
+
+    Args:
+        model: SQLModel table class
+        batch_size: Rows per INSERT statement (default: 5000)
+        on_conflict: Primary-key conflict policy, see `build_insert` (default: 'ignore')
+        engine: Async engine to write with (default: finhub_etl.database.engine)
+        validate_sample: Fraction of rows strictly validated per write, see
+            `build_rows` (default: 0)
+        listeners: Callables given the rows of each committed write, e.g.
+            `CandleCache.write_rows` (default: none)
+    """
+
+    def __init__(
+        self,
+        model: Type[T],
+        batch_size: int = 5000,
+        on_conflict: str = "ignore",
+        engine: Optional[AsyncEngine] = None,
+        validate_sample: float = 0.0,
+        listeners: Sequence[Callable[[List[Dict[str, Any]]], Any]] = (),
+    ):
+        if engine is None:
+            from ..database import engine
+
+        self.model = model
+        self.table: Table = model.__table__
+        self.columns = list(self.table.columns.keys())
+        self.batch_size = batch_size
+        self.validate_sample = validate_sample
+        self.engine = engine
+        self.stmt = build_insert(self.table, engine.dialect.name, on_conflict)
+        self.listeners = list(listeners)
+        self.written = 0
+
+    def to_rows(self, records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert API records to column dicts."""
+        return build_rows(self.model, records, self.validate_sample)
+
+    async def write(self, records: Sequence[Dict[str, Any]]) -> int:
+        """Insert API records in batches of `batch_size`.
+
+        Args:
+            records: API records keyed by alias or field name
+
+        Returns:
+            Number of rows sent to the database
+        """
+        return await self.write_rows(self.to_rows(records))
+
+    async def write_tuples(self, rows: Sequence[Tuple[Any, ...]]) -> int:
+        """Insert rows given as tuples in table column order (see `transform_payload`)."""
+        columns = self.columns
+        return await self.write_rows([dict(zip(columns, row)) for row in rows])
+
+    async def write_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert already-converted column dicts in batches of `batch_size`."""
+        if not rows:
+            return 0
+
+        async with self.engine.begin() as conn:
+            for start in range(0, len(rows), self.batch_size):
+                await conn.execute(self.stmt, rows[start:start + self.batch_size])
+
+        self.written += len(rows)
+        for listener in self.listeners:
+            listener(rows)
+        return len(rows)
+
+
+__all__ = [
+    "BulkWriter",
+    "build_insert",
+]
@@ -0,0 +1,339 @@
+"""News ingestion: incremental /news polling and a deduplicated article store.
+
+General news
+------------
+
+`/news` returns the latest page of a category on every call. `NewsPoller`
+remembers the highest id stored per category (table `news_cursors`) and
+asks only for newer articles with `minId`, polling all categories
+concurrently. Ids are also checked against a bounded set of recently
+stored ids, so an article listed under two categories, or returned again
+at a page boundary, is written once.
+
+Articles are written before the cursors advance: if the insert fails, the
+next poll asks for the same range again.
+
+Company news
+------------
+/company-news lists a story under every ticker it mentions. `NewsStore`
+keeps each article once in `news_articles`, keyed by Finnhub id, and links
+it to its symbols in `news_symbols`. A batch is deduplicated in memory,
+then the remaining ids are checked against the table with chunked bulk
+`IN` queries, so only unseen articles are sent. `load_company_news` fetches
+symbols concurrently into one store.
+
+Readers of the old per-symbol `company_news` table should move to
+`news_articles` joined with `news_symbols`. Until they have, a store built
+with `legacy=True` also upserts each newly seen (symbol, article) pair into
+`company_news`. This is opt-in because it writes every article once per
+symbol again. `load_endpoint`, `load_windowed` and the raw-lake `rebuild`
+write /company-news through a `NewsStore` too, so every path fills the same
+tables.
+
+Example:
+    >>> poller = NewsPoller(["general", "merger"])
+    >>> await poller.poll()
+    {'general': 12, 'merger': 0}
+    >>> await load_company_news(symbols, "2024-01-01", "2024-01-31")
+    (8312, 14760)
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config.breaker import CircuitOpenError
+from ..config.finhub import FinnhubAPIClient, api_client
+from ..config.windows import DateLike, fetch_windowed
+from ..models import CompanyNews, GeneralNews, NewsArticle, NewsCursor, NewsSymbol, get_table_spec
+from .bulk import BulkWriter
+
+NEWS_CATEGORIES = ("general", "forex", "crypto", "merger")
+
+
+class RecentIds:
+    """Set of the last `maxlen` ids added; the oldest are forgotten first."""
+
+    def __init__(self, maxlen: int = 10000):
+        self.maxlen = maxlen
+        self._ids: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def __contains__(self, id: Hashable) -> bool:
+        return id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def update(self, ids: Iterable[Hashable]) -> None:
+        """Remember ids, evicting the oldest beyond `maxlen`."""
+        for id in ids:
+            self._ids[id] = None
+            self._ids.move_to_end(id)
+        while len(self._ids) > self.maxlen:
+            self._ids.popitem(last=False)
+
+
+class NewsPoller:
+    """Poll /news categories for articles newer than each category's cursor.
+
+    Args:
+        categories: Categories to poll (default: NEWS_CATEGORIES)
+        seen_size: Recently stored ids remembered for dedupe (default: 10000)
+        client: API client (default: the global `api_client`)
+        engine: Async engine (default: finhub_etl.database.engine)
+    """
+
+    def __init__(
+        self,
+        categories: Sequence[str] = NEWS_CATEGORIES,
+        seen_size: int = 10000,
+        client: Optional[FinnhubAPIClient] = None,
+        engine: Optional[AsyncEngine] = None,
+    ):
+        if engine is None:
+            from ..database import engine
+        self.categories = list(categories)
+        self.seen = RecentIds(seen_size)
+        self.client = client or api_client
+        self.engine = engine
+        self.cursors: Dict[str, int] = {}
+        self.loaded = False
+        self.articles = BulkWriter(GeneralNews, on_conflict="ignore", engine=engine)
+        self.cursor_writer = BulkWriter(NewsCursor, on_conflict="update", engine=engine)
+
+    async def load_cursors(self) -> Dict[str, int]:
+        """Read the stored cursors of the polled categories."""
+        c = NewsCursor.__table__.c
+        async with self.engine.connect() as conn:
+            result = await conn.execute(select(c.category, c.max_id).where(c.category.in_(self.categories)))
+            self.cursors.update(dict(result.all()))
+        self.loaded = True
+        return dict(self.cursors)
+
+    async def fetch(self, category: str) -> List[Dict[str, Any]]:
+        """Articles of a category newer than its cursor."""
+        cursor = self.cursors.get(category, 0)
+        params: Dict[str, Any] = {"category": category}
+        if cursor:
+            params["minId"] = cursor
+        payload = await self.client.get("/news", params)
+        return [record for record in payload or [] if record.get("id") and record["id"] > cursor]
+
+    async def poll(self) -> Dict[str, int]:
+        """Poll every category once and store the new articles.
+
+        A category whose request fails keeps its cursor and is retried on the
+        next poll; the others are stored regardless.
+
+        Returns:
+            Articles stored per category; one listed under several categories
+            counts for the first
+        """
+        if not self.loaded:
+            await self.load_cursors()
+
+        results = await asyncio.gather(*(self.fetch(category) for category in self.categories),
+                                       return_exceptions=True)
+        fresh: List[Tuple[str, List[Dict[str, Any]]]] = []
+        for category, result in zip(self.categories, results):
+            if isinstance(result, BaseException):
+                print(f"❌ /news {category}: {result!r}")
+                continue
+            fresh.append((category, result))
+
+        batch: Dict[int, Dict[str, Any]] = {}
+        counts = {}
+        for category, records in fresh:
+            new = [record for record in records if record["id"] not in self.seen and record["id"] not in batch]
+            batch.update((record["id"], record) for record in new)
+            counts[category] = len(new)
+        await self.articles.write(list(batch.values()))
+
+        stamp = int(time.time() * 1000)
+        moved = []
+        for category, records in fresh:
+            if records:
+                self.cursors[category] = max(record["id"] for record in records)
+                moved.append({"category": category, "max_id": self.cursors[category], "updated_at": stamp})
+        await self.cursor_writer.write_rows(moved)
+        self.seen.update(batch)
+        return counts
+
+
+class NewsStore:
+    """Store company news once per article, linked to every symbol it is listed under.
+
+    Args:
+        link_related: Also link the tickers in each article's comma-separated
+            `related` field (default: True)
+        seen_size: Recently stored article ids and links remembered, skipping
+            the database check for them (default: 50000)
+        chunk_size: Ids per existence query (default: 1000)
+        legacy: Also upsert each new (fetched symbol, article) row into the
+            old company_news table (default: False)
+        engine: Async engine (default: finhub_etl.database.engine)
+    """
+
+    def __init__(
+        self,
+        link_related: bool = True,
+        seen_size: int = 50000,
+        chunk_size: int = 1000,
+        legacy: bool = False,
+        engine: Optional[AsyncEngine] = None,
+    ):
+        if engine is None:
+            from ..database import engine
+        self.link_related = link_related
+        self.chunk_size = chunk_size
+        self.engine = engine
+        self.model = NewsArticle
+        self.seen = RecentIds(seen_size)
+        self.seen_links = RecentIds(seen_size)
+        self.seen_legacy = RecentIds(seen_size)
+        self.article_writer = BulkWriter(NewsArticle, on_conflict="ignore", engine=engine)
+        self.link_writer = BulkWriter(NewsSymbol, on_conflict="ignore", engine=engine)
+        self.legacy_writer = BulkWriter(CompanyNews, on_conflict="update", engine=engine) if legacy else None
+
+    @property
+    def written(self) -> int:
+        """New articles stored so far, like `BulkWriter.written`."""
+        return self.article_writer.written
+
+    async def existing(self, ids: Sequence[int]) -> Set[int]:
+        """Which of `ids` are already in news_articles."""
+        c = NewsArticle.__table__.c
+        found: Set[int] = set()
+        async with self.engine.connect() as conn:
+            for start in range(0, len(ids), self.chunk_size):
+                chunk = ids[start:start + self.chunk_size]
+                found.update((await conn.execute(select(c.id).where(c.id.in_(chunk)))).scalars())
+        return found
+
+    def _symbols(self, record: Dict[str, Any]) -> Set[str]:
+        symbols = {record["symbol"]} if record.get("symbol") else set()
+        if self.link_related and record.get("related"):
+            symbols.update(symbol.strip() for symbol in record["related"].split(",") if symbol.strip())
+        return symbols
+
+    async def store(self, records: Sequence[Dict[str, Any]]) -> Tuple[int, int]:
+        """Store /company-news records tagged with the 'symbol' they were fetched for.
+
+        Returns:
+            (new articles, links) sent to the database; links not remembered
+            from earlier batches are sent with INSERT IGNORE
+        """
+        articles: Dict[int, Dict[str, Any]] = {}
+        links: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        legacy: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        for record in records:
+            id = record.get("id")
+            if not id:
+                continue
+            articles.setdefault(id, record)
+            # company_news is keyed (symbol, datetime, id): only the fetched-for symbol, never `related`
+            symbol = record.get("symbol")
+            if symbol and record.get("datetime") is not None and (symbol, id) not in self.seen_legacy:
+                legacy[(symbol, id)] = record
+            for symbol in self._symbols(record):
+                if (symbol, id) not in self.seen_links:
+                    links[(symbol, id)] = {"symbol": symbol, "article_id": id, "datetime": record.get("datetime")}
+
+        candidates = [id for id in articles if id not in self.seen]
+        known = await self.existing(candidates) if candidates else set()
+        new = [articles[id] for id in candidates if id not in known]
+        await self.article_writer.write(new)
+        await self.link_writer.write_rows(list(links.values()))
+        if self.legacy_writer is not None:
+            await self.legacy_writer.write(list(legacy.values()))
+            self.seen_legacy.update(legacy)
+        self.seen.update(articles)
+        self.seen_links.update(links)
+        return len(new), len(links)
+
+    async def write_tuples(self, rows: Sequence[Tuple[Any, ...]]) -> int:
+        """`BulkWriter`-compatible sink for `load_endpoint`/`load_windowed`/`rebuild`.
+
+        Args:
+            rows: /company-news rows in company_news column order (see `transform_payload`)
+
+        Returns:
+            Number of new articles
+        """
+        columns = get_table_spec(CompanyNews).columns
+        articles, _ = await self.store([dict(zip(columns, row)) for row in rows])
+        return articles
+
+
+async def load_company_news(
+    symbols: Sequence[str],
+    start: DateLike,
+    end: DateLike,
+    store: Optional[NewsStore] = None,
+    window_days: Optional[int] = None,
+    concurrency: int = 4,
+    batch_size: int = 5000,
+    parked: Optional[List[Dict[str, Any]]] = None,
+    limiter: Optional[Any] = None,
+) -> Tuple[int, int]:
+    """Fetch /company-news for many symbols into a `NewsStore`.
+
+    Each symbol's range is fetched in adaptive windows (see
+    `config.windows`); records from several symbols are stored together so
+    stories shared between them are deduplicated in memory.
+
+    Args:
+        symbols: Symbols to load
+        start: First day, date or YYYY-MM-DD
+        end: Last day, date or YYYY-MM-DD
+        store: Article store (default: a new NewsStore)
+        window_days: Initial sub-window length (default: the endpoint's)
+        concurrency: Symbols in flight (default: 4)
+        batch_size: Records buffered before each store (default: 5000)
+        parked: Collects the params of symbols refused by an open circuit
+            breaker; without it the refusal is raised (default: None)
+        limiter: Rate limiter awaited before each request (default: none)
+
+    Returns:
+        (new articles, links) sent to the database, see `NewsStore.store`
+    """
+    store = store or NewsStore()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(symbol: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                records = await fetch_windowed("/company-news", {"symbol": symbol}, start, end, window_days,
+                                               limiter=limiter)
+            except CircuitOpenError:
+                if parked is None:
+                    raise
+                parked.append({"symbol": symbol, "from": str(start), "to": str(end), "windowed": True})
+                return []
+        return [dict(record, symbol=symbol) for record in records]
+
+    articles = links = 0
+    pending: List[Dict[str, Any]] = []
+    for done in asyncio.as_completed([fetch(symbol) for symbol in symbols]):
+        pending += await done
+        if len(pending) >= batch_size:
+            new_articles, new_links = await store.store(pending)
+            articles, links, pending = articles + new_articles, links + new_links, []
+    new_articles, new_links = await store.store(pending)
+    articles, links = articles + new_articles, links + new_links
+
+    print(f"✅ Stored {articles} news articles, {links} symbol links")
+    return articles, links
+
+
+__all__ = [
+    "NEWS_CATEGORIES",
+    "RecentIds",
+    "NewsPoller",
+    "NewsStore",
+    "load_company_news",
+]
@@ -0,0 +1,83 @@
+"""Process-pool transform stage.
+
+Decoding a large response and mapping it to rows is CPU-bound; done on the
+event loop it stalls every in-flight request. `TransformPool` runs
+`transform_payload` inline for small bodies and in a process pool for
+bodies of at least `threshold` bytes. Workers receive the raw bytes and
+return column tuples, so neither the decoded payload nor model instances
+cross the process boundary.
+
+Example:
+    >>> async with TransformPool(threshold=256 * 1024) as pool:
+    ...     rows = await pool.transform("/stock/candle", params, body)
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .transforms import transform_payload
+
+
+class TransformPool:
+    """Offload CPU-heavy payload transforms to worker processes.
+
+    Args:
+        workers: Worker processes (default: CPU count)
+        threshold: Bodies at least this many bytes go to the pool; smaller
+            ones are transformed inline, where pickling would cost more
+            than it saves (default: 256 KiB)
+    """
+
+    def __init__(self, workers: Optional[int] = None, threshold: int = 256 * 1024):
+        self.workers = workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self.inline = 0
+        self.offloaded = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers: forking a process that runs the event loop's threads can deadlock
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def transform(self, endpoint: str, params: Dict[str, Any], content: bytes) -> List[Tuple[Any, ...]]:
+        """Decode and transform a response body into column tuples.
+
+        Args:
+            endpoint: API endpoint registered in ENDPOINT_TRANSFORMS
+            params: Query parameters of the request
+            content: Raw response body
+
+        Returns:
+            Rows as tuples in the table's column order
+        """
+        if len(content) < self.threshold:
+            self.inline += 1
+            return transform_payload(endpoint, params, content)
+
+        self.offloaded += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(), transform_payload, endpoint, params, content)
+
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def __aenter__(self) -> "TransformPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = [
+    "TransformPool",
+]
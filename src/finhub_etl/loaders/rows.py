@@ -0,0 +1,109 @@
+"""Fast row construction for trusted API payloads.
+
+`Model(**record)` runs full pydantic validation and alias resolution for
+every record. For bulk loads from a known-good schema this module instead
+maps records through the precompiled `TableSpec` of each model (see
+`finhub_etl.models.registry`), producing tuples or column dicts ready for
+Core INSERTs. Strict validation is kept as an opt-in sampling check.
+"""
+
+import random
+from typing import Any, Dict, List, Sequence, Tuple, Type, TypeVar
+
+from sqlmodel import SQLModel
+
+from ..models.registry import get_table_spec
+
+T = TypeVar("T", bound=SQLModel)
+
+
+def field_map(model: Type[T]) -> Dict[str, str]:
+    """Map every accepted input key (alias or field name) to its column name.
+
+    Args:
+        model: SQLModel table class
+
+    Returns:
+        Dictionary of input key -> column name
+    """
+    return get_table_spec(model).key_map
+
+
+def build_tuples(model: Type[T], records: Sequence[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    """Convert API records into tuples in table column order (no validation)."""
+    return get_table_spec(model).to_tuples(records)
+
+
+def build_rows(
+    model: Type[T],
+    records: Sequence[Dict[str, Any]],
+    validate_sample: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """Convert API records into column dicts for Core inserts.
+
+    Unknown keys are dropped and missing columns get the model default
+    (`default` or `default_factory`, else None), as `Model(**record)` would.
+
+    Args:
+        model: SQLModel table class
+        records: API records keyed by alias or field name
+        validate_sample: Fraction of rows to run through full pydantic
+            validation (e.g. 0.01 for 1%). 0 disables the check (default: 0)
+
+    Returns:
+        List of column dicts with a uniform key set
+
+    Raises:
+        pydantic.ValidationError: If a sampled row fails validation
+    """
+    rows = get_table_spec(model).to_dicts(records)
+
+    if validate_sample:
+        validate_rows(model, rows, validate_sample)
+    return rows
+
+
+def build_instances(
+    model: Type[T],
+    records: Sequence[Dict[str, Any]],
+    validate_sample: float = 0.0,
+) -> List[T]:
+    """Build model instances with `model_construct` (no validation).
+
+    The instances are plain pydantic objects that are not attached to the
+    ORM, so insert them with a Core statement rather than `session.add`.
+    """
+    rows = build_rows(model, records, validate_sample)
+    return [model.model_construct(**row) for row in rows]
+
+
+def validate_rows(model: Type[T], rows: Sequence[Dict[str, Any]], rate: float) -> int:
+    """Run strict validation on a random sample of column dicts.
+
+    Args:
+        model: SQLModel table class
+        rows: Column dicts produced by `build_rows`
+        rate: Fraction of rows to validate (at least one row when rate > 0)
+
+    Returns:
+        Number of rows validated
+
+    Raises:
+        pydantic.ValidationError: If a sampled row fails validation
+    """
+    if not rows or rate <= 0:
+        return 0
+
+    count = min(len(rows), max(1, round(len(rows) * rate)))
+    for row in random.sample(rows, count):
+        model.model_validate(row)
+    return count
+
+
+__all__ = [
+    "field_map",
+    "build_tuples",
+    "build_rows",
+    "build_instances",
+    "validate_rows",
+]
@@ -0,0 +1,162 @@
+"""Endpoint transforms: raw response payload -> table rows.
+
+Each endpoint with a table and a known record mapping is registered in
+`ENDPOINT_TRANSFORMS`. `transform_payload` runs the whole CPU-bound path for
+one response body (decode, transform, column tuples) and is a plain
+module-level function, so it can run inline or in a worker process; the
+result is a list of tuples in table column order, cheap to pickle back.
+
+Example:
+    >>> rows = transform_payload("/stock/candle", {"symbol": "AAPL", "resolution": "D"}, body)
+    >>> await BulkWriter(CandlestickData).write_tuples(rows)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from sqlmodel import SQLModel
+
+from ..config.decoders import JSONDecoder, get_decoder
+from ..models import get_table_spec
+
+Transform = Callable[[Any, Dict[str, Any]], List[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class EndpointTransform:
+    """How to turn one endpoint's decoded responses into table records."""
+
+    model: Type[SQLModel]
+    transform: Transform
+
+
+def _records(payload: Any, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if isinstance(payload, list):
+        return payload
+    return [payload] if payload else []
+
+
+def _symbol_records(payload: Any, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"symbol": params.get("symbol"), **record} for record in _records(payload, params)]
+
+
+def _estimates(payload: Any, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    from ..utils.etl import transform_estimates_response
+
+    symbol = payload.get("symbol", params.get("symbol")) if isinstance(payload, dict) else params.get("symbol")
+    return [{"symbol": symbol, **record} for record in transform_estimates_response(payload)]
+
+
+def _candles(payload: Any, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    from ..utils.etl import transform_candles_response
+
+    return transform_candles_response(payload, params["symbol"], params["resolution"])
+
+
+def _peers(payload: Any, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    from ..utils.etl import transform_peers_response
+
+    return transform_peers_response(payload, params["symbol"])
+
+
+def _insider_transactions(payload: Any, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if not isinstance(payload, dict):
+        return []
+    return [{"symbol": params.get("symbol"), **record} for record in payload.get("data") or []]
+
+
+def _market_holiday(payload: Any, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    from ..config.handlers.market import transform_market_holiday
+
+    return transform_market_holiday(payload, params["exchange"])
+
+
+def default_endpoint_transforms() -> Dict[str, EndpointTransform]:
+    """Endpoint -> EndpointTransform for endpoints with a table and a known transform."""
+    from ..models import (
+        AnalystRecommendation,
+        CandlestickData,
+        CompanyFiling,
+        CompanyNews,
+        CompanyPeer,
+        Dividend,
+        EbitdaEstimate,
+        EbitEstimate,
+        EpsEstimate,
+        GeneralNews,
+        InsiderTransaction,
+        MarketHoliday,
+        MarketStatus,
+        RealtimeQuote,
+        RevenueEstimate,
+        StockSplit,
+        StockSymbol,
+    )
+
+    return {
+        "/stock/symbol": EndpointTransform(StockSymbol, _records),
+        "/stock/market-holiday": EndpointTransform(MarketHoliday, _market_holiday),
+        "/stock/market-status": EndpointTransform(MarketStatus, _records),
+        "/quote": EndpointTransform(RealtimeQuote, _symbol_records),
+        "/stock/candle": EndpointTransform(CandlestickData, _candles),
+        "/stock/peers": EndpointTransform(CompanyPeer, _peers),
+        "/news": EndpointTransform(GeneralNews, _records),
+        "/company-news": EndpointTransform(CompanyNews, _symbol_records),
+        "/stock/filings": EndpointTransform(CompanyFiling, _symbol_records),
+        "/stock/insider-transactions": EndpointTransform(InsiderTransaction, _insider_transactions),
+        "/stock/dividend": EndpointTransform(Dividend, _records),
+        "/stock/split": EndpointTransform(StockSplit, _records),
+        "/stock/recommendation": EndpointTransform(AnalystRecommendation, _records),
+        "/stock/revenue-estimate": EndpointTransform(RevenueEstimate, _estimates),
+        "/stock/eps-estimate": EndpointTransform(EpsEstimate, _estimates),
+        "/stock/ebitda-estimate": EndpointTransform(EbitdaEstimate, _estimates),
+        "/stock/ebit-estimate": EndpointTransform(EbitEstimate, _estimates),
+    }
+
+
+# Endpoint -> EndpointTransform; filled with the defaults on first use.
+# Worker processes resolve transforms here too, so extra entries must be
+# registered at import time of a module the workers also import.
+ENDPOINT_TRANSFORMS: Dict[str, EndpointTransform] = {}
+
+
+def get_endpoint_transforms() -> Dict[str, EndpointTransform]:
+    """The transform registry, with the defaults registered."""
+    if not ENDPOINT_TRANSFORMS:
+        ENDPOINT_TRANSFORMS.update(default_endpoint_transforms())
+    return ENDPOINT_TRANSFORMS
+
+
+_decoder: Optional[JSONDecoder] = None
+
+
+def transform_payload(endpoint: str, params: Dict[str, Any], content: Union[bytes, Any]) -> List[Tuple[Any, ...]]:
+    """Decode and transform one response into column tuples.
+
+    Args:
+        endpoint: API endpoint registered in ENDPOINT_TRANSFORMS
+        params: Query parameters of the request (transforms read symbol etc.)
+        content: Raw response body, or an already decoded payload
+
+    Returns:
+        Rows as tuples in the table's column order
+
+    Raises:
+        KeyError: If no transform is registered for the endpoint
+    """
+    global _decoder
+    transform = get_endpoint_transforms()[endpoint]
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        if _decoder is None:
+            _decoder = get_decoder()
+        content = _decoder.decode(bytes(content))
+    return get_table_spec(transform.model).to_tuples(transform.transform(content, params))
+
+
+__all__ = [
+    "EndpointTransform",
+    "ENDPOINT_TRANSFORMS",
+    "default_endpoint_transforms",
+    "get_endpoint_transforms",
+    "transform_payload",
+]
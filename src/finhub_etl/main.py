@@ -0,0 +1,193 @@
+"""Scheduled ETL entry point.
+
+Runs the recurring jobs for one exchange on a market-calendar-aware
+`Scheduler`: daily candles after the close, company news around the
+clock, general news incrementally by minId cursor every two minutes and
+fundamentals weekly. Market status and
+holidays are refreshed on their own cadences and feed the calendar the
+other jobs are gated on. Requests refused by an open circuit breaker are
+parked in the 'parked' work-item job, which is retried every 10 minutes.
+
+Quotes are polled while the session is open by a `QuotePoller` that
+spends `--quote-rate` requests per second, refreshing the most active
+symbols every `--quote-interval` seconds and quiet ones rarely; their
+activity scores are recomputed hourly. Answers go through an in-memory
+`QuoteCache`, so only quotes that moved are written.
+
+With `--stream`, active symbols' trades arrive over Finnhub's WebSocket
+instead: ticks go to trade_ticks, rolling quote snapshots replace their
+polling and 1-minute bars are built from the trades and written to
+candlestick_data as each minute closes (requires the `stream` extra). The
+poller keeps covering the symbols that are not streamed.
+
+Usage:
+    python -m finhub_etl.main --exchange US --quote-interval 5 --quote-rate 15
+    python -m finhub_etl.main --stream
+"""
+
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import or_, select
+
+from .config.finhub import api_client
+from .config.handlers.market import get_market_status
+from .loaders import BulkWriter, NewsPoller, NewsStore, load_company_news, load_endpoint
+from .models import MarketStatus, MatchedStock
+from .realtime import QuoteCache, QuotePoller
+from .schedule import AfterClose, Interval, MarketCalendar, ScheduledJob, Scheduler, Weekly
+from .workers import park_requests, run_worker
+
+FUNDAMENTAL_ENDPOINTS = (
+    "/stock/recommendation",
+    "/stock/revenue-estimate",
+    "/stock/eps-estimate",
+    "/stock/ebitda-estimate",
+    "/stock/ebit-estimate",
+)
+
+
+async def active_symbols() -> List[str]:
+    """Finnhub symbols of active, non-deleted matched stocks."""
+    from .database import engine
+
+    c = MatchedStock.__table__.c
+    symbol = c.finnhubSymbol
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(symbol).where(c.is_active == 1, or_(c.is_deleted.is_(None), c.is_deleted == 0), symbol.is_not(None))
+        )
+        return sorted(set(result.scalars().all()))
+
+
+async def load(endpoint: str, params_list: Sequence[Dict[str, Any]]) -> int:
+    """`load_endpoint`, parking requests refused by an open breaker."""
+    parked: List[Dict[str, Any]] = []
+    count = await load_endpoint(endpoint, params_list, parked=parked)
+    if parked:
+        await park_requests(endpoint, parked, retry_after=api_client.breakers.reset_timeout)
+        print(f"⚠️ {endpoint}: circuit open, parked {len(parked)} requests")
+    return count
+
+
+def default_jobs(
+    calendar: MarketCalendar,
+    quote_poller: Optional[QuotePoller] = None,
+    streamed: Iterable[str] = (),
+) -> List[ScheduledJob]:
+    """The standard ETL schedule for the calendar's exchange.
+
+    `quote_poller` itself runs beside the scheduler; the schedule only
+    refreshes its priorities, leaving out the `streamed` symbols.
+    """
+    exchange = calendar.exchange
+    quote_poller = quote_poller or QuotePoller()
+    streamed = set(streamed)
+    news_poller = NewsPoller()
+    news_store = NewsStore()
+
+    async def market_status() -> None:
+        status = await get_market_status(exchange)
+        calendar.update_status(status)
+        await BulkWriter(MarketStatus, on_conflict="update").write([status])
+
+    async def market_holidays() -> None:
+        await load("/stock/market-holiday", [{"exchange": exchange}])
+        await calendar.refresh()
+
+    async def quote_priorities() -> None:
+        if len(quote_poller):
+            staleness = quote_poller.staleness()
+            print(f"Quote staleness: p50 {staleness['p50']:.0f}s, p99 {staleness['p99']:.0f}s, "
+                  f"{staleness['overdue']} of {staleness['symbols']} overdue")
+        await quote_poller.load_activity(exclude=streamed)
+
+    async def candles() -> None:
+        end = int(datetime.now(timezone.utc).timestamp())
+        start = end - 7 * 24 * 3600
+        await load("/stock/candle", [
+            {"symbol": symbol, "resolution": "D", "from": start, "to": end} for symbol in await active_symbols()
+        ])
+
+    async def company_news() -> None:
+        today = date.today()
+        parked: List[Dict[str, Any]] = []
+        await load_company_news(await active_symbols(), today - timedelta(days=1), today, news_store, parked=parked)
+        if parked:
+            await park_requests("/company-news", parked, retry_after=api_client.breakers.reset_timeout)
+
+    async def general_news() -> None:
+        await news_poller.poll()
+
+    async def fundamentals() -> None:
+        symbols = await active_symbols()
+        for endpoint in FUNDAMENTAL_ENDPOINTS:
+            await load(endpoint, [{"symbol": symbol} for symbol in symbols])
+
+    async def parked() -> None:
+        await run_worker("parked", until_idle=True)
+
+    return [
+        ScheduledJob("market-status", market_status, Interval(300, session=False), jitter=10, run_at_start=True),
+        ScheduledJob("market-holidays", market_holidays, Weekly(6, time(5, 0)), jitter=600, run_at_start=True),
+        ScheduledJob("quote-priorities", quote_priorities, Interval(3600, session=False), run_at_start=True),
+        ScheduledJob("candles", candles, AfterClose(minutes=30), jitter=600),
+        ScheduledJob("company-news", company_news, Interval(1800, session=False), jitter=120),
+        ScheduledJob("general-news", general_news, Interval(120, session=False), jitter=10, run_at_start=True),
+        ScheduledJob("fundamentals", fundamentals, Weekly(5, time(8, 0)), jitter=1800),
+        ScheduledJob("parked", parked, Interval(600, session=False), jitter=60),
+    ]
+
+
+async def run(
+    exchange: str = "US",
+    quote_interval: float = 5.0,
+    quote_rate: Optional[float] = None,
+    stream: bool = False,
+) -> None:
+    calendar = await MarketCalendar.load(exchange)
+    quote_cache = QuoteCache()
+    await quote_cache.warm()
+    # By default quotes may use half of the client's request budget
+    quote_poller = QuotePoller(
+        quote_cache,
+        rate=quote_rate or (api_client.scheduler.rate or 20.0) / 2,
+        min_interval=quote_interval,
+        gate=lambda: calendar.is_open(datetime.now(timezone.utc)),
+    )
+    tasks = [quote_poller.run()]
+    streamed: List[str] = []
+    if stream:
+        from .realtime import BarAggregator, FinnhubStream, TickIngestor
+
+        ingestor = TickIngestor(cache=quote_cache)
+        bars = BarAggregator(live_interval=1.0)
+        trades = FinnhubStream(
+            await active_symbols(), tokens=[key.token for key in api_client.keys.keys], on_trades=[ingestor.add, bars.add]
+        )
+        streamed = sorted(trades.symbols)
+        print(f"✅ Streaming {len(streamed)} symbols over {len(trades.shards)} connections")
+        tasks += [trades.run(), ingestor.run(), bars.run()]
+
+    scheduler = Scheduler(calendar, default_jobs(calendar, quote_poller, streamed))
+    for name, due in scheduler.upcoming():
+        print(f"{name}: next run {due.astimezone(calendar.zone):%Y-%m-%d %H:%M:%S %Z}")
+    await asyncio.gather(scheduler.run(), *tasks)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the scheduled Finnhub ETL")
+    parser.add_argument("--exchange", default="US")
+    parser.add_argument("--quote-interval", type=float, default=5.0,
+                        help="seconds between quote polls of the most active symbols")
+    parser.add_argument("--quote-rate", type=float, default=None,
+                        help="quote requests per second (default: half the API budget)")
+    parser.add_argument("--stream", action="store_true", help="stream trades over WebSocket instead of polling quotes")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.exchange, args.quote_interval, args.quote_rate, args.stream))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ from .company_profile import CompanyProfile, CompanyProfile2
 
 # Company News
 from .company_news import CompanyNews
+from .news_article import NewsArticle, NewsSymbol
 
 # Company Peers
 from .company_peers import CompanyPeer
@@ -60,7 +61,7 @@ from .market_info import MarketStatus, MarketHoliday
 from .executive import CompanyExecutive
 
 # General News
-from .general_news import GeneralNews
+from .general_news import GeneralNews, NewsCursor
 
 # Insider Transactions
 from .insider_transaction import InsiderTransaction
@@ -86,6 +87,9 @@ from .quote import RealtimeQuote
 # Candlestick
 from .candle import CandlestickData
 
+# Streamed trades
+from .trade import TradeTick
+
 # Stock Splits
 from .stock_split import StockSplit
 
@@ -95,6 +99,13 @@ from .technical_indicator import TechnicalIndicator
 # Earnings Quality
 from .earnings_quality import EarningsQualityScore
 
+# Work leasing
+from .work import WorkItem, RateLimitBucket
+
+# Column mapping registry (built once all models above are imported)
+from .registry import TableSpec, TABLE_REGISTRY, get_table_spec, load_registry
+
+load_registry()
 
 __all__ = [
     "SQLModel",
@@ -107,6 +118,8 @@ __all__ = [
     "CompanyProfile2",
     # Company News
     "CompanyNews",
+    "NewsArticle",
+    "NewsSymbol",
     # Company Peers
     "CompanyPeer",
     # Press Releases
@@ -139,6 +152,7 @@ __all__ = [
     "CompanyExecutive",
     # General News
     "GeneralNews",
+    "NewsCursor",
     # Insider Transactions
     "InsiderTransaction",
     # Filings
@@ -161,10 +175,20 @@ __all__ = [
     "RealtimeQuote",
     # Candlestick
     "CandlestickData",
+    # Streamed trades
+    "TradeTick",
     # Stock Splits
     "StockSplit",
     # Technical Indicators
     "TechnicalIndicator",
     # Earnings Quality
     "EarningsQualityScore",
+    # Work leasing
+    "WorkItem",
+    "RateLimitBucket",
+    # Registry
+    "TableSpec",
+    "TABLE_REGISTRY",
+    "get_table_spec",
+    "load_registry",
 ]
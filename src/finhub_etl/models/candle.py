@@ -1,17 +1,29 @@
 from typing import Optional
+from sqlalchemy import Double, Integer, Numeric
+from sqlalchemy.dialects import mysql
 from sqlmodel import SQLModel, Field
 
+# Fixed precision prices (8 integer + 6 fractional digits, 7 bytes in MySQL),
+# read back as float
+PRICE = Numeric(14, 6, asdecimal=False)
+# Bar open time in UNIX seconds (4-byte unsigned in MySQL)
+UNIX_SECONDS = Integer().with_variant(mysql.INTEGER(unsigned=True), "mysql")
+
 
 class CandlestickData(SQLModel, table=True):
-    """Historical Candlestick Data - /stock/candle"""
+    """Historical Candlestick Data - /stock/candle
+
+    One row per (symbol, resolution, bar open time). In MySQL the table is
+    RANGE partitioned by month on `timestamp`, see `database.candles`.
+    """
     __tablename__ = "candlestick_data"
 
-    symbol: str = Field(primary_key=True, index=True)
-    timestamp: int = Field(primary_key=True, alias="t")
+    symbol: str = Field(primary_key=True, max_length=20)
+    resolution: str = Field(default="D", primary_key=True, max_length=2)
+    timestamp: int = Field(primary_key=True, alias="t", sa_type=UNIX_SECONDS)
 
-    close: Optional[float] = Field(default=None, alias="c")
-    high: Optional[float] = Field(default=None, alias="h")
-    low: Optional[float] = Field(default=None, alias="l")
-    open: Optional[float] = Field(default=None, alias="o")
-    volume: Optional[float] = Field(default=None, alias="v")
-    status: Optional[str] = Field(default=None, alias="s")
+    close: Optional[float] = Field(default=None, alias="c", sa_type=PRICE)
+    high: Optional[float] = Field(default=None, alias="h", sa_type=PRICE)
+    low: Optional[float] = Field(default=None, alias="l", sa_type=PRICE)
+    open: Optional[float] = Field(default=None, alias="o", sa_type=PRICE)
+    volume: Optional[float] = Field(default=None, alias="v", sa_type=Double)  # Fractional for crypto/FX
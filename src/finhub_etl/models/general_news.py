@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import BigInteger
 from sqlmodel import SQLModel, Field
 
 
@@ -15,3 +16,12 @@ class GeneralNews(SQLModel, table=True):
     source: Optional[str] = None
     summary: Optional[str] = None
     url: Optional[str] = None
+
+
+class NewsCursor(SQLModel, table=True):
+    """Highest /news id stored per requested category, polled onward with minId"""
+    __tablename__ = "news_cursors"
+
+    category: str = Field(primary_key=True, max_length=32)
+    max_id: int = Field(sa_type=BigInteger)
+    updated_at: int = Field(sa_type=BigInteger)  # UNIX milliseconds
@@ -0,0 +1,33 @@
+from typing import Optional
+from sqlalchemy import BigInteger, Index, Text
+from sqlmodel import SQLModel, Field
+
+
+class NewsArticle(SQLModel, table=True):
+    """Company news article stored once per Finnhub id - /company-news
+
+    The same story is listed under every related ticker; `NewsSymbol` links
+    it to each of them instead of repeating the article per symbol.
+    """
+    __tablename__ = "news_articles"
+
+    id: int = Field(primary_key=True, sa_type=BigInteger)
+    datetime: Optional[int] = Field(default=None, sa_type=BigInteger, index=True)  # Unix timestamp
+
+    category: Optional[str] = None
+    headline: Optional[str] = Field(default=None, sa_type=Text)
+    image: Optional[str] = Field(default=None, sa_type=Text)
+    related: Optional[str] = Field(default=None, sa_type=Text)
+    source: Optional[str] = None
+    summary: Optional[str] = Field(default=None, sa_type=Text)
+    url: Optional[str] = Field(default=None, sa_type=Text)
+
+
+class NewsSymbol(SQLModel, table=True):
+    """Symbol <-> news article link"""
+    __tablename__ = "news_symbols"
+    __table_args__ = (Index("ix_news_symbols_symbol_datetime", "symbol", "datetime"),)
+
+    symbol: str = Field(primary_key=True, max_length=32)
+    article_id: int = Field(primary_key=True, sa_type=BigInteger, index=True)
+    datetime: Optional[int] = Field(default=None, sa_type=BigInteger)  # Article time, for per-symbol ranges
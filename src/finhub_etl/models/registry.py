@@ -0,0 +1,199 @@
+"""Precompiled API-key -> column mappings for every SQLModel table.
+
+Finnhub returns records keyed by short aliases (`c`, `dp`, `52WeekHigh`,
+`epsActual`) mixed with extra keys the tables don't store, while our
+transforms emit field names. `TableSpec` compiles, once per table, the
+column order, primary key, column types and the key each column is read
+from, so converting a record is a single itemgetter/tuple operation and
+unknown keys are never looked at.
+
+Example:
+    >>> from finhub_etl.models import RealtimeQuote, get_table_spec
+    >>> spec = get_table_spec(RealtimeQuote)
+    >>> spec.primary_key
+    ('symbol', 'timestamp')
+    >>> spec.to_tuples([{"symbol": "AAPL", "t": 1700000000, "c": 189.7, "extra": 1}])
+    [('AAPL', 1700000000, 189.7, None, None, None, None, None, None)]
+"""
+
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from pydantic_core import PydanticUndefined
+from sqlalchemy import Table
+from sqlmodel import SQLModel
+
+# Distinct record layouts remembered per table before the getter cache resets
+MAX_LAYOUTS = 64
+
+
+def _python_type(column) -> Optional[type]:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def _default_of(info) -> Callable[[], Any]:
+    """Return a zero-argument callable producing the field's default value."""
+    if info is None:
+        return lambda: None
+    if info.default_factory is not None:
+        return info.default_factory
+    default = None if info.default is PydanticUndefined else info.default
+    return lambda: default
+
+
+@dataclass(frozen=True, eq=False)
+class TableSpec:
+    """Compiled column layout of one SQLModel table."""
+
+    model: Type[SQLModel]
+    table: Table
+    columns: Tuple[str, ...]
+    primary_key: Tuple[str, ...]
+    column_types: Dict[str, Optional[type]]
+    # Accepted input keys per column, API alias first
+    sources: Tuple[Tuple[str, ...], ...]
+    key_map: Dict[str, str] = field(repr=False)
+    # Model default (or default_factory) per column, used for missing keys
+    defaults: Tuple[Callable[[], Any], ...] = field(default=(), repr=False)
+    # Compiled getters per record key layout
+    _getters: Dict[frozenset, Callable[[Dict[str, Any]], Tuple[Any, ...]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    @classmethod
+    def from_model(cls, model: Type[SQLModel]) -> "TableSpec":
+        """Compile the spec of a SQLModel table class."""
+        table: Table = model.__table__
+        fields = model.model_fields
+        columns = tuple(table.columns.keys())
+
+        sources = []
+        key_map = {}
+        for name in columns:
+            alias = fields[name].alias if name in fields else None
+            keys = (alias, name) if alias and alias != name else (name,)
+            sources.append(keys)
+            for key in keys:
+                key_map[key] = name
+
+        return cls(
+            model=model,
+            table=table,
+            columns=columns,
+            primary_key=tuple(column.name for column in table.primary_key.columns),
+            column_types={column.name: _python_type(column) for column in table.columns},
+            sources=tuple(sources),
+            key_map=key_map,
+            defaults=tuple(_default_of(fields.get(name)) for name in columns),
+        )
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+    def getter(self, keys: Iterable[str]) -> Callable[[Dict[str, Any]], Tuple[Any, ...]]:
+        """Return a row -> tuple function for records laid out with `keys`.
+
+        Columns with no accepted key in the layout get the model default.
+        Getters are cached per spec and key layout.
+        """
+        keys = frozenset(keys)
+        getter = self._getters.get(keys)
+        if getter is None:
+            if len(self._getters) >= MAX_LAYOUTS:
+                self._getters.clear()
+            getter = self._getters[keys] = self._compile(keys)
+        return getter
+
+    def _compile(self, keys: frozenset) -> Callable[[Dict[str, Any]], Tuple[Any, ...]]:
+        # Read each column from whichever accepted key this layout uses
+        lookup = tuple(next((key for key in candidates if key in keys), None) for candidates in self.sources)
+        if len(lookup) > 1 and None not in lookup:
+            return itemgetter(*lookup)
+        pairs = tuple(zip(lookup, self.defaults))
+        return lambda record: tuple(default() if key is None else record[key] for key, default in pairs)
+
+    def to_tuples(self, records: Sequence[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+        """Convert records to tuples in `columns` order.
+
+        When the first record carries every column, its key layout drives a
+        single itemgetter for the batch. Otherwise (or when a later record
+        lacks one of those keys) each record is read with the getter of its
+        own layout, so alias and field-name keys can be mixed across records
+        and missing columns get the model default. Unknown keys are ignored.
+        """
+        if not records:
+            return []
+
+        getter = self.getter(records[0].keys())
+        if isinstance(getter, itemgetter):
+            try:
+                return [getter(record) for record in records]
+            except KeyError:
+                pass
+        get = self.getter
+        return [get(record.keys())(record) for record in records]
+
+    def to_dicts(self, records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert records to column dicts (for Core executemany)."""
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.to_tuples(records)]
+
+    def key_of(self, row: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Return the primary-key tuple of a column dict."""
+        return tuple(row[name] for name in self.primary_key)
+
+
+def build_registry() -> Dict[str, TableSpec]:
+    """Compile a `TableSpec` for every mapped SQLModel table class.
+
+    Returns:
+        Dictionary of table name -> TableSpec
+    """
+    registry = {}
+    for mapper in SQLModel._sa_registry.mappers:
+        model = mapper.class_
+        if isinstance(getattr(model, "__table__", None), Table):
+            spec = TableSpec.from_model(model)
+            registry[spec.name] = spec
+    return registry
+
+
+TABLE_REGISTRY: Dict[str, TableSpec] = {}
+_MODEL_SPECS: Dict[Type[SQLModel], TableSpec] = {}
+
+
+def load_registry() -> Dict[str, TableSpec]:
+    """(Re)build the registry from every model imported so far."""
+    TABLE_REGISTRY.clear()
+    _MODEL_SPECS.clear()
+    for spec in build_registry().values():
+        TABLE_REGISTRY[spec.name] = spec
+        _MODEL_SPECS[spec.model] = spec
+    return TABLE_REGISTRY
+
+
+def get_table_spec(model: Type[SQLModel]) -> TableSpec:
+    """Return the compiled spec of a model.
+
+    Models defined after the registry was built are compiled on first use.
+    """
+    spec = _MODEL_SPECS.get(model)
+    if spec is None:
+        spec = TableSpec.from_model(model)
+        TABLE_REGISTRY[spec.name] = spec
+        _MODEL_SPECS[model] = spec
+    return spec
+
+
+__all__ = [
+    "TableSpec",
+    "TABLE_REGISTRY",
+    "build_registry",
+    "load_registry",
+    "get_table_spec",
+]
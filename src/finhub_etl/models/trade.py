@@ -0,0 +1,24 @@
+from typing import Optional
+from sqlalchemy import BigInteger, Double, Index, Integer
+from sqlmodel import SQLModel, Field
+
+from .candle import PRICE
+
+# SQLite only autoincrements INTEGER PRIMARY KEY
+ROW_ID = BigInteger().with_variant(Integer(), "sqlite")
+
+
+class TradeTick(SQLModel, table=True):
+    """Trade from the Finnhub WebSocket stream - wss://ws.finnhub.io
+
+    Written in micro-batches by `realtime.TickIngestor`. Trades carry no id
+    and may repeat (symbol, timestamp, price), hence the surrogate key.
+    """
+    __tablename__ = "trade_ticks"
+    __table_args__ = (Index("ix_trade_ticks_symbol_timestamp", "symbol", "timestamp"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True, sa_type=ROW_ID)
+    symbol: str = Field(max_length=20, alias="s")
+    timestamp: int = Field(alias="t", sa_type=BigInteger)  # UNIX milliseconds
+    price: float = Field(alias="p", sa_type=PRICE)
+    volume: Optional[float] = Field(default=None, alias="v", sa_type=Double)  # Fractional for crypto
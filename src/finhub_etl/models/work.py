@@ -0,0 +1,37 @@
+from typing import Optional
+from sqlalchemy import BigInteger, Double, Index, Text
+from sqlmodel import SQLModel, Field
+
+
+class WorkItem(SQLModel, table=True):
+    """Leased unit of ETL work (dataset x symbol shard x window)
+
+    Claimed by worker processes with `SELECT ... FOR UPDATE SKIP LOCKED`,
+    see `finhub_etl.workers`. Times are UNIX milliseconds.
+    """
+    __tablename__ = "work_items"
+    __table_args__ = (Index("ix_work_items_claim", "job", "status", "lease_expires"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job: str = Field(max_length=64)
+    dataset: str = Field(max_length=64)  # Endpoint, e.g. '/stock/candle'
+    params: str = Field(sa_type=Text)  # JSON query parameters
+
+    status: str = Field(default="pending", max_length=8)  # pending / leased / done / failed
+    attempts: int = 0
+    lease_owner: Optional[str] = Field(default=None, max_length=64)
+    lease_token: Optional[str] = Field(default=None, max_length=32, index=True)
+    lease_expires: Optional[int] = Field(default=None, sa_type=BigInteger)
+    error: Optional[str] = Field(default=None, sa_type=Text)
+    updated_at: Optional[int] = Field(default=None, sa_type=BigInteger)
+
+
+class RateLimitBucket(SQLModel, table=True):
+    """Token bucket shared by every worker process, refilled on read"""
+    __tablename__ = "rate_limits"
+
+    name: str = Field(primary_key=True, max_length=64)
+    capacity: float = Field(sa_type=Double)
+    refill_per_second: float = Field(sa_type=Double)
+    tokens: float = Field(sa_type=Double)
+    updated_at: int = Field(sa_type=BigInteger)  # UNIX milliseconds
@@ -0,0 +1,28 @@
+from .stream import WS_URL, Tick, FinnhubStream
+from .cache import QUOTE_COLUMNS, Quote, QuoteCache
+from .ingest import RollingQuotes, TickIngestor
+from .bars import BarAggregator
+from .poller import STALENESS_TIERS, allocate_intervals, QuotePoller
+from .standin import StandInServer
+
+__all__ = [
+    # WebSocket stream
+    "WS_URL",
+    "Tick",
+    "FinnhubStream",
+    # Hot quote cache
+    "QUOTE_COLUMNS",
+    "Quote",
+    "QuoteCache",
+    # Micro-batched persistence
+    "RollingQuotes",
+    "TickIngestor",
+    # Live 1-minute bars
+    "BarAggregator",
+    # Prioritized quote polling
+    "STALENESS_TIERS",
+    "allocate_intervals",
+    "QuotePoller",
+    # Local stand-in server
+    "StandInServer",
+]
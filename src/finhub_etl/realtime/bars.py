@@ -0,0 +1,255 @@
+"""1-minute OHLCV bars built from streamed trades.
+
+`BarAggregator.add` is an `on_trades` callback of a `FinnhubStream`: each
+trade is folded into its symbol's bar for the trade's minute, one short
+list per open (minute, symbol). A minute's bars stay open for `grace`
+seconds after the minute ends so late trades still land in the right bar;
+then `run()` writes every bar of that minute to `candlestick_data`
+(resolution '1') in one bulk upsert. Trades for minutes already written
+are counted in `too_late` and dropped. Trades for a minute whose write is
+still in flight are held back: they are re-added if the write fails (the
+minute is kept for the next flush) and counted in `too_late` otherwise.
+A failed flush backs `run()` off for at least `grace` or `live_interval`
+seconds, doubling per consecutive failure, instead of retrying at once.
+
+With `live_interval`, the bars of the running minute are also upserted
+every `live_interval` seconds, so readers of `candlestick_data` see the
+current bar to the second; the minute-boundary flush overwrites them with
+the final values. `current(symbol)` reads the running bar from memory.
+
+Example:
+    >>> bars = BarAggregator(grace=2.0)
+    >>> stream = FinnhubStream(symbols, tokens, on_trades=[bars.add])
+    >>> await asyncio.gather(stream.run(), bars.run())
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..loaders import BulkWriter
+from ..models import CandlestickData
+from .stream import Tick
+
+MINUTE = 60
+# Longest pause after consecutive failed flushes
+MAX_BACKOFF = 60.0
+
+
+class BarAggregator:
+    """Fold trades into 1-minute bars and flush each minute in bulk.
+
+    Args:
+        grace: Seconds after a minute ends during which late trades are
+            still added to its bars (default: 2.0)
+        live_interval: Seconds between upserts of the running minute's
+            changed bars; None writes finished bars only (default: None)
+        resolution: Resolution stored in candlestick_data (default: '1')
+        clock: Wall clock in UNIX seconds (default: time.time)
+        engine: Async engine (default: finhub_etl.database.engine)
+    """
+
+    def __init__(
+        self,
+        grace: float = 2.0,
+        live_interval: Optional[float] = None,
+        resolution: str = "1",
+        clock: Callable[[], float] = time.time,
+        engine: Optional[AsyncEngine] = None,
+    ):
+        self.grace = grace
+        self.live_interval = live_interval
+        self.resolution = resolution
+        self.clock = clock
+        self.writer = BulkWriter(CandlestickData, batch_size=10_000, on_conflict="update", engine=engine)
+        # minute start (UNIX s) -> symbol -> [open, high, low, close, volume, first ms, last ms]
+        self.minutes: Dict[int, Dict[str, List[float]]] = {}
+        # symbols of the running minute changed since the last live write
+        self.changed: Dict[int, Set[str]] = {}
+        # every minute up to and including this one has been written
+        self.flushed_through = -MINUTE
+        # Trades for minutes being written, held until the write succeeds or fails
+        self._held: Optional[List[Tick]] = None
+        self._held_after = -MINUTE
+        self.failures = 0
+        self.retry_at = 0.0
+        self.running = False
+        self._wake: Optional[asyncio.Event] = None
+        self.trades = self.late = self.too_late = 0
+        self.bars_written = self.live_written = self.flushes = 0
+        self.last_flush_seconds = 0.0
+
+    def add(self, ticks: Sequence[Tick]) -> None:
+        """Fold trades into their bars (a `FinnhubStream` `on_trades` callback)."""
+        minutes, changed = self.minutes, self.changed
+        now_minute = int(self.clock()) // MINUTE * MINUTE
+        last_minute, bars, touched = None, None, None
+        for symbol, price, volume, timestamp in ticks:
+            minute = timestamp // 60000 * MINUTE
+            if minute != last_minute:
+                if minute <= self.flushed_through:
+                    if self._held is not None and minute > self._held_after:
+                        self._held.append(Tick(symbol, price, volume, timestamp))
+                    else:
+                        self.too_late += 1
+                    continue
+                last_minute = minute
+                bars = minutes.get(minute)
+                if bars is None:
+                    bars = minutes[minute] = {}
+                touched = changed.setdefault(minute, set()) if self.live_interval else None
+            if minute < now_minute:
+                self.late += 1
+            bar = bars.get(symbol)
+            if bar is None:
+                bars[symbol] = [price, price, price, price, volume, timestamp, timestamp]
+            else:
+                if price > bar[1]:
+                    bar[1] = price
+                if price < bar[2]:
+                    bar[2] = price
+                # Open and close follow trade time, not arrival order, so late trades land right
+                if timestamp < bar[5]:
+                    bar[0] = price
+                    bar[5] = timestamp
+                if timestamp >= bar[6]:
+                    bar[3] = price
+                    bar[6] = timestamp
+                bar[4] += volume
+            if touched is not None:
+                touched.add(symbol)
+        self.trades += len(ticks)
+
+    def current(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """The symbol's bar for the running minute, or None if it has not traded in it."""
+        minute = int(self.clock()) // MINUTE * MINUTE
+        bar = self.minutes.get(minute, {}).get(symbol)
+        return self._row(symbol, minute, bar) if bar is not None else None
+
+    def _row(self, symbol: str, minute: int, bar: List[float]) -> Dict[str, Any]:
+        open_, high, low, close, volume = bar[:5]
+        return {
+            "symbol": symbol, "resolution": self.resolution, "timestamp": minute,
+            "open": open_, "high": high, "low": low, "close": close, "volume": volume,
+        }
+
+    async def flush(self, final: bool = False) -> int:
+        """Write the bars of every minute whose grace window has passed.
+
+        Args:
+            final: Also write the bars still open, e.g. on shutdown
+
+        Returns:
+            Number of bars written
+        """
+        now = self.clock()
+        due = sorted(minute for minute in self.minutes if final or minute + MINUTE + self.grace <= now)
+        if not due:
+            return 0
+
+        closed = {minute: self.minutes.pop(minute) for minute in due}
+        for minute in due:
+            self.changed.pop(minute, None)
+        rows = [self._row(symbol, minute, bar) for minute, bars in closed.items() for symbol, bar in bars.items()]
+        # Close the minutes before awaiting, so a trade arriving mid-write cannot reopen them
+        previous, self.flushed_through = self.flushed_through, max(self.flushed_through, due[-1])
+        self._held, self._held_after = [], previous
+        started = time.perf_counter()
+        try:
+            await self.writer.write_rows(rows)
+        except Exception as exc:
+            held, self._held = self._held, None
+            self.failures += 1
+            backoff = min(max(self.grace, self.live_interval or 0.0, 1.0) * 2 ** (self.failures - 1), MAX_BACKOFF)
+            self.retry_at = self.clock() + backoff
+            print(f"❌ Bar flush failed, keeping {len(rows)} bars, retrying in {backoff:.0f}s: {exc!r}")
+            self.flushed_through = previous
+            self.minutes.update(closed)
+            # Trades that arrived mid-write belong to the restored minutes
+            self.trades -= len(held)
+            self.add(held)
+            return 0
+
+        held, self._held = self._held, None
+        self.too_late += len(held)
+        self.failures = 0
+        self.last_flush_seconds = time.perf_counter() - started
+        self.bars_written += len(rows)
+        self.flushes += 1
+        return len(rows)
+
+    async def flush_live(self) -> int:
+        """Upsert the open bars that changed since the last live write.
+
+        Returns:
+            Number of bars written
+        """
+        rows = []
+        for minute, symbols in self.changed.items():
+            bars = self.minutes.get(minute, {})
+            rows.extend(self._row(symbol, minute, bars[symbol]) for symbol in symbols if symbol in bars)
+        self.changed = {}
+        if not rows:
+            return 0
+        try:
+            await self.writer.write_rows(rows)
+        except Exception as exc:
+            print(f"⚠️ Live bar write failed: {exc!r}")
+            return 0
+        self.live_written += len(rows)
+        return len(rows)
+
+    def _next_wait(self) -> float:
+        now = self.clock()
+        if self.failures:
+            return max(self.retry_at - now, 0.0)
+        oldest = min(self.minutes, default=int(now) // MINUTE * MINUTE)
+        wait = oldest + MINUTE + self.grace - now
+        if self.live_interval:
+            wait = min(wait, self.live_interval)
+        return max(wait, 0.0)
+
+    async def run(self) -> None:
+        """Flush each minute after its grace window until `stop()`; then flush every open bar."""
+        self.running = True
+        self._wake = asyncio.Event()
+        try:
+            while self.running:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self._next_wait())
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                await self.flush()
+                if self.live_interval:
+                    await self.flush_live()
+        finally:
+            self.running = False
+            await self.flush(final=True)
+
+    def stop(self) -> None:
+        """End `run()` after a final flush."""
+        self.running = False
+        if self._wake is not None:
+            self._wake.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Trade, late-trade and bar counts, open bars and flush time."""
+        return {
+            "trades": self.trades,
+            "late": self.late,
+            "too_late": self.too_late,
+            "open_bars": sum(len(bars) for bars in self.minutes.values()),
+            "bars_written": self.bars_written,
+            "live_written": self.live_written,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+
+__all__ = [
+    "BarAggregator",
+]
@@ -0,0 +1,189 @@
+"""In-memory latest quote per symbol, persisted only when it changes.
+
+`realtime_quotes` is keyed (symbol, timestamp), so writing every polled
+quote adds a row per symbol per cycle even when nothing moved. A
+`QuoteCache` holds the latest `Quote` of each symbol in a dict and
+compares every incoming quote with it: quotes whose prices match the
+cached ones, and quotes older than the cached one, are dropped. Changed
+quotes are marked dirty and `flush()` writes them all in one bulk upsert.
+
+The cache is a drop-in `writer` for `load_endpoint('/quote', ...)`
+(`write_tuples`) and the quote sink of a `TickIngestor`, and in-process
+consumers read the latest quote with `get(symbol)` in O(1) instead of
+querying the database.
+
+Example:
+    >>> cache = QuoteCache()
+    >>> await cache.warm()
+    >>> await load_endpoint("/quote", [{"symbol": s} for s in symbols], writer=cache)
+    >>> await cache.flush()
+    >>> cache.get("AAPL").current_price
+"""
+
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..loaders import BulkWriter, build_tuples
+from ..models import RealtimeQuote
+
+
+class Quote(NamedTuple):
+    """Latest quote of a symbol, with the columns of `realtime_quotes` in table order."""
+
+    symbol: str
+    timestamp: int
+    current_price: Optional[float]
+    change: Optional[float]
+    percent_change: Optional[float]
+    high: Optional[float]
+    low: Optional[float]
+    open_price: Optional[float]
+    previous_close: Optional[float]
+
+
+QUOTE_COLUMNS = list(RealtimeQuote.__table__.columns.keys())
+
+
+class QuoteCache:
+    """Latest quote per symbol with change detection and bulk persistence.
+
+    Args:
+        engine: Async engine (default: finhub_etl.database.engine)
+    """
+
+    def __init__(self, engine: Optional[AsyncEngine] = None):
+        if engine is None:
+            from ..database import engine
+        self.engine = engine
+        self.writer = BulkWriter(RealtimeQuote, on_conflict="update", engine=engine)
+        self.quotes: Dict[str, Quote] = {}
+        self.dirty: Set[str] = set()
+        self.received = self.changed = self.unchanged = self.stale = self.empty = 0
+        self.written = self.flushes = 0
+
+    def __len__(self) -> int:
+        return len(self.quotes)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.quotes
+
+    def __iter__(self) -> Iterator[Quote]:
+        return iter(self.quotes.values())
+
+    def get(self, symbol: str) -> Optional[Quote]:
+        """Latest quote of `symbol`, or None if it has never been quoted."""
+        return self.quotes.get(symbol)
+
+    def put(self, quote: Quote) -> bool:
+        """Keep `quote` if it differs from the cached one.
+
+        Returns:
+            True if the quote changed and will be written on the next flush
+        """
+        self.received += 1
+        if not quote.timestamp:
+            # /quote answers unknown symbols with zeros and t=0
+            self.empty += 1
+            return False
+        previous = self.quotes.get(quote.symbol)
+        if previous is not None:
+            if quote.timestamp < previous.timestamp:
+                self.stale += 1
+                return False
+            if quote[2:] == previous[2:]:
+                self.unchanged += 1
+                return False
+        self.quotes[quote.symbol] = quote
+        self.dirty.add(quote.symbol)
+        self.changed += 1
+        return True
+
+    def update(self, records: Sequence[Dict[str, Any]]) -> int:
+        """Fold /quote-shaped records (alias or column keys, with 'symbol').
+
+        Returns:
+            Number of changed quotes
+        """
+        return self.update_tuples(build_tuples(RealtimeQuote, records))
+
+    def update_tuples(self, rows: Sequence[Tuple[Any, ...]]) -> int:
+        """Fold rows given as tuples in table column order (see `transform_payload`).
+
+        Returns:
+            Number of changed quotes
+        """
+        put, make = self.put, Quote._make
+        return sum(put(make(row)) for row in rows)
+
+    async def write_tuples(self, rows: Sequence[Tuple[Any, ...]]) -> int:
+        """`BulkWriter`-compatible sink for `load_endpoint`: caches rows, writes nothing yet."""
+        return self.update_tuples(rows)
+
+    async def write(self, records: Sequence[Dict[str, Any]]) -> int:
+        """`BulkWriter`-compatible sink for API records: caches them, writes nothing yet."""
+        return self.update(records)
+
+    async def flush(self) -> int:
+        """Write every quote changed since the last flush in one bulk upsert.
+
+        Returns:
+            Number of quotes written
+        """
+        symbols, self.dirty = self.dirty, set()
+        rows = [self.quotes[symbol]._asdict() for symbol in symbols]
+        try:
+            await self.writer.write_rows(rows)
+        except Exception:
+            self.dirty |= symbols
+            raise
+        self.written += len(rows)
+        self.flushes += bool(rows)
+        return len(rows)
+
+    async def warm(self, symbols: Optional[Sequence[str]] = None) -> int:
+        """Load each symbol's latest stored quote, so a restart does not rewrite them.
+
+        Args:
+            symbols: Only these symbols (default: every stored symbol)
+
+        Returns:
+            Number of quotes loaded
+        """
+        c = RealtimeQuote.__table__.c
+        latest = select(c.symbol, func.max(c.timestamp).label("timestamp")).group_by(c.symbol)
+        if symbols is not None:
+            latest = latest.where(c.symbol.in_(list(symbols)))
+        latest = latest.subquery()
+        query = select(*(c[name] for name in QUOTE_COLUMNS)).join(
+            latest, and_(c.symbol == latest.c.symbol, c.timestamp == latest.c.timestamp)
+        )
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(query)).all()
+        for row in rows:
+            quote = Quote(*row)
+            if quote.symbol not in self.quotes or quote.timestamp >= self.quotes[quote.symbol].timestamp:
+                self.quotes[quote.symbol] = quote
+        return len(rows)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Cached symbols, pending writes and received/changed/unchanged/stale counts."""
+        return {
+            "symbols": len(self.quotes),
+            "dirty": len(self.dirty),
+            "received": self.received,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "stale": self.stale,
+            "empty": self.empty,
+            "written": self.written,
+            "flushes": self.flushes,
+        }
+
+
+__all__ = [
+    "Quote",
+    "QUOTE_COLUMNS",
+    "QuoteCache",
+]
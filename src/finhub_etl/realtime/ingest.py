@@ -0,0 +1,235 @@
+"""Micro-batched persistence of streamed trades.
+
+`TickIngestor.add` is the `on_trades` callback of a `FinnhubStream`: it only
+appends to an in-memory buffer. `run()` drains the buffer to `trade_ticks`
+every `flush_interval` seconds, or as soon as `batch_size` ticks are
+waiting, in one executemany per batch. A failed write keeps the ticks for
+the next flush (up to `max_buffer`).
+
+Alongside the ticks, `RollingQuotes` keeps each symbol's session open,
+high, low and last price, and every flush writes a `realtime_quotes`
+snapshot for the symbols that traded since the previous one, so quotes
+stay current without polling /quote. Given a `QuoteCache`, snapshots go
+through it instead: consumers read them from memory and only quotes whose
+prices moved are written.
+
+Example:
+    >>> ingestor = TickIngestor(flush_interval=0.5)
+    >>> stream = FinnhubStream(symbols, tokens, on_trades=[ingestor.add])
+    >>> await asyncio.gather(stream.run(), ingestor.run())
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Set
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..loaders import BulkWriter
+from ..models import RealtimeQuote, TradeTick
+from .cache import QuoteCache
+from .stream import Tick
+
+
+class RollingQuotes:
+    """Session open/high/low/last per symbol, built from trades.
+
+    The session rolls over at local midnight of `timezone`: every last
+    price becomes the previous close and open/high/low restart. Trades
+    from before the current session are ignored.
+
+    Args:
+        timezone: Exchange timezone (default: 'America/New_York')
+        previous_close: Known previous closes by symbol (default: none)
+    """
+
+    def __init__(self, timezone: str = "America/New_York", previous_close: Optional[Dict[str, float]] = None):
+        self.zone = ZoneInfo(timezone)
+        self.previous_close: Dict[str, float] = dict(previous_close or {})
+        # symbol -> [open, high, low, last, last trade ms]
+        self.state: Dict[str, List[float]] = {}
+        self.changed: Set[str] = set()
+        self.day_start = self.day_end = 0
+
+    def _roll(self, timestamp: int) -> None:
+        for symbol, (_, _, _, last, _) in self.state.items():
+            self.previous_close[symbol] = last
+        self.state.clear()
+        self.changed.clear()
+        local = datetime.fromtimestamp(timestamp / 1000, self.zone)
+        start = datetime(local.year, local.month, local.day, tzinfo=self.zone)
+        self.day_start = int(start.timestamp() * 1000)
+        self.day_end = int((start + timedelta(days=1)).timestamp() * 1000)
+
+    def update(self, ticks: Sequence[Tick]) -> None:
+        """Fold trades into the symbols' session state."""
+        state = self.state
+        for symbol, price, _, timestamp in ticks:
+            if timestamp >= self.day_end:
+                self._roll(timestamp)
+            elif timestamp < self.day_start:
+                continue
+            quote = state.get(symbol)
+            if quote is None:
+                state[symbol] = [price, price, price, price, timestamp]
+            else:
+                if price > quote[1]:
+                    quote[1] = price
+                if price < quote[2]:
+                    quote[2] = price
+                if timestamp >= quote[4]:
+                    quote[3] = price
+                    quote[4] = timestamp
+            self.changed.add(symbol)
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        """/quote-shaped records of the symbols changed since the last call."""
+        records = []
+        for symbol in self.changed:
+            open_, high, low, last, timestamp = self.state[symbol]
+            previous = self.previous_close.get(symbol)
+            change = last - previous if previous else None
+            records.append({
+                "symbol": symbol, "t": int(timestamp // 1000), "c": last, "h": high, "l": low, "o": open_,
+                "pc": previous, "d": change, "dp": change / previous * 100 if change is not None else None,
+            })
+        self.changed = set()
+        return records
+
+
+class TickIngestor:
+    """Buffer streamed trades and write them, with quote snapshots, in micro-batches.
+
+    Args:
+        batch_size: Waiting ticks that trigger an early flush (default: 5000)
+        flush_interval: Seconds between flushes (default: 1.0)
+        quotes: Rolling quote state (default: RollingQuotes())
+        store_ticks: Write raw ticks to trade_ticks (default: True)
+        store_quotes: Write quote snapshots to realtime_quotes (default: True)
+        cache: Quote cache the snapshots are written through (default: none,
+            snapshots are upserted directly)
+        max_buffer: Ticks kept across failed writes before the oldest are
+            dropped (default: 1,000,000)
+        engine: Async engine (default: finhub_etl.database.engine)
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 5000,
+        flush_interval: float = 1.0,
+        quotes: Optional[RollingQuotes] = None,
+        store_ticks: bool = True,
+        store_quotes: bool = True,
+        cache: Optional[QuoteCache] = None,
+        max_buffer: int = 1_000_000,
+        engine: Optional[AsyncEngine] = None,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.quotes = (quotes or RollingQuotes()) if store_quotes else None
+        self.store_ticks = store_ticks
+        self.max_buffer = max_buffer
+        self.tick_writer = BulkWriter(TradeTick, batch_size=batch_size, on_conflict="error", engine=engine)
+        self.cache = cache
+        self.quote_writer = BulkWriter(RealtimeQuote, on_conflict="update", engine=engine)
+        self.buffer: List[Tick] = []
+        self.running = False
+        self._wake: Optional[asyncio.Event] = None
+        self.received = self.written = self.quotes_written = self.flushes = self.dropped = 0
+        self.max_lag_ms = 0
+        self.last_flush_seconds = 0.0
+
+    def add(self, ticks: List[Tick]) -> None:
+        """Buffer trades (a `FinnhubStream` `on_trades` callback)."""
+        if self.store_ticks:
+            self.buffer.extend(ticks)
+        if self.quotes is not None:
+            self.quotes.update(ticks)
+        self.received += len(ticks)
+        if self._wake is not None and len(self.buffer) >= self.batch_size:
+            self._wake.set()
+
+    async def flush(self) -> int:
+        """Write the buffered ticks and changed quotes now.
+
+        Returns:
+            Number of ticks written
+        """
+        ticks, self.buffer = self.buffer, []
+        snapshots = self.quotes.snapshots() if self.quotes is not None else []
+        if not ticks and not snapshots:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            # Quote upserts are idempotent, so a failed tick write can retry both
+            if self.cache is not None:
+                self.cache.update(snapshots)
+                snapshots = []
+                self.quotes_written += await self.cache.flush()
+            else:
+                await self.quote_writer.write(snapshots)
+            await self.tick_writer.write_rows([
+                {"symbol": symbol, "timestamp": timestamp, "price": price, "volume": volume}
+                for symbol, price, volume, timestamp in ticks
+            ])
+        except Exception as exc:
+            print(f"❌ Tick flush failed, keeping {len(ticks)} ticks: {exc!r}")
+            self.buffer[:0] = ticks
+            if len(self.buffer) > self.max_buffer:
+                self.dropped += len(self.buffer) - self.max_buffer
+                del self.buffer[:len(self.buffer) - self.max_buffer]
+            if self.quotes is not None:
+                self.quotes.changed.update(record["symbol"] for record in snapshots)
+            return 0
+
+        self.last_flush_seconds = time.perf_counter() - started
+        if ticks:
+            self.max_lag_ms = max(self.max_lag_ms, int(time.time() * 1000) - min(tick.timestamp for tick in ticks))
+        self.written += len(ticks)
+        self.quotes_written += len(snapshots)
+        self.flushes += 1
+        return len(ticks)
+
+    async def run(self) -> None:
+        """Flush on a timer or a full batch until `stop()`; then flush what is left."""
+        self.running = True
+        self._wake = asyncio.Event()
+        try:
+            while self.running:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                await self.flush()
+        finally:
+            self.running = False
+            await self.flush()
+
+    def stop(self) -> None:
+        """End `run()` after a final flush."""
+        self.running = False
+        if self._wake is not None:
+            self._wake.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Tick and quote counts, buffered ticks, flush time and worst tick-to-disk lag."""
+        return {
+            "received": self.received,
+            "written": self.written,
+            "buffered": len(self.buffer),
+            "dropped": self.dropped,
+            "quotes_written": self.quotes_written,
+            "flushes": self.flushes,
+            "last_flush_seconds": self.last_flush_seconds,
+            "max_lag_ms": self.max_lag_ms,
+        }
+
+
+__all__ = [
+    "RollingQuotes",
+    "TickIngestor",
+]
@@ -0,0 +1,393 @@
+"""Prioritized /quote polling for symbols that are not streamed.
+
+Polling 15k symbols round-robin leaves every quote minutes old. A
+`QuotePoller` instead gives each symbol a target refresh interval from its
+activity and spends a fixed request budget (`rate` per second) on the
+symbols that are most overdue:
+
+- `load_activity()` scores symbols from stored daily candles: the square
+  root of average dollar volume times average daily range, so liquid,
+  moving names rank first without a few megacaps taking the whole budget.
+  Symbols without candles fall back to the range of their cached quote.
+  Symbols that `matched_stocks` does not mark active are weighted down by
+  `inactive_weight`.
+- `allocate_intervals()` turns scores into refresh intervals: every symbol
+  gets at least one poll per `max_interval`, and the remaining budget is
+  shared in proportion to score, capped at one poll per `min_interval`.
+- `run()` polls the due symbols, most overdue first, up to the budget
+  each `tick`, folds the answers into a `QuoteCache` and flushes it, so
+  only quotes that moved are written.
+
+`staleness()` reports how old each symbol's last successful poll is,
+overall and by target-interval tier.
+
+Example:
+    >>> poller = QuotePoller(cache, rate=15)
+    >>> await poller.load_activity(exclude=stream.symbols)
+    >>> await poller.run()
+"""
+
+import asyncio
+import heapq
+import math
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config.breaker import CircuitOpenError
+from ..config.finhub import FinnhubAPIClient, api_client
+from ..loaders import transform_payload
+from ..models import CandlestickData, MatchedStock
+from .cache import QuoteCache
+
+# Upper edges (seconds of target interval) of the tiers staleness is reported by
+STALENESS_TIERS = (10.0, 60.0, 600.0, math.inf)
+
+
+def allocate_intervals(
+    weights: Dict[str, float],
+    rate: float,
+    min_interval: float = 5.0,
+    max_interval: float = 3600.0,
+) -> Dict[str, float]:
+    """Split a poll budget into per-symbol refresh intervals.
+
+    Every symbol is polled at least once per `max_interval`; what the budget
+    has left is shared in proportion to weight, no symbol more often than
+    once per `min_interval`. The share of capped symbols is passed on to
+    the rest. If the budget cannot even cover `max_interval` for all
+    symbols, they are polled round-robin.
+
+    Args:
+        weights: Symbol -> activity weight (>= 0)
+        rate: Polls per second to spend
+        min_interval: Fastest refresh in seconds (default: 5)
+        max_interval: Slowest refresh in seconds (default: 3600)
+
+    Returns:
+        Symbol -> seconds between polls
+    """
+    symbols = list(weights)
+    count = len(symbols)
+    if not count:
+        return {}
+    floor, cap = 1.0 / max_interval, 1.0 / min_interval
+    if rate <= count * floor:
+        return dict.fromkeys(symbols, count / rate)
+
+    weight = np.array([max(weights[symbol] or 0.0, 0.0) for symbol in symbols])
+    if not weight.any():
+        weight[:] = 1.0
+    rates = np.full(count, floor)
+    spare = rate - count * floor
+    open_ = weight > 0
+    while spare > 1e-12 and open_.any():
+        share = np.where(open_, spare * weight / weight[open_].sum(), 0.0)
+        room = cap - rates
+        full = open_ & (share >= room)
+        if not full.any():
+            rates[open_] += share[open_]
+            break
+        spare -= room[full].sum()
+        rates[full] = cap
+        open_ &= ~full
+    return dict(zip(symbols, (1.0 / rates).tolist()))
+
+
+class QuotePoller:
+    """Poll /quote within a request budget, most active symbols most often.
+
+    Args:
+        cache: Quote cache the answers go through (default: QuoteCache())
+        rate: Quote requests per second to spend (default: 10)
+        min_interval: Fastest refresh in seconds (default: 5)
+        max_interval: Slowest refresh in seconds (default: 3600)
+        inactive_weight: Weight factor for symbols not marked active in
+            matched_stocks (default: 0.1)
+        tick: Seconds between polling rounds (default: 1.0)
+        concurrency: Requests in flight per round (default: 16)
+        gate: Polls only while this returns True, e.g. the session is open
+            (default: always)
+        client: API client (default: the global `api_client`)
+        clock: Monotonic clock in seconds (default: time.monotonic)
+        engine: Async engine (default: finhub_etl.database.engine)
+    """
+
+    def __init__(
+        self,
+        cache: Optional[QuoteCache] = None,
+        rate: float = 10.0,
+        min_interval: float = 5.0,
+        max_interval: float = 3600.0,
+        inactive_weight: float = 0.1,
+        tick: float = 1.0,
+        concurrency: int = 16,
+        gate: Optional[Callable[[], bool]] = None,
+        client: Optional[FinnhubAPIClient] = None,
+        clock: Callable[[], float] = time.monotonic,
+        engine: Optional[AsyncEngine] = None,
+    ):
+        if engine is None:
+            from ..database import engine
+        self.engine = engine
+        self.cache = cache or QuoteCache(engine=engine)
+        self.rate = rate
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.inactive_weight = inactive_weight
+        self.tick = tick
+        self.concurrency = concurrency
+        self.gate = gate
+        self.client = client or api_client
+        self.clock = clock
+        self.weights: Dict[str, float] = {}
+        self.intervals: Dict[str, float] = {}
+        self.polled_at: Dict[str, float] = {}
+        self.since = clock()
+        # (due, symbol) heap; an entry whose due differs from self._due[symbol] is stale
+        self._queue: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+        self.running = False
+        self._stop: Optional[asyncio.Event] = None
+        self.requests = self.errors = self.refused = self.rounds = 0
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def set_weights(self, weights: Dict[str, float]) -> Dict[str, float]:
+        """Replace the polled symbols and their weights, and re-plan the intervals.
+
+        Known symbols keep their last poll time; new ones are queued now,
+        heaviest first.
+
+        Returns:
+            Symbol -> seconds between polls
+        """
+        now = self.clock()
+        self.weights = dict(weights)
+        self.intervals = allocate_intervals(self.weights, self.rate, self.min_interval, self.max_interval)
+        for symbol in set(self.polled_at) - set(self.intervals):
+            del self.polled_at[symbol]
+        new = sorted((s for s in self.intervals if s not in self.polled_at), key=lambda s: -self.weights[s])
+        self._due = {s: self.polled_at[s] + interval for s, interval in self.intervals.items() if s in self.polled_at}
+        self._due.update((symbol, now + i / self.rate) for i, symbol in enumerate(new))
+        self._queue = [(due, symbol) for symbol, due in self._due.items()]
+        heapq.heapify(self._queue)
+        return dict(self.intervals)
+
+    def _schedule(self, symbol: str, due: float) -> None:
+        if symbol in self.intervals:
+            self._due[symbol] = due
+            heapq.heappush(self._queue, (due, symbol))
+
+    async def load_activity(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        exclude: Iterable[str] = (),
+        days: int = 20,
+        chunk_size: int = 1000,
+    ) -> Dict[str, float]:
+        """Score symbols from stored daily candles and matched_stocks, then `set_weights`.
+
+        Args:
+            symbols: Symbols to poll (default: every non-deleted matched stock)
+            exclude: Symbols not to poll, e.g. the streamed ones
+            days: Days of daily candles to score on (default: 20)
+            chunk_size: Symbols per IN query (default: 1000)
+
+        Returns:
+            Symbol -> activity weight
+        """
+        m = MatchedStock.__table__.c
+        c = CandlestickData.__table__.c
+        live = or_(m.is_deleted.is_(None), m.is_deleted == 0)
+        active: Dict[str, bool] = {}
+        activity: Dict[str, Tuple[float, float]] = {}
+        since = int(time.time()) - days * 86400
+
+        async with self.engine.connect() as conn:
+            if symbols is None:
+                rows = await conn.execute(select(m.finnhubSymbol, m.is_active).where(live, m.finnhubSymbol.is_not(None)))
+                for symbol, is_active in rows:
+                    active[symbol] = active.get(symbol, False) or is_active == 1
+                symbols = list(active)
+            else:
+                symbols = list(dict.fromkeys(symbols))
+                for start in range(0, len(symbols), chunk_size):
+                    chunk = symbols[start:start + chunk_size]
+                    rows = await conn.execute(
+                        select(m.finnhubSymbol, m.is_active).where(live, m.finnhubSymbol.in_(chunk))
+                    )
+                    for symbol, is_active in rows:
+                        active[symbol] = active.get(symbol, False) or is_active == 1
+
+            excluded: Set[str] = set(exclude)
+            symbols = [symbol for symbol in symbols if symbol not in excluded]
+            for start in range(0, len(symbols), chunk_size):
+                chunk = symbols[start:start + chunk_size]
+                rows = await conn.execute(
+                    select(c.symbol, func.avg(c.close * c.volume), func.avg((c.high - c.low) / c.close))
+                    .where(c.resolution == "D", c.timestamp >= since, c.close > 0, c.symbol.in_(chunk))
+                    .group_by(c.symbol)
+                )
+                for symbol, dollar_volume, day_range in rows:
+                    activity[symbol] = (float(dollar_volume or 0.0), float(day_range or 0.0))
+
+        # Without candles: a low dollar volume and the cached quote's range, if any
+        known = [dollar_volume for dollar_volume, _ in activity.values()]
+        fallback_volume = float(np.percentile(known, 10)) if known else 1.0
+        weights = {}
+        for symbol in symbols:
+            dollar_volume, day_range = activity.get(symbol) or (fallback_volume, self._quote_range(symbol))
+            weight = math.sqrt(max(dollar_volume, 0.0) * max(day_range, 0.0))
+            weights[symbol] = weight * (1.0 if active.get(symbol) else self.inactive_weight)
+
+        self.set_weights(weights)
+        return weights
+
+    def _quote_range(self, symbol: str) -> float:
+        quote = self.cache.get(symbol)
+        if quote is None or not quote.current_price or quote.high is None or quote.low is None:
+            return 0.0
+        return (quote.high - quote.low) / quote.current_price
+
+    async def _fetch(self, symbol: str, semaphore: asyncio.Semaphore) -> None:
+        params = {"symbol": symbol}
+        retry = self.intervals.get(symbol, self.max_interval)
+        async with semaphore:
+            self.requests += 1
+            try:
+                payload = await self.client.get("/quote", params)
+            except CircuitOpenError as exc:
+                self.refused += 1
+                retry = min(retry, exc.retry_after)
+            except Exception as exc:
+                self.errors += 1
+                print(f"⚠️ Quote poll failed for {symbol}: {exc!r}")
+            else:
+                self.cache.update_tuples(transform_payload("/quote", params, payload))
+                self.polled_at[symbol] = self.clock()
+        self._schedule(symbol, self.clock() + retry)
+
+    async def poll_due(self, limit: Optional[int] = None) -> int:
+        """Poll the symbols that are due, most overdue first, and flush the cache.
+
+        Args:
+            limit: Most requests to send (default: every due symbol)
+
+        Returns:
+            Number of symbols polled
+        """
+        now = self.clock()
+        due: List[str] = []
+        while self._queue and self._queue[0][0] <= now and (limit is None or len(due) < limit):
+            at, symbol = heapq.heappop(self._queue)
+            if self._due.get(symbol) == at:
+                del self._due[symbol]
+                due.append(symbol)
+        if not due:
+            return 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._fetch(symbol, semaphore) for symbol in due))
+        await self.cache.flush()
+        self.rounds += 1
+        return len(due)
+
+    async def poll_round(self, budget: float = 0.0) -> float:
+        """Spend one tick's budget on due symbols.
+
+        Each round adds `rate * tick` requests to the carried `budget` and
+        sends its whole part; only the fractional remainder is carried, so
+        rates below one request per tick still poll and fractional rates
+        are not floored, while idle rounds never build up a burst.
+
+        Args:
+            budget: Remainder carried from the previous round (default: 0)
+
+        Returns:
+            Remainder to carry into the next round
+        """
+        budget += self.rate * self.tick
+        try:
+            await self.poll_due(int(budget))
+        except Exception as exc:
+            print(f"❌ Quote polling round failed: {exc!r}")
+        return budget % 1.0
+
+    async def run(self) -> None:
+        """Poll within the budget every `tick` until `stop()`."""
+        self.running = True
+        self._stop = asyncio.Event()
+        budget = 0.0
+        while self.running:
+            started = self.clock()
+            if self.gate is None or self.gate():
+                budget = await self.poll_round(budget)
+            try:
+                await asyncio.wait_for(self._stop.wait(), max(self.tick - (self.clock() - started), 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        """End `run()` after the current round."""
+        self.running = False
+        if self._stop is not None:
+            self._stop.set()
+
+    def staleness(self, percentiles: Sequence[float] = (50, 90, 99)) -> Dict[str, Any]:
+        """Seconds since each symbol's last successful poll, as a distribution.
+
+        Never-polled symbols count from when the poller started.
+
+        Returns:
+            Overall percentiles, max and overdue count (older than twice the
+            target interval), plus count/percentiles/max per target-interval tier
+        """
+        if not self.intervals:
+            return {"symbols": 0}
+        now = self.clock()
+        symbols = list(self.intervals)
+        ages = np.array([now - self.polled_at.get(symbol, self.since) for symbol in symbols])
+        intervals = np.array([self.intervals[symbol] for symbol in symbols])
+
+        def summary(values: np.ndarray) -> Dict[str, float]:
+            points = np.percentile(values, percentiles)
+            return {**{f"p{p:g}": float(v) for p, v in zip(percentiles, points)}, "max": float(values.max())}
+
+        report: Dict[str, Any] = {
+            "symbols": len(symbols),
+            **summary(ages),
+            "overdue": int((ages > 2 * intervals).sum()),
+            "tiers": {},
+        }
+        lower = 0.0
+        for upper in STALENESS_TIERS:
+            in_tier = (intervals > lower) & (intervals <= upper)
+            if in_tier.any():
+                label = f"<={upper:g}s" if upper != math.inf else f">{lower:g}s"
+                report["tiers"][label] = {"symbols": int(in_tier.sum()), **summary(ages[in_tier])}
+            lower = upper
+        return report
+
+    def metrics(self) -> Dict[str, Any]:
+        """Requests, errors, refusals, rounds, cache counts and the staleness distribution."""
+        return {
+            "symbols": len(self.intervals),
+            "rate": self.rate,
+            "requests": self.requests,
+            "errors": self.errors,
+            "refused": self.refused,
+            "rounds": self.rounds,
+            "cache": self.cache.metrics(),
+            "staleness": self.staleness(),
+        }
+
+
+__all__ = [
+    "STALENESS_TIERS",
+    "allocate_intervals",
+    "QuotePoller",
+]
@@ -0,0 +1,226 @@
+"""Local stand-in for Finnhub's WebSocket stream, for tests and benchmarks.
+
+`StandInServer` speaks the subset of the wss://ws.finnhub.io protocol the
+ETL uses: `?token=` authentication, `subscribe` / `unsubscribe` (and their
+`-news` variants) messages, batched `trade` messages and `ping`s. Each
+connection emits `trades_per_second` random-walk trades spread over its
+subscribed symbols. `drop_connections()` cuts every client off to exercise
+reconnects.
+
+Example:
+    >>> async with StandInServer(trades_per_second=5000) as server:
+    ...     stream = FinnhubStream(symbols, tokens=["test"], url=server.url, on_trades=[ingestor.add])
+
+    $ python -m finhub_etl.realtime.standin --port 8765 --rate 20000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, Optional, Sequence, Set
+from urllib.parse import parse_qs, urlparse
+
+try:
+    from websockets.asyncio.server import serve
+    from websockets.exceptions import ConnectionClosed
+except ImportError:  # optional dependency
+    serve = None
+
+
+class StandInServer:
+    """Fake Finnhub trade stream on localhost.
+
+    Args:
+        host: Interface to bind (default: '127.0.0.1')
+        port: Port, 0 for any free port (default: 0)
+        trades_per_second: Trades emitted per connection (default: 1000)
+        tick_interval: Seconds between trade messages (default: 0.05)
+        tokens: Accepted API tokens; None accepts any (default: None)
+        max_symbols: Subscriptions allowed per connection; None for no cap
+        ping_interval: Seconds between {"type": "ping"} messages (default: 10)
+        news_interval: Seconds between news items for news subscribers (default: 1)
+        seed: Random seed for prices and symbol choice (default: None)
+
+    Raises:
+        ImportError: If websockets is not installed
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        trades_per_second: float = 1000.0,
+        tick_interval: float = 0.05,
+        tokens: Optional[Sequence[str]] = None,
+        max_symbols: Optional[int] = None,
+        ping_interval: float = 10.0,
+        news_interval: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        if serve is None:
+            raise ImportError("websockets is required for the stream stand-in: pip install finhub-etl[stream]")
+        self.host = host
+        self.port = port
+        self.trades_per_second = trades_per_second
+        self.tick_interval = tick_interval
+        self.tokens = set(tokens) if tokens is not None else None
+        self.max_symbols = max_symbols
+        self.ping_interval = ping_interval
+        self.news_interval = news_interval
+        self.rng = random.Random(seed)
+        self.prices: Dict[str, float] = {}
+        self.connections: Set[Any] = set()
+        self.subscriptions: Dict[Any, Set[str]] = {}
+        self.news_subscriptions: Dict[Any, Set[str]] = {}
+        self.accepted = self.rejected = self.subscribe_messages = self.trades_sent = 0
+        self.news_id = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        """ws:// URL of the running server."""
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self) -> "StandInServer":
+        self._server = await serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StandInServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def drop_connections(self) -> int:
+        """Close every client connection, as an outage would.
+
+        Returns:
+            Number of connections closed
+        """
+        connections = list(self.connections)
+        for connection in connections:
+            await connection.close(code=1011, reason="stand-in outage")
+        return len(connections)
+
+    def subscribed(self) -> Set[str]:
+        """Symbols subscribed on any connection."""
+        return {symbol for symbols in self.subscriptions.values() for symbol in symbols}
+
+    def _price(self, symbol: str) -> float:
+        price = self.prices.get(symbol) or self.rng.uniform(10, 500)
+        price = round(max(0.01, price * (1 + self.rng.gauss(0, 0.0005))), 4)
+        self.prices[symbol] = price
+        return price
+
+    async def _handle(self, connection) -> None:
+        query = parse_qs(urlparse(connection.request.path).query)
+        token = (query.get("token") or [None])[0]
+        if self.tokens is not None and token not in self.tokens:
+            self.rejected += 1
+            await connection.send(json.dumps({"type": "error", "msg": "Invalid API key"}))
+            await connection.close(code=1008, reason="invalid token")
+            return
+
+        self.accepted += 1
+        self.connections.add(connection)
+        symbols = self.subscriptions[connection] = set()
+        news = self.news_subscriptions[connection] = set()
+        emitter = asyncio.create_task(self._emit(connection, symbols, news))
+        try:
+            async for message in connection:
+                request = json.loads(message)
+                kind, symbol = request.get("type"), request.get("symbol")
+                target = news if kind in ("subscribe-news", "unsubscribe-news") else symbols
+                if kind in ("subscribe", "subscribe-news"):
+                    self.subscribe_messages += 1
+                    if self.max_symbols is not None and kind == "subscribe" and len(symbols) >= self.max_symbols:
+                        await connection.send(json.dumps({"type": "error", "msg": "Subscription limit reached"}))
+                        continue
+                    target.add(symbol)
+                elif kind in ("unsubscribe", "unsubscribe-news"):
+                    target.discard(symbol)
+        except ConnectionClosed:
+            pass
+        finally:
+            emitter.cancel()
+            self.connections.discard(connection)
+            self.subscriptions.pop(connection, None)
+            self.news_subscriptions.pop(connection, None)
+
+    async def _emit(self, connection, symbols: Set[str], news: Set[str]) -> None:
+        per_tick = self.trades_per_second * self.tick_interval
+        carry = 0.0
+        last_ping = last_news = time.monotonic()
+        try:
+            while True:
+                await asyncio.sleep(self.tick_interval)
+                now = time.monotonic()
+                if symbols:
+                    carry += per_tick
+                    count, carry = int(carry), carry - int(carry)
+                    stamp = int(time.time() * 1000)
+                    pool = list(symbols)
+                    data = [
+                        {"s": symbol, "p": self._price(symbol), "t": stamp, "v": self.rng.randint(1, 500), "c": None}
+                        for symbol in (self.rng.choice(pool) for _ in range(count))
+                    ]
+                    if data:
+                        await connection.send(json.dumps({"type": "trade", "data": data}))
+                        self.trades_sent += len(data)
+                if news and now - last_news >= self.news_interval:
+                    last_news = now
+                    symbol = self.rng.choice(list(news))
+                    self.news_id += 1
+                    await connection.send(json.dumps({"type": "news", "data": [{
+                        "id": self.news_id, "datetime": int(time.time()), "headline": f"{symbol} stand-in story",
+                        "related": symbol, "source": "stand-in", "category": "company", "summary": "", "url": "",
+                    }]}))
+                if now - last_ping >= self.ping_interval:
+                    last_ping = now
+                    await connection.send('{"type":"ping"}')
+        except ConnectionClosed:
+            pass
+
+    def metrics(self) -> Dict[str, int]:
+        """Connections, subscriptions and trades sent."""
+        return {
+            "connections": len(self.connections),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "subscribed": len(self.subscribed()),
+            "subscribe_messages": self.subscribe_messages,
+            "trades_sent": self.trades_sent,
+        }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a local stand-in for Finnhub's trade stream")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=1000.0, help="trades per second per connection")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        async with StandInServer(args.host, args.port, trades_per_second=args.rate) as server:
+            print(f"✅ Stand-in stream listening on {server.url}")
+            await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = [
+    "StandInServer",
+]
@@ -0,0 +1,297 @@
+"""Finnhub WebSocket trade (and news) stream.
+
+`FinnhubStream` keeps `wss://ws.finnhub.io` connections open for any number
+of symbols. Symbols are sharded over connections of at most
+`symbols_per_connection` subscriptions each, and the shards take turns over
+the given API tokens, so more keys mean more connections. Each connection
+reconnects with jittered exponential backoff and replays its subscriptions
+on every reconnect. Symbols can be added or dropped while running.
+
+Trades are decoded into compact `Tick` tuples and handed in batches, one
+per message, to the `on_trades` callbacks (e.g. `TickIngestor.add`).
+Callbacks run on the event loop and must only buffer, never block.
+
+Requires the optional `websockets` package (pip install finhub-etl[stream]).
+
+Example:
+    >>> ingestor = TickIngestor()
+    >>> stream = FinnhubStream(symbols, tokens=[api_key], on_trades=[ingestor.add])
+    >>> await asyncio.gather(stream.run(), ingestor.run())
+"""
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+from ..config.decoders import get_decoder
+
+try:
+    from websockets.asyncio.client import connect
+    from websockets.exceptions import ConnectionClosed, InvalidHandshake, InvalidURI
+except ImportError:  # optional dependency
+    connect = None
+
+WS_URL = "wss://ws.finnhub.io"
+
+
+class Tick(NamedTuple):
+    """One trade: symbol, price, volume and UNIX ms timestamp."""
+
+    symbol: str
+    price: float
+    volume: float
+    timestamp: int
+
+
+TradeCallback = Callable[[List[Tick]], Any]
+NewsCallback = Callable[[List[Dict[str, Any]]], Any]
+
+
+class _Shard:
+    """One connection and the symbols subscribed on it."""
+
+    def __init__(self, index: int, token: str):
+        self.index = index
+        self.token = token
+        self.symbols: Set[str] = set()
+        self.ws = None
+        self.task: Optional[asyncio.Task] = None
+        self.connects = 0
+
+
+class FinnhubStream:
+    """Sharded, self-healing subscription to Finnhub's trade stream.
+
+    Args:
+        symbols: Symbols to subscribe to initially
+        tokens: API keys; shard i connects with tokens[i % len(tokens)]
+        url: Stream URL (default: wss://ws.finnhub.io; a `StandInServer`'s url in tests)
+        symbols_per_connection: Subscriptions per connection (default: 50,
+            Finnhub's free-plan cap)
+        on_trades: Callbacks receiving each message's trades as a list of `Tick`
+        on_news: Callbacks receiving streamed news records; subscribes to news
+            for every symbol when given (default: none)
+        reconnect_min: First reconnect delay in seconds (default: 1)
+        reconnect_max: Longest reconnect delay in seconds (default: 60)
+        subscribe_rate: Subscribe messages per second per connection, so a
+            resubscribe burst is not dropped (default: 100)
+
+    Raises:
+        ImportError: If websockets is not installed
+        ValueError: If no tokens are given
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = (),
+        tokens: Sequence[str] = (),
+        url: str = WS_URL,
+        symbols_per_connection: int = 50,
+        on_trades: Sequence[TradeCallback] = (),
+        on_news: Sequence[NewsCallback] = (),
+        reconnect_min: float = 1.0,
+        reconnect_max: float = 60.0,
+        subscribe_rate: float = 100.0,
+    ):
+        if connect is None:
+            raise ImportError("websockets is required for streaming: pip install finhub-etl[stream]")
+        if not tokens:
+            raise ValueError("FinnhubStream needs at least one API token")
+        self.tokens = list(tokens)
+        self.url = url
+        self.symbols_per_connection = symbols_per_connection
+        self.on_trades = list(on_trades)
+        self.on_news = list(on_news)
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self.subscribe_rate = subscribe_rate
+        self.decoder = get_decoder()
+        self.shards: List[_Shard] = []
+        self._shard_of: Dict[str, _Shard] = {}
+        self.running = False
+        self._done: Optional[asyncio.Event] = None
+        self._error: Optional[BaseException] = None
+        self.messages = 0
+        self.trades = 0
+        self.reconnects = 0
+        self.subscribe(symbols)
+
+    def _new_shard(self) -> _Shard:
+        shard = _Shard(len(self.shards), self.tokens[len(self.shards) % len(self.tokens)])
+        self.shards.append(shard)
+        if self.running:
+            self._start(shard)
+        return shard
+
+    @property
+    def symbols(self) -> Set[str]:
+        """Every subscribed symbol."""
+        return set(self._shard_of)
+
+    def subscribe(self, symbols: Iterable[str]) -> int:
+        """Subscribe to more symbols, on the least loaded connection with room.
+
+        Returns:
+            Number of newly subscribed symbols
+        """
+        added = 0
+        for symbol in symbols:
+            if symbol in self._shard_of:
+                continue
+            open_shards = [shard for shard in self.shards if len(shard.symbols) < self.symbols_per_connection]
+            shard = min(open_shards, key=lambda s: len(s.symbols)) if open_shards else self._new_shard()
+            shard.symbols.add(symbol)
+            self._shard_of[symbol] = shard
+            added += 1
+            if shard.ws is not None:
+                self._send(shard, self._messages("subscribe", [symbol]))
+        return added
+
+    def unsubscribe(self, symbols: Iterable[str]) -> int:
+        """Drop symbols from their connections.
+
+        Returns:
+            Number of symbols unsubscribed
+        """
+        removed = 0
+        for symbol in symbols:
+            shard = self._shard_of.pop(symbol, None)
+            if shard is None:
+                continue
+            shard.symbols.discard(symbol)
+            removed += 1
+            if shard.ws is not None:
+                self._send(shard, self._messages("unsubscribe", [symbol]))
+        return removed
+
+    def _messages(self, action: str, symbols: Iterable[str]) -> List[str]:
+        kinds = [action] + ([f"{action}-news"] if self.on_news else [])
+        return [json.dumps({"type": kind, "symbol": symbol}) for symbol in symbols for kind in kinds]
+
+    def _send(self, shard: _Shard, messages: List[str]) -> None:
+        ws = shard.ws
+
+        async def send():
+            try:
+                for message in messages:
+                    await ws.send(message)
+            except ConnectionClosed:
+                pass  # the reconnect replays every subscription
+
+        asyncio.get_running_loop().create_task(send())
+
+    async def _resubscribe(self, shard: _Shard, ws) -> None:
+        pause = 1.0 / self.subscribe_rate if self.subscribe_rate else 0.0
+        try:
+            for message in self._messages("subscribe", sorted(shard.symbols)):
+                await ws.send(message)
+                if pause:
+                    await asyncio.sleep(pause)
+        except ConnectionClosed:
+            pass  # retried on the next connection
+
+    def _handle(self, message: Any) -> None:
+        self.messages += 1
+        payload = self.decoder.decode(message if isinstance(message, bytes) else message.encode())
+        kind = payload.get("type")
+        if kind == "trade":
+            ticks = [Tick(t["s"], t["p"], t.get("v") or 0.0, t["t"]) for t in payload.get("data") or ()]
+            self.trades += len(ticks)
+            for callback in self.on_trades:
+                callback(ticks)
+        elif kind == "news":
+            for callback in self.on_news:
+                callback(payload.get("data") or [])
+        elif kind == "error":
+            print(f"⚠️ Stream error: {payload.get('msg')}")
+
+    async def _run_shard(self, shard: _Shard) -> None:
+        delay = self.reconnect_min
+        while self.running:
+            connected_at = None
+            try:
+                async with connect(f"{self.url}?token={shard.token}", max_size=None) as ws:
+                    connected_at = time.monotonic()
+                    shard.connects += 1
+                    shard.ws = ws
+                    resubscribe = asyncio.create_task(self._resubscribe(shard, ws))
+                    try:
+                        async for message in ws:
+                            self._handle(message)
+                    finally:
+                        resubscribe.cancel()
+            except (OSError, asyncio.TimeoutError, ConnectionClosed, InvalidHandshake, InvalidURI) as exc:
+                if self.running:
+                    print(f"⚠️ Stream connection {shard.index} lost: {exc!r}")
+            finally:
+                shard.ws = None
+            if not self.running:
+                break
+            if connected_at is not None and time.monotonic() - connected_at > self.reconnect_max:
+                delay = self.reconnect_min
+            self.reconnects += 1
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, self.reconnect_max)
+
+    def _start(self, shard: _Shard) -> None:
+        shard.task = asyncio.create_task(self._run_shard(shard))
+        shard.task.add_done_callback(self._shard_done)
+
+    def _shard_done(self, task: asyncio.Task) -> None:
+        # Network errors are retried inside the task; anything else ends the stream
+        if not task.cancelled() and task.exception() is not None and self._done is not None:
+            self._error = self._error or task.exception()
+            self._done.set()
+
+    async def run(self) -> None:
+        """Stream until `stop()` is called.
+
+        Raises:
+            Exception: Whatever a connection task or trade callback raised
+        """
+        self.running = True
+        self._done = asyncio.Event()
+        self._error = None
+        for shard in self.shards:
+            self._start(shard)
+        try:
+            await self._done.wait()
+            if self._error is not None:
+                raise self._error
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Close every connection and end `run()`."""
+        self.running = False
+        if self._done is not None:
+            self._done.set()
+        for shard in self.shards:
+            if shard.ws is not None:
+                await shard.ws.close()
+        tasks = [shard.task for shard in self.shards if shard.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for shard in self.shards:
+            shard.task = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Connections, subscriptions, reconnects and message/trade counts."""
+        return {
+            "connections": sum(shard.ws is not None for shard in self.shards),
+            "shards": len(self.shards),
+            "symbols": sum(len(shard.symbols) for shard in self.shards),
+            "reconnects": self.reconnects,
+            "messages": self.messages,
+            "trades": self.trades,
+        }
+
+
+__all__ = [
+    "WS_URL",
+    "Tick",
+    "FinnhubStream",
+]
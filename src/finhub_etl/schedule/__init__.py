@@ -0,0 +1,25 @@
+from .calendar import EXCHANGE_SESSIONS, MarketCalendar
+from .scheduler import (
+    Cadence,
+    Interval,
+    AfterClose,
+    Daily,
+    Weekly,
+    ScheduledJob,
+    Scheduler,
+)
+
+__all__ = [
+    # Market calendar
+    "EXCHANGE_SESSIONS",
+    "MarketCalendar",
+    # Cadences
+    "Cadence",
+    "Interval",
+    "AfterClose",
+    "Daily",
+    "Weekly",
+    # Scheduler
+    "ScheduledJob",
+    "Scheduler",
+]
@@ -0,0 +1,185 @@
+"""Exchange trading calendar built from MarketHoliday and MarketStatus.
+
+`MarketCalendar` knows an exchange's regular session hours, its holidays
+(full closures) and half-days (a MarketHoliday row with `trading_hour`,
+e.g. '09:30-13:00'). Holidays come from the `market_holidays` table; the
+live `/stock/market-status` payload can be fed in with `update_status` and
+overrides the computed answer to "is the market open now" while it is
+fresh, so unscheduled closures are honoured too.
+
+All datetimes are timezone-aware; session boundaries are computed in the
+exchange's local time zone, so DST changes need no special handling.
+
+Example:
+    >>> calendar = await MarketCalendar.load("US")
+    >>> calendar.is_open(datetime.now(timezone.utc))
+    True
+    >>> calendar.next_session(datetime.now(timezone.utc))
+    (datetime(2024, 12, 26, 9, 30, tzinfo=...), datetime(2024, 12, 26, 16, 0, tzinfo=...))
+"""
+
+import time as clock
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..models import MarketHoliday
+
+# Exchange -> (time zone, regular open, regular close)
+EXCHANGE_SESSIONS: Dict[str, Tuple[str, time, time]] = {
+    "US": ("America/New_York", time(9, 30), time(16, 0)),
+    "L": ("Europe/London", time(8, 0), time(16, 30)),
+    "DE": ("Europe/Berlin", time(9, 0), time(17, 30)),
+    "T": ("Asia/Tokyo", time(9, 0), time(15, 0)),
+    "HK": ("Asia/Hong_Kong", time(9, 30), time(16, 0)),
+    "TO": ("America/Toronto", time(9, 30), time(16, 0)),
+}
+
+Session = Tuple[datetime, datetime]
+
+
+def _parse_hours(trading_hour: str) -> Optional[Tuple[time, time]]:
+    """'09:30-13:00' -> (09:30, 13:00); None if unparseable."""
+    try:
+        start, end = trading_hour.split("-")
+        return time.fromisoformat(start.strip()), time.fromisoformat(end.strip())
+    except ValueError:
+        return None
+
+
+class MarketCalendar:
+    """Trading sessions of one exchange.
+
+    Args:
+        exchange: Exchange code (default: 'US')
+        timezone: IANA time zone (default: from EXCHANGE_SESSIONS)
+        open_time: Regular session open, local time (default: from EXCHANGE_SESSIONS)
+        close_time: Regular session close, local time (default: from EXCHANGE_SESSIONS)
+        holidays: Date -> trading hours; '' (or None) for a full closure,
+            e.g. '09:30-13:00' for a half-day (default: none)
+        status_ttl: Seconds a live market status overrides the calendar (default: 300)
+    """
+
+    def __init__(
+        self,
+        exchange: str = "US",
+        timezone: Optional[str] = None,
+        open_time: Optional[time] = None,
+        close_time: Optional[time] = None,
+        holidays: Optional[Dict[date, Optional[str]]] = None,
+        status_ttl: float = 300.0,
+    ):
+        default_zone, default_open, default_close = EXCHANGE_SESSIONS.get(exchange, EXCHANGE_SESSIONS["US"])
+        self.exchange = exchange
+        self.zone = ZoneInfo(timezone or default_zone)
+        self.open_time = open_time or default_open
+        self.close_time = close_time or default_close
+        self.holidays: Dict[date, Optional[str]] = dict(holidays or {})
+        self.status_ttl = status_ttl
+        self.status: Optional[Dict[str, Any]] = None
+        self._status_at = 0.0
+
+    @classmethod
+    async def load(cls, exchange: str = "US", engine: Optional[AsyncEngine] = None, **kwargs: Any) -> "MarketCalendar":
+        """Build a calendar from the exchange's `market_holidays` rows."""
+        calendar = cls(exchange, **kwargs)
+        await calendar.refresh(engine)
+        return calendar
+
+    async def refresh(self, engine: Optional[AsyncEngine] = None) -> int:
+        """Reload holidays from `market_holidays`.
+
+        Returns:
+            Number of holiday rows loaded
+        """
+        if engine is None:
+            from ..database import engine
+
+        c = MarketHoliday.__table__.c
+        async with engine.connect() as conn:
+            rows = (await conn.execute(
+                select(c.date, c.trading_hour, c.timezone).where(c.exchange == self.exchange)
+            )).all()
+
+        self.holidays = {date.fromisoformat(day): trading_hour or None for day, trading_hour, _ in rows}
+        zones = {zone for _, _, zone in rows if zone}
+        if len(zones) == 1:
+            self.zone = ZoneInfo(zones.pop())
+        return len(rows)
+
+    def update_status(self, status: Dict[str, Any]) -> None:
+        """Record a live /stock/market-status payload (isOpen, session, holiday)."""
+        self.status = status
+        self._status_at = clock.monotonic()
+
+    def is_holiday(self, day: date) -> bool:
+        """Full closure on a weekday."""
+        return day in self.holidays and not self.holidays[day]
+
+    def is_half_day(self, day: date) -> bool:
+        """Shortened session (holiday row with trading hours)."""
+        return bool(self.holidays.get(day))
+
+    def is_trading_day(self, day: date, half_days: bool = True) -> bool:
+        """Weekday that is not a holiday (nor a half-day, unless `half_days`)."""
+        if day.weekday() >= 5 or self.is_holiday(day):
+            return False
+        return half_days or not self.is_half_day(day)
+
+    def session(self, day: date) -> Optional[Session]:
+        """(open, close) of a day's session as aware datetimes, None if closed."""
+        if not self.is_trading_day(day):
+            return None
+        open_time, close_time = self.open_time, self.close_time
+        if self.is_half_day(day):
+            open_time, close_time = _parse_hours(self.holidays[day]) or (open_time, close_time)
+        return (
+            datetime.combine(day, open_time, tzinfo=self.zone),
+            datetime.combine(day, close_time, tzinfo=self.zone),
+        )
+
+    def local_date(self, at: datetime) -> date:
+        """Exchange-local date of an aware datetime."""
+        return at.astimezone(self.zone).date()
+
+    def next_session(self, after: datetime, half_days: bool = True, horizon: int = 30) -> Optional[Session]:
+        """First session that has not closed by `after`.
+
+        Args:
+            after: Aware datetime
+            half_days: Consider half-day sessions (default: True)
+            horizon: Days to search ahead (default: 30)
+
+        Returns:
+            (open, close), where open may already have passed, or None
+        """
+        day = self.local_date(after)
+        for offset in range(horizon):
+            current = day + timedelta(days=offset)
+            if not self.is_trading_day(current, half_days):
+                continue
+            session = self.session(current)
+            if session[1] > after:
+                return session
+        return None
+
+    def is_open(self, at: datetime) -> bool:
+        """Whether the regular session is open at `at`.
+
+        For times near the present, a live status recorded within
+        `status_ttl` seconds takes precedence.
+        """
+        live = abs((at - datetime.now(timezone.utc)).total_seconds()) < 60
+        if live and self.status is not None and clock.monotonic() - self._status_at < self.status_ttl:
+            return bool(self.status.get("isOpen", self.status.get("is_open")))
+        session = self.session(self.local_date(at))
+        return session is not None and session[0] <= at < session[1]
+
+
+__all__ = [
+    "EXCHANGE_SESSIONS",
+    "MarketCalendar",
+]
@@ -0,0 +1,253 @@
+"""Async scheduler for recurring ETL jobs, gated on the market calendar.
+
+Each `ScheduledJob` pairs an async callable with a cadence:
+
+    Interval(15)                    every 15 s, only while the session is open
+    Interval(300, session=False)    every 5 min, around the clock
+    AfterClose(minutes=30)          once per trading day, 30 min after the close
+    Daily(time(6, 0))               every trading day at 06:00 exchange time
+    Weekly(5, time(8, 0))           Saturdays at 08:00 exchange time
+
+Session-bound cadences skip weekends and holidays from `MarketCalendar`, and
+half-days too unless the job sets `half_days=True`. Start times get a
+random `jitter` so jobs sharing a cadence don't hit the API in the same
+second; the jitter never accumulates into the schedule. A job still running
+when it comes due again is skipped rather than stacked.
+
+Example:
+    >>> calendar = await MarketCalendar.load("US")
+    >>> scheduler = Scheduler(calendar, [
+    ...     ScheduledJob("quotes", poll_quotes, Interval(15), jitter=2),
+    ...     ScheduledJob("candles", load_daily_candles, AfterClose(minutes=30), jitter=300),
+    ... ])
+    >>> await scheduler.run()
+"""
+
+import asyncio
+import heapq
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .calendar import MarketCalendar
+
+
+class Cadence:
+    """When a job runs. Subclasses implement `next_after`."""
+
+    def next_after(self, after: datetime, calendar: MarketCalendar, half_days: bool) -> Optional[datetime]:
+        """First run time strictly after `after`, or None if there is none."""
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class Interval(Cadence):
+    """Every `seconds`; while the session is open unless `session` is False."""
+
+    seconds: float
+    session: bool = True
+
+    def next_after(self, after: datetime, calendar: MarketCalendar, half_days: bool) -> Optional[datetime]:
+        candidate = after + timedelta(seconds=self.seconds)
+        if not self.session:
+            return candidate
+        upcoming = calendar.next_session(candidate, half_days)
+        if upcoming is None:
+            return None
+        return max(candidate, upcoming[0])
+
+
+@dataclass(frozen=True)
+class AfterClose(Cadence):
+    """Once per trading day, `minutes` after the session closes."""
+
+    minutes: float = 15.0
+
+    def next_after(self, after: datetime, calendar: MarketCalendar, half_days: bool) -> Optional[datetime]:
+        delay = timedelta(minutes=self.minutes)
+        upcoming = calendar.next_session(after - delay, half_days)
+        while upcoming is not None:
+            run = upcoming[1] + delay
+            if run > after:
+                return run
+            upcoming = calendar.next_session(upcoming[1] + timedelta(seconds=1), half_days)
+        return None
+
+
+@dataclass(frozen=True)
+class Daily(Cadence):
+    """Every day at a local exchange time; only trading days unless `trading_days` is False."""
+
+    at: time
+    trading_days: bool = True
+
+    def next_after(self, after: datetime, calendar: MarketCalendar, half_days: bool) -> Optional[datetime]:
+        day = calendar.local_date(after)
+        for offset in range(31):
+            current = day + timedelta(days=offset)
+            run = datetime.combine(current, self.at, tzinfo=calendar.zone)
+            if run <= after:
+                continue
+            if not self.trading_days or calendar.is_trading_day(current, half_days):
+                return run
+        return None
+
+
+@dataclass(frozen=True)
+class Weekly(Cadence):
+    """Every week on `weekday` (0 = Monday) at a local exchange time."""
+
+    weekday: int
+    at: time
+
+    def next_after(self, after: datetime, calendar: MarketCalendar, half_days: bool) -> Optional[datetime]:
+        day = calendar.local_date(after)
+        for offset in range(8):
+            current = day + timedelta(days=offset)
+            run = datetime.combine(current, self.at, tzinfo=calendar.zone)
+            if current.weekday() == self.weekday and run > after:
+                return run
+        return None
+
+
+@dataclass
+class ScheduledJob:
+    """A recurring job.
+
+    Args:
+        name: Job name used in logs and stats
+        func: Async callable run with no arguments
+        cadence: When to run it
+        jitter: Up to this many seconds of random delay per run (default: 0)
+        half_days: Run session-bound cadences on half-days too (default: False)
+        run_at_start: Also run once when the scheduler starts (default: False)
+    """
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    cadence: Cadence
+    jitter: float = 0.0
+    half_days: bool = False
+    run_at_start: bool = False
+    runs: int = field(default=0, init=False)
+    skipped: int = field(default=0, init=False)
+    failures: int = field(default=0, init=False)
+    last_run: Optional[datetime] = field(default=None, init=False)
+
+    def next_after(self, after: datetime, calendar: MarketCalendar) -> Optional[datetime]:
+        return self.cadence.next_after(after, calendar, self.half_days)
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Scheduler:
+    """Run `ScheduledJob`s on their cadences.
+
+    Args:
+        calendar: Market calendar the cadences consult
+        jobs: Initial jobs (more can be added with `add`)
+        clock: Returns the current aware datetime (default: UTC now)
+        rng: Random source for jitter (default: a fresh `random.Random`)
+    """
+
+    def __init__(
+        self,
+        calendar: MarketCalendar,
+        jobs: Sequence[ScheduledJob] = (),
+        clock: Callable[[], datetime] = utc_now,
+        rng: Optional[random.Random] = None,
+    ):
+        self.calendar = calendar
+        self.jobs: List[ScheduledJob] = []
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._queue: List[Tuple[datetime, int, datetime, ScheduledJob]] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._sequence = 0
+        self._stop = asyncio.Event()
+        for job in jobs:
+            self.add(job)
+
+    def _push(self, job: ScheduledJob, base: Optional[datetime]) -> None:
+        if base is None:
+            print(f"⚠️ {job.name}: no upcoming run within the calendar horizon")
+            return
+        due = base + timedelta(seconds=self.rng.uniform(0, job.jitter)) if job.jitter else base
+        self._sequence += 1
+        heapq.heappush(self._queue, (due, self._sequence, base, job))
+
+    def add(self, job: ScheduledJob) -> None:
+        """Schedule a job from now."""
+        self.jobs.append(job)
+        now = self.clock()
+        self._push(job, now if job.run_at_start else job.next_after(now, self.calendar))
+
+    def upcoming(self) -> List[Tuple[str, datetime]]:
+        """(job name, due time) of every queued run, soonest first."""
+        return [(job.name, due) for due, _, _, job in sorted(self._queue)]
+
+    async def _execute(self, job: ScheduledJob) -> None:
+        try:
+            await job.func()
+        except Exception as exc:
+            job.failures += 1
+            print(f"❌ {job.name} failed: {exc!r}")
+        finally:
+            self._running.pop(job.name, None)
+
+    def _dispatch(self, job: ScheduledJob, now: datetime) -> None:
+        if job.name in self._running:
+            job.skipped += 1
+            print(f"⚠️ {job.name}: previous run still in progress, skipping")
+            return
+        job.runs += 1
+        job.last_run = now
+        self._running[job.name] = asyncio.create_task(self._execute(job), name=f"schedule:{job.name}")
+
+    def stop(self) -> None:
+        """Make `run` return, cancelling in-flight runs."""
+        self._stop.set()
+
+    async def run(self, until: Optional[datetime] = None) -> None:
+        """Run jobs as they come due until `stop()` is called or `until` passes."""
+        self._stop.clear()
+        try:
+            while self._queue and not self._stop.is_set():
+                due, _, base, job = self._queue[0]
+                if until is not None and due > until:
+                    break
+                delay = (due - self.clock()).total_seconds()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._stop.wait(), timeout=delay)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                heapq.heappop(self._queue)
+                now = self.clock()
+                self._dispatch(job, now)
+                # Reschedule from the unjittered slot; after a stall, from now (no catch-up burst)
+                self._push(job, job.next_after(max(base, now - timedelta(seconds=job.jitter)), self.calendar))
+        finally:
+            # stop() cancels in-flight runs; reaching `until` lets them finish
+            tasks = list(self._running.values())
+            if self._stop.is_set():
+                for task in tasks:
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+__all__ = [
+    "Cadence",
+    "Interval",
+    "AfterClose",
+    "Daily",
+    "Weekly",
+    "ScheduledJob",
+    "Scheduler",
+]
@@ -0,0 +1,35 @@
+from .candle_cache import CACHE_DTYPES, CandleCache, sync_candle_cache
+from .archive import (
+    ArchiveWriter,
+    archive_files,
+    default_compression,
+    iter_archive,
+    iter_archive_batches,
+    replay_archive,
+)
+from .lake import LakeEntry, RawLake, rebuild
+from .export import DATE_GRANULARITY, arrow_schema, date_column, export_table, json_columns
+
+__all__ = [
+    # Candle cache
+    "CACHE_DTYPES",
+    "CandleCache",
+    "sync_candle_cache",
+    # NDJSON archives
+    "ArchiveWriter",
+    "archive_files",
+    "default_compression",
+    "iter_archive",
+    "iter_archive_batches",
+    "replay_archive",
+    # Raw-response lake
+    "LakeEntry",
+    "RawLake",
+    "rebuild",
+    # Parquet export
+    "DATE_GRANULARITY",
+    "arrow_schema",
+    "json_columns",
+    "date_column",
+    "export_table",
+]
@@ -0,0 +1,309 @@
+"""Streaming, compressed NDJSON archives of API records.
+
+`ArchiveWriter` appends records as compact JSON lines to a gzip or zstd
+stream and rotates to a new file by size or age. Files are written as
+`<name>.part` and renamed when closed, so a directory listing only ever
+shows complete archives:
+
+    <directory>/<prefix>-20240102T093000-0000-5f2c9a1e.ndjson.zst
+
+The last part of the name is a random id per writer, so writers sharing a
+directory and prefix (several processes, or several instances) never
+collide on a name.
+
+From async code use `write_many_async`, which serializes and compresses
+on a worker thread instead of the event loop.
+
+`iter_archive` reads them back lazily, one record at a time, oldest file
+first by the timestamp in its name, and `replay_archive` feeds them through
+`BulkWriter` to rebuild a table without calling the API, reading and
+decompressing on a worker thread.
+
+zstd needs the optional `zstandard` package (`pip install finhub-etl[archive]`);
+gzip works out of the box.
+
+Example:
+    >>> with ArchiveWriter("archives/company_news", prefix="company_news") as archive:
+    ...     archive.write_many(await get_company_news("AAPL", "2024-01-01", "2024-01-31"))
+    >>> await replay_archive("archives/company_news", CompanyNews)
+    1520
+"""
+
+import asyncio
+import gzip
+import io
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Type, Union
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel
+
+from ..loaders import BulkWriter
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+EXTENSIONS = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+# <prefix>-<YYYYmmddTHHMMSS>-<sequence>[-<writer id>].ndjson.*
+_FILE_STAMP = re.compile(r"-(\d{8}T\d{6})-(\d+)(?:-([0-9a-f]+))?\.ndjson\.")
+
+PathLike = Union[str, Path]
+
+
+def _dumps(record: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def default_compression() -> str:
+    """'zstd' when zstandard is installed, else 'gzip'."""
+    return "zstd" if zstandard is not None else "gzip"
+
+
+class ArchiveWriter:
+    """Append records to rotating, compressed NDJSON files.
+
+    Args:
+        directory: Directory for the archive files
+        prefix: File name prefix, e.g. the dataset name (default: 'archive')
+        compression: 'zstd' or 'gzip' (default: zstd when available)
+        level: Compression level (default: 3 for zstd, 6 for gzip)
+        max_bytes: Rotate once a file holds this many uncompressed bytes; the
+            compressors buffer, so on-disk size lags (default: 1 GiB)
+        max_seconds: Rotate once a file is this old, None to disable (default: 3600)
+
+    Raises:
+        ValueError: If the compression is unknown
+        ImportError: If zstd is requested without zstandard installed
+    """
+
+    def __init__(
+        self,
+        directory: PathLike,
+        prefix: str = "archive",
+        compression: Optional[str] = None,
+        level: Optional[int] = None,
+        max_bytes: int = 1024 * 1024 * 1024,
+        max_seconds: Optional[float] = 3600,
+    ):
+        compression = compression or default_compression()
+        if compression not in EXTENSIONS:
+            raise ValueError(f"compression must be one of {tuple(EXTENSIONS)}, got '{compression}'")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstandard is required for zstd archives: pip install finhub-etl[archive]")
+
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.compression = compression
+        self.level = level if level is not None else (3 if compression == "zstd" else 6)
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.files: List[Path] = []
+        self.records = 0
+
+        self._raw: Optional[IO[bytes]] = None
+        self._stream: Optional[IO[bytes]] = None
+        self._path: Optional[Path] = None
+        self._opened = 0.0
+        self._size = 0
+        self._sequence = 0
+        self._id = uuid.uuid4().hex[:8]
+        # `write_many_async` calls run on worker threads
+        self._lock = threading.Lock()
+
+    def _open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self._path = self.directory / f"{self.prefix}-{stamp}-{self._sequence:04d}-{self._id}{EXTENSIONS[self.compression]}"
+        self._sequence += 1
+        self._raw = open(f"{self._path}.part", "wb")
+        if self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor(level=self.level).stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=self.level)
+        self._opened = time.monotonic()
+        self._size = 0
+
+    def _due(self) -> bool:
+        if self._size >= self.max_bytes:
+            return True
+        return self.max_seconds is not None and time.monotonic() - self._opened >= self.max_seconds
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append one record."""
+        self.write_many([record])
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Append records in one compressed write.
+
+        Returns:
+            Number of records written
+        """
+        lines = [_dumps(record) for record in records]
+        if not lines:
+            return 0
+        data = b"\n".join(lines) + b"\n"
+        with self._lock:
+            if self._stream is None:
+                self._open()
+            elif self._due():
+                self._rotate()
+                self._open()
+            self._stream.write(data)
+            self._size += len(data)
+            self.records += len(lines)
+        return len(lines)
+
+    async def write_many_async(self, records: Iterable[Dict[str, Any]]) -> int:
+        """`write_many` on a worker thread, keeping compression off the event loop.
+
+        Returns:
+            Number of records written
+        """
+        return await asyncio.to_thread(self.write_many, list(records))
+
+    def rotate(self) -> Optional[Path]:
+        """Close the current file and publish it; the next write opens a new one.
+
+        Returns:
+            Path of the finished file, or None if nothing was open
+        """
+        with self._lock:
+            return self._rotate()
+
+    def _rotate(self) -> Optional[Path]:
+        if self._stream is None:
+            return None
+        self._stream.close()
+        self._raw.close()
+        os.replace(f"{self._path}.part", self._path)
+        self.files.append(self._path)
+        path, self._stream, self._raw, self._path = self._path, None, None, None
+        return path
+
+    def close(self) -> None:
+        """Flush and publish the current file."""
+        self.rotate()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _file_order(path: Path) -> tuple:
+    # Files named by ArchiveWriter sort by their UTC stamp and sequence, whatever the prefix;
+    # the writer id keeps files of concurrent writers in the same second in a fixed order
+    match = _FILE_STAMP.search(path.name)
+    if match is None:
+        return ("", 0, "", path.name)
+    return (match.group(1), int(match.group(2)), match.group(3) or "", path.name)
+
+
+def archive_files(source: PathLike, prefix: str = "") -> List[Path]:
+    """Completed archive files under `source` (a file or directory), oldest first.
+
+    Files are ordered by the timestamp and sequence number in their names,
+    not by name, so archives of several prefixes interleave in write order.
+    """
+    source = Path(source)
+    if source.is_file():
+        return [source]
+    return sorted(
+        (path for path in source.glob(f"{prefix}*") if path.name.endswith(tuple(EXTENSIONS.values()))),
+        key=_file_order,
+    )
+
+
+def _open_lines(path: Path) -> IO[bytes]:
+    if path.name.endswith(EXTENSIONS["zstd"]):
+        if zstandard is None:
+            raise ImportError("zstandard is required to read zstd archives: pip install finhub-etl[archive]")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+    return gzip.open(path, "rb")
+
+
+def iter_archive(source: PathLike, prefix: str = "") -> Iterator[Dict[str, Any]]:
+    """Lazily yield records from an archive file or directory.
+
+    Args:
+        source: Archive file, or directory of archives read oldest first
+        prefix: Only read files whose name starts with this prefix (default: all)
+
+    Yields:
+        Records in write order
+    """
+    for path in archive_files(source, prefix):
+        with _open_lines(path) as lines:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def iter_archive_batches(source: PathLike, batch_size: int = 5000, prefix: str = "") -> Iterator[List[Dict[str, Any]]]:
+    """`iter_archive` grouped into lists of up to `batch_size` records."""
+    batch: List[Dict[str, Any]] = []
+    for record in iter_archive(source, prefix):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def replay_archive(
+    source: PathLike,
+    model: Type[SQLModel],
+    prefix: str = "",
+    batch_size: int = 5000,
+    on_conflict: str = "update",
+    engine: Optional[AsyncEngine] = None,
+) -> int:
+    """Load archived records into a table through `BulkWriter`.
+
+    Args:
+        source: Archive file or directory
+        model: SQLModel table the records belong to
+        prefix: Only replay files whose name starts with this prefix (default: all)
+        batch_size: Records per INSERT (default: 5000)
+        on_conflict: Primary-key conflict policy, see `build_insert` (default: 'update')
+        engine: Async engine (default: finhub_etl.database.engine)
+
+    Returns:
+        Number of rows written
+    """
+    writer = BulkWriter(model, batch_size=batch_size, on_conflict=on_conflict, engine=engine)
+    batches = iter_archive_batches(source, batch_size, prefix)
+    # Decompression and parsing run on a worker thread, one batch at a time
+    while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+        await writer.write(batch)
+    print(f"Replayed {writer.written} {model.__name__} records from {source}")
+    return writer.written
+
+
+__all__ = [
+    "ArchiveWriter",
+    "archive_files",
+    "default_compression",
+    "iter_archive",
+    "iter_archive_batches",
+    "replay_archive",
+]
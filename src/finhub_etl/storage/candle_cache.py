@@ -0,0 +1,307 @@
+"""Memory-mapped columnar cache of `candlestick_data`.
+
+Each (resolution, symbol) series lives in its own directory with one raw
+little-endian file per column:
+
+    <root>/<resolution>/<symbol>/timestamp.i8
+                                  open.f8 high.f8 low.f8 close.f8 volume.f8
+
+Files only grow: bars newer than the last cached timestamp are appended.
+A batch that reaches back into the cached range (a corrected bar, a late
+backfill) rewrites the columns from the first affected position into new
+files swapped in by rename, so `timestamp` is always strictly increasing
+and doubles as the sorted index. Reads `np.memmap` the files and binary search the
+timestamp column, so a range read returns zero-copy views without touching
+the database.
+
+The cache assumes a single writer per root. Readers may run concurrently in
+other processes: they only see whole appended bars, and views they hold
+stay valid across rewrites.
+
+Example:
+    >>> cache = CandleCache("/var/cache/finhub/candles")
+    >>> await sync_candle_cache(cache, resolution="D")
+    >>> bars = cache.read("AAPL", "D", from_timestamp, to_timestamp)
+    >>> bars["close"][-5:]
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import distinct, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..database.candles import CANDLE_COLUMNS, read_candles
+from ..models import CandlestickData
+
+# Column -> on-disk dtype (volume is float so missing values stay NaN, as in read_candles)
+CACHE_DTYPES: Dict[str, np.dtype] = {
+    name: np.dtype("<i8") if name == "timestamp" else np.dtype("<f8")
+    for name in CANDLE_COLUMNS
+}
+DEFAULT_CACHE_DIR = os.getenv("FINHUB_CANDLE_CACHE", ".cache/candles")
+# Upper bound of the unsigned INT timestamp column
+MAX_TIMESTAMP = 2**32 - 1
+
+Series = Dict[str, np.ndarray]
+
+
+def _empty() -> Series:
+    return {name: np.empty(0, dtype=dtype) for name, dtype in CACHE_DTYPES.items()}
+
+
+class CandleCache:
+    """On-disk columnar candle store with zero-copy range reads.
+
+    Args:
+        root: Cache directory (default: $FINHUB_CANDLE_CACHE or '.cache/candles')
+    """
+
+    def __init__(self, root: Union[str, Path, None] = None):
+        self.root = Path(root or DEFAULT_CACHE_DIR)
+        # (symbol, resolution) -> (bars mapped, column memmaps)
+        self._maps: Dict[Tuple[str, str], Tuple[int, Series]] = {}
+        # (symbol, resolution) -> column file paths; pathlib is too slow per read
+        self._paths: Dict[Tuple[str, str], Dict[str, str]] = {}
+
+    def path(self, symbol: str, resolution: str) -> Path:
+        """Directory holding one series."""
+        return self.root / resolution / symbol.replace("/", "_")
+
+    def _files(self, symbol: str, resolution: str) -> Dict[str, str]:
+        key = (symbol, resolution)
+        paths = self._paths.get(key)
+        if paths is None:
+            directory = self.path(symbol, resolution)
+            paths = self._paths[key] = {
+                name: str(directory / f"{name}.{dtype.str[1:]}") for name, dtype in CACHE_DTYPES.items()
+            }
+        return paths
+
+    def length(self, symbol: str, resolution: str) -> int:
+        """Number of complete bars cached for a series."""
+        sizes = []
+        for name, path in self._files(symbol, resolution).items():
+            try:
+                sizes.append(os.stat(path).st_size // CACHE_DTYPES[name].itemsize)
+            except FileNotFoundError:
+                return 0
+        # A crash between column appends leaves ragged files; the shortest one wins
+        return min(sizes)
+
+    def symbols(self, resolution: str) -> List[str]:
+        """Symbols with a cached series at `resolution`."""
+        directory = self.root / resolution
+        if not directory.is_dir():
+            return []
+        return sorted(entry.name for entry in directory.iterdir() if entry.is_dir())
+
+    def columns(self, symbol: str, resolution: str) -> Series:
+        """Memory-map a whole series (read-only views, empty if not cached)."""
+        length = self.length(symbol, resolution)
+        if not length:
+            return _empty()
+
+        key = (symbol, resolution)
+        mapped = self._maps.get(key)
+        if mapped is None or mapped[0] != length:
+            files = self._files(symbol, resolution)
+            series = {
+                name: np.memmap(files[name], dtype=dtype, mode="r", shape=(length,))
+                for name, dtype in CACHE_DTYPES.items()
+            }
+            mapped = self._maps[key] = (length, series)
+        return mapped[1]
+
+    def last_timestamp(self, symbol: str, resolution: str) -> Optional[int]:
+        """Newest cached bar time, or None for an empty series."""
+        timestamps = self.columns(symbol, resolution)["timestamp"]
+        return int(timestamps[-1]) if len(timestamps) else None
+
+    def read(
+        self,
+        symbol: str,
+        resolution: str,
+        from_timestamp: Optional[int] = None,
+        to_timestamp: Optional[int] = None,
+    ) -> Series:
+        """Return zero-copy views of the bars in [from_timestamp, to_timestamp].
+
+        Args:
+            symbol: Stock symbol
+            resolution: Candle resolution
+            from_timestamp: UNIX timestamp in seconds, inclusive (default: first bar)
+            to_timestamp: UNIX timestamp in seconds, inclusive (default: last bar)
+
+        Returns:
+            Dictionary of column -> array view, in the layout of `read_candles`
+        """
+        series = self.columns(symbol, resolution)
+        timestamps = series["timestamp"]
+        start = 0 if from_timestamp is None else int(np.searchsorted(timestamps, from_timestamp, "left"))
+        end = len(timestamps) if to_timestamp is None else int(np.searchsorted(timestamps, to_timestamp, "right"))
+        return {name: values[start:end] for name, values in series.items()}
+
+    def read_many(
+        self,
+        symbols: Iterable[str],
+        resolution: str,
+        from_timestamp: Optional[int] = None,
+        to_timestamp: Optional[int] = None,
+    ) -> Dict[str, Series]:
+        """`read` several symbols; drop-in for `database.read_candles` results."""
+        out = {}
+        for symbol in symbols:
+            series = self.read(symbol, resolution, from_timestamp, to_timestamp)
+            if len(series["timestamp"]):
+                out[symbol] = series
+        return out
+
+    def append(self, symbol: str, resolution: str, series: Mapping[str, Any]) -> int:
+        """Merge bars into a series, appending in place when they are all newer.
+
+        Args:
+            symbol: Stock symbol
+            resolution: Candle resolution
+            series: Column arrays ('timestamp' + OHLCV); missing columns are NaN
+
+        Returns:
+            Number of bars written to disk
+        """
+        timestamps = np.asarray(series["timestamp"], dtype=np.int64)
+        if not len(timestamps):
+            return 0
+        incoming = {
+            name: timestamps if name == "timestamp" else np.asarray(
+                series.get(name, np.full(len(timestamps), np.nan)), dtype=dtype
+            )
+            for name, dtype in CACHE_DTYPES.items()
+        }
+
+        # Sort and keep the last occurrence of each timestamp
+        order = np.argsort(timestamps, kind="stable")
+        sorted_ts = timestamps[order]
+        last = np.r_[sorted_ts[1:] != sorted_ts[:-1], True]
+        incoming = {name: values[order][last] for name, values in incoming.items()}
+
+        length = self.length(symbol, resolution)
+        start = length
+        if length:
+            stored = self.columns(symbol, resolution)
+            start = int(np.searchsorted(stored["timestamp"], incoming["timestamp"][0], "left"))
+            if start < length:
+                # Overlap: rebuild the tail from the first affected bar
+                tail = {name: np.array(values[start:]) for name, values in stored.items()}
+                keep = ~np.isin(tail["timestamp"], incoming["timestamp"])
+                merged = {name: np.concatenate([tail[name][keep], incoming[name]]) for name in CACHE_DTYPES}
+                order = np.argsort(merged["timestamp"], kind="stable")
+                incoming = {name: values[order] for name, values in merged.items()}
+
+        directory = self.path(symbol, resolution)
+        directory.mkdir(parents=True, exist_ok=True)
+        self._maps.pop((symbol, resolution), None)
+        files = self._files(symbol, resolution)
+        for name, dtype in CACHE_DTYPES.items():
+            path = files[name]
+            data = incoming[name].astype(dtype, copy=False).tobytes()
+            if start < length:
+                # Shrinking a file under live memmaps would fault their readers,
+                # so rewrites go to a new file swapped in by rename
+                temp = path + ".tmp"
+                with open(path, "rb") as source, open(temp, "wb") as handle:
+                    handle.write(source.read(start * dtype.itemsize))
+                    handle.write(data)
+                os.replace(temp, path)
+            else:
+                with open(path, "ab") as handle:
+                    # Drops bytes past the last complete bar left by an interrupted append
+                    if handle.tell() > start * dtype.itemsize:
+                        handle.truncate(start * dtype.itemsize)
+                    handle.write(data)
+        return len(incoming["timestamp"])
+
+    def write_rows(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """Append CandlestickData column dicts (the `BulkWriter` row layout).
+
+        Usable as a `BulkWriter` listener so the ETL keeps the cache in sync.
+
+        Returns:
+            Number of bars written to disk
+        """
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault((row["symbol"], row.get("resolution") or "D"), []).append(row)
+
+        written = 0
+        for (symbol, resolution), group in groups.items():
+            written += self.append(symbol, resolution, {
+                name: [np.nan if row.get(name) is None else row[name] for row in group]
+                for name in CANDLE_COLUMNS
+            })
+        return written
+
+    def clear(self, symbol: str, resolution: str) -> None:
+        """Drop a cached series."""
+        self._maps.pop((symbol, resolution), None)
+        for path in self._files(symbol, resolution).values():
+            Path(path).unlink(missing_ok=True)
+
+
+async def sync_candle_cache(
+    cache: CandleCache,
+    symbols: Optional[Sequence[str]] = None,
+    resolution: str = "D",
+    batch_size: int = 200,
+    engine: Optional[AsyncEngine] = None,
+) -> int:
+    """Bring the cache up to date with `candlestick_data`, incrementally.
+
+    Only bars newer than each symbol's last cached bar are read, so repeated
+    runs cost one bounded range query per batch of symbols.
+
+    Args:
+        cache: Cache to update
+        symbols: Symbols to sync (default: every symbol stored at `resolution`)
+        resolution: Candle resolution (default: 'D')
+        batch_size: Symbols per DB round trip (default: 200)
+        engine: Async engine (default: finhub_etl.database.engine)
+
+    Returns:
+        Number of bars appended
+    """
+    if engine is None:
+        from ..database import engine
+
+    if symbols is None:
+        candles = CandlestickData.__table__.c
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                select(distinct(candles.symbol))
+                .where(candles.resolution == resolution)
+                .order_by(candles.symbol)
+            )
+            symbols = result.scalars().all()
+
+    appended = 0
+    for start in range(0, len(symbols), batch_size):
+        batch = symbols[start:start + batch_size]
+        after = {symbol: cache.last_timestamp(symbol, resolution) for symbol in batch}
+        from_timestamp = min(-1 if ts is None else ts for ts in after.values()) + 1
+        series = await read_candles(batch, resolution, from_timestamp, MAX_TIMESTAMP, engine)
+
+        for symbol, columns in series.items():
+            if after[symbol] is not None:
+                newer = columns["timestamp"] > after[symbol]
+                columns = {name: values[newer] for name, values in columns.items()}
+            appended += cache.append(symbol, resolution, columns)
+
+    return appended
+
+
+__all__ = [
+    "CACHE_DTYPES",
+    "CandleCache",
+    "sync_candle_cache",
+]
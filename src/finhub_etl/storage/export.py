@@ -0,0 +1,281 @@
+"""Streaming Parquet export of ETL tables.
+
+`export_table` reads a table through a server-side cursor (`yield_per`) in
+chunks of `chunk_size` rows and appends each chunk as Arrow row groups to a
+hive-partitioned Parquet dataset, so memory stays bounded by the chunk size
+and the number of open partition files regardless of table size:
+
+    <root>/<table>/symbol=AAPL/date=2024-01/part-00000.parquet
+
+`date` is derived from the table's date-like primary-key column (UNIX
+seconds or 'YYYY-MM-DD' strings) at day, month or year granularity.
+Partition columns are encoded in the directory names rather than the files,
+as hive readers expect.
+
+Requires the optional `pyarrow` dependency (`pip install finhub-etl[export]`).
+
+Example:
+    >>> await export_table(CompanyNews, "exports", columns=["headline", "url"])
+    1834221
+    >>> pyarrow.dataset.dataset("exports/company_news", partitioning="hive")
+
+Command line:
+    python -m finhub_etl.storage.export candlestick_data exports --date-granularity year
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
+from urllib.parse import quote
+
+from sqlalchemy import JSON, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel
+
+from ..models import TABLE_REGISTRY, get_table_spec
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Length of the 'YYYY-MM-DD' prefix kept per granularity
+DATE_GRANULARITY = {"day": 10, "month": 7, "year": 4}
+
+
+def arrow_schema(model: Type[SQLModel], columns: Sequence[str]) -> "pa.Schema":
+    """Arrow schema for table columns, from their SQL types.
+
+    JSON columns are exported as JSON-encoded strings (see `json_columns`).
+    """
+    types = get_table_spec(model).column_types
+    arrow_types = {
+        int: pa.int64(),
+        float: pa.float64(),
+        bool: pa.bool_(),
+        datetime: pa.timestamp("us"),
+        date: pa.date32(),
+    }
+    encoded = json_columns(model)
+    return pa.schema([
+        (name, pa.string() if name in encoded else arrow_types.get(types[name], pa.string()))
+        for name in columns
+    ])
+
+
+def json_columns(model: Type[SQLModel]) -> List[str]:
+    """Columns stored as JSON, which are written to Parquet as `json.dumps` strings."""
+    return [column.name for column in get_table_spec(model).table.columns if isinstance(column.type, JSON)]
+
+
+def _encode_json(values: Sequence[Any]) -> List[Optional[str]]:
+    return [None if value is None else json.dumps(value) for value in values]
+
+
+def date_column(model: Type[SQLModel]) -> Optional[str]:
+    """The date-like primary-key column used for `date=` partitions, if any."""
+    for name in get_table_spec(model).primary_key:
+        if "date" in name or "time" in name:
+            return name
+    return None
+
+
+def _date_key(value: Any, size: int) -> str:
+    if value is None:
+        return "unknown"
+    if isinstance(value, (int, float)):
+        value = datetime.fromtimestamp(value, timezone.utc).strftime("%Y-%m-%d")
+    return str(value)[:size] or "unknown"
+
+
+class _PartitionWriters:
+    """Parquet writers per partition directory, LRU-closed past `max_open`."""
+
+    def __init__(self, root: Path, schema: "pa.Schema", compression: str, max_open: int):
+        self.root = root
+        self.schema = schema
+        self.compression = compression
+        self.max_open = max_open
+        self.open: "OrderedDict[str, pq.ParquetWriter]" = OrderedDict()
+        self.parts: Dict[str, int] = {}
+        self.files = 0
+
+    def write(self, partition: str, table: "pa.Table") -> None:
+        writer = self.open.pop(partition, None)
+        if writer is None:
+            if len(self.open) >= self.max_open:
+                self.open.popitem(last=False)[1].close()
+            directory = self.root / partition if partition else self.root
+            directory.mkdir(parents=True, exist_ok=True)
+            part = self.parts.get(partition, 0)
+            self.parts[partition] = part + 1
+            writer = pq.ParquetWriter(
+                directory / f"part-{part:05d}.parquet", self.schema, compression=self.compression
+            )
+            self.files += 1
+        self.open[partition] = writer
+        writer.write_table(table)
+
+    def close(self) -> None:
+        while self.open:
+            self.open.popitem()[1].close()
+
+
+async def export_table(
+    model: Union[Type[SQLModel], str],
+    root: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    partition_by: Sequence[str] = ("symbol", "date"),
+    date_granularity: str = "month",
+    where: Optional[Any] = None,
+    chunk_size: int = 50_000,
+    compression: str = "zstd",
+    max_open_files: int = 256,
+    overwrite: bool = False,
+    engine: Optional[AsyncEngine] = None,
+) -> int:
+    """Stream a table into a partitioned Parquet dataset.
+
+    Args:
+        model: SQLModel table class or table name (e.g. 'company_news')
+        root: Export directory; the dataset is written to <root>/<table>
+        columns: Columns to export (default: all)
+        partition_by: Partition keys, any of the table's columns plus 'date'.
+            Keys the table lacks are skipped (default: ('symbol', 'date'))
+        date_granularity: 'day', 'month' or 'year' for the 'date' key (default: 'month')
+        where: Optional SQLAlchemy filter expression
+        chunk_size: Rows fetched per cursor round trip and written per row group (default: 50000)
+        compression: Parquet codec: 'zstd', 'snappy', 'gzip', 'none' (default: 'zstd')
+        max_open_files: Partition files kept open at once (default: 256)
+        overwrite: Replace an existing export of the table (default: False)
+        engine: Async engine (default: finhub_etl.database.engine)
+
+    Returns:
+        Number of rows exported
+
+    Raises:
+        ImportError: If pyarrow is not installed
+        FileExistsError: If the export exists and overwrite is False
+        ValueError: If a column or the date granularity is unknown
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet export: pip install finhub-etl[export]")
+    if engine is None:
+        from ..database import engine
+
+    if isinstance(model, str):
+        model = TABLE_REGISTRY[model].model
+    spec = get_table_spec(model)
+    table = spec.table
+
+    columns = list(columns or spec.columns)
+    unknown = [name for name in columns if name not in spec.columns]
+    if unknown:
+        raise ValueError(f"Unknown columns for {spec.name}: {unknown}")
+    if date_granularity not in DATE_GRANULARITY:
+        raise ValueError(f"date_granularity must be one of {tuple(DATE_GRANULARITY)}")
+
+    date_source = date_column(model)
+    keys: List[Tuple[str, str]] = []  # (partition key, source column)
+    for key in partition_by:
+        if key == "date" and date_source:
+            keys.append((key, date_source))
+        elif key in spec.columns:
+            keys.append((key, key))
+
+    # Hive partition columns live in the path, not in the files
+    data_columns = [name for name in columns if name not in dict(keys)]
+    selected = list(dict.fromkeys(data_columns + [source for _, source in keys]))
+    positions = {name: i for i, name in enumerate(selected)}
+    date_size = DATE_GRANULARITY[date_granularity]
+
+    target = Path(root) / spec.name
+    if target.exists() and any(target.iterdir()):
+        if not overwrite:
+            raise FileExistsError(f"{target} is not empty (pass overwrite=True to replace it)")
+        shutil.rmtree(target)
+
+    stmt = select(*(table.c[name] for name in selected)).order_by(*(table.c[name] for name in spec.primary_key))
+    if where is not None:
+        stmt = stmt.where(where)
+
+    schema = arrow_schema(model, data_columns)
+    encoded = set(json_columns(model))
+    writers = _PartitionWriters(target, schema, compression, max_open_files)
+    total = 0
+    try:
+        async with engine.connect() as conn:
+            result = await conn.stream(stmt.execution_options(yield_per=chunk_size))
+            async for rows in result.partitions(chunk_size):
+                groups: Dict[str, List[tuple]] = {}
+                for row in rows:
+                    partition = "/".join(
+                        f"{key}={_date_key(row[positions[source]], date_size)}" if key == "date"
+                        else f"{key}={quote(str(row[positions[source]]), safe='')}"
+                        for key, source in keys
+                    )
+                    groups.setdefault(partition, []).append(row)
+
+                for partition, group in groups.items():
+                    values = list(zip(*group))
+                    batch = pa.table(
+                        [
+                            pa.array(
+                                _encode_json(values[positions[name]]) if name in encoded else values[positions[name]],
+                                type=schema.field(name).type,
+                            )
+                            for name in data_columns
+                        ],
+                        schema=schema,
+                    )
+                    writers.write(partition, batch)
+                total += len(rows)
+    finally:
+        writers.close()
+
+    print(f"Exported {total} rows of {spec.name} to {target} ({writers.files} files)")
+    return total
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export an ETL table to partitioned Parquet")
+    parser.add_argument("table", choices=sorted(TABLE_REGISTRY))
+    parser.add_argument("root", help="export directory")
+    parser.add_argument("--columns", nargs="+", help="columns to export (default: all)")
+    parser.add_argument("--partition-by", nargs="*", default=["symbol", "date"])
+    parser.add_argument("--date-granularity", choices=tuple(DATE_GRANULARITY), default="month")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--compression", default="zstd")
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args(argv)
+
+    asyncio.run(export_table(
+        args.table,
+        args.root,
+        columns=args.columns,
+        partition_by=args.partition_by,
+        date_granularity=args.date_granularity,
+        chunk_size=args.chunk_size,
+        compression=args.compression,
+        overwrite=args.overwrite,
+    ))
+
+
+__all__ = [
+    "DATE_GRANULARITY",
+    "arrow_schema",
+    "json_columns",
+    "date_column",
+    "export_table",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""Raw-response data lake with replay-based table rebuilds.
+
+Every response body fetched through `FinnhubAPIClient.get` can be kept
+verbatim so a changed transform costs CPU instead of API quota:
+
+    <root>/objects/3f/3f9c...e41.json.zst     compressed body, named by its SHA-256
+    <root>/manifest.sqlite                    one row per fetch
+
+A fetch is keyed by SHA-256 of (endpoint, params, fetched_at). Bodies are
+content-addressed, so re-fetching unchanged data adds a manifest row but no
+new object. The manifest is a plain SQLite file indexed by endpoint and
+fetch time. The API client stores bodies with `put_async`, which
+compresses, writes and commits on a worker thread so the event loop keeps
+serving requests.
+
+`rebuild` replays the lake: manifest entries are transformed into column
+rows in a process pool (decompress + decode + transform run on every core)
+and bulk loaded in fetch order, so newer fetches win on conflicts.
+Transforms are looked up per endpoint in `loaders.ENDPOINT_TRANSFORMS` and
+rows go to the same sink as live loads (`loaders.endpoint_writer`), so
+/company-news is replayed into the deduplicated article store.
+
+Example:
+    >>> api_client.lake = RawLake("lake")
+    >>> await get_market_holiday("US")
+    >>> await rebuild(RawLake("lake"), endpoints=["/stock/market-holiday"])
+    {'market_holidays': 42}
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..loaders import endpoint_writer, get_endpoint_transforms, transform_payload
+from .archive import default_compression, zstandard
+
+OBJECT_EXTENSIONS = {"gzip": ".json.gz", "zstd": ".json.zst"}
+
+_MANIFEST = """
+CREATE TABLE IF NOT EXISTS fetches (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    params TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    object TEXT NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_fetches_endpoint_time ON fetches (endpoint, fetched_at);
+"""
+
+
+def canonical_params(params: Optional[Dict[str, Any]]) -> str:
+    """Stable JSON encoding of query parameters (sorted keys, None dropped)."""
+    return json.dumps(
+        {key: value for key, value in (params or {}).items() if value is not None},
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+
+
+def fetch_key(endpoint: str, params: Optional[Dict[str, Any]], fetched_at: float) -> str:
+    """SHA-256 address of one fetch: endpoint + params + fetch time."""
+    payload = f"{endpoint}\n{canonical_params(params)}\n{fetched_at!r}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class LakeEntry:
+    """One manifest row."""
+
+    key: str
+    endpoint: str
+    params: Dict[str, Any]
+    fetched_at: float
+    object: str
+    size: int
+
+
+class RawLake:
+    """Content-addressed store of raw API responses.
+
+    Args:
+        root: Lake directory (default: $FINHUB_RAW_LAKE or '.lake')
+        compression: 'zstd' or 'gzip' (default: zstd when available)
+    """
+
+    def __init__(self, root: Union[str, Path, None] = None, compression: Optional[str] = None):
+        self.root = Path(root or os.getenv("FINHUB_RAW_LAKE", ".lake"))
+        self.compression = compression or default_compression()
+        if self.compression not in OBJECT_EXTENSIONS:
+            raise ValueError(f"compression must be one of {tuple(OBJECT_EXTENSIONS)}, got '{self.compression}'")
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Shared with `put_async` worker threads; every use holds the lock
+        self._manifest = sqlite3.connect(self.root / "manifest.sqlite", check_same_thread=False)
+        self._lock = threading.Lock()
+        self._manifest.executescript(_MANIFEST)
+
+    def object_path(self, digest: str) -> Path:
+        """Path of a stored body, in whichever compression it was written with."""
+        return object_path(self.root, digest, self.compression)
+
+    def put(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        content: bytes,
+        fetched_at: Optional[float] = None,
+    ) -> str:
+        """Store a raw response body and record the fetch.
+
+        Args:
+            endpoint: API endpoint (e.g. '/stock/candle')
+            params: Query parameters of the request
+            content: Undecoded response body
+            fetched_at: UNIX time of the fetch (default: now)
+
+        Returns:
+            Fetch key
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if self.compression == "zstd":
+                data = zstandard.ZstdCompressor(level=3).compress(content)
+            else:
+                data = gzip.compress(content, compresslevel=6)
+            # Concurrent writers of the same body each get their own temp file
+            handle, temp = tempfile.mkstemp(prefix=path.name, suffix=".part", dir=path.parent)
+            try:
+                with os.fdopen(handle, "wb") as out:
+                    out.write(data)
+                if path.exists():
+                    # Stored by another writer meanwhile; the content is identical
+                    os.unlink(temp)
+                else:
+                    os.replace(temp, path)
+            except BaseException:
+                if os.path.exists(temp):
+                    os.unlink(temp)
+                raise
+
+        key = fetch_key(endpoint, params, fetched_at)
+        with self._lock, self._manifest:
+            self._manifest.execute(
+                "INSERT OR IGNORE INTO fetches VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, canonical_params(params), fetched_at, digest, len(content)),
+            )
+        return key
+
+    async def put_async(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        content: bytes,
+        fetched_at: Optional[float] = None,
+    ) -> str:
+        """`put` on a worker thread, stamped with the time of the call.
+
+        Returns:
+            Fetch key
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        return await asyncio.to_thread(self.put, endpoint, params, content, fetched_at)
+
+    def read(self, digest: str) -> bytes:
+        """Raw body of a stored object."""
+        return read_object(self.object_path(digest))
+
+    def entries(
+        self,
+        endpoints: Optional[Sequence[str]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        latest: bool = True,
+    ) -> List[LakeEntry]:
+        """Manifest rows in fetch order.
+
+        Args:
+            endpoints: Only these endpoints (default: all)
+            since: Fetched at or after this UNIX time (default: no bound)
+            until: Fetched before this UNIX time (default: no bound)
+            latest: Keep only the newest fetch per (endpoint, params) (default: True)
+
+        Returns:
+            Entries sorted by fetch time
+        """
+        clauses, args = [], []
+        if endpoints:
+            clauses.append(f"endpoint IN ({', '.join('?' * len(endpoints))})")
+            args.extend(endpoints)
+        if since is not None:
+            clauses.append("fetched_at >= ?")
+            args.append(since)
+        if until is not None:
+            clauses.append("fetched_at < ?")
+            args.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT key, endpoint, params, fetched_at, object, size FROM fetches {where}"
+        if latest:
+            query = (
+                f"SELECT key, endpoint, params, fetched_at, object, size FROM ("
+                f"SELECT *, ROW_NUMBER() OVER (PARTITION BY endpoint, params ORDER BY fetched_at DESC) AS n "
+                f"FROM fetches {where}) WHERE n = 1"
+            )
+        with self._lock:
+            rows = self._manifest.execute(f"{query} ORDER BY fetched_at, key", args).fetchall()
+        return [
+            LakeEntry(key, endpoint, json.loads(params), fetched_at, digest, size)
+            for key, endpoint, params, fetched_at, digest, size in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._manifest.close()
+
+
+def object_path(root: Path, digest: str, compression: str = "gzip") -> Path:
+    """Existing object file for `digest`, else where `compression` would write it."""
+    directory = Path(root) / "objects" / digest[:2]
+    for extension in OBJECT_EXTENSIONS.values():
+        path = directory / f"{digest}{extension}"
+        if path.exists():
+            return path
+    return directory / f"{digest}{OBJECT_EXTENSIONS[compression]}"
+
+
+def read_object(path: Path) -> bytes:
+    """Decompress a stored body."""
+    data = path.read_bytes()
+    if path.name.endswith(OBJECT_EXTENSIONS["zstd"]):
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _transform_chunk(root: str, endpoint: str, chunk: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[Any, ...]]:
+    """Process-pool task: decompress, decode and transform a chunk of fetches."""
+    rows: List[Tuple[Any, ...]] = []
+    for digest, params in chunk:
+        path = object_path(Path(root), digest)
+        if path.exists():
+            rows.extend(transform_payload(endpoint, params, read_object(path)))
+    return rows
+
+
+async def rebuild(
+    lake: RawLake,
+    endpoints: Optional[Sequence[str]] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    latest: bool = True,
+    workers: Optional[int] = None,
+    chunk_size: int = 200,
+    on_conflict: str = "update",
+    engine: Optional[AsyncEngine] = None,
+) -> Dict[str, int]:
+    """Re-run transforms over stored responses and bulk load the results.
+
+    Chunks of `chunk_size` fetches are transformed in a process pool while
+    earlier chunks are written, and chunks are written in fetch order.
+
+    Args:
+        lake: Lake to replay
+        endpoints: Endpoints to rebuild (default: every endpoint in ENDPOINT_TRANSFORMS)
+        since: Only fetches at or after this UNIX time (default: no bound)
+        until: Only fetches before this UNIX time (default: no bound)
+        latest: Only the newest fetch per (endpoint, params) (default: True)
+        workers: Worker processes (default: CPU count)
+        chunk_size: Fetches per pool task (default: 200)
+        on_conflict: Primary-key conflict policy, see `endpoint_writer` (default: 'update')
+        engine: Async engine (default: finhub_etl.database.engine)
+
+    Returns:
+        Dictionary of table name -> rows written
+    """
+    if engine is None:
+        from ..database import engine
+
+    registry = get_endpoint_transforms()
+    endpoints = list(endpoints or registry)
+    entries = lake.entries(endpoints, since, until, latest)
+
+    tasks: List[Tuple[str, List[Tuple[str, Dict[str, Any]]]]] = []
+    for endpoint in endpoints:
+        selected = [(entry.object, entry.params) for entry in entries if entry.endpoint == endpoint]
+        for start in range(0, len(selected), chunk_size):
+            tasks.append((endpoint, selected[start:start + chunk_size]))
+
+    writers: Dict[str, Any] = {}
+
+    async def write(endpoint: str, future: "asyncio.Future[List[Tuple[Any, ...]]]") -> None:
+        writer = writers.get(endpoint)
+        if writer is None:
+            writer = writers[endpoint] = endpoint_writer(endpoint, on_conflict=on_conflict, engine=engine)
+        await writer.write_tuples(await future)
+
+    loop = asyncio.get_running_loop()
+    window = (workers or os.cpu_count() or 1) * 2
+    # Spawned workers: forking a process that runs the event loop's threads can deadlock
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        # Keep `window` chunks in flight; write them back in submission order
+        pending: Deque[Tuple[str, asyncio.Future]] = deque()
+        for endpoint, chunk in tasks:
+            pending.append((endpoint, loop.run_in_executor(pool, _transform_chunk, str(lake.root), endpoint, chunk)))
+            if len(pending) >= window:
+                await write(*pending.popleft())
+        while pending:
+            await write(*pending.popleft())
+
+    written: Dict[str, int] = {}
+    for writer in writers.values():
+        name = writer.model.__tablename__
+        written[name] = written.get(name, 0) + writer.written
+    print(f"Rebuilt from {len(entries)} fetches: {written}")
+    return written
+
+
+__all__ = [
+    "LakeEntry",
+    "RawLake",
+    "canonical_params",
+    "fetch_key",
+    "object_path",
+    "read_object",
+    "rebuild",
+]
@@ -5,8 +5,10 @@ ETL utility functions for fetching data from Finnhub API and storing in database
 import logging
 from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, Union
 from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from ..database import engine
+from ..loaders import BulkWriter, build_rows
 
 T = TypeVar("T", bound=SQLModel)
 
@@ -147,6 +149,8 @@ async def batch_fetch_and_store(
 async def save_to_db(
     model_class: Type[T],
     data: Union[Dict, List[Dict]],
+    fast: bool = False,
+    validate_sample: float = 0.0,
 ) -> Union[T, List[T], None]:
     """
     Save data to database using SQLModel.
@@ -154,6 +158,9 @@ async def save_to_db(
     Args:
         model_class: SQLModel class to instantiate
         data: Dictionary or list of dictionaries to save
+        fast: Skip per-row validation and refresh; rows are inserted with a
+            Core statement and returned as `model_construct` instances
+        validate_sample: With fast=True, fraction of rows strictly validated (e.g. 0.01)
 
     Returns:
         Created model instance(s) or None if error
@@ -163,7 +170,14 @@ async def save_to_db(
         company = await save_to_db(CompanyProfile, company_data)
     """
     try:
-        async with get_session() as session:
+        if fast:
+            records = data if isinstance(data, list) else [data]
+            rows = build_rows(model_class, records, validate_sample)
+            await BulkWriter(model_class, on_conflict="error").write_rows(rows)
+            instances = [model_class.model_construct(**row) for row in rows]
+            return instances if isinstance(data, list) else instances[0]
+
+        async with AsyncSession(engine) as session:
             if isinstance(data, list):
                 if not data:
                     return []
@@ -2,10 +2,12 @@ import json
 from pathlib import Path
 from typing import Any, Union ,TypeVar
 from sqlmodel import SQLModel
-from typing import Type, List, Callable
+from typing import Type, List, Callable, Optional
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from ..database import engine
+from ..loaders import BulkWriter, build_rows
+from ..storage import ArchiveWriter
 
 T = TypeVar("T", bound=SQLModel)
 
@@ -16,6 +18,9 @@ def save_json(
     """
     Save data to a JSON file.
 
+    Buffers and pretty-prints the whole object; for raw-response archives
+    use `storage.ArchiveWriter`, which streams compressed NDJSON.
+
     Args:
         data: JSON-serializable data to save
         file_path: Path where the file should be saved
@@ -45,6 +50,9 @@ T = TypeVar("T", bound=SQLModel)
 async def fetch_and_store_data(
     handler: Callable[..., Any],
     model: Type[T],
+    fast: bool = False,
+    validate_sample: float = 0.0,
+    archive: Optional[ArchiveWriter] = None,
     **params
 ) -> Union[T, List[T], None]:
     """
@@ -55,6 +63,10 @@ async def fetch_and_store_data(
     Args:
         handler: Function to fetch data from API (e.g. trading.get_dividends)
         model: SQLModel class where data will be stored
+        fast: Skip per-row validation and insert with a Core statement; the
+            returned instances are built with `model_construct` (default: False)
+        validate_sample: With fast=True, fraction of rows strictly validated (e.g. 0.01)
+        archive: Also append the fetched records to this archive (default: None)
         **params: Parameters to pass to the handler (e.g. symbol, from_date, to_date)
 
     Returns:
@@ -70,13 +82,21 @@ async def fetch_and_store_data(
 
             # 2️⃣ Normalize to list
             records = data if isinstance(data, list) else [data]
-
-            # 3️⃣ Convert dicts → model instances
-            model_instances = [model(**record) for record in records]
-
-            # 4️⃣ Store in DB
-            session.add_all(model_instances)
-            await session.commit()
+            if archive is not None:
+                await archive.write_many_async(records)
+
+            if fast:
+                # 3️⃣ Convert dicts → column rows, 4️⃣ bulk insert
+                rows = build_rows(model, records, validate_sample)
+                await BulkWriter(model, on_conflict="error").write_rows(rows)
+                model_instances = [model.model_construct(**row) for row in rows]
+            else:
+                # 3️⃣ Convert dicts → model instances
+                model_instances = [model(**record) for record in records]
+
+                # 4️⃣ Store in DB
+                session.add_all(model_instances)
+                await session.commit()
 
             print(f"✅ Stored {len(model_instances)} records in {model.__name__}")
             await session.close()
@@ -0,0 +1,37 @@
+from .leases import (
+    LeasedItem,
+    now_ms,
+    plan_work,
+    create_job,
+    claim,
+    heartbeat,
+    complete,
+    fail,
+    defer,
+    park_requests,
+    job_progress,
+)
+from .ratelimit import LocalRateLimiter, SharedRateLimiter
+from .runner import load_work_item, run_worker, run_workers
+
+__all__ = [
+    # Lease table
+    "LeasedItem",
+    "now_ms",
+    "plan_work",
+    "create_job",
+    "claim",
+    "heartbeat",
+    "complete",
+    "fail",
+    "defer",
+    "park_requests",
+    "job_progress",
+    # Rate limiting
+    "LocalRateLimiter",
+    "SharedRateLimiter",
+    # Worker processes
+    "load_work_item",
+    "run_worker",
+    "run_workers",
+]
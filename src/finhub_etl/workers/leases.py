@@ -0,0 +1,355 @@
+"""Lease table of ETL work items.
+
+A job is split up front into work items, one per (dataset, symbol shard,
+date window), stored in `work_items`. Workers on any host claim a batch of
+pending items, hold them under a time-limited lease they keep alive with
+heartbeats, and mark them done or failed. An item whose lease expires
+(crashed or stalled worker) becomes claimable again.
+
+Pending items may carry a not-before time in `lease_expires`: `defer` and
+`park_requests` use it to retry work later, e.g. once a tripped circuit
+breaker closes, without spending an attempt. Items that exhaust
+`max_attempts` end up `failed`, the job's dead-letter set. That includes
+items whose worker crashed on every attempt: `claim` fails an expired
+lease that has used up its attempts instead of leasing it again.
+
+Every claim gets a fresh `lease_token`; heartbeat, complete and fail only
+touch rows still carrying that token, so a worker that lost its lease can
+never overwrite the item's new owner.
+
+MySQL 8 and PostgreSQL claim with `SELECT ... FOR UPDATE SKIP LOCKED`, so
+concurrent workers skip each other's rows instead of queueing on them.
+SQLite has no row locks: the claim is a single `UPDATE ... WHERE id IN
+(SELECT ... LIMIT n)`, atomic under its database write lock.
+
+Example:
+    >>> items = plan_work(["/stock/candle"], symbols, shard_size=50,
+    ...                   windows=[(start, end)], params={"resolution": "D"})
+    >>> await create_job("candles-2024", items)
+    120
+    >>> leased = await claim("candles-2024", owner="host-a:4242", limit=4)
+"""
+
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..loaders import BulkWriter
+from ..models import WorkItem
+
+STATUSES = ("pending", "leased", "done", "failed")
+
+
+def now_ms() -> int:
+    """Current UNIX time in milliseconds."""
+    return int(time.time() * 1000)
+
+
+@dataclass(frozen=True)
+class LeasedItem:
+    """A claimed work item."""
+
+    id: int
+    dataset: str
+    params: Dict[str, Any]
+    attempts: int
+    token: str
+
+
+def plan_work(
+    datasets: Sequence[str],
+    symbols: Sequence[str],
+    shard_size: int = 50,
+    windows: Optional[Sequence[Tuple[Any, Any]]] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Split datasets x symbols x windows into work items.
+
+    Args:
+        datasets: Endpoints to load (e.g. ['/stock/candle', '/company-news'])
+        symbols: Symbols to cover
+        shard_size: Symbols per item (default: 50)
+        windows: (from, to) pairs passed through as the 'from'/'to' query
+            parameters, in whatever form the endpoint expects (default: no window)
+        params: Extra query parameters for every request (e.g. {'resolution': 'D'})
+
+    Returns:
+        (dataset, params) pairs; params carry a 'symbols' list
+    """
+    shards = [list(symbols[start:start + shard_size]) for start in range(0, len(symbols), shard_size)]
+    items = []
+    for dataset in datasets:
+        for shard in shards:
+            for window in windows or [None]:
+                item = dict(params or {}, symbols=shard)
+                if window is not None:
+                    item["from"], item["to"] = window
+                items.append((dataset, item))
+    return items
+
+
+async def create_job(
+    job: str,
+    items: Iterable[Tuple[str, Dict[str, Any]]],
+    engine: Optional[AsyncEngine] = None,
+    *,
+    not_before: Optional[int] = None,
+) -> int:
+    """Insert the work items of a job as pending.
+
+    Args:
+        job: Job name shared by its items
+        items: (dataset, params) pairs, e.g. from `plan_work`
+        engine: Async engine (default: finhub_etl.database.engine)
+        not_before: UNIX ms before which the items are not claimable (default: now)
+
+    Returns:
+        Number of items created
+    """
+    stamp = now_ms()
+    rows = [
+        {
+            "job": job, "dataset": dataset, "params": json.dumps(params, sort_keys=True, default=str),
+            "status": "pending", "attempts": 0, "lease_expires": not_before, "updated_at": stamp,
+        }
+        for dataset, params in items
+    ]
+    writer = BulkWriter(WorkItem, on_conflict="error", engine=engine)
+    await writer.write_rows(rows)
+    return writer.written
+
+
+async def park_requests(
+    endpoint: str,
+    params_list: Sequence[Dict[str, Any]],
+    retry_after: float,
+    job: str = "parked",
+    engine: Optional[AsyncEngine] = None,
+) -> int:
+    """Queue requests refused by an open circuit breaker for a later retry.
+
+    Args:
+        endpoint: Endpoint of the requests
+        params_list: Query parameters per request (e.g. `load_endpoint`'s `parked`)
+        retry_after: Seconds until the items become claimable
+        job: Job to queue them under (default: 'parked')
+        engine: Async engine (default: finhub_etl.database.engine)
+
+    Returns:
+        Number of items created
+    """
+    not_before = now_ms() + int(retry_after * 1000)
+    return await create_job(job, [(endpoint, params) for params in params_list], engine, not_before=not_before)
+
+
+def _claimable(job: str, now: int, max_attempts: int):
+    c = WorkItem.__table__.c
+    return and_(
+        c.job == job,
+        or_(
+            and_(c.status == "pending", or_(c.lease_expires.is_(None), c.lease_expires < now)),
+            and_(c.status == "leased", c.lease_expires < now, c.attempts < max_attempts),
+        ),
+    )
+
+
+def _exhausted(job: str, now: int, max_attempts: int):
+    # Expired leases with no attempts left: the worker died holding them every time
+    c = WorkItem.__table__.c
+    return and_(c.job == job, c.status == "leased", c.lease_expires < now, c.attempts >= max_attempts)
+
+
+async def claim(
+    job: str,
+    owner: str,
+    limit: int = 1,
+    lease_seconds: float = 60.0,
+    engine: Optional[AsyncEngine] = None,
+    *,
+    max_attempts: int = 3,
+) -> List[LeasedItem]:
+    """Lease up to `limit` pending (or expired) items of a job.
+
+    An expired lease on an item already attempted `max_attempts` times is
+    marked failed instead of being leased again.
+
+    Args:
+        job: Job name
+        owner: Worker identity recorded on the lease (e.g. 'host:pid')
+        limit: Items to claim (default: 1)
+        lease_seconds: Lease length; renew with `heartbeat` (default: 60)
+        engine: Async engine (default: finhub_etl.database.engine)
+        max_attempts: Attempts before an expired lease is failed, as in `fail` (default: 3)
+
+    Returns:
+        Claimed items, oldest first; empty when nothing is claimable
+    """
+    if engine is None:
+        from ..database import engine
+
+    table = WorkItem.__table__
+    c = table.c
+    token = uuid.uuid4().hex
+    now = now_ms()
+    lease = update(table).values(
+        status="leased", lease_owner=owner[:64], lease_token=token,
+        lease_expires=now + int(lease_seconds * 1000), attempts=c.attempts + 1, updated_at=now,
+    )
+    dead = update(table).values(
+        status="failed", lease_token=None, lease_expires=None, updated_at=now,
+        error=f"lease expired on each of {max_attempts} attempts",
+    )
+    candidates = select(c.id).where(_claimable(job, now, max_attempts)).order_by(c.id).limit(limit)
+
+    async with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            await conn.execute(dead.where(_exhausted(job, now, max_attempts)))
+            # One statement under SQLite's write lock: pick and lease atomically
+            await conn.execute(lease.where(c.id.in_(candidates)))
+        else:
+            exhausted = select(c.id).where(_exhausted(job, now, max_attempts)).with_for_update(skip_locked=True)
+            dead_ids = (await conn.execute(exhausted)).scalars().all()
+            if dead_ids:
+                await conn.execute(dead.where(c.id.in_(dead_ids)))
+            ids = (await conn.execute(candidates.with_for_update(skip_locked=True))).scalars().all()
+            if not ids:
+                return []
+            await conn.execute(lease.where(c.id.in_(ids)))
+        result = await conn.execute(
+            select(c.id, c.dataset, c.params, c.attempts).where(c.lease_token == token).order_by(c.id)
+        )
+        return [
+            LeasedItem(id, dataset, json.loads(params), attempts, token)
+            for id, dataset, params, attempts in result.all()
+        ]
+
+
+async def heartbeat(token: str, lease_seconds: float = 60.0, engine: Optional[AsyncEngine] = None) -> int:
+    """Extend every lease still held under `token`.
+
+    Returns:
+        Number of leases extended; fewer than claimed means some were lost
+    """
+    if engine is None:
+        from ..database import engine
+
+    c = WorkItem.__table__.c
+    now = now_ms()
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            update(WorkItem.__table__)
+            .where(c.lease_token == token, c.status == "leased")
+            .values(lease_expires=now + int(lease_seconds * 1000), updated_at=now)
+        )
+    return result.rowcount
+
+
+async def complete(item: LeasedItem, engine: Optional[AsyncEngine] = None) -> bool:
+    """Mark a leased item done.
+
+    Returns:
+        False if the lease was lost to another worker meanwhile
+    """
+    if engine is None:
+        from ..database import engine
+
+    c = WorkItem.__table__.c
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            update(WorkItem.__table__)
+            .where(c.id == item.id, c.lease_token == item.token, c.status == "leased")
+            .values(status="done", lease_token=None, lease_expires=None, error=None, updated_at=now_ms())
+        )
+    return result.rowcount == 1
+
+
+async def fail(
+    item: LeasedItem,
+    error: str,
+    max_attempts: int = 3,
+    engine: Optional[AsyncEngine] = None,
+) -> bool:
+    """Release a leased item after an error.
+
+    The item goes back to pending, or to failed once it has been attempted
+    `max_attempts` times.
+
+    Returns:
+        False if the lease was lost to another worker meanwhile
+    """
+    if engine is None:
+        from ..database import engine
+
+    c = WorkItem.__table__.c
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            update(WorkItem.__table__)
+            .where(c.id == item.id, c.lease_token == item.token, c.status == "leased")
+            .values(
+                status="failed" if item.attempts >= max_attempts else "pending",
+                lease_token=None, lease_expires=None, error=error[:10000], updated_at=now_ms(),
+            )
+        )
+    return result.rowcount == 1
+
+
+async def defer(
+    item: LeasedItem,
+    seconds: float,
+    error: Optional[str] = None,
+    engine: Optional[AsyncEngine] = None,
+) -> bool:
+    """Release a leased item for a retry after `seconds`, without spending an attempt.
+
+    Returns:
+        False if the lease was lost to another worker meanwhile
+    """
+    if engine is None:
+        from ..database import engine
+
+    c = WorkItem.__table__.c
+    now = now_ms()
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            update(WorkItem.__table__)
+            .where(c.id == item.id, c.lease_token == item.token, c.status == "leased")
+            .values(
+                status="pending", attempts=c.attempts - 1, lease_token=None,
+                lease_expires=now + int(seconds * 1000), error=error, updated_at=now,
+            )
+        )
+    return result.rowcount == 1
+
+
+async def job_progress(job: str, engine: Optional[AsyncEngine] = None) -> Dict[str, int]:
+    """Item count per status for a job, e.g. {'pending': 3, 'leased': 2, 'done': 40, 'failed': 0}."""
+    if engine is None:
+        from ..database import engine
+
+    c = WorkItem.__table__.c
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(c.status, func.count()).where(c.job == job).group_by(c.status)
+        )
+        counts = dict(result.all())
+    return {status: counts.get(status, 0) for status in STATUSES}
+
+
+__all__ = [
+    "LeasedItem",
+    "now_ms",
+    "plan_work",
+    "create_job",
+    "claim",
+    "heartbeat",
+    "complete",
+    "fail",
+    "defer",
+    "park_requests",
+    "job_progress",
+]
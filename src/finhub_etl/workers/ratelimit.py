@@ -0,0 +1,166 @@
+"""Token-bucket rate limiters for API calls.
+
+Finnhub enforces its request quota per API key, not per process, so workers
+on several hosts must draw from one budget. `SharedRateLimiter` keeps the
+bucket in the `rate_limits` table: taking a token is a single conditional
+UPDATE that refills the bucket from the elapsed time and subtracts the
+tokens only if enough are available, so concurrent workers never overdraw
+it and need no locks beyond the row update. Hosts are assumed to have
+NTP-synced clocks; a clock running behind adds no tokens.
+
+`LocalRateLimiter` is the same bucket in memory, for a single process or
+when no shared database is available.
+
+Example:
+    >>> limiter = SharedRateLimiter("finnhub", rate_per_second=30)
+    >>> await limiter.acquire()
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import case, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..loaders import build_insert
+from ..models import RateLimitBucket
+from .leases import now_ms
+
+
+class LocalRateLimiter:
+    """In-process token bucket.
+
+    Args:
+        rate_per_second: Tokens added per second
+        capacity: Bucket size, i.e. the largest burst (default: one second of tokens)
+    """
+
+    def __init__(self, rate_per_second: float, capacity: Optional[float] = None):
+        self.rate = rate_per_second
+        self.capacity = capacity if capacity is not None else max(rate_per_second, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available.
+
+        Returns:
+            0.0 on success, else the estimated seconds until enough tokens accrue
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate if self.rate > 0 else float("inf")
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until `tokens` are available and take them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        async with self._lock:
+            while (wait := self.try_acquire(tokens)) > 0:
+                await asyncio.sleep(wait)
+        return time.monotonic() - started
+
+
+class SharedRateLimiter:
+    """Token bucket stored in the database, shared by every worker.
+
+    Args:
+        name: Bucket name, e.g. one per API key (default: 'finnhub')
+        rate_per_second: Tokens added per second (Finnhub's free tier: 1)
+        capacity: Bucket size, i.e. the largest burst (default: one second of tokens)
+        max_wait: Upper bound on a single sleep between attempts (default: 1.0)
+        engine: Async engine (default: finhub_etl.database.engine)
+    """
+
+    def __init__(
+        self,
+        name: str = "finnhub",
+        rate_per_second: float = 1.0,
+        capacity: Optional[float] = None,
+        max_wait: float = 1.0,
+        engine: Optional[AsyncEngine] = None,
+    ):
+        if engine is None:
+            from ..database import engine
+
+        self.name = name
+        self.rate = rate_per_second
+        self.capacity = capacity if capacity is not None else max(rate_per_second, 1.0)
+        self.max_wait = max_wait
+        self.engine = engine
+        self._ready = False
+
+    async def setup(self) -> None:
+        """Create the bucket row if missing and apply this limiter's rate and capacity."""
+        table = RateLimitBucket.__table__
+        c = table.c
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                build_insert(table, conn.dialect.name, "ignore"),
+                [{
+                    "name": self.name, "capacity": self.capacity, "refill_per_second": self.rate,
+                    "tokens": self.capacity, "updated_at": now_ms(),
+                }],
+            )
+            await conn.execute(
+                update(table).where(c.name == self.name)
+                .values(capacity=self.capacity, refill_per_second=self.rate)
+            )
+        self._ready = True
+
+    async def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens from the shared bucket if available.
+
+        Returns:
+            0.0 on success, else the estimated seconds until enough tokens accrue
+        """
+        if not self._ready:
+            await self.setup()
+
+        table = RateLimitBucket.__table__
+        c = table.c
+        now = now_ms()
+        elapsed = case((c.updated_at < now, (now - c.updated_at) / 1000.0), else_=0.0)
+        refilled = c.tokens + elapsed * c.refill_per_second
+        available = case((refilled > c.capacity, c.capacity), else_=refilled)
+
+        async with self.engine.begin() as conn:
+            # MySQL evaluates SET left to right: tokens must read the old updated_at
+            result = await conn.execute(
+                update(table)
+                .where(c.name == self.name, available >= tokens)
+                .ordered_values(
+                    (c.tokens, available - tokens),
+                    (c.updated_at, case((c.updated_at < now, now), else_=c.updated_at)),
+                )
+            )
+            if result.rowcount == 1:
+                return 0.0
+            current = (await conn.execute(select(available).where(c.name == self.name))).scalar_one()
+        return (tokens - current) / self.rate if self.rate > 0 else float("inf")
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until `tokens` are available in the shared bucket and take them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        while (wait := await self.try_acquire(tokens)) > 0:
+            await asyncio.sleep(min(wait, self.max_wait))
+        return time.monotonic() - started
+
+
+__all__ = [
+    "LocalRateLimiter",
+    "SharedRateLimiter",
+]
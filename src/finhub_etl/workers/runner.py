@@ -0,0 +1,246 @@
+"""Worker processes that drain a job's lease table.
+
+`run_worker` is one worker: it claims a batch of items, keeps their leases
+alive with a background heartbeat while the handler runs, and completes or
+fails each item. It returns once the job has nothing pending or leased.
+`run_workers` starts several of them as spawned processes, each with its own
+engine; start it on more hosts against the same database to scale out.
+
+A handler is an async callable `handler(item, limiter)`. The default,
+`load_work_item`, loads the item's endpoint for every symbol of its shard
+through `load_endpoint`.
+
+Example:
+    $ python -m finhub_etl.workers.runner plan candles-2024 --datasets /stock/candle \\
+          --symbols AAPL MSFT NVDA --window 1704067200:1735689599 --param resolution=D
+    $ python -m finhub_etl.workers.runner run candles-2024 --processes 4 --rate 1
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from ..config.breaker import CircuitOpenError
+from ..config.priority import priority
+from ..loaders import load_company_news, load_endpoint, load_windowed
+from .leases import LeasedItem, claim, complete, create_job, defer, fail, heartbeat, job_progress, plan_work
+from .ratelimit import SharedRateLimiter
+
+Handler = Callable[[LeasedItem, Any], Awaitable[Any]]
+
+
+async def load_work_item(item: LeasedItem, limiter: Any = None) -> int:
+    """Default handler: fetch the item's endpoint for each symbol and bulk load the rows.
+
+    Requests go out in the 'backfill' priority class unless the item's
+    params name another under 'priority'. Items flagged 'windowed' load
+    their from..to range in adaptive sub-windows with `load_windowed`,
+    or into the article store with `load_company_news` for /company-news.
+    """
+    params = dict(item.params)
+    symbols = params.pop("symbols", None)
+    request_class = params.pop("priority", "backfill")
+    with priority(request_class):
+        if params.pop("windowed", False):
+            start, end = params.pop("from"), params.pop("to")
+            symbols = symbols or [params.pop("symbol")]
+            if item.dataset == "/company-news":
+                return sum(await load_company_news(symbols, start, end, limiter=limiter))
+            return await load_windowed(item.dataset, symbols, start, end, params, limiter=limiter)
+        params_list = [dict(params, symbol=symbol) for symbol in symbols] if symbols else [params]
+        return await load_endpoint(item.dataset, params_list, limiter=limiter)
+
+
+async def _keep_alive(token: str, lease_seconds: float, engine: AsyncEngine) -> None:
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        await heartbeat(token, lease_seconds, engine)
+
+
+async def run_worker(
+    job: str,
+    handler: Handler = load_work_item,
+    owner: Optional[str] = None,
+    batch_size: int = 1,
+    lease_seconds: float = 60.0,
+    max_attempts: int = 3,
+    poll_interval: float = 1.0,
+    limiter: Any = None,
+    until_idle: bool = False,
+    engine: Optional[AsyncEngine] = None,
+) -> Dict[str, int]:
+    """Claim and process a job's items until none are pending or leased.
+
+    An item refused by an open circuit breaker is deferred until the breaker
+    may close again, without spending one of its attempts.
+
+    Args:
+        job: Job name
+        handler: Async `handler(item, limiter)` (default: `load_work_item`)
+        owner: Lease owner name (default: '<hostname>:<pid>')
+        batch_size: Items claimed per round trip (default: 1)
+        lease_seconds: Lease length, renewed every third of it (default: 60)
+        max_attempts: Attempts before an item is marked failed (default: 3)
+        poll_interval: Sleep while only other workers' leases remain (default: 1.0)
+        limiter: Rate limiter passed to the handler (default: none)
+        until_idle: Return as soon as nothing is claimable instead of waiting
+            for deferred items and other workers' leases (default: False)
+        engine: Async engine (default: finhub_etl.database.engine)
+
+    Returns:
+        {'done': n, 'failed': m, 'deferred': k} for items this worker handled
+    """
+    if engine is None:
+        from ..database import engine
+
+    owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+    counts = {"done": 0, "failed": 0, "deferred": 0}
+
+    while True:
+        items = await claim(job, owner, batch_size, lease_seconds, engine, max_attempts=max_attempts)
+        if not items:
+            if until_idle:
+                return counts
+            progress = await job_progress(job, engine)
+            if not progress["pending"] and not progress["leased"]:
+                return counts
+            # Remaining items are leased elsewhere; retake them if those leases expire
+            await asyncio.sleep(poll_interval)
+            continue
+
+        beat = asyncio.create_task(_keep_alive(items[0].token, lease_seconds, engine))
+        try:
+            for item in items:
+                try:
+                    await handler(item, limiter)
+                except CircuitOpenError as exc:
+                    await defer(item, exc.retry_after, str(exc), engine)
+                    counts["deferred"] += 1
+                except Exception as exc:
+                    print(f"❌ {owner}: item {item.id} ({item.dataset}) failed: {exc!r}")
+                    await fail(item, repr(exc), max_attempts, engine)
+                    counts["failed"] += 1
+                else:
+                    if await complete(item, engine):
+                        counts["done"] += 1
+                    else:
+                        print(f"⚠️ {owner}: lease on item {item.id} was lost before completion")
+        finally:
+            beat.cancel()
+
+
+def _worker_main(
+    job: str,
+    handler: Handler,
+    index: int,
+    database_url: Optional[str],
+    rate_per_second: Optional[float],
+    options: Dict[str, Any],
+) -> Dict[str, int]:
+    async def main() -> Dict[str, int]:
+        engine = create_async_engine(database_url) if database_url else None
+        if engine is None:
+            from ..database import engine
+        limiter = SharedRateLimiter(rate_per_second=rate_per_second, engine=engine) if rate_per_second else None
+        try:
+            owner = f"{socket.gethostname()}:{os.getpid()}:{index}"
+            return await run_worker(job, handler, owner=owner, limiter=limiter, engine=engine, **options)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def run_workers(
+    job: str,
+    processes: int = 4,
+    handler: Handler = load_work_item,
+    database_url: Optional[str] = None,
+    rate_per_second: Optional[float] = None,
+    **options: Any,
+) -> Dict[str, int]:
+    """Run `processes` workers on this host and wait for the job to drain.
+
+    Args:
+        job: Job name
+        processes: Worker processes (default: 4)
+        handler: Module-level async handler, importable by spawned processes
+            (default: `load_work_item`)
+        database_url: Database for the workers (default: $DATABASE_URL)
+        rate_per_second: Shared request budget across every worker on every
+            host, via `SharedRateLimiter` (default: unlimited)
+        **options: Passed to `run_worker` (batch_size, lease_seconds, ...)
+
+    Returns:
+        {'done': n, 'failed': m, 'deferred': k} summed over this host's workers
+    """
+    # Spawned workers: forking a process that runs the event loop's threads can deadlock
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        futures = [
+            pool.submit(_worker_main, job, handler, index, database_url, rate_per_second, options)
+            for index in range(processes)
+        ]
+        results: List[Dict[str, int]] = [future.result() for future in futures]
+
+    totals = {key: sum(result[key] for result in results) for key in ("done", "failed", "deferred")}
+    print(f"✅ {job}: {totals['done']} items done, {totals['failed']} failed by {processes} workers")
+    return totals
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Plan and run leased ETL jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan = commands.add_parser("plan", help="split a job into work items")
+    plan.add_argument("job")
+    plan.add_argument("--datasets", nargs="+", required=True, help="endpoints, e.g. /stock/candle")
+    plan.add_argument("--symbols", nargs="+", required=True)
+    plan.add_argument("--shard-size", type=int, default=50)
+    plan.add_argument("--window", action="append", default=[], help="FROM:TO, repeatable")
+    plan.add_argument("--param", action="append", default=[], help="KEY=VALUE, repeatable")
+    plan.add_argument("--windowed", action="store_true",
+                      help="load each FROM:TO (YYYY-MM-DD) in adaptive sub-windows, e.g. /company-news")
+
+    run = commands.add_parser("run", help="work a job on this host")
+    run.add_argument("job")
+    run.add_argument("--processes", type=int, default=4)
+    run.add_argument("--rate", type=float, help="requests per second shared by all workers")
+    run.add_argument("--batch-size", type=int, default=1)
+    run.add_argument("--lease-seconds", type=float, default=60.0)
+    run.add_argument("--max-attempts", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "plan":
+        windows = [tuple(window.split(":", 1)) for window in args.window]
+        params = dict(param.split("=", 1) for param in args.param)
+        if args.windowed:
+            params["windowed"] = True
+        items = plan_work(args.datasets, args.symbols, args.shard_size, windows or None, params)
+        print(f"Planned {asyncio.run(create_job(args.job, items))} items for {args.job}")
+    else:
+        run_workers(
+            args.job,
+            processes=args.processes,
+            rate_per_second=args.rate,
+            batch_size=args.batch_size,
+            lease_seconds=args.lease_seconds,
+            max_attempts=args.max_attempts,
+        )
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = [
+    "load_work_item",
+    "run_worker",
+    "run_workers",
+]
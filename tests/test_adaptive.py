@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+from finhub_etl.config.adaptive import AdaptiveConcurrency
+
+
+def test_limit_grows_additively_while_healthy():
+    async def run():
+        limiter = AdaptiveConcurrency(initial=4, max_limit=6)
+        for _ in range(40):
+            async with limiter.slot("/quote") as outcome:
+                outcome.status = 200
+        return limiter
+
+    limiter = asyncio.run(run())
+
+    assert limiter.limit("/quote") == 6
+    assert limiter.metrics()["/quote"]["decreases"] == 0
+
+
+def test_burst_of_429s_cuts_once_per_window():
+    async def run():
+        limiter = AdaptiveConcurrency(initial=8)
+
+        async def rejected():
+            async with limiter.slot("/stock/candle") as outcome:
+                await asyncio.sleep(0.01)
+                outcome.status = 429
+
+        await asyncio.gather(*(rejected() for _ in range(8)))
+        return limiter
+
+    limiter = asyncio.run(run())
+
+    # Eight concurrent 429s from the same window: one halving, not eight
+    assert limiter.limit("/stock/candle") == 4
+    assert limiter.metrics()["/stock/candle"]["decreases"] == 1
+
+
+def test_timeouts_and_latency_spikes_cut_and_endpoints_are_independent():
+    async def run():
+        limiter = AdaptiveConcurrency(initial=8, warmup=3, min_spike=0.0)
+        for _ in range(3):
+            async with limiter.slot("/stock/profile2") as outcome:
+                await asyncio.sleep(0.005)
+                outcome.status = 200
+        before = limiter.limit("/stock/profile2")
+        async with limiter.slot("/stock/profile2") as outcome:
+            await asyncio.sleep(0.1)
+            outcome.status = 200
+        with pytest.raises(httpx.ReadTimeout):
+            async with limiter.slot("/company-news"):
+                raise httpx.ReadTimeout("slow")
+        return limiter, before
+
+    limiter, before = asyncio.run(run())
+
+    assert limiter.limit("/stock/profile2") == pytest.approx(before / 2)
+    assert limiter.limit("/company-news") == 4
+
+
+def test_concurrency_converges_below_server_capacity():
+    capacity = 6
+    peak = {"in_flight": 0, "rejected": 0}
+
+    async def run():
+        limiter = AdaptiveConcurrency(initial=2, max_limit=64)
+        active = 0
+
+        async def request():
+            nonlocal active
+            async with limiter.slot("/stock/candle") as outcome:
+                active += 1
+                peak["in_flight"] = max(peak["in_flight"], active)
+                overloaded = active > capacity
+                await asyncio.sleep(0.002)
+                active -= 1
+                outcome.status = 429 if overloaded else 200
+                peak["rejected"] += overloaded
+
+        await asyncio.gather(*(request() for _ in range(600)))
+        return limiter
+
+    limiter = asyncio.run(run())
+
+    assert limiter.limit("/stock/candle") <= capacity + 2
+    assert peak["rejected"] < 60
@@ -0,0 +1,96 @@
+import asyncio
+import gzip
+import threading
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.models import CompanyNews
+from finhub_etl.storage import ArchiveWriter, archive_files, iter_archive, replay_archive
+from finhub_etl.storage import archive as archive_module
+from finhub_etl.storage.archive import zstandard
+
+COMPRESSIONS = ["gzip"] + (["zstd"] if zstandard is not None else [])
+
+
+def _news(count):
+    return [{"symbol": "AAPL", "datetime": 1704153600 + i, "id": i, "headline": f"Headline é {i}"}
+            for i in range(count)]
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_round_trip_with_size_rotation(tmp_path, compression):
+    with ArchiveWriter(tmp_path, prefix="news", compression=compression, max_bytes=1) as archive:
+        for start in range(0, 30, 10):
+            archive.write_many(_news(30)[start:start + 10])
+        # Only published files are visible while writing
+        assert len(archive_files(tmp_path)) == 2
+
+    assert len(archive.files) == 3
+    assert list(iter_archive(tmp_path)) == _news(30)
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_replay_into_db(tmp_path, monkeypatch):
+    with ArchiveWriter(tmp_path, compression="gzip") as archive:
+        archive.write_many(_news(25))
+        archive.write_many(_news(5))  # duplicates are upserted
+
+    threads = []
+    open_lines = archive_module._open_lines
+
+    def tracking_open_lines(path):
+        threads.append(threading.get_ident())
+        return open_lines(path)
+
+    monkeypatch.setattr(archive_module, "_open_lines", tracking_open_lines)
+
+    async def run():
+        threads.append(threading.get_ident())
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[CompanyNews.__table__])
+        written = await replay_archive(tmp_path, CompanyNews, batch_size=7, engine=engine)
+        async with engine.connect() as conn:
+            stored = await conn.scalar(select(func.count()).select_from(CompanyNews.__table__))
+        await engine.dispose()
+        return written, stored
+
+    assert asyncio.run(run()) == (30, 25)
+    # Files are read off the event loop
+    assert len(threads) == 2 and threads[1] != threads[0]
+
+
+def test_writers_sharing_a_prefix_never_share_a_file(tmp_path):
+    writers = [ArchiveWriter(tmp_path, prefix="news", compression="gzip") for _ in range(3)]
+    for i, writer in enumerate(writers):
+        writer.write_many(_news(30)[i * 10:(i + 1) * 10])
+    for writer in writers:
+        writer.close()
+
+    assert len({path.name for writer in writers for path in writer.files}) == 3
+    assert len(archive_files(tmp_path)) == 3
+    assert sorted(record["id"] for record in iter_archive(tmp_path)) == list(range(30))
+
+
+def test_files_replay_in_timestamp_order_across_prefixes(tmp_path):
+    for name, n in (("zz-20240101T000000-0000", 1), ("aa-20240102T000000-0000-0c1d2e3f", 3),
+                    ("mm-20240101T120000-0009-ffffffff", 2), ("mm-20240101T120000-0010-00000000", 2.5)):
+        with gzip.open(tmp_path / f"{name}.ndjson.gz", "wb") as f:
+            f.write(b'{"n": %s}\n' % str(n).encode())
+
+    assert [record["n"] for record in iter_archive(tmp_path)] == [1, 2, 2.5, 3]
+
+
+def test_write_many_async_keeps_every_record(tmp_path):
+    async def run():
+        with ArchiveWriter(tmp_path, compression="gzip", max_bytes=200) as archive:
+            counts = await asyncio.gather(*(archive.write_many_async(_news(30)[i:i + 3]) for i in range(0, 30, 3)))
+        return counts, archive
+
+    counts, archive = asyncio.run(run())
+
+    assert sum(counts) == archive.records == 30 and len(archive.files) > 1
+    assert sorted(record["id"] for record in iter_archive(tmp_path)) == list(range(30))
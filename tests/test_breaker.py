@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+import pytest
+
+from finhub_etl.config.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreakers, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _call(breakers, endpoint, status):
+    async with breakers.guard(endpoint) as outcome:
+        outcome.status = status
+
+
+def test_breaker_opens_probes_and_closes():
+    clock = Clock()
+    breakers = CircuitBreakers(failure_threshold=3, reset_timeout=30, success_threshold=2, clock=clock)
+
+    async def run():
+        for _ in range(3):
+            await _call(breakers, "/stock/financials-reported", 503)
+        assert breakers.breaker("/stock/financials-reported").state == OPEN
+        # Other endpoints keep flowing
+        await _call(breakers, "/stock/candle", 200)
+
+        with pytest.raises(CircuitOpenError) as refused:
+            await _call(breakers, "/stock/financials-reported", 200)
+        assert refused.value.retry_after == 30
+
+        clock.now = 31
+        await _call(breakers, "/stock/financials-reported", 200)
+        assert breakers.breaker("/stock/financials-reported").state == HALF_OPEN
+        await _call(breakers, "/stock/financials-reported", 200)
+        assert breakers.breaker("/stock/financials-reported").state == CLOSED
+
+    asyncio.run(run())
+
+    metrics = breakers.metrics()
+    assert metrics["/stock/financials-reported"]["trips"] == 1
+    assert metrics["/stock/financials-reported"]["rejected"] == 1
+    assert metrics["/stock/candle"]["state"] == CLOSED
+
+
+def test_half_open_failure_reopens_and_probes_are_limited():
+    clock = Clock()
+    breakers = CircuitBreakers(failure_threshold=1, reset_timeout=10, half_open_max=1, clock=clock)
+
+    async def run():
+        with pytest.raises(httpx.ConnectError):
+            async with breakers.guard("/quote"):
+                raise httpx.ConnectError("down")
+        clock.now = 11
+        breakers.check("/quote")          # the single probe is in flight
+        with pytest.raises(CircuitOpenError):
+            breakers.check("/quote")
+        breakers.record("/quote", failed=True)
+
+    asyncio.run(run())
+
+    assert breakers.breaker("/quote").state == OPEN
+    assert breakers.breaker("/quote").trips == 2
+
+
+def test_throttling_and_client_errors_do_not_trip():
+    breakers = CircuitBreakers(failure_threshold=2)
+
+    async def run():
+        for status in (500, 429, 500):
+            await _call(breakers, "/stock/candle", status)
+
+    asyncio.run(run())
+    assert breakers.breaker("/stock/candle").state == OPEN
+
+    breakers = CircuitBreakers(failure_threshold=2)
+
+    async def run_mixed():
+        for status in (500, 403, 500):
+            await _call(breakers, "/stock/candle", status)
+
+    asyncio.run(run_mixed())
+    assert breakers.breaker("/stock/candle").state == CLOSED
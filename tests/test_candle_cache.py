@@ -0,0 +1,72 @@
+import asyncio
+
+import numpy as np
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.loaders import BulkWriter
+from finhub_etl.models import CandlestickData
+from finhub_etl.storage import CandleCache, sync_candle_cache
+
+DAY = 86400
+
+
+def _bars(timestamps, close):
+    return {"timestamp": timestamps, "open": close, "high": close, "low": close,
+            "close": close, "volume": np.ones(len(close))}
+
+
+def test_append_and_zero_copy_range_read(tmp_path):
+    cache = CandleCache(tmp_path)
+    ts = np.arange(10) * DAY
+    cache.append("AAPL", "D", _bars(ts, ts / DAY))
+    cache.append("AAPL", "D", _bars(ts + 10 * DAY, ts / DAY + 10))
+
+    bars = cache.read("AAPL", "D", 3 * DAY, 5 * DAY)
+    assert bars["timestamp"].tolist() == [3 * DAY, 4 * DAY, 5 * DAY]
+    assert bars["close"].tolist() == [3.0, 4.0, 5.0]
+    assert isinstance(bars["close"].base, np.memmap) or isinstance(bars["close"], np.memmap)
+    assert cache.length("AAPL", "D") == 20
+    assert cache.last_timestamp("AAPL", "D") == 19 * DAY
+
+
+def test_overlapping_batch_rewrites_tail(tmp_path):
+    cache = CandleCache(tmp_path)
+    cache.append("AAPL", "D", _bars(np.arange(5) * DAY, np.arange(5.0)))
+    before = cache.read("AAPL", "D")
+
+    cache.append("AAPL", "D", _bars(np.array([3, 6]) * DAY, np.array([30.0, 60.0])))
+
+    bars = cache.read("AAPL", "D")
+    assert bars["timestamp"].tolist() == [0, DAY, 2 * DAY, 3 * DAY, 4 * DAY, 6 * DAY]
+    assert bars["close"].tolist() == [0.0, 1.0, 2.0, 30.0, 4.0, 60.0]
+    # Views taken before the rewrite stay readable
+    assert before["close"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_sync_from_db_and_writer_listener(tmp_path):
+    cache = CandleCache(tmp_path)
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[CandlestickData.__table__])
+        writer = BulkWriter(CandlestickData, engine=engine)
+        await writer.write_rows([
+            {"symbol": s, "resolution": "D", "timestamp": i * DAY, "close": float(i)}
+            for s in ("AAPL", "MSFT") for i in range(3)
+        ])
+        first = await sync_candle_cache(cache, engine=engine)
+        again = await sync_candle_cache(cache, engine=engine)
+
+        writer.listeners.append(cache.write_rows)
+        await writer.write_rows([{"symbol": "AAPL", "resolution": "D", "timestamp": 3 * DAY, "close": 3.0}])
+        await engine.dispose()
+        return first, again
+
+    first, again = asyncio.run(run())
+
+    assert (first, again) == (6, 0)
+    assert cache.symbols("D") == ["AAPL", "MSFT"]
+    assert cache.read("AAPL", "D")["close"].tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert np.isnan(cache.read("MSFT", "D")["volume"]).all()
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.analytics import resample, store_resampled
+from finhub_etl.database import read_candles
+from finhub_etl.database.candles import partition_name
+from finhub_etl.loaders import BulkWriter
+from finhub_etl.models import CandlestickData, MarketHoliday
+
+OPEN = 1704205800  # 2024-01-02 09:30 America/New_York
+
+
+async def _store_session(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[CandlestickData.__table__, MarketHoliday.__table__],
+        )
+    rows = [
+        {"symbol": "AAPL", "resolution": "1", "timestamp": OPEN + 60 * i,
+         "open": 1.0 + i, "high": 2.0 + i, "low": 0.5 + i, "close": 1.5 + i, "volume": 10}
+        for i in range(390)
+    ]
+    await BulkWriter(CandlestickData, engine=engine).write_rows(rows)
+
+
+def test_resolutions_share_symbol_and_timestamp():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        await _store_session(engine)
+        written = await store_resampled(["AAPL"], OPEN - 34200, OPEN + 52200, targets=("60", "D"), engine=engine)
+        hourly = await read_candles(["AAPL"], "60", OPEN, OPEN + 86400, engine)
+        daily = await read_candles(["AAPL"], "D", 0, OPEN + 86400, engine)
+        minutes = await read_candles(["AAPL"], "1", OPEN, OPEN + 119, engine)
+        await engine.dispose()
+        return written, hourly, daily, minutes
+
+    written, hourly, daily, minutes = asyncio.run(run())
+
+    assert written == {"60": 7, "D": 1}
+    assert hourly["AAPL"]["timestamp"][0] == OPEN
+    assert hourly["AAPL"]["volume"].tolist() == [600] * 6 + [300]
+    assert daily["AAPL"]["high"][0] == 391.0
+    assert minutes["AAPL"]["timestamp"].tolist() == [OPEN, OPEN + 60]
+
+
+def test_partition_name():
+    assert partition_name(OPEN) == "p202401"
+
+
+def _utc(*args):
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+
+def _minute_bars(*opens):
+    t = np.concatenate([np.arange(start, start + 390 * 60, 60) for start in opens])
+    x = np.arange(len(t), dtype=float)
+    return t, x, x + 1, x - 1, x + 0.5, np.full(len(t), 10.0)
+
+
+def test_daily_input_buckets_by_utc_date_and_skips_holidays():
+    days = np.arange(np.datetime64("2024-01-02"), np.datetime64("2024-02-03"))
+    days = days[np.is_busday(days)]                      # includes the 2024-01-15 closure
+    t = days.astype("datetime64[s]").astype(np.int64)
+    x = np.arange(len(t), dtype=float)
+    bars = (t, x, x + 1, x - 1, x + 0.5, np.full(len(t), 100.0))
+    holidays = {"2024-01-15": None, "2024-01-01": ""}
+
+    daily = resample(*bars, "D", holidays=holidays)
+    weekly = resample(*bars, "W", holidays=holidays)
+    monthly = resample(*bars, "M", holidays=holidays)
+
+    assert daily["t"][0] == _utc(2024, 1, 2) and len(daily["t"]) == len(t) - 1
+    assert _utc(2024, 1, 15) not in daily["t"].tolist()
+    assert weekly["t"].tolist()[:3] == [_utc(2024, 1, 2), _utc(2024, 1, 8), _utc(2024, 1, 16)]
+    assert weekly["v"].tolist()[:3] == [400.0, 500.0, 400.0]
+    assert monthly["t"].tolist() == [_utc(2024, 1, 2), _utc(2024, 2, 1)]
+    assert monthly["v"].tolist() == [2100.0, 200.0] and monthly["c"][-1] == x[-1] + 0.5
+
+
+def test_half_day_ends_at_its_trading_hour_close():
+    open_ = _utc(2024, 11, 29, 14, 30)                   # 09:30 EST
+    hourly = resample(*_minute_bars(open_), "60", holidays={"2024-11-29": "09:30-13:00"})
+    daily = resample(*_minute_bars(open_), "D", holidays={"2024-11-29": "09:30-13:00"})
+
+    assert hourly["t"].tolist() == [open_ + 3600 * i for i in range(4)]
+    assert hourly["v"][-1] == 300.0
+    assert daily["t"].tolist() == [_utc(2024, 11, 29)] and daily["v"].tolist() == [2100.0]
+
+
+def test_sessions_follow_the_exchange_clock_across_dst():
+    before, after = _utc(2024, 3, 8, 14, 30), _utc(2024, 3, 11, 13, 30)   # 09:30 EST / EDT
+    bars = _minute_bars(before, after)
+
+    hourly = resample(*bars, "60")
+    daily = resample(*bars, "D")
+
+    assert hourly["t"].tolist() == [before + 3600 * i for i in range(7)] + [after + 3600 * i for i in range(7)]
+    assert daily["t"].tolist() == [_utc(2024, 3, 8), _utc(2024, 3, 11)]
+    assert daily["v"].tolist() == [3900.0, 3900.0]
+    assert len(resample(*bars, "W")["t"]) == 2
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from finhub_etl.config import decoders
+from finhub_etl.config.decoders import (
+    MsgspecDecoder,
+    OrjsonDecoder,
+    StdlibDecoder,
+    available_decoders,
+    get_decoder,
+)
+
+msgspec = pytest.importorskip("msgspec")
+pytest.importorskip("orjson")
+
+SYMBOLS = [
+    {"symbol": "AAPL", "displaySymbol": "AAPL", "description": "APPLE INC", "currency": "USD",
+     "figi": "BBG000B9XRY4", "mic": "XNAS", "type": "Common Stock"},
+    {"symbol": "NEW"},
+]
+CANDLES = {"s": "ok", "t": [100, 200], "o": [1.0, 2.0], "h": [1.5, 2.5], "l": [0.5, 1.5], "c": [1.2, 2.2], "v": [10, 20]}
+FINANCIALS = {"cik": "320193", "symbol": "AAPL", "data": [
+    {"accessNumber": "0000320193-24-000123", "symbol": "AAPL", "year": 2024, "quarter": 0, "form": "10-K",
+     "filedDate": "2024-11-01 00:00:00", "report": {"bs": [{"concept": "Assets", "value": 1.0}]}},
+]}
+
+
+def test_get_decoder_prefers_the_fastest_installed_backend(monkeypatch):
+    monkeypatch.delenv("FINHUB_JSON_DECODER", raising=False)
+    assert available_decoders() == ["orjson", "msgspec", "json"]
+    assert isinstance(get_decoder(), OrjsonDecoder)
+
+    monkeypatch.setattr(decoders, "orjson", None)
+    assert available_decoders() == ["msgspec", "json"]
+    assert isinstance(get_decoder(), MsgspecDecoder)
+
+    monkeypatch.setattr(decoders, "msgspec", None)
+    assert available_decoders() == ["json"]
+    assert isinstance(get_decoder(), StdlibDecoder)
+
+
+def test_env_override_and_explicit_names(monkeypatch):
+    monkeypatch.setenv("FINHUB_JSON_DECODER", "json")
+    assert get_decoder().name == "json"
+    assert get_decoder("msgspec").name == "msgspec"             # an explicit name beats the env var
+
+    monkeypatch.setenv("FINHUB_JSON_DECODER", "simdjson")
+    with pytest.raises(ValueError, match="simdjson"):
+        get_decoder()
+
+    # A named backend that is not installed is an error, not a silent fallback
+    monkeypatch.setenv("FINHUB_JSON_DECODER", "orjson")
+    monkeypatch.setattr(decoders, "orjson", None)
+    with pytest.raises(ImportError):
+        get_decoder()
+    monkeypatch.delenv("FINHUB_JSON_DECODER")
+    assert get_decoder().name == "msgspec"
+
+
+def test_every_backend_decodes_the_same_payloads():
+    for payload in (SYMBOLS, CANDLES, FINANCIALS, {"c": 1.5, "t": None}):
+        body = json.dumps(payload).encode()
+        for name in available_decoders():
+            assert get_decoder(name).decode(body, "/stock/symbol") == payload, name
+
+
+def test_typed_msgspec_decoder_builds_the_endpoint_structs():
+    decoder = MsgspecDecoder(typed=True)
+
+    symbols = decoder.decode(json.dumps(SYMBOLS).encode(), "/stock/symbol")
+    assert [type(item).__name__ for item in symbols] == ["StockSymbolStruct"] * 2
+    assert symbols[0].display_symbol == "AAPL" and symbols[0].type == "Common Stock"
+    assert symbols[1].display_symbol is None
+
+    candles = decoder.decode(json.dumps(CANDLES).encode(), "/stock/candle")
+    assert candles.s == "ok" and candles.t == [100, 200] and candles.v == [10.0, 20.0]
+    assert decoder.decode(b'{"s": "no_data"}', "/stock/candle").c == []
+
+    financials = decoder.decode(json.dumps(FINANCIALS).encode(), "/stock/financials-reported")
+    filing = financials.data[0]
+    assert financials.cik == "320193"
+    assert (filing.access_number, filing.filed_date, filing.cik) == ("0000320193-24-000123", "2024-11-01 00:00:00", None)
+    assert filing.report == FINANCIALS["data"][0]["report"]
+
+    # Other endpoints, and the untyped decoder, return plain JSON
+    assert decoder.decode(b'{"c": 1.5}', "/quote") == {"c": 1.5}
+    assert MsgspecDecoder().decode(json.dumps(CANDLES).encode(), "/stock/candle") == CANDLES
+    with pytest.raises(msgspec.ValidationError):
+        decoder.decode(b'[{"displaySymbol": "X"}]', "/stock/symbol")
@@ -0,0 +1,76 @@
+import asyncio
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import JSON
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.loaders import BulkWriter
+from finhub_etl.models import TABLE_REGISTRY, CandlestickData, CompanyNews
+from finhub_etl.storage import export_table
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+
+JAN, FEB = 1704153600, 1706832000  # 2024-01-02, 2024-02-02 UTC
+
+
+async def _export(tmp_path, model, rows, **options):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[model.__table__])
+    await BulkWriter(model, engine=engine).write_rows(rows)
+    total = await export_table(model, tmp_path, chunk_size=3, engine=engine, **options)
+    await engine.dispose()
+    return total
+
+
+def test_candles_partitioned_by_symbol_and_month(tmp_path):
+    rows = [
+        {"symbol": symbol, "resolution": "D", "timestamp": ts + i * 86400, "close": float(i), "volume": i}
+        for symbol in ("AAPL", "BRK/B") for ts in (JAN, FEB) for i in range(4)
+    ]
+    total = asyncio.run(_export(tmp_path, CandlestickData, rows))
+
+    assert total == 16
+    root = tmp_path / "candlestick_data"
+    assert (root / "symbol=BRK%2FB" / "date=2024-02").is_dir()
+    table = ds.dataset(root, partitioning="hive").to_table()
+    assert table.num_rows == 16
+    assert table.schema.field("volume").type == pa.float64()
+    assert sorted(set(table.column("symbol").to_pylist())) == ["AAPL", "BRK/B"]
+
+
+def test_column_projection_and_overwrite(tmp_path):
+    rows = [{"symbol": "AAPL", "datetime": JAN + i, "id": i, "headline": f"h{i}", "summary": "x"} for i in range(5)]
+    asyncio.run(_export(tmp_path, CompanyNews, rows, columns=["id", "headline"], partition_by=["symbol"]))
+
+    table = ds.dataset(tmp_path / "company_news", partitioning="hive").to_table()
+    assert set(table.column_names) == {"id", "headline", "symbol"}
+    assert table.column("headline").to_pylist() == [f"h{i}" for i in range(5)]
+
+    with pytest.raises(FileExistsError):
+        asyncio.run(_export(tmp_path, CompanyNews, rows))
+    assert asyncio.run(_export(tmp_path, CompanyNews, rows, overwrite=True)) == 5
+
+
+def _sample_row(spec):
+    samples = {int: 1, float: 1.5, bool: True, datetime: datetime(2024, 1, 2, 3, 4, 5), date: date(2024, 1, 2)}
+    return {
+        column.name: ["A", "B"] if isinstance(column.type, JSON)
+        else samples.get(spec.column_types[column.name], "x")
+        for column in spec.table.columns
+    }
+
+
+def test_every_registry_table_exports(tmp_path):
+    for name, spec in sorted(TABLE_REGISTRY.items()):
+        assert asyncio.run(_export(tmp_path, spec.model, [_sample_row(spec)])) == 1, name
+        table = ds.dataset(tmp_path / name, partitioning="hive").to_table()
+        assert table.num_rows == 1, name
+
+    peers = ds.dataset(tmp_path / "company_peers", partitioning="hive").to_table()
+    assert peers.column("peers").to_pylist() == ['["A", "B"]']
+    matched = ds.dataset(tmp_path / "matched_stocks", partitioning="hive").to_table()
+    assert any(pa.types.is_timestamp(field.type) for field in matched.schema)
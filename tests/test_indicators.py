@@ -0,0 +1,142 @@
+import asyncio
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.analytics import update_indicators
+from finhub_etl.analytics.indicators import atr, bbands, ema, macd, rsi, sma
+from finhub_etl.loaders import BulkWriter
+from finhub_etl.models import CandlestickData, TechnicalIndicator
+
+DAY = 86400
+START = 1_600_000_000 // DAY * DAY
+
+
+def _bars(count, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 1.0, count))
+    high = close + rng.uniform(0.0, 2.0, count)
+    low = close - rng.uniform(0.0, 2.0, count)
+    return high, low, close
+
+
+# Naive references: one loop per definition, no vectorization
+
+def _naive_sma(values, window):
+    return [np.nan if i < window - 1 else sum(values[i - window + 1:i + 1]) / window for i in range(len(values))]
+
+
+def _naive_ema(values, window):
+    out, alpha = [np.nan] * len(values), 2.0 / (window + 1)
+    for i in range(window - 1, len(values)):
+        out[i] = sum(values[:window]) / window if i == window - 1 else alpha * values[i] + (1 - alpha) * out[i - 1]
+    return out
+
+
+def _naive_wilder(values, window, first):
+    out = [np.nan] * len(values)
+    for i in range(first + window - 1, len(values)):
+        if i == first + window - 1:
+            out[i] = sum(values[first:i + 1]) / window
+        else:
+            out[i] = (out[i - 1] * (window - 1) + values[i]) / window
+    return out
+
+
+def _naive_rsi(close, window):
+    gains = [0.0] + [max(close[i] - close[i - 1], 0.0) for i in range(1, len(close))]
+    losses = [0.0] + [max(close[i - 1] - close[i], 0.0) for i in range(1, len(close))]
+    out = []
+    for gain, loss in zip(_naive_wilder(gains, window, 1), _naive_wilder(losses, window, 1)):
+        out.append(np.nan if np.isnan(gain) else 100.0 - 100.0 / (1.0 + gain / loss))
+    return out
+
+
+def _naive_atr(high, low, close, window):
+    ranges = [high[0] - low[0]] + [
+        max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])) for i in range(1, len(close))
+    ]
+    return _naive_wilder(ranges, window, 0)
+
+
+def _naive_bbands(close, window, width):
+    middle = _naive_sma(close, window)
+    upper, lower = [], []
+    for i, mean in enumerate(middle):
+        if np.isnan(mean):
+            upper.append(np.nan)
+            lower.append(np.nan)
+            continue
+        std = (sum((x - mean) ** 2 for x in close[i - window + 1:i + 1]) / window) ** 0.5
+        upper.append(mean + width * std)
+        lower.append(mean - width * std)
+    return upper, middle, lower
+
+
+def _naive_macd(close, fast, slow, signal):
+    line = [a - b for a, b in zip(_naive_ema(close, fast), _naive_ema(close, slow))]
+    first = slow - 1
+    signal_line = [np.nan] * first + _naive_ema(line[first:], signal)
+    return line, signal_line, [a - b for a, b in zip(line, signal_line)]
+
+
+def _same(actual, expected):
+    np.testing.assert_allclose(np.asarray(actual, dtype=float), np.asarray(expected, dtype=float),
+                               rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_indicators_match_naive_references():
+    high, low, close = _bars(400)
+    values = close.tolist()
+
+    for window in (1, 5, 20):
+        _same(sma(close, window), _naive_sma(values, window))
+    for window in (2, 12, 26):
+        _same(ema(close, window), _naive_ema(values, window))
+    _same(rsi(close, 14), _naive_rsi(values, 14))
+    _same(atr(high, low, close, 14), _naive_atr(high.tolist(), low.tolist(), values, 14))
+    for actual, expected in zip(bbands(close, 20, 2.0), _naive_bbands(values, 20, 2.0)):
+        _same(actual, expected)
+    for actual, expected in zip(macd(close, 12, 26, 9), _naive_macd(values, 12, 26, 9)):
+        _same(actual, expected)
+
+    # Short series stay NaN instead of failing
+    assert np.isnan(sma(close[:3], 20)).all() and np.isnan(rsi(close[:3], 14)).all()
+
+
+def test_incremental_update_matches_a_full_recompute(tmp_path):
+    # Longer than the 400-day warm-up, so incremental runs start from a truncated history
+    high, low, close = _bars(600, seed=1)
+    rows = [
+        {"symbol": "AAPL", "resolution": "D", "timestamp": START + i * DAY,
+         "open": close[i], "high": high[i], "low": low[i], "close": close[i], "volume": 100}
+        for i in range(len(close))
+    ]
+
+    async def store(path, batches):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all,
+                                tables=[CandlestickData.__table__, TechnicalIndicator.__table__])
+        written = []
+        for batch in batches:
+            await BulkWriter(CandlestickData, engine=engine).write_rows(batch)
+            written.append(await update_indicators(["AAPL"], engine=engine))
+        table = TechnicalIndicator.__table__.c
+        async with engine.connect() as conn:
+            values = (await conn.execute(
+                select(table.indicator, table.timestamp, table.value).order_by(table.indicator, table.timestamp)
+            )).all()
+        await engine.dispose()
+        return written, values
+
+    full_written, full = asyncio.run(store(tmp_path / "full.sqlite", [rows]))
+    written, incremental = asyncio.run(store(tmp_path / "incremental.sqlite", [rows[:500], rows[500:540], rows[540:]]))
+
+    assert sum(written) == full_written[0] == len(full)
+    assert written[1] < written[0] and written[2] < written[0]
+    assert [(key, ts) for key, ts, _ in incremental] == [(key, ts) for key, ts, _ in full]
+    assert [value for _, _, value in incremental] == pytest.approx([value for _, _, value in full], rel=1e-9)
@@ -0,0 +1,155 @@
+import asyncio
+
+import httpx
+import pytest
+
+from finhub_etl.config import finhub
+from finhub_etl.config.finhub import FinnhubAPIClient
+from finhub_etl.config.keys import KeyPool, NoKeyAvailableError, keys_from_env
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_keys_from_env_prefers_the_pool(monkeypatch):
+    monkeypatch.setenv("FINHUB_API_KEY", "single")
+    monkeypatch.setenv("FINHUB_API_KEYS", " a, b ,,a,c")
+    assert keys_from_env() == ["a", "b", "c"]
+
+    monkeypatch.setenv("FINHUB_API_KEYS", "")
+    assert keys_from_env() == ["single"]
+
+
+def test_pool_picks_most_budget_and_scales_with_keys():
+    clock = Clock()
+    pool = KeyPool(["a", "b", "c"], rate_per_second=10, clock=clock)
+
+    # One second of budget per key, spread evenly
+    taken = [pool.try_acquire() for _ in range(30)]
+    assert pool.try_acquire() is None
+    assert {key.token: key.requests for key in pool.keys} == {"a": 10, "b": 10, "c": 10}
+
+    clock.now = 1.0
+    assert sum(pool.try_acquire() is not None for _ in range(40)) == 30
+    assert all(key is not None for key in taken)
+
+    single = KeyPool(["a"], rate_per_second=10, clock=clock)
+    assert sum(single.try_acquire() is not None for _ in range(40)) == 10
+
+
+def test_throttled_and_unauthorized_keys_are_quarantined():
+    clock = Clock()
+    pool = KeyPool(["a", "b"], rate_per_second=100, throttle_quarantine=10, auth_quarantine=600, clock=clock)
+    a, b = pool.keys
+
+    pool.report(a, 429)
+    assert [key.token for key in pool.healthy()] == ["b"]
+    assert all(pool.try_acquire() is b for _ in range(5))
+
+    clock.now = 11
+    pool.report(a, 429)              # second strike in a row: twice as long
+    clock.now = 11 + 19
+    assert a not in pool.healthy()
+    clock.now = 11 + 21
+    pool.report(a, 200)
+    assert a in pool.healthy() and a.strikes == 0
+
+    pool.report(b, 401)
+    clock.now += 599
+    assert b not in pool.healthy()
+    assert pool.metrics()[b.label]["unauthorized"] == 1
+
+
+def test_acquire_waits_for_quarantine_or_gives_up():
+    pool = KeyPool(["a"], rate_per_second=100, throttle_quarantine=0.05, auth_quarantine=600, max_wait=1)
+
+    async def run():
+        pool.report(pool.keys[0], 429)
+        key = await pool.acquire()
+        pool.report(key, 401)
+        with pytest.raises(NoKeyAvailableError):
+            await pool.acquire()
+        return key
+
+    assert asyncio.run(run()).token == "a"
+
+
+def test_client_retries_a_throttled_request_on_another_key():
+    seen = []
+
+    def handler(request):
+        token = request.headers["X-Finnhub-Token"]
+        seen.append(token)
+        return httpx.Response(429 if token == "busy-key-1" else 200, json={"c": 1})
+
+    pool = KeyPool(["busy-key-1", "idle-key-2"], rate_per_second=None)
+    client = FinnhubAPIClient(keys=pool)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            first = await client._send(http, "https://finnhub.test/quote", {"symbol": "AAPL"})
+            second = await client._send(http, "https://finnhub.test/quote", {"symbol": "MSFT"})
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first.status_code == second.status_code == 200
+    assert seen == ["busy-key-1", "idle-key-2", "idle-key-2"]
+    assert client.metrics()["keys"][pool.keys[0].label]["throttled"] == 1
+
+
+def test_streamed_requests_fail_over_to_another_key(monkeypatch):
+    seen = []
+    records = [{"symbol": f"S{i}"} for i in range(5)]
+
+    def handler(request):
+        token = request.headers["X-Finnhub-Token"]
+        seen.append(token)
+        if token == "revoked-key-1":
+            return httpx.Response(401, json={"error": "Invalid API key"})
+        return httpx.Response(200, json=records)
+
+    transport = httpx.MockTransport(handler)
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(finhub.httpx, "AsyncClient", lambda: async_client(transport=transport))
+    pool = KeyPool(["revoked-key-1", "good-key-2"], rate_per_second=None)
+    client = FinnhubAPIClient(keys=pool)
+
+    async def run():
+        return [record async for batch in client.stream("/stock/symbol", {"exchange": "US"}, 2) for record in batch]
+
+    assert asyncio.run(run()) == records
+    assert seen == ["revoked-key-1", "good-key-2"]
+    assert pool.keys[0] not in pool.healthy()
+
+
+def test_concurrent_429s_count_as_one_strike_and_spare_the_last_key():
+    clock = Clock()
+    pool = KeyPool(["a", "b"], rate_per_second=None, throttle_quarantine=30, last_key_backoff=5, clock=clock)
+    a, b = pool.keys
+
+    # Eight requests in flight on 'a' all answer 429
+    for _ in range(8):
+        pool.report(a, 429, started=0.0)
+    assert (a.strikes, a.throttled, a.quarantined_until) == (1, 8, 30.0)
+
+    # A request sent after the quarantine began is a new strike
+    clock.now = 31
+    pool.report(a, 429, started=30.5)
+    assert (a.strikes, a.quarantined_until) == (2, 91.0)
+
+    # With 'a' resting, 'b' is the last healthy key: short fixed backoff however many 429s arrive
+    for _ in range(8):
+        pool.report(b, 429, started=31.0)
+    assert b.strikes == 1 and b.quarantined_until == 36.0
+
+    single = KeyPool(["only"], rate_per_second=None, throttle_quarantine=30, last_key_backoff=5, clock=clock)
+    for started in (31.0, 31.0, 40.0, 50.0, 60.0):
+        clock.now = started + 0.5
+        single.report(single.keys[0], 429, started=started)
+    assert single.keys[0].quarantined_until - clock.now == 5.0
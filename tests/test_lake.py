@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.models import CandlestickData, CompanyNews, MarketHoliday, NewsArticle, NewsSymbol
+from finhub_etl.storage import RawLake, rebuild
+
+
+def _holidays(name):
+    return json.dumps({"exchange": "US", "timezone": "America/New_York", "data": [
+        {"eventName": name, "atDate": "2024-12-25", "tradingHour": ""},
+        {"eventName": "Christmas Eve", "atDate": "2024-12-24", "tradingHour": "09:30-13:00"},
+    ]}).encode()
+
+
+def test_objects_are_content_addressed(tmp_path):
+    lake = RawLake(tmp_path, compression="gzip")
+    first = lake.put("/stock/market-holiday", {"exchange": "US"}, _holidays("Christmas"), fetched_at=1.0)
+    second = lake.put("/stock/market-holiday", {"exchange": "US"}, _holidays("Christmas"), fetched_at=2.0)
+
+    assert first != second
+    assert len(list((tmp_path / "objects").rglob("*.json.gz"))) == 1
+    assert [e.fetched_at for e in lake.entries(latest=False)] == [1.0, 2.0]
+    assert [e.fetched_at for e in lake.entries()] == [2.0]
+    assert lake.read(lake.entries()[0].object) == _holidays("Christmas")
+
+
+def test_rebuild_reruns_transforms_in_worker_processes(tmp_path):
+    lake = RawLake(tmp_path, compression="gzip")
+    lake.put("/stock/market-holiday", {"exchange": "US"}, _holidays("Xmas"), fetched_at=1.0)
+    lake.put("/stock/market-holiday", {"exchange": "US"}, _holidays("Christmas Day"), fetched_at=2.0)
+    for i, symbol in enumerate(("AAPL", "MSFT")):
+        body = {"s": "ok", "t": [100, 200], "o": [1, 2], "h": [1, 2], "l": [1, 2], "c": [1, 2 + i], "v": [5, 6]}
+        lake.put("/stock/candle", {"symbol": symbol, "resolution": "D", "from": 0, "to": 300},
+                 json.dumps(body).encode(), fetched_at=3.0)
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all,
+                                tables=[MarketHoliday.__table__, CandlestickData.__table__])
+        written = await rebuild(lake, ["/stock/market-holiday", "/stock/candle"],
+                                workers=2, chunk_size=1, engine=engine)
+        async with engine.connect() as conn:
+            names = (await conn.execute(select(MarketHoliday.__table__.c.event_name))).scalars().all()
+            closes = (await conn.execute(select(CandlestickData.__table__.c.close))).scalars().all()
+        await engine.dispose()
+        return written, names, closes
+
+    written, names, closes = asyncio.run(run())
+
+    assert written == {"market_holidays": 2, "candlestick_data": 4}
+    assert sorted(names) == ["Christmas Day", "Christmas Eve"]
+    assert sorted(closes) == [1.0, 1.0, 2.0, 3.0]
+
+
+def test_put_async_writes_off_the_event_loop(tmp_path):
+    lake = RawLake(tmp_path, compression="gzip")
+    loop_thread = []
+
+    async def run():
+        loop_thread.append(threading.get_ident())
+        put = lake.put
+
+        def tracking_put(*args):
+            loop_thread.append(threading.get_ident())
+            return put(*args)
+
+        lake.put = tracking_put
+        return await asyncio.gather(*(
+            lake.put_async("/stock/market-holiday", {"exchange": f"X{i}"}, _holidays(f"H{i}")) for i in range(8)
+        ))
+
+    keys = asyncio.run(run())
+
+    assert len(set(keys)) == 8 and len(lake.entries(latest=False)) == 8
+    assert loop_thread[0] not in loop_thread[1:]
+
+
+def test_concurrent_puts_of_one_body_all_succeed(tmp_path):
+    body = os.urandom(1024 * 1024)
+
+    def run(trial):
+        lake = RawLake(tmp_path / str(trial), compression="gzip")
+        barrier = threading.Barrier(8)
+
+        def put(i):
+            barrier.wait()
+            return lake.put("/stock/symbol", {"exchange": "US", "n": i}, body)
+
+        with ThreadPoolExecutor(8) as pool:
+            keys = list(pool.map(put, range(8)))
+        files = [path.name for path in (tmp_path / str(trial) / "objects").rglob("*") if path.is_file()]
+        return lake, keys, files
+
+    for trial in range(5):
+        lake, keys, files = run(trial)
+        digest = lake.entries()[0].object
+        assert len(set(keys)) == 8 and files == [f"{digest}.json.gz"]
+        assert lake.read(digest) == body
+
+
+def test_rebuild_replays_company_news_into_the_article_store(tmp_path):
+    lake = RawLake(tmp_path, compression="gzip")
+    body = json.dumps([{"id": 7, "datetime": 1700000000, "headline": "Chipmakers rally", "related": "NVDA,AMD"}])
+    for symbol in ("NVDA", "AMD"):
+        lake.put("/company-news", {"symbol": symbol, "from": "2024-01-01", "to": "2024-01-31"}, body.encode())
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[
+                NewsArticle.__table__, NewsSymbol.__table__, CompanyNews.__table__,
+            ])
+        written = await rebuild(lake, ["/company-news"], workers=1, engine=engine)
+        async with engine.connect() as conn:
+            links = (await conn.execute(select(NewsSymbol.__table__.c.symbol).order_by("symbol"))).scalars().all()
+            legacy = (await conn.execute(select(CompanyNews.__table__.c.id))).all()
+        await engine.dispose()
+        return written, links, legacy
+
+    written, links, legacy = asyncio.run(run())
+
+    assert written == {"news_articles": 1}
+    assert links == ["AMD", "NVDA"] and legacy == []
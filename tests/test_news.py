@@ -0,0 +1,136 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.loaders import NewsPoller, NewsStore, RecentIds, endpoint_writer, transform_payload
+from finhub_etl.models import CompanyNews, GeneralNews, NewsArticle, NewsCursor, NewsSymbol
+
+
+class FakeNewsAPI:
+    """/news stand-in serving a fixed article list per category, honouring minId."""
+
+    def __init__(self, articles):
+        self.articles = articles
+        self.requests = []
+
+    async def get(self, endpoint, params):
+        self.requests.append(dict(params))
+        if params["category"] == "broken":
+            raise RuntimeError("boom")
+        min_id = params.get("minId", 0)
+        return [{"id": id, "category": params["category"], "headline": f"#{id}"}
+                for id in self.articles[params["category"]] if id >= min_id]
+
+
+async def _setup(path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[
+            GeneralNews.__table__, NewsCursor.__table__, NewsArticle.__table__, NewsSymbol.__table__,
+            CompanyNews.__table__,
+        ])
+    return engine
+
+
+def test_recent_ids_are_bounded_and_forget_the_oldest():
+    seen = RecentIds(maxlen=3)
+    seen.update([1, 2, 3])
+    seen.update([1, 4])
+
+    assert len(seen) == 3
+    assert 2 not in seen and 1 in seen and 4 in seen
+
+
+def test_poller_fetches_only_newer_articles_and_resumes_from_cursors(tmp_path):
+    api = FakeNewsAPI({"general": [10, 11, 12], "merger": [11, 20], "broken": []})
+
+    async def run():
+        engine = await _setup(tmp_path / "db.sqlite")
+        poller = NewsPoller(["general", "merger", "broken"], client=api, engine=engine)
+        first = await poller.poll()
+        api.articles["general"].append(13)
+        second = await poller.poll()
+
+        # A fresh process resumes from the stored cursors
+        restarted = NewsPoller(["general", "merger"], client=api, engine=engine)
+        api.requests.clear()
+        third = await restarted.poll()
+
+        async with engine.connect() as conn:
+            ids = (await conn.execute(select(GeneralNews.__table__.c.id).order_by(GeneralNews.__table__.c.id))).scalars().all()
+            cursors = dict((await conn.execute(select(NewsCursor.__table__.c.category, NewsCursor.__table__.c.max_id))).all())
+        await engine.dispose()
+        return first, second, third, ids, cursors
+
+    first, second, third, ids, cursors = asyncio.run(run())
+
+    assert first == {"general": 3, "merger": 1}          # 11 is stored once, under general
+    assert second == {"general": 1, "merger": 0}
+    assert third == {"general": 0, "merger": 0}
+    assert api.requests == [{"category": "general", "minId": 13}, {"category": "merger", "minId": 20}]
+    assert ids == [10, 11, 12, 13, 20]
+    assert cursors == {"general": 13, "merger": 20}
+
+
+def test_news_store_keeps_one_article_per_story(tmp_path):
+    story = {"id": 7, "datetime": 1700000000, "headline": "Chipmakers rally", "related": "NVDA,AMD"}
+    batch = [dict(story, symbol="NVDA"), dict(story, symbol="AMD"), dict(story, symbol="TSM"),
+             {"id": 8, "datetime": 1700000100, "headline": "Other", "related": "AMD", "symbol": "AMD"}]
+
+    async def run():
+        engine = await _setup(tmp_path / "db.sqlite")
+        first = await NewsStore(engine=engine).store(batch)
+        # A new store (empty memory) finds the articles with the bulk existence check
+        fresh = NewsStore(engine=engine, chunk_size=1)
+        known = await fresh.existing([7, 8, 9])
+        second = await fresh.store([dict(story, symbol="INTC"), {"id": 9, "symbol": "INTC", "related": ""}])
+
+        async with engine.connect() as conn:
+            articles = (await conn.execute(select(NewsArticle.__table__.c.id))).scalars().all()
+            links = (await conn.execute(select(NewsSymbol.__table__.c.symbol, NewsSymbol.__table__.c.article_id)
+                                        .order_by(NewsSymbol.__table__.c.article_id, NewsSymbol.__table__.c.symbol))).all()
+        await engine.dispose()
+        return first, known, second, articles, links
+
+    first, known, second, articles, links = asyncio.run(run())
+
+    assert first == (2, 4)
+    assert known == {7, 8}
+    assert second == (1, 4)        # only article 9 is new; already-stored links are ignored on insert
+    assert sorted(articles) == [7, 8, 9]
+    assert links == [("AMD", 7), ("INTC", 7), ("NVDA", 7), ("TSM", 7), ("AMD", 8), ("INTC", 9)]
+
+
+def test_every_company_news_path_fills_the_article_store_and_legacy_company_news_on_request(tmp_path):
+    payload = [{"id": 7, "datetime": 1700000000, "headline": "Chipmakers rally", "related": "NVDA,AMD"},
+               {"id": 8, "datetime": 1700000100, "headline": "Other", "related": ""}]
+
+    async def run():
+        engine = await _setup(tmp_path / "db.sqlite")
+        await NewsStore(engine=engine).store([dict(payload[1], symbol="AMD")])
+        async with engine.connect() as conn:
+            default = (await conn.execute(select(CompanyNews.__table__.c.id))).all()
+
+        store = NewsStore(legacy=True, engine=engine)
+        # The load_endpoint / load_windowed path: transformed company_news tuples
+        first = await store.write_tuples(transform_payload("/company-news", {"symbol": "NVDA"}, payload))
+        # The load_company_news path: records tagged with their symbol
+        second = await store.store([dict(payload[0], symbol="AMD"), dict(payload[0], symbol="NVDA")])
+
+        async with engine.connect() as conn:
+            legacy = (await conn.execute(select(CompanyNews.__table__.c.symbol, CompanyNews.__table__.c.id)
+                                         .order_by("id", "symbol"))).all()
+            links = (await conn.execute(select(NewsSymbol.__table__.c.symbol, NewsSymbol.__table__.c.article_id)
+                                        .order_by("article_id", "symbol"))).all()
+        await engine.dispose()
+        return default, first, second, legacy, links
+
+    default, first, second, legacy, links = asyncio.run(run())
+
+    assert isinstance(endpoint_writer("/company-news"), NewsStore)
+    assert default == []                   # company_news is only written when asked for
+    assert first == 1 and second == (0, 0)
+    assert legacy == [("AMD", 7), ("NVDA", 7), ("NVDA", 8)]
+    assert links == [("AMD", 7), ("NVDA", 7), ("AMD", 8), ("NVDA", 8)]
@@ -0,0 +1,32 @@
+import asyncio
+import json
+
+from finhub_etl.loaders import TransformPool, transform_payload
+
+PARAMS = {"symbol": "AAPL", "resolution": "1"}
+BODY = json.dumps({
+    "s": "ok", "t": list(range(0, 6000, 60)), "o": [1.0] * 100, "h": [2.0] * 100,
+    "l": [0.5] * 100, "c": [1.5] * 100, "v": [10] * 100,
+}).encode()
+
+
+def test_transform_payload_returns_column_tuples():
+    rows = transform_payload("/stock/candle", PARAMS, BODY)
+
+    assert len(rows) == 100
+    # (symbol, resolution, timestamp, close, high, low, open, volume)
+    assert rows[1] == ("AAPL", "1", 60, 1.5, 2.0, 0.5, 1.0, 10)
+
+
+def test_pool_offloads_large_payloads_only():
+    async def run():
+        async with TransformPool(workers=1, threshold=len(BODY)) as pool:
+            offloaded = await pool.transform("/stock/candle", PARAMS, BODY)
+            compact = json.dumps(json.loads(BODY), separators=(",", ":")).encode()
+            inline = await pool.transform("/stock/candle", PARAMS, compact)
+            return pool, offloaded, inline
+
+    pool, offloaded, inline = asyncio.run(run())
+
+    assert (pool.offloaded, pool.inline) == (1, 1)
+    assert offloaded == inline == transform_payload("/stock/candle", PARAMS, BODY)
@@ -0,0 +1,71 @@
+import asyncio
+
+from finhub_etl.config.priority import PriorityScheduler, priority
+
+
+async def _request(scheduler, order, name=None, endpoint=None, hold=0.0):
+    async with scheduler.slot(endpoint, name) as admitted:
+        order.append(admitted)
+        await asyncio.sleep(hold)
+
+
+def test_weighted_fair_share_when_all_classes_wait():
+    async def run():
+        scheduler = PriorityScheduler(rate_per_second=500, burst=1)
+        order = []
+        tasks = [
+            asyncio.create_task(_request(scheduler, order, name))
+            for name in ("backfill", "incremental", "realtime") for _ in range(40)
+        ]
+        await asyncio.gather(*tasks)
+        return order
+
+    first = (asyncio.run(run()))[:34]
+
+    # 12:4:1 weights -> about 24:8:2 over two rounds of 17 admissions
+    assert 22 <= first.count("realtime") <= 25
+    assert 7 <= first.count("incremental") <= 9
+    assert 1 <= first.count("backfill") <= 3
+
+
+def test_realtime_overtakes_a_backfill_queue():
+    async def run():
+        scheduler = PriorityScheduler(rate_per_second=200, burst=1)
+        order = []
+        backfill = [asyncio.create_task(_request(scheduler, order, "backfill")) for _ in range(40)]
+        await asyncio.sleep(0.03)
+        await _request(scheduler, order, endpoint="/quote")
+        await asyncio.gather(*backfill)
+        return order, scheduler.metrics()
+
+    order, metrics = asyncio.run(run())
+
+    assert order.index("realtime") < 15
+    assert metrics["realtime"]["wait_max"] < 0.05
+    assert metrics["backfill"]["wait_max"] > 0.1
+    assert metrics["backfill"]["admitted"] == 40 and metrics["backfill"]["queued"] == 0
+
+
+def test_class_concurrency_caps_and_context_priority():
+    peak = {"backfill": 0}
+
+    async def run():
+        scheduler = PriorityScheduler(rate_per_second=None, max_concurrency={"backfill": 2})
+        order = []
+
+        async def tracked():
+            await _request(scheduler, order, hold=0.01)
+            peak["backfill"] = max(peak["backfill"], scheduler.classes["backfill"].in_flight)
+
+        with priority("backfill"):
+            tasks = [asyncio.create_task(tracked()) for _ in range(10)]
+        await asyncio.sleep(0.001)
+        peak["backfill"] = max(peak["backfill"], scheduler.classes["backfill"].in_flight)
+        await asyncio.gather(*tasks)
+        return order, scheduler
+
+    order, scheduler = asyncio.run(run())
+
+    assert order == ["backfill"] * 10
+    assert peak["backfill"] == 2
+    assert scheduler.classes["backfill"].in_flight == 0
@@ -0,0 +1,52 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.loaders import transform_payload
+from finhub_etl.models import RealtimeQuote
+from finhub_etl.realtime import QuoteCache
+
+
+def _quote(c, t, **extra):
+    return dict({"c": c, "d": 1.0, "dp": 0.5, "h": c + 1, "l": c - 1, "o": c, "pc": c - 1, "t": t}, **extra)
+
+
+def test_quote_cache_writes_only_changed_quotes_and_warms_from_the_table(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[RealtimeQuote.__table__])
+        cache = QuoteCache(engine=engine)
+
+        # First poll: the load_endpoint path hands over transformed tuples
+        for symbol, price in (("AAPL", 190.0), ("MSFT", 410.0)):
+            await cache.write_tuples(transform_payload("/quote", {"symbol": symbol}, _quote(price, 100)))
+        first = await cache.flush()
+
+        # Second poll: MSFT unchanged, AAPL moved, an out-of-order and an unknown-symbol answer
+        changed = cache.update([
+            dict(_quote(410.0, 160), symbol="MSFT"), dict(_quote(191.5, 160), symbol="AAPL"),
+            dict(_quote(150.0, 90), symbol="AAPL"), dict(_quote(0, 0), symbol="NOPE"),
+        ])
+        second = await cache.flush()
+        latest = cache.get("AAPL")
+
+        restarted = QuoteCache(engine=engine)
+        warmed = await restarted.warm()
+        repeat = restarted.update([dict(_quote(191.5, 160), symbol="AAPL")])
+
+        async with engine.connect() as conn:
+            rows = (await conn.execute(select(RealtimeQuote.__table__.c.symbol, RealtimeQuote.__table__.c.timestamp)
+                                       .order_by("symbol", "timestamp"))).all()
+        await engine.dispose()
+        return first, changed, second, latest, warmed, restarted, repeat, rows, cache.metrics()
+
+    first, changed, second, latest, warmed, restarted, repeat, rows, metrics = asyncio.run(run())
+
+    assert (first, changed, second) == (2, 1, 1)
+    assert latest.current_price == 191.5 and latest.timestamp == 160
+    assert rows == [("AAPL", 100), ("AAPL", 160), ("MSFT", 100)]
+    assert metrics["unchanged"] == 1 and metrics["stale"] == 1 and metrics["empty"] == 1
+    assert warmed == 2 and restarted.get("AAPL").current_price == 191.5 and repeat == 0
@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.config.breaker import CircuitOpenError
+from finhub_etl.loaders import BulkWriter
+from finhub_etl.models import CandlestickData, MatchedStock, RealtimeQuote
+from finhub_etl.realtime import QuoteCache, QuotePoller, allocate_intervals
+
+
+class FakeQuoteAPI:
+    """/quote stand-in whose price moves on every call; 'DOWN' is refused by an open breaker."""
+
+    def __init__(self):
+        self.calls = {}
+
+    async def get(self, endpoint, params):
+        symbol = params["symbol"]
+        self.calls[symbol] = self.calls.get(symbol, 0) + 1
+        if symbol == "DOWN":
+            raise CircuitOpenError(endpoint, 30.0)
+        price = 100.0 + self.calls[symbol]
+        return {"c": price, "h": price, "l": 100.0, "o": 100.0, "pc": 99.0, "d": 1.0, "dp": 1.0,
+                "t": 1_700_000_000 + self.calls[symbol]}
+
+
+async def _setup(path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[
+            RealtimeQuote.__table__, CandlestickData.__table__, MatchedStock.__table__,
+        ])
+    return engine
+
+
+def test_allocation_spends_the_budget_within_the_interval_bounds():
+    weights = {f"S{i}": float(i) ** 3 for i in range(100)}
+    intervals = allocate_intervals(weights, rate=5.0, min_interval=2.0, max_interval=300.0)
+
+    assert sum(1 / interval for interval in intervals.values()) == pytest.approx(5.0)
+    assert min(intervals.values()) >= 2.0 and intervals["S0"] == pytest.approx(300.0)
+    assert intervals["S99"] <= intervals["S50"] <= intervals["S1"] <= intervals["S0"]
+    # A capped symbol's share goes to the others
+    assert allocate_intervals({"A": 1000.0, "B": 1.0, "C": 1.0}, rate=1.0, min_interval=2.0, max_interval=100.0) \
+        == pytest.approx({"A": 2.0, "B": 4.0, "C": 4.0})
+    # A budget below one poll per max_interval for everyone degrades to round-robin
+    assert set(allocate_intervals(weights, rate=0.1, max_interval=300.0).values()) == {1000.0}
+
+
+def test_poller_refreshes_active_symbols_most_and_reports_staleness(tmp_path):
+    now = [0.0]
+    api = FakeQuoteAPI()
+
+    async def run():
+        engine = await _setup(tmp_path / "db.sqlite")
+        poller = QuotePoller(QuoteCache(engine=engine), rate=1.0, min_interval=2.0, max_interval=60.0,
+                             client=api, clock=lambda: now[0], engine=engine)
+        intervals = poller.set_weights({"HOT": 100.0, "WARM": 10.0, "COLD": 0.0, "DOWN": 1.0})
+        for _ in range(120):
+            await poller.poll_due(limit=1)
+            now[0] += 1.0
+        staleness = poller.staleness()
+        await engine.dispose()
+        return poller, intervals, staleness
+
+    poller, intervals, staleness = asyncio.run(run())
+
+    assert intervals["HOT"] == 2.0 and intervals["COLD"] == 60.0
+    # The budget is fully planned, so the two fast symbols share it evenly before the slow ones
+    assert api.calls["HOT"] >= 35 and api.calls["WARM"] >= 35
+    assert api.calls["DOWN"] > api.calls["COLD"] and 2 <= api.calls["COLD"] <= 3
+    assert poller.refused == api.calls["DOWN"] and "DOWN" not in poller.cache
+    assert poller.cache.get("HOT").current_price == 100.0 + api.calls["HOT"]
+    assert staleness["symbols"] == 4 and staleness["overdue"] == 1          # DOWN has never answered
+    assert staleness["tiers"]["<=10s"]["max"] <= 3.0 and ">600s" not in staleness["tiers"]
+
+
+def test_activity_ranks_liquid_moving_active_symbols_first(tmp_path):
+    day = int(time.time()) - 86400
+
+    async def run():
+        engine = await _setup(tmp_path / "db.sqlite")
+        await BulkWriter(MatchedStock, engine=engine).write([
+            {"id": "1", "finnhubSymbol": "BIG", "is_active": 1},
+            {"id": "2", "finnhubSymbol": "SMALL", "is_active": 1},
+            {"id": "3", "finnhubSymbol": "DORMANT", "is_active": 0},
+            {"id": "4", "finnhubSymbol": "NEW", "is_active": 1},
+            {"id": "5", "finnhubSymbol": "GONE", "is_active": 1, "is_deleted": 1},
+            {"id": "6", "finnhubSymbol": "LIVE", "is_active": 1},
+        ])
+        await BulkWriter(CandlestickData, engine=engine).write_rows([
+            {"symbol": symbol, "resolution": "D", "timestamp": day, "open": 10.0, "high": high, "low": 10.0,
+             "close": 10.0, "volume": volume}
+            for symbol, high, volume in (("BIG", 11.0, 1_000_000), ("SMALL", 11.0, 1_000), ("DORMANT", 11.0, 1_000_000))
+        ])
+        poller = QuotePoller(QuoteCache(engine=engine), client=FakeQuoteAPI(), engine=engine)
+        weights = await poller.load_activity(exclude=["LIVE"])
+        await engine.dispose()
+        return poller, weights
+
+    poller, weights = asyncio.run(run())
+
+    assert set(weights) == {"BIG", "SMALL", "DORMANT", "NEW"}
+    assert weights["BIG"] > weights["DORMANT"] > weights["SMALL"]
+    assert weights["BIG"] == pytest.approx(10 * weights["DORMANT"])
+    assert weights["NEW"] == 0.0                                      # no candles and no cached quote yet
+    assert set(poller.intervals) == set(weights)
+
+
+def test_rounds_carry_the_fractional_budget(tmp_path):
+    now = [0.0]
+
+    async def run(rate):
+        engine = await _setup(tmp_path / f"db-{rate}.sqlite")
+        api = FakeQuoteAPI()
+        poller = QuotePoller(QuoteCache(engine=engine), rate=rate, tick=1.0, min_interval=2.0,
+                             max_interval=3600.0, client=api, clock=lambda: now[0], engine=engine)
+        poller.set_weights({f"S{i}": 1.0 for i in range(200)})
+        now[0] += 1000.0                                 # every symbol is due
+        budget = 0.0
+        for _ in range(20):
+            budget = await poller.poll_round(budget)
+            now[0] += 1.0
+        await engine.dispose()
+        return sum(api.calls.values())
+
+    # Below one request per tick still polls; fractional rates are not floored
+    assert asyncio.run(run(0.25)) == 5
+    assert asyncio.run(run(2.5)) == 50
@@ -0,0 +1,70 @@
+from finhub_etl.loaders import build_rows
+from finhub_etl.models import (
+    TABLE_REGISTRY,
+    BasicFinancials,
+    CandlestickData,
+    CompanyPeer,
+    EarningsCalendar,
+    RealtimeQuote,
+    get_table_spec,
+)
+
+
+def test_registry_covers_all_tables():
+    assert "realtime_quotes" in TABLE_REGISTRY
+    assert "candlestick_data" in TABLE_REGISTRY
+    assert get_table_spec(RealtimeQuote) is TABLE_REGISTRY["realtime_quotes"]
+
+
+def test_spec_layout():
+    spec = get_table_spec(BasicFinancials)
+    assert spec.primary_key == ("symbol", "metric_type")
+    assert spec.key_map["52WeekHigh"] == "fifty_two_week_high"
+    assert spec.key_map["fifty_two_week_high"] == "fifty_two_week_high"
+    assert spec.column_types["fifty_two_week_high"] is float
+
+
+def test_to_tuples_maps_aliases_and_drops_unknown_keys():
+    spec = get_table_spec(RealtimeQuote)
+    record = {"symbol": "AAPL", "t": 1, "c": 10.0, "d": 0.5, "dp": 5.0,
+              "h": 11.0, "l": 9.0, "o": 9.5, "pc": 9.5, "unknown": "x"}
+
+    assert spec.to_tuples([record]) == [("AAPL", 1, 10.0, 0.5, 5.0, 11.0, 9.0, 9.5, 9.5)]
+
+
+def test_to_tuples_handles_missing_and_mixed_layouts():
+    spec = get_table_spec(EarningsCalendar)
+    records = [
+        {"symbol": "AAPL", "date": "2024-01-01", "epsActual": 1.0, "epsEstimate": 0.9,
+         "hour": "amc", "quarter": 1, "revenueActual": 1e9, "revenueEstimate": 9e8, "year": 2024},
+        {"symbol": "MSFT", "date": "2024-01-02", "epsActual": 2.0},
+    ]
+
+    rows = build_rows(EarningsCalendar, records)
+    assert rows[0]["revenue_actual"] == 1e9
+    assert rows[1] == {
+        "symbol": "MSFT", "date": "2024-01-02", "eps_actual": 2.0, "eps_estimate": None,
+        "hour": None, "quarter": None, "revenue_actual": None, "revenue_estimate": None, "year": None,
+    }
+
+
+def test_to_tuples_resolves_keys_per_record_when_the_first_is_partial():
+    spec = get_table_spec(EarningsCalendar)
+    records = [
+        {"symbol": "A", "date": "2024-01-01"},
+        {"symbol": "B", "date": "2024-01-02", "eps_actual": 2.0, "revenue_actual": 5},
+        {"symbol": "C", "date": "2024-01-03", "epsActual": 3.0},
+    ]
+
+    rows = spec.to_dicts(records)
+    assert (rows[1]["eps_actual"], rows[1]["revenue_actual"]) == (2.0, 5)
+    assert rows[2]["eps_actual"] == 3.0 and rows[0]["eps_actual"] is None
+
+
+def test_missing_columns_get_model_defaults():
+    candle = get_table_spec(CandlestickData).to_dicts([{"symbol": "AAPL", "t": 1, "c": 10.0}])[0]
+    peers = get_table_spec(CompanyPeer).to_tuples([{"symbol": "A"}, {"symbol": "B"}])
+
+    assert candle["resolution"] == "D" and candle["volume"] is None
+    assert peers == [("A", []), ("B", [])]
+    assert peers[0][1] is not peers[1][1]
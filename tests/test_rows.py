@@ -0,0 +1,123 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import finhub_etl.database
+import finhub_etl.utils.etl
+import finhub_etl.utils.save
+from finhub_etl.loaders import build_rows, build_tuples
+from finhub_etl.models import (
+    CandlestickData,
+    CompanyPeer,
+    EarningsCalendar,
+    MatchedStock,
+    RealtimeQuote,
+    get_table_spec,
+)
+from finhub_etl.utils.csv_loader import load_matched_stocks_csv
+from finhub_etl.utils.etl import save_to_db
+from finhub_etl.utils.save import fetch_and_store_data
+
+CASES = [
+    (RealtimeQuote, [{"symbol": "AAPL", "t": 1, "c": 10.0, "dp": 1.5, "extra": "x"},
+                     {"symbol": "MSFT", "timestamp": 2, "current_price": 20.0, "percent_change": 2.0}]),
+    (EarningsCalendar, [{"symbol": "A", "date": "2024-01-01"},
+                        {"symbol": "B", "date": "2024-01-02", "eps_actual": 2.0, "revenueActual": 5.0}]),
+    (CandlestickData, [{"symbol": "AAPL", "t": 1, "o": 1.0, "c": 2.0, "v": 10}]),
+    (CompanyPeer, [{"symbol": "AAPL"}, {"symbol": "MSFT", "peers": ["AAPL"]}]),
+]
+
+
+def _pydantic_rows(model, records):
+    columns = get_table_spec(model).columns
+    return [{name: getattr(model(**record), name) for name in columns} for record in records]
+
+
+def _use_engine(monkeypatch, path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    for module in (finhub_etl.database, finhub_etl.utils.etl, finhub_etl.utils.save):
+        monkeypatch.setattr(module, "engine", engine)
+    return engine
+
+
+async def _create(engine, *models):
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[model.__table__ for model in models])
+
+
+async def _table(engine, model):
+    table = model.__table__
+    async with engine.connect() as conn:
+        rows = (await conn.execute(select(table).order_by(*table.primary_key.columns))).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def test_build_rows_and_tuples_match_the_pydantic_path():
+    for model, records in CASES:
+        expected = _pydantic_rows(model, records)
+        columns = get_table_spec(model).columns
+
+        assert build_rows(model, records) == expected, model.__name__
+        assert build_tuples(model, records) == [tuple(row[name] for name in columns) for row in expected]
+
+
+def test_save_to_db_and_fetch_and_store_fast_paths_store_the_same_rows(tmp_path, monkeypatch):
+    async def store(path, fast):
+        engine = _use_engine(monkeypatch, path)
+        await _create(engine, *(model for model, _ in CASES))
+        for model, records in CASES:
+            assert await save_to_db(model, records[:1], fast=fast) is not None
+
+            async def handler(**params):
+                return records[1:]
+
+            if records[1:]:
+                assert await fetch_and_store_data(handler, model, fast=fast, symbol="AAPL") is not None
+        tables = {model.__name__: await _table(engine, model) for model, _ in CASES}
+        await engine.dispose()
+        return tables
+
+    slow = asyncio.run(store(tmp_path / "slow.sqlite", fast=False))
+    fast = asyncio.run(store(tmp_path / "fast.sqlite", fast=True))
+
+    assert fast == slow
+    assert fast["CandlestickData"][0]["resolution"] == "D"
+    assert [row["peers"] for row in fast["CompanyPeer"]] == [[], ["AAPL"]]
+
+
+def test_csv_load_matches_model_instances(tmp_path, monkeypatch):
+    path = tmp_path / "matched.csv"
+    path.write_text(
+        "id,name,is_active,last_price,changePercent,created_at,finnhubSymbol,description\n"
+        "1,Apple,1,189.5,0.4,2024-11-27 06:26:48.606,AAPL,NULL\n"
+        "2,Other,,,,,,\n",
+        encoding="utf-8",
+    )
+
+    async def run():
+        engine = _use_engine(monkeypatch, tmp_path / "csv.sqlite")
+        await _create(engine, MatchedStock)
+        count = await load_matched_stocks_csv(path)
+        loaded = await _table(engine, MatchedStock)
+
+        reference = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'reference.sqlite'}")
+        await _create(reference, MatchedStock)
+        async with AsyncSession(reference) as session:
+            session.add_all([
+                MatchedStock(id="1", name="Apple", is_active=1, last_price=189.5, changePercent=0.4,
+                             created_at=loaded[0]["created_at"], finnhubSymbol="AAPL"),
+                MatchedStock(id="2", name="Other"),
+            ])
+            await session.commit()
+        expected = await _table(reference, MatchedStock)
+        await engine.dispose()
+        await reference.dispose()
+        return count, loaded, expected
+
+    count, loaded, expected = asyncio.run(run())
+
+    assert count == 2 and loaded == expected
+    assert loaded[0]["created_at"].isoformat() == "2024-11-27T06:26:48"
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.loaders import BulkWriter
+from finhub_etl.models import MarketHoliday
+from finhub_etl.schedule import AfterClose, Daily, Interval, MarketCalendar, ScheduledJob, Scheduler, Weekly
+
+NY = ZoneInfo("America/New_York")
+HOLIDAYS = {date(2024, 12, 24): "09:30-13:00", date(2024, 12, 25): None}
+
+
+def _at(day, hour, minute=0):
+    return datetime(2024, 12, day, hour, minute, tzinfo=NY)
+
+
+def test_calendar_sessions_skip_holidays_and_weekends():
+    calendar = MarketCalendar("US", holidays=HOLIDAYS)
+
+    assert calendar.session(date(2024, 12, 23)) == (_at(23, 9, 30), _at(23, 16))
+    assert calendar.session(date(2024, 12, 24)) == (_at(24, 9, 30), _at(24, 13))
+    assert calendar.session(date(2024, 12, 25)) is None
+    assert calendar.session(date(2024, 12, 28)) is None
+    assert calendar.is_open(_at(24, 12)) and not calendar.is_open(_at(24, 14))
+    assert calendar.next_session(_at(23, 17), half_days=False) == (_at(26, 9, 30), _at(26, 16))
+
+
+def test_cadences_follow_the_calendar():
+    calendar = MarketCalendar("US", holidays=HOLIDAYS)
+
+    assert Interval(60).next_after(_at(23, 10), calendar, False) == _at(23, 10, 1)
+    # Half-day skipped by default, taken when allowed
+    assert Interval(60).next_after(_at(23, 16), calendar, False) == _at(26, 9, 30)
+    assert Interval(60).next_after(_at(23, 16), calendar, True) == _at(24, 9, 30)
+    assert Interval(60, session=False).next_after(_at(25, 3), calendar, False) == _at(25, 3, 1)
+    assert AfterClose(30).next_after(_at(23, 17), calendar, False) == _at(26, 16, 30)
+    assert AfterClose(30).next_after(_at(23, 16, 10), calendar, False) == _at(23, 16, 30)
+    assert Daily(time(6)).next_after(_at(24, 7), calendar, True) == _at(26, 6)
+    assert Weekly(5, time(8)).next_after(_at(23, 9), calendar, False) == _at(28, 8)
+
+
+def test_calendar_loads_holidays_from_the_database(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[MarketHoliday.__table__])
+        await BulkWriter(MarketHoliday, engine=engine).write([
+            {"exchange": "US", "date": "2024-12-24", "event_name": "Christmas Eve",
+             "trading_hour": "09:30-13:00", "timezone": "America/New_York"},
+            {"exchange": "US", "date": "2024-12-25", "event_name": "Christmas",
+             "trading_hour": "", "timezone": "America/New_York"},
+        ])
+        calendar = await MarketCalendar.load("US", engine=engine)
+        await engine.dispose()
+        return calendar
+
+    calendar = asyncio.run(run())
+
+    assert calendar.holidays == HOLIDAYS
+    assert calendar.is_half_day(date(2024, 12, 24)) and calendar.is_holiday(date(2024, 12, 25))
+
+
+def test_scheduler_runs_jobs_with_jitter_and_skips_overlaps():
+    calls = {"fast": 0, "slow": 0}
+
+    async def fast():
+        calls["fast"] += 1
+
+    async def slow():
+        calls["slow"] += 1
+        await asyncio.sleep(0.25)
+
+    async def run():
+        scheduler = Scheduler(MarketCalendar("US"), [
+            ScheduledJob("fast", fast, Interval(0.05, session=False), jitter=0.01),
+            ScheduledJob("slow", slow, Interval(0.05, session=False)),
+        ])
+        await scheduler.run(until=datetime.now(timezone.utc) + timedelta(seconds=0.4))
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    fast_job, slow_job = scheduler.jobs
+
+    assert 3 <= calls["fast"] <= 8
+    assert calls["slow"] == slow_job.runs <= 3
+    assert slow_job.skipped >= 3
+    assert fast_job.failures == slow_job.failures == 0
@@ -0,0 +1,204 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+pytest.importorskip("websockets")
+
+from finhub_etl.models import CandlestickData, RealtimeQuote, TradeTick
+from finhub_etl.realtime import BarAggregator, FinnhubStream, RollingQuotes, StandInServer, Tick, TickIngestor
+
+
+async def _wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+def test_stream_shards_subscriptions_and_resubscribes_after_outage():
+    symbols = [f"S{i:03d}" for i in range(120)]
+    received = []
+
+    async def run():
+        async with StandInServer(trades_per_second=2000, tick_interval=0.01, tokens=["k1", "k2"],
+                                 max_symbols=50, seed=1) as server:
+            stream = FinnhubStream(symbols, tokens=["k1", "k2"], url=server.url, symbols_per_connection=50,
+                                   on_trades=[received.extend], reconnect_min=0.05, subscribe_rate=0)
+            task = asyncio.create_task(stream.run())
+            await _wait_for(lambda: server.subscribed() == set(symbols) and len(received) > 500)
+            connections = server.metrics()["connections"]
+
+            assert await server.drop_connections() == 3
+            received.clear()
+            await _wait_for(lambda: server.subscribed() == set(symbols) and len(received) > 500)
+
+            stream.unsubscribe(symbols[:10])
+            stream.subscribe(["NEW"])
+            await _wait_for(lambda: "NEW" in server.subscribed() and "S000" not in server.subscribed())
+            await stream.stop()
+            await task
+            return connections, stream.metrics(), [shard.token for shard in stream.shards]
+
+    connections, metrics, tokens = asyncio.run(run())
+
+    assert connections == 3
+    assert tokens == ["k1", "k2", "k1"]
+    assert metrics["reconnects"] >= 3 and metrics["symbols"] == 111
+    assert all(isinstance(tick, Tick) and tick.symbol in set(symbols) | {"NEW"} for tick in received)
+
+
+def test_rolling_quotes_track_the_session_and_roll_at_midnight():
+    quotes = RollingQuotes(timezone="UTC", previous_close={"AAPL": 100.0})
+    day = 1_700_006_400_000                      # 2023-11-15 00:00 UTC
+    quotes.update([Tick("AAPL", 101.0, 1, day + 1000), Tick("AAPL", 99.0, 1, day + 2000),
+                   Tick("AAPL", 102.0, 1, day + 1500)])
+    (first,) = quotes.snapshots()
+
+    assert (first["o"], first["h"], first["l"], first["c"]) == (101.0, 102.0, 99.0, 99.0)
+    assert first["pc"] == 100.0 and first["d"] == -1.0
+    assert quotes.snapshots() == []
+
+    quotes.update([Tick("AAPL", 98.0, 1, day + 86_400_000 + 5), Tick("AAPL", 500.0, 1, day + 3000)])
+    (second,) = quotes.snapshots()
+    assert second["pc"] == 99.0 and second["o"] == second["c"] == 98.0
+
+
+def test_ingestor_writes_micro_batches_and_quote_snapshots(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[TradeTick.__table__, RealtimeQuote.__table__])
+
+        async with StandInServer(trades_per_second=3000, tick_interval=0.01, seed=2) as server:
+            ingestor = TickIngestor(batch_size=200, flush_interval=0.05, engine=engine)
+            stream = FinnhubStream(["AAPL", "MSFT", "NVDA"], tokens=["t"], url=server.url,
+                                   on_trades=[ingestor.add], subscribe_rate=0)
+            tasks = [asyncio.create_task(stream.run()), asyncio.create_task(ingestor.run())]
+            await _wait_for(lambda: ingestor.written >= 1000)
+            await stream.stop()
+            ingestor.stop()
+            await asyncio.gather(*tasks)
+
+        async with engine.connect() as conn:
+            ticks = await conn.scalar(select(func.count()).select_from(TradeTick.__table__))
+            quoted = (await conn.execute(select(RealtimeQuote.__table__.c.symbol).distinct())).scalars().all()
+        await engine.dispose()
+        return ingestor.metrics(), ticks, quoted
+
+    metrics, ticks, quoted = asyncio.run(run())
+
+    assert ticks == metrics["received"] == metrics["written"]
+    assert metrics["flushes"] > 1 and metrics["buffered"] == 0
+    assert sorted(quoted) == ["AAPL", "MSFT", "NVDA"]
+
+
+def test_bar_aggregator_flushes_closed_minutes_and_folds_late_trades(tmp_path):
+    minute = 1_700_000_040                       # a minute boundary, UNIX seconds
+    now = [minute + 30.0]
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[CandlestickData.__table__])
+        bars = BarAggregator(grace=2.0, live_interval=1.0, clock=lambda: now[0], engine=engine)
+
+        ms = minute * 1000
+        bars.add([Tick("AAPL", 10.0, 5, ms + 1000), Tick("AAPL", 12.0, 1, ms + 2000),
+                  Tick("AAPL", 9.0, 2, ms + 3000), Tick("MSFT", 50.0, 7, ms + 4000)])
+        live = await bars.flush_live()
+        current = bars.current("AAPL")
+
+        now[0] = minute + 61.0                   # next minute, inside the grace window
+        bars.add([Tick("AAPL", 11.0, 3, ms + 59_000), Tick("AAPL", 13.0, 1, ms + 61_000),
+                  Tick("AAPL", 8.5, 1, ms + 500)])
+        inside_grace = await bars.flush()
+
+        now[0] = minute + 62.5                   # grace over: the first minute is final
+        written = await bars.flush()
+        bars.add([Tick("MSFT", 1.0, 1, ms + 30_000)])
+        final = await bars.flush(final=True)
+
+        async with engine.connect() as conn:
+            rows = (await conn.execute(
+                select(CandlestickData.__table__).order_by(CandlestickData.__table__.c.timestamp,
+                                                           CandlestickData.__table__.c.symbol)
+            )).all()
+        await engine.dispose()
+        return live, current, inside_grace, written, final, rows, bars.metrics()
+
+    live, current, inside_grace, written, final, rows, metrics = asyncio.run(run())
+
+    assert live == 2
+    assert current["open"] == 10.0 and current["close"] == 9.0 and current["volume"] == 8
+    assert (inside_grace, written, final) == (0, 2, 1)
+    assert [(r.symbol, r.resolution, r.timestamp, r.open, r.high, r.low, r.close, r.volume) for r in rows] == [
+        ("AAPL", "1", minute, 8.5, 12.0, 8.5, 11.0, 12),
+        ("MSFT", "1", minute, 50.0, 50.0, 50.0, 50.0, 7),
+        ("AAPL", "1", minute + 60, 13.0, 13.0, 13.0, 13.0, 1),
+    ]
+    assert metrics["late"] == 2 and metrics["too_late"] == 1 and metrics["open_bars"] == 0
+
+
+def test_bar_volume_keeps_fractional_trade_sizes(tmp_path):
+    minute = 1_700_000_040
+    now = [minute + 63.0]
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[CandlestickData.__table__])
+        bars = BarAggregator(grace=2.0, clock=lambda: now[0], engine=engine)
+        ms = minute * 1000
+        bars.add([Tick("BINANCE:BTCUSDT", 37000.0, 0.25, ms + 1000), Tick("BINANCE:BTCUSDT", 37010.0, 0.5, ms + 2000),
+                  Tick("OANDA:EUR_USD", 1.09, 0.4, ms + 3000)])
+        await bars.flush()
+        async with engine.connect() as conn:
+            volumes = dict((await conn.execute(select(CandlestickData.__table__.c.symbol,
+                                                      CandlestickData.__table__.c.volume))).all())
+        await engine.dispose()
+        return volumes
+
+    assert asyncio.run(run()) == {"BINANCE:BTCUSDT": 0.75, "OANDA:EUR_USD": 0.4}
+
+
+def test_bar_aggregator_backs_off_and_keeps_trades_when_a_flush_fails(tmp_path):
+    minute = 1_700_000_040
+    now = [minute + 63.0]
+    ms = minute * 1000
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        bars = BarAggregator(grace=2.0, clock=lambda: now[0], engine=engine)
+        write_rows = bars.writer.write_rows
+
+        async def write_during_trade(rows):
+            # A trade for the minute being written arrives mid-write
+            bars.add([Tick("AAPL", 20.0, 4, ms + 50_000)])
+            return await write_rows(rows)
+
+        bars.writer.write_rows = write_during_trade
+        bars.add([Tick("AAPL", 10.0, 5, ms + 1000)])
+        failed = [await bars.flush(), bars._next_wait()]       # no table yet
+        now[0] += 2.0
+        failed += [await bars.flush(), bars._next_wait()]
+        kept = bars.minutes[minute]["AAPL"][:5]
+
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[CandlestickData.__table__])
+        now[0] += 4.0
+        written = await bars.flush()
+        async with engine.connect() as conn:
+            row = (await conn.execute(select(CandlestickData.__table__))).one()
+        await engine.dispose()
+        return failed, kept, written, row, bars.metrics(), bars._next_wait()
+
+    failed, kept, written, row, metrics, wait = asyncio.run(run())
+
+    assert failed == [0, 2.0, 0, 4.0]
+    assert kept == [10.0, 20.0, 10.0, 20.0, 13]                # both mid-write trades were folded back in
+    assert written == 1 and (row.close, row.volume) == (20.0, 13)
+    assert metrics["too_late"] == 1 and metrics["failures"] == 0 and metrics["trades"] == 4
+    assert wait > 0
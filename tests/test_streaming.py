@@ -0,0 +1,159 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from finhub_etl.config.decoders import available_decoders, get_decoder
+from finhub_etl.config.streaming import MAX_DEPTH, JSONArrayParser, iter_json_array
+from finhub_etl.loaders import BulkWriter, stream_to_db
+from finhub_etl.models import StockSymbol
+
+RECORDS = [
+    {"symbol": f"S{i}", "displaySymbol": f"S{i}", "description": "Ünïcode \"quoted\" [x]", "figi": None, "price": i * 1.5}
+    for i in range(25)
+]
+NESTED = [
+    {"accessNumber": "1", "report": {"bs": [{"concept": "a},{\\\"b", "value": 1.5}, {"x": [[], {}]}], "ic": []}},
+    [1, [2, [3]], "],[", None],
+    "plain, string",
+    -1.5e3,
+    {},
+]
+
+
+class CountingDecoder:
+    name = "counting"
+
+    def __init__(self, decoder):
+        self.decoder = decoder
+        self.calls = 0
+
+    def decode(self, content, endpoint=None):
+        self.calls += 1
+        return self.decoder.decode(content, endpoint)
+
+
+def test_parser_handles_every_split_point():
+    """Elements come out intact no matter where the byte stream is cut."""
+    body = json.dumps(RECORDS[:4]).encode()
+
+    for cut in range(len(body) + 1):
+        parser = JSONArrayParser()
+        items = parser.feed(body[:cut]) + parser.feed(body[cut:]) + parser.close()
+        assert items == RECORDS[:4]
+
+
+def test_parser_handles_nested_elements_with_every_decoder():
+    body = json.dumps(NESTED).encode()
+
+    for name in available_decoders():
+        for cut in range(len(body) + 1):
+            parser = JSONArrayParser(get_decoder(name))
+            items = parser.feed(body[:cut]) + parser.feed(body[cut:]) + parser.close()
+            assert items == NESTED, (name, cut)
+
+
+def test_parser_decodes_completed_elements_in_one_decoder_call():
+    decoder = CountingDecoder(get_decoder())
+    body = json.dumps(RECORDS).encode()
+    parser = JSONArrayParser(decoder)
+
+    items = [item for start in range(0, len(body), 1000) for item in parser.feed(body[start:start + 1000])]
+    items += parser.close()
+
+    assert items == RECORDS
+    assert decoder.calls <= len(body) // 1000 + 2
+
+
+def test_parser_passes_elements_deeper_than_max_depth():
+    deep = 0
+    for _ in range(MAX_DEPTH + 2):
+        deep = {"k": [deep, 1]}
+    records = [{"symbol": "A"}, deep, {"symbol": "B"}, deep, 7]
+    body = json.dumps(records).encode()
+
+    for size in (5, 64, len(body)):
+        parser = JSONArrayParser()
+        items = [item for start in range(0, len(body), size) for item in parser.feed(body[start:start + size])]
+        assert items + parser.close() == records
+
+
+def test_parser_scalars_and_empty_array():
+    parser = JSONArrayParser()
+    assert parser.feed(b"[1, 2") == [1]
+    assert parser.feed(b"3, true]") == [23, True]
+    assert parser.close() == []
+
+    parser = JSONArrayParser()
+    assert parser.feed(b" [ ] ") == []
+    assert parser.close() == []
+
+
+def test_parser_rejects_bad_input():
+    with pytest.raises(ValueError):
+        JSONArrayParser().feed(b'{"error": "limit"}')
+
+    parser = JSONArrayParser()
+    parser.feed(b'[{"a": 1},')
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_iter_json_array_batches():
+    body = json.dumps(RECORDS).encode()
+
+    async def chunks():
+        for start in range(0, len(body), 7):
+            yield body[start:start + 7]
+
+    async def collect():
+        return [batch async for batch in iter_json_array(chunks(), chunk_size=10)]
+
+    batches = asyncio.run(collect())
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [item for batch in batches for item in batch] == RECORDS
+
+
+def test_stream_to_db_writes_all_batches():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[StockSymbol.__table__])
+
+        async def batches():
+            for start in range(0, len(RECORDS), 10):
+                yield RECORDS[start:start + 10]
+
+        writer = BulkWriter(StockSymbol, batch_size=8, engine=engine)
+        total = await stream_to_db(batches(), StockSymbol, writer)
+
+        async with AsyncSession(engine) as session:
+            rows = (await session.exec(select(StockSymbol))).all()
+        await engine.dispose()
+        return total, rows
+
+    total, rows = asyncio.run(run())
+    assert total == len(RECORDS)
+    assert sorted(row.symbol for row in rows) == sorted(r["symbol"] for r in RECORDS)
+    assert {row.display_symbol for row in rows} == {r["displaySymbol"] for r in RECORDS}
+
+
+def test_stream_to_db_stops_the_download_when_the_writer_fails():
+    class FailingWriter:
+        async def write(self, batch):
+            raise RuntimeError("insert failed")
+
+    async def run():
+        async def batches():
+            for start in range(0, len(RECORDS), 5):
+                yield RECORDS[start:start + 5]
+
+        with pytest.raises(RuntimeError, match="insert failed"):
+            await stream_to_db(batches(), StockSymbol, FailingWriter(), queue_size=1)
+        # The producer was blocked on the full queue; it must not be left hanging on its sentinel
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
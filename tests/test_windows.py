@@ -0,0 +1,65 @@
+import asyncio
+from datetime import date, timedelta
+
+from finhub_etl.config.windows import fetch_windowed, split_range
+
+
+class FakeNews:
+    """/company-news stand-in: `per_day` articles a day, truncated at 250, plus one story repeated daily."""
+
+    def __init__(self, per_day):
+        self.per_day = per_day
+        self.requests = []
+        self.in_flight = self.peak = 0
+
+    async def get(self, endpoint, params):
+        self.requests.append((params["from"], params["to"]))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        day, end = date.fromisoformat(params["from"]), date.fromisoformat(params["to"])
+        records = [{"id": 0, "headline": "evergreen"}]
+        while day <= end:
+            n = self.per_day(day)
+            records += [{"id": day.toordinal() * 1000 + i, "datetime": day.isoformat()} for i in range(n)]
+            day += timedelta(days=1)
+        return records[:250]
+
+
+def test_split_range_covers_every_day_once():
+    windows = split_range("2024-01-01", "2024-03-01", 7)
+    days = [start + timedelta(days=i) for start, stop in windows for i in range((stop - start).days + 1)]
+    assert days == [date(2024, 1, 1) + timedelta(days=i) for i in range(61)]
+    assert split_range("2024-01-02", "2024-01-01", 7) == []
+
+
+def test_dense_periods_are_bisected_until_complete():
+    # Quiet year with a dense burst in March
+    client = FakeNews(lambda day: 40 if day.month == 3 else 2)
+
+    news = asyncio.run(fetch_windowed("/company-news", {"symbol": "AAPL"}, "2023-01-01", "2023-12-31",
+                                      window_days=60, concurrency=4, client=client))
+
+    expected = 31 * 40 + 334 * 2
+    assert len(news) == expected + 1                   # the repeated story is kept once
+    assert len({record["id"] for record in news}) == len(news)
+    assert 1 < client.peak <= 4
+    # Far fewer requests than one per day: quiet windows are fetched whole
+    assert len(client.requests) < 60
+    assert ("2023-01-01", "2023-03-01") in client.requests
+
+
+def test_object_responses_keep_their_shape():
+    class FakeInsider:
+        async def get(self, endpoint, params):
+            return {"symbol": params["symbol"], "data": [
+                {"name": "Cook", "transactionDate": params["from"], "share": 1, "change": -1},
+                {"name": "Cook", "transactionDate": "2024-01-01", "share": 1, "change": -1},
+            ]}
+
+    payload = asyncio.run(fetch_windowed("/stock/insider-transactions", {"symbol": "AAPL"},
+                                         "2024-01-01", "2024-01-05", window_days=2, client=FakeInsider()))
+
+    assert payload["symbol"] == "AAPL"
+    assert [record["transactionDate"] for record in payload["data"]] == ["2024-01-01", "2024-01-03", "2024-01-05"]
@@ -0,0 +1,160 @@
+import asyncio
+import os
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from finhub_etl.config.breaker import CircuitOpenError
+from finhub_etl.models import RateLimitBucket, WorkItem
+from finhub_etl.workers import (
+    SharedRateLimiter,
+    claim,
+    complete,
+    create_job,
+    fail,
+    job_progress,
+    park_requests,
+    plan_work,
+    run_worker,
+    run_workers,
+)
+
+
+async def record_item(item, limiter):
+    """Handler run in the worker processes: one marker file per processed item."""
+    await limiter.acquire()
+    await asyncio.sleep(0.01)
+    Path(item.params["out"], f"{item.id}-{os.getpid()}").touch()
+
+
+async def refuse_item(item, limiter):
+    raise CircuitOpenError(item.dataset, 60)
+
+
+def _engine(path):
+    return create_async_engine(f"sqlite+aiosqlite:///{path}?timeout=30")
+
+
+async def _setup(path):
+    engine = _engine(path)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[WorkItem.__table__, RateLimitBucket.__table__])
+    return engine
+
+
+async def _items(engine, job):
+    async with engine.connect() as conn:
+        return (await conn.execute(WorkItem.__table__.select().where(WorkItem.__table__.c.job == job))).all()
+
+
+def test_plan_work_shards_symbols_and_windows():
+    items = plan_work(["/stock/candle"], ["A", "B", "C"], shard_size=2,
+                      windows=[(0, 10), (10, 20)], params={"resolution": "D"})
+
+    assert len(items) == 4
+    assert items[0] == ("/stock/candle", {"resolution": "D", "symbols": ["A", "B"], "from": 0, "to": 10})
+    assert items[3][1]["symbols"] == ["C"]
+
+
+def test_expired_leases_are_reclaimed_and_fenced(tmp_path):
+    async def run():
+        engine = await _setup(tmp_path / "db.sqlite")
+        await create_job("job", [("/x", {"n": 1}), ("/x", {"n": 2})], engine)
+
+        first = await claim("job", "a", limit=1, lease_seconds=0, engine=engine)
+        await asyncio.sleep(0.01)
+        # First lease expired: worker b takes the same item plus the next one
+        second = await claim("job", "b", limit=2, lease_seconds=60, engine=engine)
+        stale = await complete(first[0], engine)
+        fresh = [await complete(second[0], engine), await fail(second[1], "boom", max_attempts=1, engine=engine)]
+        progress = await job_progress("job", engine)
+        await engine.dispose()
+        return first, second, stale, fresh, progress
+
+    first, second, stale, fresh, progress = asyncio.run(run())
+
+    assert [item.id for item in second] == [first[0].id, first[0].id + 1]
+    assert second[0].attempts == 2
+    assert stale is False and fresh == [True, True]
+    assert progress == {"pending": 0, "leased": 0, "done": 1, "failed": 1}
+
+
+def test_items_whose_worker_keeps_crashing_are_dead_lettered(tmp_path):
+    async def run():
+        engine = await _setup(tmp_path / "db.sqlite")
+        await create_job("job", [("/x", {"n": 1})], engine)
+
+        claims = []
+        for worker in "abcd":
+            # Each worker crashes while holding the lease
+            claims.append(await claim("job", worker, lease_seconds=0, engine=engine, max_attempts=3))
+            await asyncio.sleep(0.01)
+        progress = await job_progress("job", engine)
+        item = (await _items(engine, "job"))[0]
+        await engine.dispose()
+        return claims, progress, item
+
+    claims, progress, item = asyncio.run(run())
+
+    assert [[leased.attempts for leased in leased_items] for leased_items in claims] == [[1], [2], [3], []]
+    assert progress == {"pending": 0, "leased": 0, "done": 0, "failed": 1}
+    assert item.attempts == 3 and "expired" in item.error and item.lease_token is None
+
+
+def test_shared_rate_limiter_never_overdraws(tmp_path):
+    async def run():
+        engine = await _setup(tmp_path / "db.sqlite")
+        limiter = SharedRateLimiter("test", rate_per_second=0.001, capacity=3, engine=engine)
+        other = SharedRateLimiter("test", rate_per_second=0.001, capacity=3, engine=engine)
+        waits = [await limiter.try_acquire(), await other.try_acquire(), await limiter.try_acquire(),
+                 await other.try_acquire()]
+        await engine.dispose()
+        return waits
+
+    waits = asyncio.run(run())
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] > 0
+
+
+def test_worker_processes_process_each_item_once(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    database = tmp_path / "db.sqlite"
+
+    async def plan():
+        engine = await _setup(database)
+        items = plan_work(["/test"], [f"S{i}" for i in range(30)], shard_size=1, params={"out": str(out)})
+        await create_job("job", items, engine)
+        await engine.dispose()
+
+    asyncio.run(plan())
+    totals = run_workers("job", processes=3, handler=record_item,
+                         database_url=f"sqlite+aiosqlite:///{database}?timeout=30",
+                         rate_per_second=1000, batch_size=2, lease_seconds=30)
+
+    ids = [name.split("-")[0] for name in os.listdir(out)]
+    assert totals == {"done": 30, "failed": 0, "deferred": 0}
+    assert sorted(ids, key=int) == [str(i) for i in range(1, 31)]
+
+
+def test_parked_and_deferred_items_wait_without_spending_attempts(tmp_path):
+    async def run():
+        engine = await _setup(tmp_path / "db.sqlite")
+        await park_requests("/stock/financials-reported", [{"symbol": "AAPL"}], retry_after=60, engine=engine)
+        parked = await claim("parked", "a", engine=engine)
+
+        await create_job("job", [("/stock/financials-reported", {"symbol": "MSFT"})], engine=engine)
+        counts = await run_worker("job", handler=refuse_item, until_idle=True, engine=engine)
+        progress = await job_progress("job", engine)
+        item = (await _items(engine, "job"))[0]
+        await engine.dispose()
+        return parked, counts, progress, item
+
+    parked, counts, progress, item = asyncio.run(run())
+
+    assert parked == []
+    assert counts == {"done": 0, "failed": 0, "deferred": 1}
+    assert progress["pending"] == 1
+    assert item.attempts == 0 and "circuit open" in item.error